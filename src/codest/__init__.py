@@ -2,7 +2,8 @@
 Codest - プロジェクトのソースコードを1つのドキュメントにまとめるツール
 """
 from .document_generator import DocumentGenerator
+from .session import CodestSession
 from .exceptions import CodestError
 
 __version__ = '0.1.4'
-__all__ = ['DocumentGenerator', 'CodestError']
\ No newline at end of file
+__all__ = ['DocumentGenerator', 'CodestSession', 'CodestError']
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""zip・tarアーカイブから展開せずにソースファイルを収集するモジュール"""
+import os
+import time
+import logging
+import tarfile
+import zipfile
+import posixpath
+from typing import Callable, Iterator, Optional, Tuple
+from .constants import ARCHIVE_EXTENSIONS
+from .exceptions import FileCollectionError
+from .file_collector import FileCollector
+from .gitignore import GitIgnoreHandler, parse_gitignore_lines
+
+logger = logging.getLogger(__name__)
+
+
+def is_archive(path: str) -> bool:
+    """
+    パスが収集対象のアーカイブファイルかを判定
+
+    Args:
+        path (str): 対象パス
+
+    Returns:
+        bool: 対応する拡張子のファイルの場合True
+    """
+    return path.lower().endswith(ARCHIVE_EXTENSIONS) and os.path.isfile(path)
+
+
+class ArchiveMember:
+    def __init__(self, name: str, size: int, mtime: float):
+        """
+        アーカイブ内のファイル情報
+
+        Args:
+            name (str): アーカイブ内のパス（'/'区切り）
+            size (int): 展開後のサイズ（バイト）
+            mtime (float): 更新時刻（UNIX時刻）
+        """
+        self.name = name
+        self.size = size
+        self.mtime = mtime
+
+
+def _normalize_member_name(name: str) -> Optional[str]:
+    """
+    メンバー名を正規化
+
+    Args:
+        name (str): アーカイブに記録された名前
+
+    Returns:
+        Optional[str]: 正規化された名前（空の場合はNone）
+    """
+    name = posixpath.normpath(name.replace('\\', '/')).lstrip('/')
+    return None if name in ('', '.') else name
+
+
+def _gitignore_root(name: str, top_dirs: set) -> Optional[str]:
+    """
+    アーカイブのルート（または唯一の最上位ディレクトリ）直下の.gitignoreであればそのディレクトリを取得
+
+    Args:
+        name (str): メンバー名
+        top_dirs (set): 最上位ディレクトリ名の候補
+
+    Returns:
+        Optional[str]: .gitignoreのディレクトリ（'.'はアーカイブのルート）、対象外の場合はNone
+    """
+    directory, basename = posixpath.split(name)
+    if basename != '.gitignore':
+        return None
+    if directory == '':
+        return '.'
+    return directory if directory in top_dirs else None
+
+
+def _iter_zip_members(archive_path: str, collector: FileCollector
+                      ) -> Iterator[Tuple[ArchiveMember, Callable[[], bytes]]]:
+    """
+    zipアーカイブのメンバーを名前順に列挙
+
+    中央ディレクトリから一覧を取得できるため、.gitignoreを先に読み込んでから列挙する。
+    """
+    with zipfile.ZipFile(archive_path) as archive:
+        infos = {}
+        for info in archive.infolist():
+            name = _normalize_member_name(info.filename)
+            if name is not None and not info.is_dir():
+                infos[name] = info
+
+        top_dirs = {name.split('/', 1)[0] for name in infos if '/' in name}
+        gitignore = None
+        for name in sorted(infos):
+            root = _gitignore_root(name, top_dirs if len(top_dirs) == 1 else set())
+            if root is not None:
+                lines = archive.read(infos[name]).decode('utf-8', errors='replace').splitlines()
+                gitignore = GitIgnoreHandler(root, parse_gitignore_lines(lines))
+                break
+
+        for name in sorted(infos):
+            if not collector.should_collect_member(name, gitignore):
+                continue
+            info = infos[name]
+            mtime = time.mktime(info.date_time + (0, 0, -1))
+            yield ArchiveMember(name, info.file_size, mtime), lambda info=info: archive.read(info)
+
+
+def _iter_tar_members(archive_path: str, collector: FileCollector
+                      ) -> Iterator[Tuple[ArchiveMember, Callable[[], bytes]]]:
+    """
+    tarアーカイブのメンバーを格納順に列挙
+
+    圧縮の有無にかかわらずストリームモードで先頭から一度だけ読み込む。
+    そのため.gitignoreはストリーム上で現れた以降のメンバーにのみ適用される。
+    """
+    with tarfile.open(archive_path, 'r|*') as archive:
+        gitignore = None
+        top_dir = None
+        for info in archive:
+            name = _normalize_member_name(info.name)
+            if name is None:
+                continue
+            # 最初のメンバーの最上位ディレクトリをアーカイブのルートとみなす（sdist等）
+            if top_dir is None:
+                top_dir = name.split('/', 1)[0] if '/' in name or info.isdir() else ''
+            if not info.isfile():
+                continue
+
+            root = _gitignore_root(name, {top_dir})
+            if root is not None:
+                data = archive.extractfile(info).read()
+                lines = data.decode('utf-8', errors='replace').splitlines()
+                gitignore = GitIgnoreHandler(root, parse_gitignore_lines(lines))
+                continue
+
+            if not collector.should_collect_member(name, gitignore):
+                continue
+            # extractfileはストリーム上の現在位置からのみ読み込める
+            yield ArchiveMember(name, info.size, info.mtime), lambda info=info: archive.extractfile(info).read()
+
+
+def iter_archive_members(archive_path: str, collector: FileCollector
+                         ) -> Iterator[Tuple[ArchiveMember, Callable[[], bytes]]]:
+    """
+    アーカイブを展開せずに収集対象のメンバーを列挙
+
+    内容は読み込み関数を呼び出したときにのみ読み込まれる。tarアーカイブでは
+    次のメンバーへ進むと前のメンバーは読み込めなくなるため、列挙中に呼び出すこと。
+
+    Args:
+        archive_path (str): アーカイブのパス
+        collector (FileCollector): 拡張子・無視パターンの判定に使用するコレクタ
+
+    Yields:
+        Tuple[ArchiveMember, Callable[[], bytes]]: (メンバー情報, 内容の読み込み関数)
+
+    Raises:
+        FileCollectionError: アーカイブの読み込みに失敗した場合
+    """
+    logger.info(f"Starting to collect files from archive: {archive_path}")
+    try:
+        if zipfile.is_zipfile(archive_path):
+            yield from _iter_zip_members(archive_path, collector)
+        else:
+            yield from _iter_tar_members(archive_path, collector)
+    except (OSError, EOFError, zipfile.BadZipFile, tarfile.TarError) as e:
+        raise FileCollectionError(f"Error reading archive {archive_path}: {str(e)}")
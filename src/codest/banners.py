@@ -0,0 +1,212 @@
+"""多数のファイルの先頭で繰り返されるライセンス・著作権表示を検出して1回だけ出力するモジュール"""
+import re
+import hashlib
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 先頭のコメントを探す範囲
+BANNER_SCAN_BYTES = 16 * 1024
+BANNER_MAX_LINES = 80
+# 共通ヘッダーとみなす最小の行数とファイル数
+DEFAULT_BANNER_MIN_LINES = 3
+DEFAULT_BANNER_MIN_FILES = 3
+
+# 1行コメント（Cプリプロセッサ指令は除く）
+_LINE_COMMENT_RE = re.compile(
+    r'^\s*(?://|--(?!-*>)|#(?!\s*(?:include|import|define|undef|if|ifdef|ifndef|elif|else|endif|pragma|'
+    r'error|warning|line|region|endregion)\b))')
+_BLOCK_STARTS = (('/*', '*/'), ('<!--', '-->'))
+
+
+def leading_comment_lines(text: str) -> Tuple[int, List[str]]:
+    """
+    ファイル先頭のコメント行を取得
+
+    Args:
+        text (str): ファイルの先頭部分（改行コードは'\\n'）
+
+    Returns:
+        Tuple[int, List[str]]: (先頭のshebang行の数（0または1）, 末尾の空白を除いたコメント行のリスト
+            （末尾の空行は含まない）)
+    """
+    lines = text.split('\n', BANNER_MAX_LINES + 1)[:BANNER_MAX_LINES + 1]
+    skip = 1 if lines and lines[0].startswith('#!') else 0
+    comment: List[str] = []
+    block_end: Optional[str] = None
+    for line in lines[skip:skip + BANNER_MAX_LINES]:
+        line = line.rstrip()
+        stripped = line.lstrip()
+        if block_end is not None:
+            comment.append(line)
+            if block_end in stripped:
+                block_end = None
+            continue
+        if not stripped:
+            comment.append(line)
+            continue
+        for start, end in _BLOCK_STARTS:
+            if stripped.startswith(start):
+                comment.append(line)
+                if end not in stripped[len(start):]:
+                    block_end = end
+                break
+        else:
+            if _LINE_COMMENT_RE.match(line):
+                comment.append(line)
+                continue
+            break
+    if block_end is not None:
+        # 閉じていないブロックコメントは共通ヘッダーとみなさない
+        return skip, []
+    while comment and not comment[-1]:
+        comment.pop()
+    return skip, comment
+
+
+def _remove_lines(content: str, skip: int, count: int) -> str:
+    """shebang行の後のcount行と直後の空行を除去"""
+    all_lines = content.split('\n')
+    end = skip + count
+    while end < len(all_lines) and not all_lines[end].strip():
+        end += 1
+    return '\n'.join(all_lines[:skip] + all_lines[end:])
+
+
+def _prefix_hashes(lines: List[str]) -> List[bytes]:
+    """先頭からk行（k=1..n）ずつの累積ハッシュ"""
+    hasher = hashlib.blake2b(digest_size=12)
+    hashes = []
+    for line in lines:
+        hasher.update(line.encode('utf-8', 'surrogatepass'))
+        hasher.update(b'\n')
+        hashes.append(hasher.copy().digest())
+    return hashes
+
+
+class Banner:
+    def __init__(self, banner_id: int, lines: List[str]):
+        """
+        複数のファイルに共通する先頭のコメント
+
+        Args:
+            banner_id (int): 番号（1から）
+            lines (List[str]): コメント行
+        """
+        self.id = banner_id
+        self.lines = lines
+        self.text = '\n'.join(lines)
+        # 検出時にこの共通ヘッダーを持っていたファイル数
+        self.files = 0
+        # 実際に除去したファイル数とバイト数
+        self.stripped_files = 0
+        self.bytes_removed = 0
+
+
+class BannerIndex:
+    def __init__(self, min_lines: int = DEFAULT_BANNER_MIN_LINES, min_files: int = DEFAULT_BANNER_MIN_FILES):
+        """
+        先頭のコメント行の累積ハッシュから共通ヘッダーを検出し、各ファイルから除去する
+
+        ファイルごとに、min_files個以上のファイルと共有している最も長い先頭のコメント行
+        （min_lines行以上）を共通ヘッダーとする。ライセンス表示の後にファイル固有の
+        説明コメントが続く場合も、共有されている部分のみが共通ヘッダーになる。
+
+        Args:
+            min_lines (int, optional): 共通ヘッダーとみなす最小の行数
+            min_files (int, optional): 共通ヘッダーとみなす最小のファイル数
+        """
+        self.min_lines = min_lines
+        self.min_files = min_files
+        self.banners: List[Banner] = []
+        # 検出時の内容から見積もった除去されるバイト数
+        self.expected_bytes = 0
+        # 相対パス -> 共通ヘッダー
+        self._assigned: Dict[str, Banner] = {}
+
+    def build(self, file_paths: Iterable[str], read_head: Callable[[str], bytes],
+              rel_path: Callable[[str], str] = None) -> None:
+        """
+        ファイルの先頭部分から共通ヘッダーを検出
+
+        Args:
+            file_paths (Iterable[str]): 対象ファイルのパス
+            read_head (Callable[[str], bytes]): ファイルの先頭BANNER_SCAN_BYTESバイトを読み込む関数
+            rel_path (Callable[[str], str], optional): ファイルパスからstrip()で使う識別名への変換
+        """
+        candidates: Dict[str, Tuple[List[str], List[bytes], int]] = {}
+        counts: Dict[bytes, int] = {}
+        for file_path in file_paths:
+            try:
+                head = read_head(file_path)
+            except OSError:
+                continue
+            text = head.decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n')
+            skip, lines = leading_comment_lines(text)
+            if len(lines) < self.min_lines:
+                continue
+            # 見積もりのためコメントの直後の空行の数のみ保持（先頭部分の内容は保持しない）
+            following = text.split('\n', skip + len(lines) + BANNER_MAX_LINES)[skip + len(lines):]
+            blank_after = next((i for i, line in enumerate(following) if line.strip()), len(following))
+            hashes = _prefix_hashes(lines)
+            candidates[rel_path(file_path) if rel_path else file_path] = (lines, hashes, blank_after)
+            for prefix_hash in hashes[self.min_lines - 1:]:
+                counts[prefix_hash] = counts.get(prefix_hash, 0) + 1
+
+        by_hash: Dict[bytes, Banner] = {}
+        for name, (lines, hashes, blank_after) in candidates.items():
+            for length in range(len(lines), self.min_lines - 1, -1):
+                prefix_hash = hashes[length - 1]
+                if counts.get(prefix_hash, 0) < self.min_files:
+                    continue
+                # 共通部分の末尾の空行は共通ヘッダーに含めない
+                while length > self.min_lines and not lines[length - 1]:
+                    length -= 1
+                    prefix_hash = hashes[length - 1]
+                banner = by_hash.get(prefix_hash)
+                if banner is None:
+                    banner = Banner(len(by_hash) + 1, lines[:length])
+                    by_hash[prefix_hash] = banner
+                self._assigned[name] = banner
+                banner.files += 1
+                end = length
+                while end < len(lines) and not lines[end]:
+                    end += 1
+                self.expected_bytes += sum(len(line.encode('utf-8')) + 1 for line in lines[:end])
+                if end == len(lines):
+                    self.expected_bytes += blank_after
+                break
+
+        self.banners = list(by_hash.values())
+        logger.info(f"Detected {len(self.banners)} common headers in {len(self._assigned)} files")
+
+    @property
+    def file_count(self) -> int:
+        """共通ヘッダーを除去する対象のファイル数"""
+        return len(self._assigned)
+
+    def strip(self, name: str, content: str) -> Tuple[str, Optional[Banner]]:
+        """
+        内容から共通ヘッダー（と直後の空行）を除去
+
+        Args:
+            name (str): build()でのファイルの識別名
+            content (str): ファイルの内容（改行コードは'\\n'）
+
+        Returns:
+            Tuple[str, Optional[Banner]]: (除去後の内容, 除去した共通ヘッダー（なければNone）)
+        """
+        banner = self._assigned.get(name)
+        if banner is None:
+            return content, None
+
+        skip, lines = leading_comment_lines(content)
+        if lines[:len(banner.lines)] != banner.lines:
+            # 検出後に内容が変わった場合はそのまま出力
+            return content, None
+
+        stripped = _remove_lines(content, skip, len(banner.lines))
+        banner.stripped_files += 1
+        banner.bytes_removed += len(content.encode('utf-8')) - len(stripped.encode('utf-8'))
+        return stripped, banner
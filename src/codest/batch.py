@@ -0,0 +1,241 @@
+"""複数のドキュメントを1プロセスで生成するバッチ処理モジュール"""
+import os
+import json
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+from .content_cache import ContentCache
+from .exceptions import BatchConfigError
+from .gitignore import GitIgnoreCache
+from .outline import OutlineCache
+
+logger = logging.getLogger(__name__)
+
+# 設定ファイルからの相対パスとして解決するオプション
+PATH_OPTIONS = {'manifest', 'since', 'files-from', 'entry', 'exclude', 'redact-markers', 'search-index',
+                'import-cache', 'dir-snapshot'}
+
+# 値ごとにフラグを繰り返して指定するオプション（action='append'）
+REPEATED_OPTIONS = {'entry', 'redact-pattern'}
+
+
+def options_to_argv(options: Dict[str, Any], base_dir: str) -> List[str]:
+    """
+    ジョブのオプション辞書をコマンドライン引数に変換
+
+    Args:
+        options (Dict[str, Any]): オプション名（'--'なし、'_'は'-'とみなす）から値への辞書
+        base_dir (str): 相対パスの基準ディレクトリ
+
+    Returns:
+        List[str]: コマンドライン引数
+    """
+    def resolve(name: str, value: Any) -> str:
+        value = str(value)
+        if name in PATH_OPTIONS and value != '-':
+            value = os.path.join(base_dir, value)
+        return value
+
+    argv = []
+    for name, value in options.items():
+        name = name.replace('_', '-')
+        flag = f'--{name}'
+        if value is None or value is False:
+            continue
+        if value is True:
+            argv.append(flag)
+        elif isinstance(value, list) and name in REPEATED_OPTIONS:
+            for item in value:
+                argv.extend([flag, resolve(name, item)])
+        elif isinstance(value, list):
+            argv.append(flag)
+            argv.extend(resolve(name, item) for item in value)
+        else:
+            argv.extend([flag, resolve(name, value)])
+    return argv
+
+
+class BatchJob:
+    def __init__(self, name: str, argv: List[str]):
+        """
+        バッチ処理の1ジョブ
+
+        Args:
+            name (str): ジョブ名
+            argv (List[str]): ジョブに対応するコマンドライン引数
+        """
+        self.name = name
+        self.argv = argv
+
+
+def load_batch_config(config_path: str) -> List[BatchJob]:
+    """
+    バッチ設定ファイル（JSON）を読み込み
+
+    形式: {"defaults": {オプション}, "jobs": [{"name", "roots", "exclude", "output", "options"}]}
+    パスは設定ファイルのディレクトリからの相対パスとして解決する。
+
+    Args:
+        config_path (str): 設定ファイルのパス
+
+    Returns:
+        List[BatchJob]: ジョブのリスト
+
+    Raises:
+        BatchConfigError: 読み込みに失敗した場合、または形式が不正な場合
+    """
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    except (OSError, ValueError) as e:
+        raise BatchConfigError(f"Failed to load batch config {config_path}: {str(e)}")
+
+    if not isinstance(config, dict) or not isinstance(config.get('jobs'), list):
+        raise BatchConfigError(f"Batch config must contain a \"jobs\" list: {config_path}")
+
+    base_dir = os.path.dirname(os.path.abspath(config_path))
+    defaults = config.get('defaults', {})
+    jobs = []
+    names = set()
+    for i, job in enumerate(config['jobs']):
+        if not isinstance(job, dict) or not job.get('output'):
+            raise BatchConfigError(f"Job #{i + 1} must be an object with an \"output\" path")
+
+        name = job.get('name') or os.path.splitext(os.path.basename(job['output']))[0]
+        if name in names:
+            raise BatchConfigError(f"Duplicate job name: {name}")
+        names.add(name)
+
+        roots = job.get('roots', ['.'])
+        if isinstance(roots, str):
+            roots = [roots]
+        argv = [os.path.join(base_dir, root) for root in roots]
+        argv += ['-o', os.path.join(base_dir, job['output'])]
+        if job.get('exclude'):
+            argv += ['--exclude'] + [os.path.join(base_dir, d) for d in job['exclude']]
+
+        options = dict(defaults)
+        options.update(job.get('options', {}))
+        argv += options_to_argv(options, base_dir)
+        jobs.append(BatchJob(name, argv))
+    return jobs
+
+
+class SharedResources:
+    def __init__(self):
+        """ジョブ間で共有するキャッシュ"""
+        self.content_cache = ContentCache()
+        self.gitignore_cache = GitIgnoreCache()
+        self.outline_cache = OutlineCache()
+
+    def generator_options(self) -> Dict[str, Any]:
+        """
+        DocumentGeneratorに渡す共有キャッシュの引数
+
+        Returns:
+            Dict[str, Any]: キーワード引数
+        """
+        return {
+            'content_cache': self.content_cache,
+            'gitignore_cache': self.gitignore_cache,
+            'outline_cache': self.outline_cache,
+        }
+
+
+class JobResult:
+    def __init__(self, name: str, output: str = None, seconds: float = 0.0,
+                 files: int = 0, size: int = 0, error: str = None):
+        """
+        ジョブの実行結果
+
+        Args:
+            name (str): ジョブ名
+            output (str, optional): 出力ファイルのパス
+            seconds (float, optional): 実行時間（秒）
+            files (int, optional): 出力したファイル数
+            size (int, optional): 出力のバイト数
+            error (str, optional): 失敗した場合のエラーメッセージ
+        """
+        self.name = name
+        self.output = output
+        self.seconds = seconds
+        self.files = files
+        self.size = size
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'status': 'ok' if self.ok else 'failed',
+            'output': self.output,
+            'seconds': round(self.seconds, 3),
+            'files': self.files,
+            'bytes': self.size,
+            'error': self.error,
+        }
+
+
+class BatchRunner:
+    def __init__(self, run_job: Callable[[BatchJob], Any], max_workers: int = None):
+        """
+        共有のワーカープールでジョブを実行
+
+        Args:
+            run_job (Callable[[BatchJob], Any]): ジョブを実行し、(出力パス, DocumentGenerator) を返す関数
+            max_workers (int, optional): ワーカー数（省略時はCPU数）
+        """
+        self.run_job = run_job
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def _run_one(self, job: BatchJob) -> JobResult:
+        start = time.perf_counter()
+        try:
+            output, generator = self.run_job(job)
+        except SystemExit:
+            # オプションの解析エラー（詳細はargparseが出力済み）
+            return JobResult(job.name, seconds=time.perf_counter() - start, error='Invalid job options')
+        except Exception as e:
+            logger.error(f"Job {job.name} failed: {str(e)}")
+            return JobResult(job.name, seconds=time.perf_counter() - start, error=str(e))
+
+        return JobResult(job.name, output, time.perf_counter() - start,
+                         generator.stats.get('files', 0), generator.stats.get('bytes', 0))
+
+    def run(self, jobs: List[BatchJob]) -> List[JobResult]:
+        """
+        すべてのジョブを実行
+
+        Args:
+            jobs (List[BatchJob]): ジョブのリスト
+
+        Returns:
+            List[JobResult]: ジョブの順序どおりの実行結果
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self._run_one, jobs))
+
+
+def format_report(results: List[JobResult]) -> str:
+    """
+    ジョブごとの実行時間のレポートを作成
+
+    Args:
+        results (List[JobResult]): 実行結果
+
+    Returns:
+        str: 表形式のレポート
+    """
+    width = max([len(r.name) for r in results] + [len('Job')])
+    lines = [f"{'Job':<{width}}  {'Status':<6}  {'Seconds':>8}  {'Files':>6}  {'Bytes':>12}"]
+    for r in results:
+        lines.append(f"{r.name:<{width}}  {'ok' if r.ok else 'FAILED':<6}  {r.seconds:>8.2f}  "
+                     f"{r.files:>6}  {r.size:>12}")
+    total = sum(r.seconds for r in results)
+    failed = sum(1 for r in results if not r.ok)
+    lines.append(f"{len(results)} jobs, {failed} failed, {total:.2f}s total job time")
+    return '\n'.join(lines)
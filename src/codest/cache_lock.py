@@ -0,0 +1,52 @@
+"""永続キャッシュの保存を同じファイルを使う他のスレッド・プロセスと排他するモジュール"""
+import os
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_thread_locks: Dict[str, threading.Lock] = {}
+_thread_locks_guard = threading.Lock()
+
+
+@contextmanager
+def cache_file_lock(path: str) -> Iterator[None]:
+    """
+    キャッシュファイルの読み込み・マージ・書き込みの間、同じファイルへの保存を排他
+
+    同じプロセス内のスレッド（バッチ処理のジョブ）はパスごとのロックで、他のプロセスとは
+    fcntlが使える環境では隣の.lockファイルのロックで排他する。
+
+    Args:
+        path (str): キャッシュファイルのパス
+    """
+    key = os.path.abspath(path)
+    with _thread_locks_guard:
+        thread_lock = _thread_locks.setdefault(key, threading.Lock())
+
+    with thread_lock:
+        lock_file = None
+        if fcntl is not None:
+            try:
+                os.makedirs(os.path.dirname(key), exist_ok=True)
+                lock_file = open(f"{key}.lock", 'a')
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            except OSError as e:
+                # ロックできなくても保存は続行（他のプロセスの記録を落とす可能性があるだけ）
+                logger.debug(f"Cannot lock cache file {path}: {str(e)}")
+                if lock_file is not None:
+                    lock_file.close()
+                    lock_file = None
+        try:
+            yield
+        finally:
+            if lock_file is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                lock_file.close()
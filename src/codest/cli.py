@@ -1,10 +1,28 @@
 import argparse
+import os
+import re
+import json
+import time
+import shlex
 import sys
 import logging
+from typing import List
 
-from .normalize_paths import normalize_paths, is_subdirectory
+from .normalize_paths import normalize_paths, find_paths_outside
 from .document_generator import DocumentGenerator
-from .exceptions import CodestError
+from .file_collector import FileCollector, read_file_list
+from .selection import budget_from_options, parse_size, parse_weights
+from .section_index import extract_sections
+from .archive import is_archive
+from .redaction import Redactor, compile_user_patterns, load_markers
+from .renderers import RENDERERS, get_renderer
+from .imports import ImportCache, default_import_cache_path
+from .banners import DEFAULT_BANNER_MIN_FILES
+from .dir_snapshot import DirectorySnapshot, default_dir_snapshot_path
+from .notebook import NOTEBOOK_OUTPUT_MODES, OUTPUTS_NONE, DEFAULT_OUTPUT_LINES
+from .search_index import SEARCH_INDEX_NAME, SearchIndex, default_search_index_path
+from .batch import BatchJob, BatchRunner, SharedResources, format_report, load_batch_config
+from .exceptions import CodestError, SearchIndexError
 
 logger = logging.getLogger(__name__)
 
@@ -25,8 +43,8 @@ def create_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument(
         'directories',
-        help='Directories to scan for source files',
-        nargs='+',  # 1つ以上のディレクトリを受け付ける
+        help='Directories to scan for source files, or zip/tar archives to read without extracting',
+        nargs='*',  # 省略時はカレントディレクトリ
         default=['.']
     )
     parser.add_argument(
@@ -35,6 +53,11 @@ def create_parser() -> argparse.ArgumentParser:
         nargs='*',
         default=[]
     )
+    parser.add_argument(
+        '--files-from',
+        metavar='FILE',
+        help='Read newline- or NUL-separated file paths from FILE (use - for stdin) instead of scanning directories'
+    )
     parser.add_argument(
         '-o', '--output',
         help='Output file path'
@@ -45,6 +68,208 @@ def create_parser() -> argparse.ArgumentParser:
         default=1000,
         help='Maximum file size in KB (default: 1000)'
     )
+    parser.add_argument(
+        '--excerpt-kb',
+        type=int,
+        metavar='N',
+        help='Include the first and last N KB of files exceeding --max-size instead of skipping them'
+    )
+    parser.add_argument(
+        '--excerpt-lines',
+        type=int,
+        metavar='N',
+        help='Include the first and last N lines of files exceeding --max-size instead of skipping them'
+    )
+    parser.add_argument(
+        '--outline',
+        action='store_true',
+        help='Render classes, functions and signatures only instead of full file contents'
+    )
+    parser.add_argument(
+        '--outline-above',
+        type=float,
+        metavar='KB',
+        help='Render only files larger than KB as outlines'
+    )
+    parser.add_argument(
+        '--budget',
+        metavar='SIZE',
+        help='Total output budget in bytes (K/M suffixes allowed); the highest-priority files are selected to fit'
+    )
+    parser.add_argument(
+        '--budget-tokens',
+        type=int,
+        metavar='N',
+        help='Total output budget in estimated tokens'
+    )
+    parser.add_argument(
+        '--priority-weights',
+        metavar='WEIGHTS',
+        help='Priority signal weights for --budget, e.g. "depth=1,recency=2,size=0.5,extension=1,entry_point=1.5"'
+    )
+    parser.add_argument(
+        '--entry',
+        metavar='PATH',
+        action='append',
+        help='Only include files reachable through imports from PATH (Python, JS/TS, Go, Swift), '
+             'dependencies first; may be repeated'
+    )
+    parser.add_argument(
+        '--import-cache',
+        metavar='FILE',
+        help='Cache file for parsed imports, keyed by content hash (default: ~/.cache/codest/imports.json)'
+    )
+    parser.add_argument(
+        '--match',
+        metavar='QUERY',
+        help='Only include files containing all words of QUERY (identifiers or their camelCase/snake_case '
+             'parts), resolved from the search index built by "codest index"'
+    )
+    parser.add_argument(
+        '--search-index',
+        metavar='FILE',
+        help=f'Search index file for --match (default: {SEARCH_INDEX_NAME} in the first directory)'
+    )
+    sample_group = parser.add_mutually_exclusive_group()
+    sample_group.add_argument(
+        '--sample',
+        type=int,
+        metavar='N',
+        help='Include a representative sample of N files, stratified by directory and language; '
+             'subtrees are not scanned once their share is filled'
+    )
+    sample_group.add_argument(
+        '--sample-ratio',
+        type=float,
+        metavar='R',
+        help='Include ratio R (0 < R <= 1) of the files of each language in every directory'
+    )
+    parser.add_argument(
+        '--sample-seed',
+        type=int,
+        default=0,
+        metavar='SEED',
+        help='Random seed for --sample and --sample-ratio (default: 0)'
+    )
+    parser.add_argument(
+        '--rev',
+        metavar='REF',
+        help='Read files from git revision REF (branch, tag or commit) instead of the working tree'
+    )
+    parser.add_argument(
+        '--manifest',
+        metavar='FILE',
+        help='Write a JSON manifest (path, size, mtime, content hash, line count, '
+             'byte offset of each section) of the collected files to FILE'
+    )
+    parser.add_argument(
+        '--hash',
+        choices=['sha256', 'blake2b'],
+        default='sha256',
+        help='Hash algorithm for the manifest (default: sha256)'
+    )
+    parser.add_argument(
+        '--since',
+        metavar='MANIFEST',
+        help='Only include files added or modified since MANIFEST, and list deleted files'
+    )
+    parser.add_argument(
+        '--format',
+        choices=sorted(RENDERERS),
+        default='markdown',
+        help='Output format: markdown, jsonl (one JSON object per file) or xml (compact tags for LLM prompts) '
+             '(default: markdown)'
+    )
+    parser.add_argument(
+        '--stats',
+        action='store_true',
+        help='Append line, byte and file counts per language and top-level directory to the document'
+    )
+    parser.add_argument(
+        '--stats-only',
+        action='store_true',
+        help='Only print the statistics from a fast read-only scan, without generating a document '
+             '(JSON with --format jsonl; written to --output if given)'
+    )
+    parser.add_argument(
+        '--dir-snapshot',
+        nargs='?',
+        const='',
+        metavar='FILE',
+        help='Persist directory mtimes and filtered listings to FILE and reuse them for unchanged directories '
+             'on the next run (default FILE: ~/.cache/codest/dirs-<hash of the directories>.json.gz)'
+    )
+    parser.add_argument(
+        '--include-generated',
+        action='store_true',
+        help='Include generated code, minified bundles, lock files and database dumps in full instead of '
+             'replacing them with a one-line notice (detected from the first 4KB of each file)'
+    )
+    parser.add_argument(
+        '--notebook-outputs',
+        choices=NOTEBOOK_OUTPUT_MODES,
+        default=OUTPUTS_NONE,
+        help='Cell outputs of Jupyter notebooks: none, truncate (first --notebook-output-lines lines '
+             'of text per cell) or full; images are never included (default: none)'
+    )
+    parser.add_argument(
+        '--notebook-output-lines',
+        type=int,
+        default=DEFAULT_OUTPUT_LINES,
+        metavar='N',
+        help=f'Maximum output lines per cell with --notebook-outputs truncate (default: {DEFAULT_OUTPUT_LINES})'
+    )
+    parser.add_argument(
+        '--raw-notebooks',
+        action='store_true',
+        help='Include Jupyter notebooks as raw JSON instead of extracting their code and markdown cells'
+    )
+    parser.add_argument(
+        '--factor-banners',
+        action='store_true',
+        help='Detect leading comment blocks (license banners) shared by several files, '
+             'print each once in the meta section and strip it from the individual files'
+    )
+    parser.add_argument(
+        '--banner-min-files',
+        type=int,
+        default=DEFAULT_BANNER_MIN_FILES,
+        metavar='N',
+        help=f'Minimum number of files sharing a leading comment block for --factor-banners '
+             f'(default: {DEFAULT_BANNER_MIN_FILES})'
+    )
+    parser.add_argument(
+        '--toc',
+        action='store_true',
+        help='Add a linked table of contents to the top of the document'
+    )
+    parser.add_argument(
+        '--index',
+        action='store_true',
+        help='Write a byte-offset index of sections to OUTPUT.index.json for "codest extract"'
+    )
+    parser.add_argument(
+        '--redact',
+        action='store_true',
+        help='Replace API keys, tokens, passwords and high-entropy strings with [REDACTED:kind], '
+             'and skip files that consist of secrets (e.g. .env)'
+    )
+    parser.add_argument(
+        '--redact-markers',
+        metavar='FILE',
+        help='Also redact the literal strings (internal hostnames etc.) listed one per line in FILE; implies --redact'
+    )
+    parser.add_argument(
+        '--redact-pattern',
+        metavar='REGEX',
+        action='append',
+        help='Also redact matches of REGEX (may be repeated); implies --redact'
+    )
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        help='Strip comments, docstrings and blank lines from Python and C-family sources'
+    )
     parser.add_argument(
         '-v', '--verbose',
         action='store_true',
@@ -55,38 +280,392 @@ def create_parser() -> argparse.ArgumentParser:
         action='store_true',
         help='Copy output to clipboard instead of creating a file'
     )
+    parser.add_argument(
+        '--clipboard-command',
+        metavar='CMD',
+        help='Command that reads the clipboard content from stdin (default: auto-detect '
+             'wl-copy, xclip, xsel or pbcopy)'
+    )
+    parser.add_argument(
+        '--clipboard-max',
+        metavar='SIZE',
+        default='32M',
+        help='Refuse to copy output larger than SIZE to the clipboard, 0 for no limit (default: 32M)'
+    )
+    return parser
+
+
+def create_extract_parser() -> argparse.ArgumentParser:
+    """Create argument parser for the extract command"""
+    parser = argparse.ArgumentParser(
+        prog='codest extract',
+        description='Extract sections from a generated document using its byte-offset index'
+    )
+    parser.add_argument(
+        'document',
+        help='Generated document path'
+    )
+    parser.add_argument(
+        'paths',
+        nargs='+',
+        help='Section paths or glob patterns to extract'
+    )
+    parser.add_argument(
+        '--index',
+        metavar='FILE',
+        help='Index file path (default: DOCUMENT.index.json)'
+    )
+    parser.add_argument(
+        '-o', '--output',
+        help='Output file path (default: stdout)'
+    )
     return parser
 
 
-def main() -> int:
+def extract_main(argv: List[str]) -> int:
+    """
+    Entry point for the extract command
+    """
+    args = create_extract_parser().parse_args(argv)
+    setup_logging(False)
+
+    try:
+        if args.output:
+            with open(args.output, 'wb') as output:
+                count = extract_sections(args.document, args.paths, output, args.index)
+        else:
+            count = extract_sections(args.document, args.paths, sys.stdout.buffer, args.index)
+            sys.stdout.buffer.flush()
+    except (CodestError, OSError) as e:
+        logger.error(str(e))
+        return 1
+
+    if count == 0:
+        logger.error(f"No sections matched: {' '.join(args.paths)}")
+        return 1
+    return 0
+
+
+def match_files(query: str, index_path: str, max_file_size_bytes: int = None) -> List[str]:
+    """
+    Resolve the files matching QUERY from the search index
+
+    Indexed files whose size or mtime changed since indexing are re-read (and deleted ones
+    dropped) before searching, so results do not come from stale entries.
+
+    Args:
+        query: Search words
+        index_path: Search index file path
+        max_file_size_bytes: Files larger than this are not re-indexed
+    """
+    start = time.perf_counter()
+    index = SearchIndex.load(index_path)
+    updated, removed = index.refresh(max_file_size_bytes)
+    if updated or removed:
+        logger.info(f"Refreshed {updated} changed and dropped {removed} deleted files in the search index "
+                    f"(run 'codest index' to pick up new files)")
+        try:
+            index.save(index_path)
+        except SearchIndexError as e:
+            # 保存できなくても今回の検索は更新済みの索引で行える
+            logger.warning(str(e))
+    matched = index.search(query)
+    logger.info(f"Matched {len(matched)} of {len(index.files)} indexed files for {query!r} "
+                f"in {(time.perf_counter() - start) * 1000:.1f}ms")
+    return matched
+
+
+def build_generator(parser: argparse.ArgumentParser, args: argparse.Namespace, **shared) -> DocumentGenerator:
+    """
+    Build a DocumentGenerator from parsed command line arguments
+
+    Args:
+        parser: Parser used to report invalid option combinations
+        args: Parsed arguments
+        **shared: Caches shared between generators (batch mode)
+    """
+    if args.rev and (args.files_from or args.since or args.manifest or args.budget or args.budget_tokens
+                     or args.match):
+        parser.error('--rev cannot be combined with --files-from, --since, --manifest, --budget or --match')
+    if args.match and args.files_from:
+        parser.error('--match cannot be combined with --files-from')
+    if args.entry and (args.files_from or args.match or args.rev or args.since):
+        parser.error('--entry cannot be combined with --files-from, --match, --rev or --since')
+    sampling = args.sample is not None or args.sample_ratio is not None
+    if sampling and (args.files_from or args.match or args.entry or args.rev or args.since):
+        parser.error('--sample and --sample-ratio cannot be combined with --files-from, --match, --entry, '
+                     '--rev or --since')
+    if args.sample is not None and args.sample < 1:
+        parser.error('--sample must be a positive number of files')
+    if args.sample_ratio is not None and not 0 < args.sample_ratio <= 1:
+        parser.error('--sample-ratio must be greater than 0 and at most 1')
+    if args.banner_min_files < 2:
+        parser.error('--banner-min-files must be at least 2')
+
+    # アーカイブはディレクトリの包含関係による重複排除の対象外
+    archives = [path for path in args.directories if is_archive(path)]
+    directories = normalize_paths([path for path in args.directories if path not in archives])
+    exclude_dirs = normalize_paths(args.exclude)
+
+    logger.debug(f"Normalized directories to scan: {directories}")
+    if exclude_dirs:
+        logger.debug(f"Normalized directories to exclude: {exclude_dirs}")
+
+    # 除外ディレクトリが指定されたディレクトリのサブディレクトリであることを確認
+    for exclude_dir in find_paths_outside(exclude_dirs, directories):
+        logger.warning(f"Excluded directory '{exclude_dir}' is not a subdirectory of any specified directories")
+
+    source_files = None
+    if args.files_from:
+        source_files = read_file_list(args.files_from)
+        logger.debug(f"Read {len(source_files)} paths from file list: {args.files_from}")
+    elif args.match:
+        source_files = match_files(args.match, args.search_index or default_search_index_path(directories),
+                                   args.max_size * 1024)
+
+    try:
+        budget_bytes = budget_from_options(args.budget, args.budget_tokens)
+        priority_weights = parse_weights(args.priority_weights) if args.priority_weights else None
+        clipboard_max_bytes = parse_size(args.clipboard_max) or None
+    except ValueError as e:
+        parser.error(str(e))
+
+    redactor = None
+    if args.redact or args.redact_markers or args.redact_pattern:
+        try:
+            markers = load_markers(args.redact_markers) if args.redact_markers else []
+            redactor = Redactor(markers, compile_user_patterns(args.redact_pattern))
+        except OSError as e:
+            parser.error(f"Cannot read redaction markers: {str(e)}")
+        except re.error as e:
+            parser.error(f"Invalid --redact-pattern: {str(e)}")
+
+    return DocumentGenerator(
+        directories=directories,
+        exclude_dirs=exclude_dirs,
+        max_file_size_kb=args.max_size,
+        source_files=source_files,
+        manifest_file=args.manifest,
+        since_manifest=args.since,
+        hash_algorithm=args.hash,
+        compact=args.compact,
+        excerpt_kb=args.excerpt_kb,
+        excerpt_lines=args.excerpt_lines,
+        outline=args.outline,
+        outline_above_kb=args.outline_above,
+        budget_bytes=budget_bytes,
+        priority_weights=priority_weights,
+        toc=args.toc,
+        write_index=args.index,
+        clipboard_command=shlex.split(args.clipboard_command) if args.clipboard_command else None,
+        clipboard_max_bytes=clipboard_max_bytes,
+        archives=archives,
+        revision=args.rev,
+        redactor=redactor,
+        renderer=get_renderer(args.format),
+        sample_size=args.sample,
+        sample_ratio=args.sample_ratio,
+        sample_seed=args.sample_seed,
+        collect_stats=args.stats,
+        entry_files=args.entry,
+        import_cache=ImportCache(args.import_cache or default_import_cache_path()) if args.entry else None,
+        factor_banners=args.factor_banners,
+        banner_min_files=args.banner_min_files,
+        raw_notebooks=args.raw_notebooks,
+        skip_generated=not args.include_generated,
+        dir_snapshot=DirectorySnapshot(args.dir_snapshot or default_dir_snapshot_path(directories))
+        if args.dir_snapshot is not None else None,
+        notebook_outputs=args.notebook_outputs,
+        notebook_output_lines=args.notebook_output_lines,
+        **shared
+    )
+
+
+def create_index_parser() -> argparse.ArgumentParser:
+    """Create argument parser for the index command"""
+    parser = argparse.ArgumentParser(
+        prog='codest index',
+        description='Build or incrementally update the search index used by --match'
+    )
+    parser.add_argument(
+        'directories',
+        nargs='+',
+        help='Directories to index'
+    )
+    parser.add_argument(
+        '--exclude',
+        help='Directories to exclude from indexing',
+        nargs='*',
+        default=[]
+    )
+    parser.add_argument(
+        '--max-size',
+        type=int,
+        default=1000,
+        help='Do not index the content of files larger than this size in KB (default: 1000)'
+    )
+    parser.add_argument(
+        '-o', '--output',
+        metavar='FILE',
+        help=f'Search index file path (default: {SEARCH_INDEX_NAME} in the first directory)'
+    )
+    parser.add_argument(
+        '--rebuild',
+        action='store_true',
+        help='Ignore the existing index and index every file again'
+    )
+    parser.add_argument(
+        '-v', '--verbose',
+        action='store_true',
+        help='Enable verbose output'
+    )
+    return parser
+
+
+def index_main(argv: List[str]) -> int:
+    """
+    Entry point for the index command
+    """
+    args = create_index_parser().parse_args(argv)
+    setup_logging(args.verbose)
+
+    directories = normalize_paths(args.directories)
+    index_path = args.output or default_search_index_path(directories)
+
+    try:
+        collector = FileCollector(directories=directories, exclude_dirs=normalize_paths(args.exclude))
+        index = None
+        if not args.rebuild and os.path.exists(index_path):
+            index = SearchIndex.load(index_path)
+            if index.directories != collector.directories:
+                logger.warning("Search index was built for different directories; rebuilding")
+                index = None
+        if index is None:
+            index = SearchIndex(collector.directories)
+
+        start = time.perf_counter()
+        added, updated, removed = index.update(collector.iter_files(), args.max_size * 1024)
+        logger.info(f"Indexed {len(index.files)} files ({added} added, {updated} updated, {removed} removed) "
+                    f"in {time.perf_counter() - start:.2f}s")
+        if added or updated or removed or not os.path.exists(index_path):
+            index.save(index_path)
+    except CodestError as e:
+        logger.error(str(e))
+        return 1
+    return 0
+
+
+def create_batch_parser() -> argparse.ArgumentParser:
+    """Create argument parser for the batch command"""
+    parser = argparse.ArgumentParser(
+        prog='codest batch',
+        description='Generate many documents in one process from a JSON job list'
+    )
+    parser.add_argument(
+        'config',
+        help='Batch config file: {"defaults": {...}, "jobs": [{"name", "roots", "exclude", "output", "options"}]}'
+    )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        metavar='N',
+        help='Number of worker threads (default: CPU count)'
+    )
+    parser.add_argument(
+        '--report',
+        metavar='FILE',
+        help='Write per-job timing report as JSON to FILE'
+    )
+    parser.add_argument(
+        '-v', '--verbose',
+        action='store_true',
+        help='Enable verbose output'
+    )
+    return parser
+
+
+def batch_main(argv: List[str]) -> int:
+    """
+    Entry point for the batch command
+    """
+    args = create_batch_parser().parse_args(argv)
+    setup_logging(args.verbose)
+
+    try:
+        jobs = load_batch_config(args.config)
+    except CodestError as e:
+        logger.error(str(e))
+        return 1
+
+    parser = create_parser()
+    shared = SharedResources()
+
+    def run_job(job: BatchJob):
+        job_args = parser.parse_args(job.argv)
+        generator = build_generator(parser, job_args, **shared.generator_options())
+        return generator.generate(job_args.output), generator
+
+    results = BatchRunner(run_job, args.jobs).run(jobs)
+    logger.info("Batch report:\n" + format_report(results))
+    logger.debug(f"Shared cache hits: content {shared.content_cache.hits}, "
+                 f"gitignore {shared.gitignore_cache.hits}, outline {shared.outline_cache.hits}")
+
+    if args.report:
+        try:
+            with open(args.report, 'w', encoding='utf-8') as f:
+                json.dump({'jobs': [r.to_dict() for r in results]}, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            logger.error(f"Failed to write report {args.report}: {str(e)}")
+            return 1
+
+    return 0 if all(r.ok for r in results) else 1
+
+
+# サブコマンド名からエントリポイントへの対応
+SUBCOMMANDS = {
+    'extract': extract_main,
+    'index': index_main,
+    'batch': batch_main,
+}
+
+
+def main(argv: List[str] = None) -> int:
     """
     Main entry point for the CLI
     """
+    if argv is None:
+        argv = sys.argv[1:]
+    # 同名のディレクトリがある場合は収集対象のディレクトリとして扱う（サブコマンドはそのディレクトリの外から実行）
+    if argv and argv[0] in SUBCOMMANDS and not os.path.isdir(argv[0]):
+        return SUBCOMMANDS[argv[0]](argv[1:])
+
     parser = create_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     setup_logging(args.verbose)
     logger = logging.getLogger(__name__)
 
+    if args.stats_only and (args.rev or args.clipboard or any(is_archive(p) for p in args.directories)):
+        parser.error('--stats-only cannot be combined with --rev, --clipboard or archives')
+    # 集計はファイルの選択（--files-from, --match, --entry, --sample）には従うが、差分・予算・マニフェストは扱わない
+    if args.stats_only and (args.since or args.manifest or args.budget or args.budget_tokens):
+        parser.error('--stats-only cannot be combined with --since, --manifest, --budget or --budget-tokens')
+
     try:
-        # パスの正規化と重複排除
-        directories = normalize_paths(args.directories)
-        exclude_dirs = normalize_paths(args.exclude)
-
-        logger.debug(f"Normalized directories to scan: {directories}")
-        if exclude_dirs:
-            logger.debug(f"Normalized directories to exclude: {exclude_dirs}")
-
-        # 除外ディレクトリが指定されたディレクトリのサブディレクトリであることを確認
-        for exclude_dir in exclude_dirs:
-            if not any(is_subdirectory(d, exclude_dir) for d in directories):
-                logger.warning(f"Excluded directory '{exclude_dir}' is not a subdirectory of any specified directories")
-
-        generator = DocumentGenerator(
-            directories=directories,
-            exclude_dirs=exclude_dirs,
-            max_file_size_kb=args.max_size
-        )
+        generator = build_generator(parser, args)
+
+        if args.stats_only:
+            stats = generator.scan_statistics()
+            if args.format == 'jsonl':
+                text = json.dumps(stats.to_dict(), ensure_ascii=False) + '\n'
+            else:
+                text = stats.format_table()
+            if args.output:
+                with open(args.output, 'w', encoding='utf-8') as f:
+                    f.write(text)
+            else:
+                sys.stdout.write(text)
+            return 0
 
         if args.clipboard:
             content, _ = generator.generate(to_clipboard=True)
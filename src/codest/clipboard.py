@@ -0,0 +1,135 @@
+"""プラットフォームのクリップボードコマンドへのストリーミング出力モジュール"""
+import os
+import sys
+import shutil
+import logging
+import subprocess
+from typing import List, Optional
+from .exceptions import ClipboardError
+
+logger = logging.getLogger(__name__)
+
+
+def detect_clipboard_command() -> Optional[List[str]]:
+    """
+    利用可能なクリップボードコマンドを検出
+
+    Returns:
+        Optional[List[str]]: コマンドと引数（見つからない場合はNone）
+    """
+    if sys.platform == 'darwin':
+        candidates = [['pbcopy']]
+    else:
+        candidates = [['xclip', '-selection', 'clipboard'], ['xsel', '--clipboard', '--input']]
+        # Waylandセッションではwl-copyを優先
+        if os.environ.get('WAYLAND_DISPLAY'):
+            candidates.insert(0, ['wl-copy'])
+
+    for command in candidates:
+        if shutil.which(command[0]):
+            return command
+    return None
+
+
+class ClipboardSink:
+    def __init__(self, command: List[str], max_bytes: int = None):
+        """
+        レンダリングされた内容を逐次クリップボードコマンドの標準入力へ書き込むシンク
+
+        書き込まれた順にパイプへ流す。max_bytesを超えた場合はコマンドを中断するため、クリップボードは変更されない。
+        max_bytesの指定時は上限以内の内容を保持してgetvalue()で返し、無制限の場合は内容をメモリに保持しない。
+
+        Args:
+            command (List[str]): クリップボードコマンドと引数
+            max_bytes (int, optional): コピーできる最大バイト数
+
+        Raises:
+            ClipboardError: コマンドを起動できない場合
+        """
+        self.command = command
+        self.max_bytes = max_bytes
+        self.bytes_written = 0
+        self._chunks: Optional[List[str]] = [] if max_bytes is not None else None
+        try:
+            # xclip等は選択内容を保持するためにバックグラウンドで動き続けるので出力は捨てる
+            self._process = subprocess.Popen(
+                command, stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError as e:
+            raise ClipboardError(f"Failed to start clipboard command {command[0]}: {str(e)}")
+
+    def write(self, text: str) -> int:
+        """
+        テキストをクリップボードコマンドへ書き込み
+
+        Args:
+            text (str): 書き込むテキスト
+
+        Returns:
+            int: 書き込んだ文字数
+
+        Raises:
+            ClipboardError: サイズの上限を超えた場合、または書き込みに失敗した場合
+        """
+        data = text.encode('utf-8')
+        self.bytes_written += len(data)
+        if self.max_bytes is not None and self.bytes_written > self.max_bytes:
+            self.abort()
+            raise ClipboardError(
+                f"Output exceeds clipboard size limit ({self.max_bytes} bytes); "
+                f"write to a file instead or raise the limit")
+        try:
+            self._process.stdin.write(data)
+        except OSError as e:
+            self.abort()
+            raise ClipboardError(f"Failed to write to clipboard command {self.command[0]}: {str(e)}")
+        if self._chunks is not None:
+            self._chunks.append(text)
+        return len(text)
+
+    def getvalue(self) -> Optional[str]:
+        """
+        書き込んだ内容を取得
+
+        Returns:
+            Optional[str]: 書き込んだ内容（max_bytesを指定しない場合は保持しないためNone）
+        """
+        if self._chunks is None:
+            return None
+        return ''.join(self._chunks)
+
+    def close(self) -> None:
+        """
+        入力を閉じてコマンドの終了を待つ
+
+        Raises:
+            ClipboardError: コマンドが異常終了した場合
+        """
+        try:
+            self._process.stdin.close()
+        except OSError as e:
+            self.abort()
+            raise ClipboardError(f"Failed to write to clipboard command {self.command[0]}: {str(e)}")
+        returncode = self._process.wait()
+        if returncode != 0:
+            raise ClipboardError(f"Clipboard command {self.command[0]} exited with status {returncode}")
+        logger.debug(f"Copied {self.bytes_written} bytes with {self.command[0]}")
+
+    def abort(self) -> None:
+        """コマンドを強制終了（クリップボードは変更されない）"""
+        if self._process.poll() is None:
+            self._process.kill()
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass
+        self._process.wait()
+
+    def __enter__(self) -> 'ClipboardSink':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -0,0 +1,319 @@
+"""ソースコードのコンパクション（コメント・docstring・空行の除去）モジュール"""
+import io
+import re
+import logging
+import tokenize
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 複数行リテラル内の改行を空行除去から保護するための一時的な置換文字
+_NEWLINE_SENTINEL = '\ue000'
+
+# Python: 保持する先頭行のコメント（shebang, エンコーディング宣言）
+_PYTHON_CODING_RE = re.compile(r'^[ \t\f]*#.*?coding[:=][ \t]*[-\w.]+')
+_FSTRING_START = getattr(tokenize, 'FSTRING_START', None)
+_FSTRING_END = getattr(tokenize, 'FSTRING_END', None)
+
+# C系言語: 正規表現リテラルの直前に来うる文字（JavaScript/TypeScript）
+_REGEX_PRECEDING_CHARS = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_PRECEDING_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'void', 'yield'}
+_TRAILING_WORD_RE = re.compile(r'[\w$]+$')
+
+# C系言語: 言語ごとの文字列・文字リテラルのパターン
+_C_FAMILY_STRING_PATTERNS = {
+    'c': [r'"(?:[^"\\\n]|\\.)*"', r"'(?:[^'\\\n]|\\.)+'"],
+    'cpp': [r'R"(?P<raw_delim>[^()\\\s]{0,16})\((?:.|\n)*?\)(?P=raw_delim)"',
+            r'"(?:[^"\\\n]|\\.)*"', r"'(?:[^'\\\n]|\\.)'"],
+    'java': [r'"""(?:[^\\]|\\.)*?"""', r'"(?:[^"\\\n]|\\.)*"', r"'(?:[^'\\\n]|\\.)+'"],
+    'csharp': [r'"""(?:.|\n)*?"""', r'@"(?:[^"]|"")*"', r'\$@"(?:[^"]|"")*"', r'@\$"(?:[^"]|"")*"',
+               r'"(?:[^"\\\n]|\\.)*"', r"'(?:[^'\\\n]|\\.)+'"],
+    'go': [r'`[^`]*`', r'"(?:[^"\\\n]|\\.)*"', r"'(?:[^'\\\n]|\\.)+'"],
+    'rust': [r'b?r(?P<raw_hashes>#*)"(?:.|\n)*?"(?P=raw_hashes)', r'b?"(?:[^"\\]|\\.)*"',
+             r"b?'(?:[^'\\\n]|\\u\{[0-9a-fA-F]{1,6}\}|\\.)'"],
+    'swift': [r'(?P<ext_hashes>#+)"(?:.|\n)*?"(?P=ext_hashes)', r'"""(?:[^\\]|\\.)*?"""',
+              r'"(?:[^"\\\n]|\\.)*"'],
+    'javascript': [r'`(?:[^`\\]|\\.)*`', r'"(?:[^"\\\n]|\\.)*"', r"'(?:[^'\\\n]|\\.)*'"],
+}
+_C_FAMILY_STRING_PATTERNS['typescript'] = _C_FAMILY_STRING_PATTERNS['javascript']
+_C_FAMILY_STRING_PATTERNS['jsx'] = _C_FAMILY_STRING_PATTERNS['javascript']
+_C_FAMILY_STRING_PATTERNS['tsx'] = _C_FAMILY_STRING_PATTERNS['javascript']
+
+# ブロックコメントのネストを許可する言語
+_NESTED_COMMENT_LANGUAGES = {'rust', 'swift'}
+# 正規表現リテラルを持つ言語
+_REGEX_LITERAL_LANGUAGES = {'javascript', 'typescript', 'jsx', 'tsx'}
+# 改行を含むブロックコメントを改行に置き換える言語（セミコロン自動挿入のため）
+_NEWLINE_PRESERVING_LANGUAGES = {'javascript', 'typescript', 'jsx', 'tsx', 'go', 'swift'}
+
+_REGEX_LITERAL_RE = re.compile(r'/(?![/*])(?:[^/\\\n\[]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[a-z]*')
+_NESTED_COMMENT_TOKEN_RE = re.compile(r'/\*|\*/')
+
+_c_family_lexers: Dict[str, 're.Pattern'] = {}
+
+
+def _squeeze_lines(text: str) -> str:
+    """
+    行末の空白と空行を除去
+
+    複数行リテラル内の改行は事前に置換文字へ置き換えておくことで保護される。
+    バックスラッシュによる行継続の直後の空行は、継続を壊さないよう保持する。
+
+    Args:
+        text (str): 対象テキスト
+
+    Returns:
+        str: 空白を詰めたテキスト
+    """
+    result = []
+    continued = False
+    for line in text.split('\n'):
+        stripped = line.rstrip()
+        if stripped or continued:
+            result.append(stripped)
+        continued = stripped.endswith('\\')
+    return '\n'.join(result).replace(_NEWLINE_SENTINEL, '\n')
+
+
+def compact_python(source: str) -> str:
+    """
+    Pythonソースからコメント・docstring・空行を除去
+
+    tokenizeで字句解析し、文字列リテラルの内容には手を加えない。
+    docstringのみのブロックは構文を保つため`pass`に置き換える。
+
+    Args:
+        source (str): Pythonソースコード
+
+    Returns:
+        str: コンパクションされたソースコード（字句解析に失敗した場合は元のまま）
+    """
+    if _NEWLINE_SENTINEL in source:
+        return source
+
+    try:
+        tokens = list(tokenize.generate_tokens(io.StringIO(source).readline))
+    except (tokenize.TokenError, IndentationError, SyntaxError):
+        return source
+
+    # (行, 列) を絶対オフセットに変換するための行頭オフセット
+    line_offsets = [0, 0]
+    for line in io.StringIO(source):
+        line_offsets.append(line_offsets[-1] + len(line))
+
+    def offset(position: Tuple[int, int]) -> int:
+        return line_offsets[position[0]] + position[1]
+
+    skip_types = {tokenize.NL, tokenize.COMMENT}
+    significant = [i for i, tok in enumerate(tokens) if tok.type not in skip_types]
+    statement_start_types = {tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT, tokenize.ENCODING}
+
+    edits: List[Tuple[int, int, str]] = []  # (開始, 終了, 置換文字列)
+
+    def protect(start: int, end: int) -> None:
+        # 複数行リテラル内の改行を保護
+        edits.append((start, end, source[start:end].replace('\n', _NEWLINE_SENTINEL)))
+
+    fstring_starts = []  # Python 3.12以降のf-string開始位置
+    for tok in tokens:
+        if tok.type == tokenize.COMMENT:
+            if tok.start[0] <= 2 and (tok.string.startswith('#!') or _PYTHON_CODING_RE.match(tok.string)):
+                continue
+            edits.append((offset(tok.start), offset(tok.end), ''))
+        elif tok.type == tokenize.STRING and '\n' in tok.string:
+            protect(offset(tok.start), offset(tok.end))
+        elif tok.type == _FSTRING_START:
+            fstring_starts.append(tok.start)
+        elif tok.type == _FSTRING_END and fstring_starts:
+            start = fstring_starts.pop()
+            if start[0] != tok.end[0]:
+                protect(offset(start), offset(tok.end))
+
+    # 文字列リテラルのみからなる文（docstring等）を除去
+    k = 0
+    while k < len(significant):
+        tok = tokens[significant[k]]
+        prev = tokens[significant[k - 1]] if k > 0 else None
+        if tok.type != tokenize.STRING or (prev is not None and prev.type not in statement_start_types):
+            k += 1
+            continue
+
+        end = k
+        while end + 1 < len(significant) and tokens[significant[end + 1]].type == tokenize.STRING:
+            end += 1
+        following = tokens[significant[end + 1]] if end + 1 < len(significant) else None
+        if following is None or following.type not in (tokenize.NEWLINE, tokenize.ENDMARKER):
+            k = end + 1
+            continue
+
+        # ブロックが空になる場合はpassに置き換える
+        after = tokens[significant[end + 2]] if end + 2 < len(significant) else None
+        empty_block = (prev is not None and prev.type == tokenize.INDENT
+                       and (after is None or after.type in (tokenize.DEDENT, tokenize.ENDMARKER)))
+        start_offset = offset(tok.start)
+        end_offset = offset(tokens[significant[end]].end)
+        edits.append((start_offset, end_offset, 'pass' if empty_block else ''))
+        k = end + 1
+
+    # 開始位置順（同じ開始位置では外側の範囲を優先）に適用し、内側の編集は読み飛ばす
+    edits.sort(key=lambda e: (e[0], -e[1]))
+    pieces = []
+    position = 0
+    for start, end, replacement in edits:
+        if start < position:
+            continue
+        pieces.append(source[position:start])
+        pieces.append(replacement)
+        position = end
+    pieces.append(source[position:])
+
+    return _squeeze_lines(''.join(pieces))
+
+
+def _get_c_family_lexer(language: str) -> 're.Pattern':
+    """
+    言語ごとの字句解析用正規表現を取得（コンパイル結果はキャッシュ）
+
+    Args:
+        language (str): 言語名
+
+    Returns:
+        re.Pattern: コメント・文字列リテラルの開始にマッチする正規表現
+    """
+    lexer = _c_family_lexers.get(language)
+    if lexer is None:
+        alternatives = [
+            r'(?P<line_comment>//[^\n]*)',
+            r'(?P<block_comment>/\*)',
+            '(?P<string>' + '|'.join(_C_FAMILY_STRING_PATTERNS[language]) + ')',
+        ]
+        if language in _REGEX_LITERAL_LANGUAGES:
+            alternatives.append(r'(?P<slash>/)')
+        lexer = re.compile('|'.join(alternatives))
+        _c_family_lexers[language] = lexer
+    return lexer
+
+
+def _is_regex_context(source: str, position: int) -> bool:
+    """
+    指定位置の`/`が正規表現リテラルの開始になりうるかを判定
+
+    Args:
+        source (str): ソースコード
+        position (int): `/`の位置
+
+    Returns:
+        bool: 正規表現リテラルの開始とみなせる場合True
+    """
+    i = position - 1
+    while i >= 0 and source[i] in ' \t\n':
+        i -= 1
+    if i < 0 or source[i] in _REGEX_PRECEDING_CHARS:
+        return True
+    word = _TRAILING_WORD_RE.search(source, max(0, i - 15), i + 1)
+    return word is not None and word.group() in _REGEX_PRECEDING_KEYWORDS
+
+
+def compact_c_family(source: str, language: str) -> str:
+    """
+    C系言語のソースからコメント・空行を除去
+
+    正規表現ベースの状態機械で文字列リテラルを読み飛ばし、
+    コメントのみを除去する。
+
+    Args:
+        source (str): ソースコード
+        language (str): 言語名（c, cpp, java, javascript, typescript, go, rust, swift, csharp等）
+
+    Returns:
+        str: コンパクションされたソースコード
+    """
+    if _NEWLINE_SENTINEL in source:
+        return source
+
+    lexer = _get_c_family_lexer(language)
+    nested = language in _NESTED_COMMENT_LANGUAGES
+    preserve_newline = language in _NEWLINE_PRESERVING_LANGUAGES
+    continued_line_comments = language in ('c', 'cpp')
+
+    pieces = []
+    position = 0
+    length = len(source)
+    while position < length:
+        match = lexer.search(source, position)
+        if match is None:
+            pieces.append(source[position:])
+            break
+
+        pieces.append(source[position:match.start()])
+        kind = match.lastgroup
+
+        if kind == 'line_comment':
+            end = match.end()
+            # C/C++では行末のバックスラッシュでコメントが次の行に継続する
+            while continued_line_comments and source[match.start():end].endswith('\\') and end < length:
+                next_end = source.find('\n', end + 1)
+                end = length if next_end == -1 else next_end
+            position = end
+
+        elif kind == 'block_comment':
+            end = _find_block_comment_end(source, match.end(), nested)
+            comment = source[match.start():end]
+            pieces.append('\n' if preserve_newline and '\n' in comment else ' ')
+            position = end
+
+        elif kind == 'slash':
+            regex_match = _REGEX_LITERAL_RE.match(source, match.start())
+            if regex_match is not None and _is_regex_context(source, match.start()):
+                pieces.append(regex_match.group())
+                position = regex_match.end()
+            else:
+                pieces.append('/')
+                position = match.end()
+
+        else:
+            pieces.append(match.group().replace('\n', _NEWLINE_SENTINEL))
+            position = match.end()
+
+    return _squeeze_lines(''.join(pieces))
+
+
+def _find_block_comment_end(source: str, position: int, nested: bool) -> int:
+    """
+    ブロックコメントの終了位置を取得
+
+    Args:
+        source (str): ソースコード
+        position (int): コメント開始記号の直後の位置
+        nested (bool): ネストしたコメントを許可するか
+
+    Returns:
+        int: コメント終了記号の直後の位置（閉じられていない場合は末尾）
+    """
+    if not nested:
+        end = source.find('*/', position)
+        return len(source) if end == -1 else end + 2
+
+    depth = 1
+    for token in _NESTED_COMMENT_TOKEN_RE.finditer(source, position):
+        depth += 1 if token.group() == '/*' else -1
+        if depth == 0:
+            return token.end()
+    return len(source)
+
+
+def get_compactor(language: str) -> Optional[Callable[[str], str]]:
+    """
+    言語に対応するコンパクション関数を取得
+
+    Args:
+        language (str): MARKDOWN_LANGUAGE_MAPの言語名
+
+    Returns:
+        Optional[Callable[[str], str]]: コンパクション関数（未対応の言語はNone）
+    """
+    if language == 'python':
+        return compact_python
+    if language in _C_FAMILY_STRING_PATTERNS:
+        return lambda source: compact_c_family(source, language)
+    return None
@@ -3,7 +3,7 @@
 # ファイル収集の際に使用する拡張子の定義
 DEFAULT_FILE_EXTENSIONS = {
     '.swift', '.strings', '.stringsdict', '.entitlements', '.xcconfig', '.plist',
-    '.py', '.js', '.tsx', '.ts', '.jsx', '.java',
+    '.py', '.ipynb', '.js', '.tsx', '.ts', '.jsx', '.java',
     '.cpp', '.h', '.hpp', '.c', '.cs', '.go', '.rs', '.rb',
     '.md', '.tex', '.html', '.css', '.scss',
     '.json', '.yml', '.yaml', '.xml'
@@ -124,4 +124,31 @@ DEFAULT_IGNORE_PATTERNS = {
     '.cache', '.temp', '.tmp', '.sass-cache',
     '*.log', 'logs', 'npm-debug.log*', 'yarn-debug.log*', 'yarn-error.log*',
     '.DS_Store', 'Thumbs.db', '*.swp', '*.bak', '*.backup'
-}
\ No newline at end of file
+}
+
+# 予算内のファイル選択で使用する優先度スコアの重み
+DEFAULT_PRIORITY_WEIGHTS = {
+    'depth': 1.0,      # 浅い階層のファイルを優先
+    'recency': 1.0,    # 最近更新されたファイルを優先
+    'size': 0.5,       # 小さいファイルを優先
+    'extension': 1.0,  # 拡張子ごとの重み
+    'entry_point': 1.5,  # main/index/__init__等のエントリポイントを優先
+}
+
+# 拡張子ごとの優先度（記載のない拡張子は0.5）
+DEFAULT_EXTENSION_WEIGHTS = {
+    '.py': 1.0, '.js': 1.0, '.ts': 1.0, '.tsx': 1.0, '.jsx': 1.0, '.java': 1.0,
+    '.go': 1.0, '.rs': 1.0, '.swift': 1.0, '.c': 1.0, '.cpp': 1.0, '.h': 0.9, '.hpp': 0.9,
+    '.cs': 1.0, '.rb': 1.0, '.kt': 1.0,
+    '.md': 0.6, '.json': 0.4, '.yml': 0.4, '.yaml': 0.4, '.xml': 0.3, '.plist': 0.3,
+    '.html': 0.5, '.css': 0.4, '.scss': 0.4, '.strings': 0.2, '.stringsdict': 0.2,
+}
+
+# エントリポイントとみなすファイル名（拡張子を除く）
+ENTRY_POINT_NAMES = {'main', 'index', '__init__', '__main__', 'app', 'cli', 'lib', 'mod', 'server'}
+
+# クリップボードにコピーできる最大バイト数のデフォルト値
+DEFAULT_CLIPBOARD_MAX_BYTES = 32 * 1024 * 1024
+
+# 展開せずに直接収集できるアーカイブの拡張子
+ARCHIVE_EXTENSIONS = ('.zip', '.whl', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
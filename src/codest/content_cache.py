@@ -0,0 +1,63 @@
+"""複数の生成処理で共有するファイル内容のキャッシュモジュール"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Tuple
+
+# キャッシュ全体の最大バイト数のデフォルト値
+DEFAULT_CONTENT_CACHE_BYTES = 256 * 1024 * 1024
+
+
+class ContentCache:
+    def __init__(self, max_bytes: int = DEFAULT_CONTENT_CACHE_BYTES):
+        """
+        パス・サイズ・更新時刻をキーとするファイル内容のキャッシュ（LRU、スレッドセーフ）
+
+        バッチ処理で複数のジョブが同じファイルを含む場合に、読み込みを1回にまとめる。
+
+        Args:
+            max_bytes (int, optional): 保持する内容の合計の最大バイト数
+        """
+        self.max_bytes = max_bytes
+        # 1ファイルでキャッシュの大部分を占めないよう上限を設ける
+        self.max_entry_bytes = max_bytes // 8
+        self._entries: 'OrderedDict[Tuple[str, int, int], bytes]' = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def read(self, file_path: str) -> bytes:
+        """
+        ファイル内容を取得（キャッシュにない場合は読み込んで保存）
+
+        Args:
+            file_path (str): ファイルパス
+
+        Returns:
+            bytes: ファイル内容
+        """
+        stat = os.stat(file_path)
+        key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return data
+            self.misses += 1
+
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        if len(data) > self.max_entry_bytes:
+            return data
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = data
+                self._size += len(data)
+                while self._size > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._size -= len(evicted)
+        return data
@@ -0,0 +1,217 @@
+"""ディレクトリのstat情報と走査結果を永続化し、再走査時に変更のないディレクトリの一覧を省くモジュール"""
+import os
+import gzip
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from .cache_lock import cache_file_lock
+
+logger = logging.getLogger(__name__)
+
+# 更新時刻がこれより新しいディレクトリは、同じ時刻のうちに再び変更される可能性があるため記録しない
+RACY_INTERVAL_NS = 2 * 1_000_000_000
+
+
+def default_dir_snapshot_path(directories: List[str]) -> str:
+    """
+    収集対象ディレクトリに対応する既定のスナップショットのパスを取得
+    （$XDG_CACHE_HOME/codest/dirs-<ディレクトリのハッシュ>.json.gz）
+
+    Args:
+        directories (List[str]): 収集対象ディレクトリ
+
+    Returns:
+        str: スナップショットのパス
+    """
+    key = hashlib.blake2b('\0'.join(os.path.abspath(d) for d in directories).encode('utf-8', 'surrogateescape'),
+                          digest_size=8).hexdigest()
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'codest', f'dirs-{key}.json.gz')
+
+
+class DirectorySnapshot:
+    VERSION = 2
+
+    def __init__(self, path: str = None):
+        """
+        ディレクトリごとの更新時刻・フィルタ適用後のエントリ・サブツリーのハッシュの永続スナップショット
+
+        ディレクトリの更新時刻は直下のエントリの追加・削除・名前変更で変わるため、更新時刻が
+        記録と同じディレクトリは一覧（scandir）と無視パターンの判定を省き、記録したエントリを使う。
+        各ディレクトリのハッシュは直下のエントリと子ディレクトリのハッシュから計算する
+        （Merkle木）ため、ルートのハッシュが同じならツリー全体の構成が変わっていない。
+
+        Args:
+            path (str, optional): スナップショットのパス（省略時は保存しない）
+        """
+        self.path = path
+        self.config_key: Optional[str] = None
+        # ルートディレクトリ -> ルートからの相対パス -> [更新時刻, エントリ名（ディレクトリは'/'付き）, ハッシュ]
+        self.roots: Dict[str, Dict[str, list]] = {}
+        # ルートディレクトリ -> 記録時のフィルタ設定のハッシュ
+        self.configs: Dict[str, str] = {}
+        self.reused_directories = 0
+        self.rescanned_directories = 0
+        self._visited: Dict[str, Set[str]] = {}
+        # 今回走査したルート（保存時にこれ以外のルートは保存済みの記録を優先する）
+        self._scanned_roots: Set[str] = set()
+        self._dirty = False
+        if path:
+            data = self._load()
+            self.roots = data.get('roots', {})
+            self.configs = data.get('configs', {})
+
+    def _load(self) -> Dict[str, Any]:
+        """スナップショットファイルを読み込み（存在しない・壊れている場合は空）"""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict) and data.get('version') == self.VERSION:
+                return data
+        except (OSError, EOFError, ValueError) as e:
+            # スナップショットが壊れていても再走査すればよいため警告のみ
+            logger.warning(f"Ignoring unreadable directory snapshot {self.path}: {str(e)}")
+        return {}
+
+    def bind(self, config_key: str) -> None:
+        """
+        フィルタ設定（無視パターン・拡張子・.gitignore等）を指定（記録時と異なるルートは走査時に記録を破棄）
+
+        Args:
+            config_key (str): フィルタ設定のハッシュ
+        """
+        if self.config_key != config_key:
+            self._scanned_roots.clear()
+            self.config_key = config_key
+
+    def listing(self, root: str, directory: str,
+                scan: Callable[[], List[Tuple[str, bool]]]) -> List[Tuple[str, bool]]:
+        """
+        ディレクトリ直下のフィルタ適用後のエントリを取得（更新時刻が記録と同じなら記録から）
+
+        Args:
+            root (str): 収集対象のルートディレクトリ
+            directory (str): 対象ディレクトリ
+            scan (Callable[[], List[Tuple[str, bool]]]): 変更時にエントリを一覧してフィルタを適用する関数
+
+        Returns:
+            List[Tuple[str, bool]]: (パス, ディレクトリかどうか) のリスト（走査順）
+        """
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return []
+        rel_dir = os.path.relpath(directory, root)
+        if root not in self._scanned_roots:
+            self._scanned_roots.add(root)
+            if self.configs.get(root) != self.config_key:
+                if self.roots.get(root):
+                    logger.info(f"Filter settings changed; discarding directory snapshot of {root}")
+                self.roots[root] = {}
+                self.configs[root] = self.config_key
+                self._dirty = True
+        entries = self.roots.setdefault(root, {})
+        self._visited.setdefault(root, set()).add(rel_dir)
+
+        entry = entries.get(rel_dir)
+        if entry is not None and entry[0] == mtime_ns:
+            self.reused_directories += 1
+            return [(os.path.join(directory, name[:-1]), True) if name.endswith('/')
+                    else (os.path.join(directory, name), False) for name in entry[1]]
+
+        self.rescanned_directories += 1
+        result = scan()
+        # 直近に変更されたディレクトリは次回も一覧し直す
+        recorded_mtime = mtime_ns if time.time_ns() - mtime_ns > RACY_INTERVAL_NS else -1
+        names = [os.path.basename(path) + '/' if is_dir else os.path.basename(path) for path, is_dir in result]
+        entries[rel_dir] = [recorded_mtime, names, entry[2] if entry is not None else None]
+        self._dirty = True
+        return result
+
+    def seal(self, root: str, directory: str) -> None:
+        """
+        配下の走査が終わったディレクトリのハッシュを直下のエントリと子ディレクトリのハッシュから計算
+
+        Args:
+            root (str): 収集対象のルートディレクトリ
+            directory (str): 対象ディレクトリ
+        """
+        entries = self.roots.get(root, {})
+        rel_dir = os.path.relpath(directory, root)
+        entry = entries.get(rel_dir)
+        if entry is None:
+            return
+        hasher = hashlib.blake2b(digest_size=16)
+        for name in entry[1]:
+            hasher.update(name.encode('utf-8', 'surrogateescape'))
+            hasher.update(b'\0')
+            if name.endswith('/'):
+                child = entries.get(os.path.normpath(os.path.join(rel_dir, name[:-1])))
+                hasher.update((child[2] or '').encode('ascii') if child else b'')
+                hasher.update(b'\0')
+        digest = hasher.hexdigest()
+        if entry[2] != digest:
+            entry[2] = digest
+            self._dirty = True
+
+    def finish(self, root: str) -> None:
+        """
+        ルート配下の走査の完了時に、走査しなかった（削除・無視された）ディレクトリの記録を破棄
+
+        Args:
+            root (str): 収集対象のルートディレクトリ
+        """
+        visited = self._visited.pop(root, set())
+        entries = self.roots.get(root, {})
+        for rel_dir in set(entries) - visited:
+            del entries[rel_dir]
+            self._dirty = True
+        logger.debug(f"Directory snapshot of {root}: root hash {self.root_hash(root)}")
+
+    def root_hash(self, root: str) -> Optional[str]:
+        """
+        ルートディレクトリのハッシュ（ツリーの構成が同じなら同じ値）
+
+        Args:
+            root (str): 収集対象のルートディレクトリ
+
+        Returns:
+            Optional[str]: ハッシュ（未走査の場合はNone）
+        """
+        entry = self.roots.get(root, {}).get('.')
+        return entry[2] if entry is not None else None
+
+    def save(self) -> None:
+        """
+        変更があればスナップショットを書き込み（失敗しても生成は続行）
+
+        並行して同じファイルを使う他のジョブ・プロセスの記録を落とさないよう、ロックした上で
+        保存済みのスナップショットを読み直し、今回走査したルートの記録だけを置き換える。
+        """
+        if not self.path or not self._dirty:
+            return
+        # バッチ処理で同じスナップショットを書き込むスレッドと一時ファイルが重ならないようにする
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with cache_file_lock(self.path):
+                data = self._load()
+                roots, configs = data.get('roots', {}), data.get('configs', {})
+                for root in self._scanned_roots:
+                    roots[root] = self.roots.get(root, {})
+                    configs[root] = self.configs[root]
+                self.roots, self.configs = roots, configs
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                with gzip.open(temp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+                    json.dump({'version': self.VERSION, 'configs': self.configs, 'roots': self.roots}, f,
+                              separators=(',', ':'))
+                os.replace(temp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            logger.warning(f"Failed to write directory snapshot {self.path}: {str(e)}")
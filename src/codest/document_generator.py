@@ -1,23 +1,125 @@
 import os
 import io
+import copy
+import shutil
 import logging
+import tempfile
+import contextlib
 from datetime import datetime
-from typing import Union, TextIO, Tuple, List
+import hashlib
+from typing import Union, TextIO, Tuple, List, Dict, Any, Callable
 import pyperclip
 from .file_collector import FileCollector
-from .exceptions import DocumentGenerationError
-from .constants import MARKDOWN_LANGUAGE_MAP
+from .exceptions import DocumentGenerationError, ClipboardError, NotebookError
+from .constants import MARKDOWN_LANGUAGE_MAP, DEFAULT_CLIPBOARD_MAX_BYTES
+from .manifest import Manifest, ManifestDiff, compute_file_hash
+from .compaction import get_compactor
+from .excerpt import read_excerpt
+from .outline import OutlineCache
+from .selection import BudgetSelector, toc_entry_bytes
+from .section_index import SectionIndex, default_index_path
+from .clipboard import ClipboardSink, detect_clipboard_command
+from .archive import ArchiveMember, iter_archive_members
+from .git_objects import GitRevision
+from .content_cache import ContentCache
+from .gitignore import GitIgnoreCache
+from .redaction import Redactor
+from .sampling import StratifiedSampler
+from .stats import CodebaseStats, scan_stats
+from .imports import ImportCache, ImportGraph
+from .banners import BannerIndex, BANNER_SCAN_BYTES, DEFAULT_BANNER_MIN_FILES
+from .dir_snapshot import DirectorySnapshot
+from .generated import GeneratedFileDetector, GENERATED_SCAN_BYTES, GENERATED_HEAD_READ_BYTES
+from .notebook import (
+    extract_notebook, is_notebook, NOTEBOOK_MAX_BYTES, OUTPUTS_NONE, DEFAULT_OUTPUT_LINES
+)
+from .renderers import (
+    DocumentHeader, Renderer, MarkdownRenderer, NOTICE_SKIPPED, NOTICE_SECRET, NOTICE_ERROR, NOTICE_GENERATED
+)
 
 logger = logging.getLogger(__name__)
 
 
+def utf8_len(text: str) -> int:
+    """
+    テキストのUTF-8でのバイト数を取得
+
+    Args:
+        text (str): 対象テキスト
+
+    Returns:
+        int: バイト数
+    """
+    return len(text) if text.isascii() else len(text.encode('utf-8'))
+
+
+class ByteCountingWriter:
+    def __init__(self, stream: TextIO):
+        """
+        書き込んだUTF-8バイト数を数えるライターの初期化
+
+        Args:
+            stream (TextIO): 書き込み先のストリーム
+        """
+        self.stream = stream
+        self.bytes_written = 0
+
+    def write(self, text: str) -> int:
+        """
+        テキストを書き込み、UTF-8でのバイト数を加算
+
+        Args:
+            text (str): 書き込むテキスト
+
+        Returns:
+            int: 書き込んだ文字数
+        """
+        self.bytes_written += utf8_len(text)
+        return self.stream.write(text)
+
+
 class DocumentGenerator:
     def __init__(
             self,
             directories: Union[str, List[str]],
             exclude_dirs: List[str] = None,
             max_file_size_kb: int = 1000,
-            collector: FileCollector = None
+            collector: FileCollector = None,
+            source_files: List[str] = None,
+            manifest_file: str = None,
+            since_manifest: str = None,
+            hash_algorithm: str = 'sha256',
+            compact: bool = False,
+            excerpt_kb: int = None,
+            excerpt_lines: int = None,
+            outline: bool = False,
+            outline_above_kb: float = None,
+            outline_cache: OutlineCache = None,
+            budget_bytes: int = None,
+            priority_weights: Dict[str, float] = None,
+            toc: bool = False,
+            write_index: bool = False,
+            clipboard_command: List[str] = None,
+            clipboard_max_bytes: int = DEFAULT_CLIPBOARD_MAX_BYTES,
+            archives: List[str] = None,
+            revision: str = None,
+            content_cache: ContentCache = None,
+            gitignore_cache: GitIgnoreCache = None,
+            redactor: Redactor = None,
+            renderer: Renderer = None,
+            sample_size: int = None,
+            sample_ratio: float = None,
+            sample_seed: int = 0,
+            collect_stats: bool = False,
+            entry_files: List[str] = None,
+            import_cache: ImportCache = None,
+            factor_banners: bool = False,
+            banner_min_files: int = DEFAULT_BANNER_MIN_FILES,
+            raw_notebooks: bool = False,
+            notebook_outputs: str = OUTPUTS_NONE,
+            notebook_output_lines: int = DEFAULT_OUTPUT_LINES,
+            skip_generated: bool = True,
+            dir_snapshot: DirectorySnapshot = None
     ):
         """
         DocumentGeneratorの初期化
@@ -27,16 +129,103 @@ class DocumentGenerator:
             exclude_dirs (List[str], optional): 除外するディレクトリリスト
             max_file_size_kb (int, optional): 最大ファイルサイズ（KB）
             collector (FileCollector, optional): カスタムFileCollector
+            source_files (List[str], optional): 明示的なファイルリスト（指定時はディレクトリを走査しない）
+            manifest_file (str, optional): マニフェストの出力先パス
+            since_manifest (str, optional): 前回のマニフェストのパス（指定時は変更されたファイルのみ出力）
+            hash_algorithm (str, optional): マニフェストに記録するハッシュアルゴリズム（sha256, blake2b）
+            compact (bool, optional): コメント・docstring・空行を除去して出力するかどうか
+            excerpt_kb (int, optional): サイズ超過ファイルの先頭・末尾から出力するサイズ（KB）
+            excerpt_lines (int, optional): サイズ超過ファイルの先頭・末尾から出力する行数
+            outline (bool, optional): すべてのファイルをアウトライン（シグネチャのみ）で出力するかどうか
+            outline_above_kb (float, optional): このサイズ（KB）を超えるファイルのみアウトラインで出力
+            outline_cache (OutlineCache, optional): 内容のハッシュをキーとするアウトラインのキャッシュ
+            budget_bytes (int, optional): 出力全体の予算（バイト）。指定時は優先度の高いファイルから選択
+            priority_weights (Dict[str, float], optional): 予算内の選択に使う優先度シグナルの重み
+            toc (bool, optional): 先頭にリンク付きの目次を出力するかどうか
+            write_index (bool, optional): セクションのバイト位置のインデックス（<出力ファイル>.index.json）を出力するかどうか
+            clipboard_command (List[str], optional): クリップボードコマンドと引数（省略時は自動検出）
+            clipboard_max_bytes (int, optional): クリップボードにコピーできる最大バイト数（Noneで無制限）
+            archives (List[str], optional): 展開せずに収集するzip・tarアーカイブのパス
+            revision (str, optional): 作業ツリーの代わりにオブジェクトストアから読み込むgitリビジョン
+            content_cache (ContentCache, optional): ファイル内容の共有キャッシュ（バッチ処理用）
+            gitignore_cache (GitIgnoreCache, optional): 解析済み.gitignoreの共有キャッシュ（バッチ処理用）
+            redactor (Redactor, optional): 出力前に秘密情報を伏せ字にする処理
+            renderer (Renderer, optional): 出力形式の書き込み処理（省略時はマークダウン）
+            sample_size (int, optional): ディレクトリ・言語ごとに層別抽出するファイル数
+            sample_ratio (float, optional): ディレクトリ・言語ごとに層別抽出する比率
+            sample_seed (int, optional): 層別抽出の乱数シード
+            collect_stats (bool, optional): 言語別・ディレクトリ別の行数等の集計を末尾に出力するかどうか
+            entry_files (List[str], optional): 指定時はこれらのファイルからimportで到達可能なファイルのみを依存先から順に出力
+            import_cache (ImportCache, optional): 解析済みimportの永続キャッシュ
+            factor_banners (bool, optional): 複数ファイル共通の先頭コメント（ライセンス表示等）を各ファイルから除去し、メタ情報に1回だけ出力するかどうか
+            banner_min_files (int, optional): 共通ヘッダーとみなす最小のファイル数
+            raw_notebooks (bool, optional): ノートブック（.ipynb）をセルを抽出せずJSONのまま出力するかどうか
+            notebook_outputs (str, optional): ノートブックのセルの出力の扱い（none, truncate, full）
+            notebook_output_lines (int, optional): truncate時にセルごとに出力する最大行数
+            skip_generated (bool, optional): 先頭部分から生成コード・minify済み・ロックファイル等と判定したファイルを1行の注記に置き換えるかどうか
+            dir_snapshot (DirectorySnapshot, optional): 変更のないディレクトリの一覧を省くためのスナップショット（走査後に保存）
         """
         if isinstance(directories, str):
             directories = [directories]
 
         self.directories = [os.path.abspath(d) for d in directories]
         self.max_file_size_kb = max_file_size_kb
+        if collector is None and revision is not None:
+            # リビジョンからの生成では作業ツリーを参照しない（ディレクトリの存在確認・作業ツリーの.gitignoreの
+            # 読み込みを行わず、既定の無視パターンとリビジョンのツリー内の.gitignoreのみで判定）
+            collector = FileCollector([], exclude_dirs=exclude_dirs)
         self.collector = collector or FileCollector(
             directories=directories,
-            exclude_dirs=exclude_dirs
+            exclude_dirs=exclude_dirs,
+            gitignore_cache=gitignore_cache,
+            dir_snapshot=dir_snapshot
         )
+        self.dir_snapshot = dir_snapshot
+        self.source_files = source_files
+        self.manifest_file = manifest_file
+        self.since_manifest = since_manifest
+        self.hash_algorithm = hash_algorithm
+        self._hash_algorithm = None
+        self.compact = compact
+        self.compaction_stats: Dict[str, List[int]] = {}  # 言語 -> [元のバイト数, 除去後のバイト数]
+        self.excerpt_kb = excerpt_kb
+        self.excerpt_lines = excerpt_lines
+        self.outline = outline
+        self.outline_above_kb = outline_above_kb
+        self.outline_cache = outline_cache or OutlineCache()
+        self.budget_bytes = budget_bytes
+        self.priority_weights = priority_weights
+        self.toc = toc
+        self.write_index = write_index
+        self.clipboard_command = clipboard_command
+        self.clipboard_max_bytes = clipboard_max_bytes
+        self.archives = [os.path.abspath(a) for a in (archives or [])]
+        self.revision = revision
+        self.content_cache = content_cache
+        self.redactor = redactor
+        self.renderer = renderer or MarkdownRenderer()
+        self.sample_size = sample_size
+        self.sample_ratio = sample_ratio
+        self.sample_seed = sample_seed
+        self.collect_stats = collect_stats
+        self.entry_files = [os.path.abspath(f) for f in (entry_files or [])]
+        self.import_cache = import_cache
+        self.factor_banners = factor_banners
+        self.banner_min_files = banner_min_files
+        self._banner_index: BannerIndex = None
+        self.raw_notebooks = raw_notebooks
+        self.notebook_outputs = notebook_outputs
+        self.notebook_output_lines = notebook_output_lines
+        self.skip_generated = skip_generated
+        # 直近の生成で注記に置き換えた生成コード等（skip_generated時のみ）
+        self.generated_detector: GeneratedFileDetector = None
+        # 直近の生成での言語別・ディレクトリ別の集計（collect_stats時のみ）
+        self.codebase_stats: CodebaseStats = None
+        self.redaction_counts: Dict[str, int] = {}  # 相対パス -> 伏せ字にした箇所の数
+        self.secret_files: List[str] = []
+        # 直近の生成結果（出力したファイル数とバイト数）
+        self.stats: Dict[str, int] = {}
+        self._generated_at: str = None
 
     def generate(self, output_file: str = None, to_clipboard: bool = False) -> Union[str, Tuple[str, str]]:
         """
@@ -50,75 +239,453 @@ class DocumentGenerator:
             Union[str, Tuple[str, str]]:
                 to_clipboard=Falseの場合: 生成されたファイルのパス
                 to_clipboard=Trueの場合: (生成された内容, ファイルパス) のタプル
+                    （クリップボードコマンドへストリーミングし、clipboard_max_bytesがNoneの場合、内容はNone）
 
         Raises:
             DocumentGenerationError: ドキュメント生成に失敗した場合
         """
+        # 書き込み途中で失敗した場合に削除する出力ファイル
+        partial_output = None
         try:
             logger.info("Starting document generation")
-            source_files = self.collector.collect_files()
+            # 一覧全体を必要とする機能がなければ、列挙しながら書き込む（ヘッダーは最後に作成）
+            lazy = (self.revision is None and self.source_files is None and not self.since_manifest
+                    and not self.manifest_file and self.budget_bytes is None and not self.toc
+                    and not to_clipboard and self.sample_size is None and self.sample_ratio is None
+                    and not self.entry_files and not self.factor_banners)
+            git_revision = None
+            revision_files = []
+            meta = {}
+            if lazy:
+                source_files = self.collector.iter_files()
+            elif self.revision is not None:
+                # 作業ツリーは参照せず、オブジェクトストアのツリーからファイルを列挙
+                git_revision = GitRevision(self.directories[0], self.revision)
+                revision_files = git_revision.list_files(self.directories, self.collector)
+                source_files = []
+            else:
+                source_files = self._select_files(meta)
+
+            # マニフェスト自体は収集対象から除外
+            if self.since_manifest or self.manifest_file:
+                manifest_paths = {os.path.abspath(p) for p in (self.since_manifest, self.manifest_file) if p}
+                source_files = [f for f in source_files if f not in manifest_paths]
+            collected_files = source_files
+
+            # 前回のマニフェストとの差分を計算
+            snapshot = None
+            changes = None
+            hash_algorithm = self.hash_algorithm
+            if self.since_manifest:
+                previous = Manifest.load(self.since_manifest)
+                hash_algorithm = previous.hash_algorithm
+                snapshot = Manifest.build(source_files, previous)
+                changes = snapshot.diff(previous)
+                source_files = changes.changed
+                logger.info(
+                    f"Changes since manifest: {len(changes.added)} added, "
+                    f"{len(changes.modified)} modified, {len(changes.deleted)} deleted")
+
+            if git_revision is not None:
+                meta['Revision'] = f"`{self.revision}` ({git_revision.commit[:12]})"
+            self._banner_index = None
+            # セクションに使える出力のバイト数（予算の指定時のみ）
+            section_limit = None
+            # 予算が指定されている場合はstat情報のみで優先度の高いファイルを選択
+            if self.budget_bytes is not None:
+                # ヘッダー（メタ情報・対象ディレクトリ・目次の見出し）・末尾を実際に描画した大きさを予算から差し引く
+                candidate_count = len(source_files)
+                budget_meta = (f"{self.budget_bytes} of {self.budget_bytes} bytes "
+                               f"({candidate_count} of {candidate_count} files selected)")
+                reserved = ByteCountingWriter(io.StringIO())
+                self._write_header(reserved, candidate_count, changes, dict(meta, Budget=budget_meta),
+                                   [] if self.toc else None)
+                if changes is not None and changes.deleted:
+                    self.renderer.write_deleted(reserved, [self._get_relative_path(p) for p in changes.deleted])
+                self.renderer.write_footer(reserved)
+                excerpting = self.excerpt_kb is not None or self.excerpt_lines is not None
+                selector = BudgetSelector(
+                    self.budget_bytes,
+                    weights=self.priority_weights,
+                    max_file_size_bytes=self.max_file_size_kb * 1024,
+                    excerpt_bytes=self._excerpt_bytes() if excerpting else None,
+                    reserved_bytes=reserved.bytes_written,
+                    toc=self.toc,
+                    section_overhead_bytes=self.renderer.section_overhead_bytes,
+                    content_ratio=self.renderer.content_ratio
+                )
+                source_files = selector.select(source_files, self._get_relative_path)
+                section_limit = max(self.budget_bytes - reserved.bytes_written, 0)
+
+            # 出力するファイルの先頭部分のみを読み込んで共通ヘッダーを検出
+            if self.factor_banners:
+                self._banner_index = BannerIndex(min_files=self.banner_min_files)
+                self._banner_index.build(source_files, self._read_head, self._get_relative_path)
+                if self._banner_index.banners:
+                    meta['Common headers'] = (
+                        f"{len(self._banner_index.banners)} stripped from {self._banner_index.file_count} files "
+                        f"({self._banner_index.expected_bytes} bytes removed)")
+
+            # マニフェストを出力する場合は読み込みと同時にハッシュを計算
+            self._hash_algorithm = hash_algorithm if self.manifest_file else None
+            # 逐次列挙時はインデックスを出力する場合のみセクション情報を保持
+            keep_sections = not lazy or self.write_index
+            self.codebase_stats = CodebaseStats() if self.collect_stats else None
+            self.generated_detector = GeneratedFileDetector() if self.skip_generated else None
+            sections = {}
+            section_count = 0
+
+            # 出力先へはセクションごとに直接書き込み、内容全体をメモリに保持しない
+            # （クリップボードへはコマンドの標準入力へ逐次書き込む）
+            clipboard_command = None
+            if to_clipboard:
+                clipboard_command = self.clipboard_command or detect_clipboard_command()
+            elif output_file is None:
+                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                output_file = f'source_code_{timestamp}{self.renderer.extension}'
+            if clipboard_command:
+                sink = ClipboardSink(clipboard_command, self.clipboard_max_bytes)
+            elif to_clipboard:
+                sink = io.StringIO()
+            else:
+                # 改行を変換するとインデックスのバイト位置がずれるため、プラットフォームによらず'\n'のまま書き込む
+                sink = open(output_file, 'w', encoding='utf-8', newline='')
+                partial_output = output_file
+
+            # 件数が確定してから作成するヘッダーは、末尾に置ける形式（jsonl, xml）では末尾に書き込み、
+            # 先頭に必要な形式（markdown）では本文を一時ファイルに書き込んでから先頭に付加する
+            # （アーカイブのメンバー数は読み込むまで確定しない）
+            # 予算の指定時は書き込んだセクションが確定してからヘッダーを作成する
+            header_first = (not lazy and not self.archives and not self.renderer.header_at_end
+                            and section_limit is None)
+            self._generated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+            with sink, contextlib.ExitStack() as stack:
+                writer = ByteCountingWriter(sink)
+                body = None
+                if header_first:
+                    toc_paths = None
+                    if self.toc:
+                        toc_paths = [self._get_relative_path(f) for f in source_files]
+                        toc_paths.extend(self._get_relative_path(f) for f, _, _ in revision_files)
+                    self._write_header(writer, len(source_files) + len(revision_files), changes, meta, toc_paths)
+                elif self.renderer.header_at_end:
+                    self.renderer.write_start(writer, self._generated_at)
+                else:
+                    body_dir = os.path.dirname(os.path.abspath(output_file)) if not to_clipboard else None
+                    body = stack.enter_context(
+                        tempfile.TemporaryFile('w+', encoding='utf-8', newline='', dir=body_dir))
+                    writer = ByteCountingWriter(body)
 
-            # メモリ上にコンテンツを生成
-            with io.StringIO() as content_buffer:
-                self._write_header(content_buffer, len(source_files))
+                def record(key: str, section: Dict[str, Any], offset: int) -> None:
+                    nonlocal section_count
+                    section_count += 1
+                    if keep_sections:
+                        section['offset'] = offset
+                        section['length'] = writer.bytes_written - offset
+                        sections[key] = section
 
+                dropped = 0
+                toc_bytes = 0
                 for file_path in source_files:
-                    self._process_file(content_buffer, file_path)
+                    offset = writer.bytes_written
+                    if section_limit is None:
+                        record(file_path, self._process_file(writer, file_path), offset)
+                        continue
+                    # 予算の指定時は描画した大きさを確かめ、収まらないセクションは書き込まない
+                    # （エスケープ等でstatからの見積もりを超える場合がある）
+                    buffer = ByteCountingWriter(io.StringIO())
+                    restore = self._snapshot_counters()
+                    section = self._process_file(buffer, file_path)
+                    # 末尾の集計（--stats）はこのセクションを含めた大きさで確かめる
+                    stats_bytes = 0
+                    if self.codebase_stats is not None:
+                        stats_writer = ByteCountingWriter(io.StringIO())
+                        self.renderer.write_stats(stats_writer, self.codebase_stats.to_dict())
+                        stats_bytes = stats_writer.bytes_written
+                    # 末尾で作成する目次の項目
+                    entry_bytes = toc_entry_bytes(section['name']) if self.toc else 0
+                    if writer.bytes_written + buffer.bytes_written + stats_bytes + toc_bytes + entry_bytes \
+                            > section_limit:
+                        restore()
+                        dropped += 1
+                        logger.debug(f"Dropping {section['name']}: rendered section exceeds the budget")
+                        continue
+                    toc_bytes += entry_bytes
+                    writer.write(buffer.stream.getvalue())
+                    record(file_path, section, offset)
+                if section_limit is not None:
+                    meta['Budget'] = (f"{self.budget_bytes - section_limit + writer.bytes_written + toc_bytes} of "
+                                      f"{self.budget_bytes} bytes ({len(source_files) - dropped} of "
+                                      f"{candidate_count} files selected)")
+                    if dropped:
+                        logger.info(f"Dropped {dropped} selected files whose rendered sections exceed the budget")
+
+                for file_path, member, sha in revision_files:
+                    offset = writer.bytes_written
+                    section = self._process_member(writer, self._get_relative_path(file_path), member,
+                                                   lambda sha=sha: git_revision.read_blob(sha))
+                    record(file_path, section, offset)
+                if git_revision is not None:
+                    git_revision.close()
+
+                # アーカイブのメンバーは展開せずに格納順に読み込みながら書き込む
+                for archive_path in self.archives:
+                    archive_name = os.path.basename(archive_path)
+                    for member, read in iter_archive_members(archive_path, self.collector):
+                        offset = writer.bytes_written
+                        section = self._process_member(writer, f"{archive_name}/{member.name}", member, read)
+                        record(f"{archive_path}/{member.name}", section, offset)
+
+                if changes is not None and changes.deleted:
+                    self.renderer.write_deleted(writer, [self._get_relative_path(p) for p in changes.deleted])
+                if self.codebase_stats is not None:
+                    self.renderer.write_stats(writer, self.codebase_stats.to_dict())
+                # 末尾で作成するヘッダーの件数と目次は書き込んだセクション（アーカイブのメンバーを含む）から作成
+                toc_paths = [section['name'] for section in sections.values()] if self.toc else None
+                if self.renderer.header_at_end:
+                    self._write_header(writer, section_count, changes, meta, toc_paths)
+                self.renderer.write_footer(writer)
+                document_size = writer.bytes_written
 
-                content = content_buffer.getvalue()
+                if body is not None:
+                    # ファイル数が確定してからヘッダーを書き込み、本文を続けて複写
+                    header_writer = ByteCountingWriter(sink)
+                    self._write_header(header_writer, section_count, changes, meta, toc_paths)
+                    body.seek(0)
+                    shutil.copyfileobj(body, sink)
+                    for section in sections.values():
+                        section['offset'] += header_writer.bytes_written
+                    document_size += header_writer.bytes_written
+
+                content = sink.getvalue() if to_clipboard else None
+            partial_output = None
+            self.stats = {'files': section_count, 'bytes': document_size}
+
+            if self.compact:
+                self._log_compaction_stats()
+            if self.redactor is not None:
+                self._log_redaction_stats()
+            if self._banner_index is not None:
+                self._log_banner_stats()
+            if self.generated_detector is not None:
+                logger.info(f"Generated, minified and lock files: {self.generated_detector.summary()}")
+            self._save_dir_snapshot()
+
+            if self.manifest_file:
+                manifest = self._build_manifest(collected_files, sections, snapshot, hash_algorithm)
+                manifest.save(self.manifest_file)
 
             # クリップボードにコピーする場合
             if to_clipboard:
+                if clipboard_command:
+                    logger.info(f"Content streamed to clipboard ({document_size} bytes)")
+                    return content, output_file if output_file else None
+
+                # クリップボードコマンドが見つからない場合はpyperclipにフォールバック
+                if self.clipboard_max_bytes is not None and document_size > self.clipboard_max_bytes:
+                    raise ClipboardError(
+                        f"Output exceeds clipboard size limit ({self.clipboard_max_bytes} bytes); "
+                        f"write to a file instead or raise the limit")
                 pyperclip.copy(content)
                 logger.info("Content copied to clipboard")
                 return content, output_file if output_file else None
 
-            # ファイルに出力する場合
-            if output_file is None:
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                output_file = f'source_code_{timestamp}.md'  # 拡張子を.mdに変更
-
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(content)
+            if self.write_index:
+                index = SectionIndex(document_size)
+                for section in sections.values():
+                    index.add(section['name'], section['offset'], section['length'])
+                index.save(default_index_path(output_file))
 
             logger.info(f"Output written to: {output_file}")
             return output_file
 
         except Exception as e:
+            if partial_output is not None and os.path.exists(partial_output):
+                os.remove(partial_output)
             raise DocumentGenerationError(f"Failed to generate document: {str(e)}")
 
-    def _write_header(self, file: TextIO, total_files: int) -> None:
+    def scan_statistics(self) -> CodebaseStats:
+        """
+        ドキュメントを生成せず、収集対象ファイルを読み込み専用で走査して集計
+
+        Returns:
+            CodebaseStats: 言語別・ディレクトリ別の集計
+
+        Raises:
+            DocumentGenerationError: 走査に失敗した場合
+        """
+        try:
+            if self.source_files is None and not self.entry_files and self.sample_size is None \
+                    and self.sample_ratio is None:
+                source_files = self.collector.iter_files()
+            else:
+                source_files = self._select_files({})
+            self.codebase_stats = scan_stats(source_files, self._get_relative_path)
+            self._save_dir_snapshot()
+            return self.codebase_stats
+        except Exception as e:
+            raise DocumentGenerationError(f"Failed to collect statistics: {str(e)}")
+
+    def _select_files(self, meta: Dict[str, str]) -> List[str]:
+        """
+        ファイル一覧・エントリファイル・サンプリングの指定に従って作業ツリーから対象ファイルを選択
+
+        Args:
+            meta (Dict[str, str]): 選択の概要を追加するメタ情報
+
+        Returns:
+            List[str]: 対象ファイルの絶対パス（出力順）
+        """
+        if self.source_files is not None:
+            return self.collector.filter_files(self.source_files)
+        if self.entry_files:
+            # エントリファイルからimportを辿り、依存先が先になる順序で出力
+            graph = ImportGraph(self.collector.collect_files(), self.import_cache)
+            source_files = graph.closure(self.entry_files)
+            graph.cache.save()
+            entries = ', '.join(f"`{self._get_relative_path(f)}`" for f in self.entry_files)
+            meta['Entry points'] = f"{entries} ({len(source_files)} of {len(graph.files)} files reachable)"
+            return source_files
+        if self.sample_size is not None or self.sample_ratio is not None:
+            # 割り当てが尽きたサブツリーは走査せずに代表的なファイルのみを選ぶ
+            sampler = StratifiedSampler(self.collector, self.sample_size, self.sample_ratio, self.sample_seed)
+            source_files = sampler.sample()
+            meta['Sample'] = (f"{len(source_files)} files "
+                              f"(seed {self.sample_seed}, {sampler.scanned_directories} directories scanned)")
+            return source_files
+        return self.collector.collect_files()
+
+    def _save_dir_snapshot(self) -> None:
+        """ディレクトリのスナップショットを保存し、一覧を省いたディレクトリ数をログに出力"""
+        if self.dir_snapshot is None:
+            return
+        logger.info(f"Directory snapshot: {self.dir_snapshot.reused_directories} directories reused, "
+                    f"{self.dir_snapshot.rescanned_directories} rescanned")
+        self.dir_snapshot.save()
+
+    def _write_header(self, file: TextIO, total_files: int, changes: ManifestDiff = None,
+                      meta: Dict[str, str] = None, toc_paths: List[str] = None) -> None:
         """
         ドキュメントヘッダーを書き込み
 
         Args:
             file (TextIO): 出力先のファイルオブジェクト
             total_files (int): 収集されたファイルの総数
+            changes (ManifestDiff, optional): 前回のマニフェストからの差分
+            meta (Dict[str, str], optional): メタ情報セクションに追加する項目
+            toc_paths (List[str], optional): 目次に載せる相対パス（指定時のみ目次を出力）
         """
-        # タイトルセクション
-        file.write("# Source Code Collection\n\n")
+        header_meta = {}
+        if changes is not None:
+            header_meta['Changes since'] = (f"`{self.since_manifest}` "
+                                            f"({len(changes.added)} added, {len(changes.modified)} modified, "
+                                            f"{len(changes.deleted)} deleted)")
+        header_meta.update(meta or {})
+        self.renderer.write_header(file, DocumentHeader(
+            generated_at=self._generated_at,
+            total_files=total_files,
+            directories=self.directories,
+            archives=self.archives,
+            meta=header_meta,
+            toc_paths=toc_paths,
+            banners=[{'id': banner.id, 'files': banner.files, 'text': banner.text}
+                     for banner in self._banner_index.banners] if self._banner_index is not None else None
+        ))
 
-        # メタ情報セクション
-        file.write("## Meta Information\n\n")
-        file.write(f"- **Generated at**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        file.write(f"- **Total files**: {total_files}\n")
+    def _process_file(self, output_file: TextIO, file_path: str) -> Dict[str, Any]:
+        """
+        単一ファイルを処理して書き込み
 
-        # ディレクトリ情報セクション
-        file.write("\n## Target Directories\n\n")
-        for directory in self.directories:
-            file.write(f"- `{directory}`\n")
+        Args:
+            output_file (TextIO): 出力先のファイルオブジェクト
+            file_path (str): 処理対象のファイルパス
 
-        # セパレータ
-        file.write("\n---\n\n")
-        file.write("## Source Files\n\n")
+        Returns:
+            Dict[str, Any]: 出力したセクションの情報（name, size, mtime_ns, status, hash, line_count）
+        """
+        shortest_rel_path = self._get_relative_path(file_path)
+
+        logger.debug(f"Processing file: {shortest_rel_path}")
+
+        stat = os.stat(file_path)
+        section = {'name': shortest_rel_path, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+        file_size_kb = stat.st_size / 1024
+        # ノートブックはセルの抽出後の内容にサイズ上限を適用
+        notebook = not self.raw_notebooks and is_notebook(file_path) and stat.st_size <= NOTEBOOK_MAX_BYTES
+        if file_size_kb > self.max_file_size_kb and not notebook:
+            if self.excerpt_kb is None and self.excerpt_lines is None:
+                self._write_skipped_file(output_file, shortest_rel_path, stat.st_size)
+                section['status'] = 'skipped'
+                return section
+            try:
+                redactions = self._write_excerpted_file(output_file, file_path, shortest_rel_path, stat.st_size)
+                section['status'] = 'excerpted'
+                if redactions:
+                    section['redactions'] = redactions
+            except Exception as e:
+                self._write_error_file(output_file, shortest_rel_path, str(e))
+                section['status'] = 'error'
+            return section
+
+        try:
+            # 大きいファイルは全体を読み込む前に先頭部分のみで生成コード等を判定
+            head_checked = (self.generated_detector is not None and stat.st_size > GENERATED_HEAD_READ_BYTES
+                            and not notebook)
+            if head_checked and self._write_if_generated(output_file, shortest_rel_path,
+                                                         self._read_head(file_path), stat.st_size):
+                section['status'] = 'generated'
+                return section
+            section.update(self._write_file_content(output_file, file_path, shortest_rel_path,
+                                                    check_generated=not head_checked))
+            section.setdefault('status', 'included')
+        except Exception as e:
+            self._write_error_file(output_file, shortest_rel_path, str(e))
+            section['status'] = 'error'
+        return section
 
-    def _process_file(self, output_file: TextIO, file_path: str) -> None:
+    def _process_member(self, output_file: TextIO, rel_path: str,
+                        member: ArchiveMember, read: Callable[[], bytes]) -> Dict[str, Any]:
         """
-        単一ファイルを処理して書き込み
+        ディスク上にないファイル（アーカイブのメンバー・gitリビジョンのブロブ）を処理して書き込み
 
         Args:
             output_file (TextIO): 出力先のファイルオブジェクト
-            file_path (str): 処理対象のファイルパス
+            rel_path (str): 表示用のパス
+            member (ArchiveMember): ファイル情報
+            read (Callable[[], bytes]): 内容の読み込み関数
+
+        Returns:
+            Dict[str, Any]: 出力したセクションの情報（name, size, status, line_count）
+        """
+        logger.debug(f"Processing member: {rel_path}")
+        section = {'name': rel_path, 'size': member.size}
+
+        # シークできないため、サイズ超過時は抜粋せずスキップ
+        file_size_kb = member.size / 1024
+        if file_size_kb > self.max_file_size_kb:
+            self._write_skipped_file(output_file, rel_path, member.size)
+            section['status'] = 'skipped'
+            return section
+
+        try:
+            section.update(self._write_content(output_file, read(), rel_path))
+            section.setdefault('status', 'included')
+        except Exception as e:
+            self._write_error_file(output_file, rel_path, str(e))
+            section['status'] = 'error'
+        return section
+
+    def _get_relative_path(self, file_path: str) -> str:
+        """
+        表示用の相対パスを取得
+
+        Args:
+            file_path (str): ファイルの絶対パス
+
+        Returns:
+            str: 収集対象ディレクトリからの相対パス
         """
         # ファイルパスを最も近い収集対象ディレクトリからの相対パスで表示
         shortest_rel_path = None
@@ -137,33 +704,66 @@ class DocumentGenerator:
         if shortest_rel_path is None:
             shortest_rel_path = os.path.basename(file_path)  # Use basename as fallback
 
-        logger.debug(f"Processing file: {shortest_rel_path}")
-
-        file_size_kb = os.path.getsize(file_path) / 1024
-        if file_size_kb > self.max_file_size_kb:
-            self._write_skipped_file(output_file, shortest_rel_path, file_size_kb)
-            return
-
-        try:
-            self._write_file_content(output_file, file_path, shortest_rel_path)
-        except Exception as e:
-            self._write_error_file(output_file, shortest_rel_path, str(e))
+        return shortest_rel_path
 
-    def _write_skipped_file(self, output_file: TextIO, rel_path: str, file_size_kb: float) -> None:
+    def _write_skipped_file(self, output_file: TextIO, rel_path: str, size: int) -> None:
         """
         スキップされたファイル情報を書き込み
 
         Args:
             output_file (TextIO): 出力先のファイルオブジェクト
             rel_path (str): ファイルの相対パス
-            file_size_kb (float): ファイルサイズ（KB）
+            size (int): ファイルサイズ（バイト）
         """
+        file_size_kb = size / 1024
         logger.warning(f"Skipping large file: {rel_path} ({file_size_kb:.1f}KB)")
-        output_file.write(f"\n### `{rel_path}`\n\n")
-        output_file.write(
-            f"> ⚠️ **File skipped**: Size ({file_size_kb:.1f}KB) exceeds limit of {self.max_file_size_kb}KB\n\n")
+        if self.codebase_stats is not None:
+            self.codebase_stats.add_unread(rel_path, size)
+        self.renderer.write_notice(
+            output_file, rel_path, NOTICE_SKIPPED,
+            f"Size ({file_size_kb:.1f}KB) exceeds limit of {self.max_file_size_kb}KB", size)
 
-    def _write_file_content(self, output_file: TextIO, file_path: str, rel_path: str) -> None:
+    def _excerpt_bytes(self) -> int:
+        """
+        サイズ超過ファイルの先頭・末尾それぞれから出力する最大バイト数
+
+        Returns:
+            int: バイト数
+        """
+        # 行数指定の場合も出力がサイズ制限に収まるようバイト数の上限を設ける
+        if self.excerpt_kb is not None:
+            return self.excerpt_kb * 1024
+        return max(self.max_file_size_kb * 1024 // 2, 1)
+
+    def _write_excerpted_file(self, output_file: TextIO, file_path: str, rel_path: str, size: int) -> int:
+        """
+        サイズ超過ファイルの先頭と末尾のみを書き込み
+
+        Args:
+            output_file (TextIO): 出力先のファイルオブジェクト
+            file_path (str): ファイルの絶対パス
+            rel_path (str): ファイルの相対パス
+            size (int): ファイルサイズ（バイト）
+
+        Returns:
+            int: 伏せ字にした箇所の数
+        """
+        head, tail, omitted = read_excerpt(file_path, self._excerpt_bytes(), self.excerpt_lines)
+        redactions = 0
+        if self.redactor is not None:
+            head, head_redactions = self.redactor.redact(head)
+            tail, tail_redactions = self.redactor.redact(tail)
+            redactions = self._record_redactions(rel_path, head_redactions + tail_redactions)
+
+        logger.warning(f"Excerpting large file: {rel_path} ({size / 1024:.1f}KB)")
+        if self.codebase_stats is not None:
+            self.codebase_stats.add_unread(rel_path, size)
+        self.renderer.write_excerpt(output_file, rel_path, self._language(file_path), head, tail, omitted,
+                                    size, self.max_file_size_kb)
+        return redactions
+
+    def _write_file_content(self, output_file: TextIO, file_path: str, rel_path: str,
+                            check_generated: bool = True) -> Dict[str, Any]:
         """
         ファイル内容を書き込み
 
@@ -171,46 +771,307 @@ class DocumentGenerator:
             output_file (TextIO): 出力先のファイルオブジェクト
             file_path (str): ファイルの絶対パス
             rel_path (str): ファイルの相対パス
+            check_generated (bool, optional): 生成コード等の判定を行うかどうか（先頭部分で判定済みの場合False）
+
+        Returns:
+            Dict[str, Any]: 読み込んだ内容の情報（line_count, ハッシュ計算時はhash）
+        """
+        if self.content_cache is not None:
+            data = self.content_cache.read(file_path)
+        else:
+            with open(file_path, 'rb') as source_file:
+                data = source_file.read()
+        return self._write_content(output_file, data, rel_path, check_generated)
+
+    def _write_content(self, output_file: TextIO, data: bytes, rel_path: str,
+                       check_generated: bool = True) -> Dict[str, Any]:
         """
-        with open(file_path, 'r', encoding='utf-8') as source_file:
-            content = source_file.read()
-            # ファイル名をコードブロックで装飾
-            output_file.write(f"\n### `{rel_path}`\n\n")
+        読み込み済みのファイル内容を書き込み
 
-            # 拡張子を取得
-            ext = os.path.splitext(file_path)[1].lower()
+        Args:
+            output_file (TextIO): 出力先のファイルオブジェクト
+            data (bytes): ファイル内容
+            rel_path (str): ファイルの相対パス（拡張子から言語を判定）
+            check_generated (bool, optional): 生成コード等の判定を行うかどうか
 
-            if ext == '.md':
-                # マークダウンファイルの場合は特別な処理
-                self._write_markdown_content(output_file, content)
-            else:
-                # 通常のファイルは従来通りの処理
-                lang = MARKDOWN_LANGUAGE_MAP.get(ext, ext[1:] if ext else '')
-                output_file.write("```" + lang + "\n")
-                output_file.write(content)
-                output_file.write("\n```\n")
+        Returns:
+            Dict[str, Any]: 内容の情報（line_count, ハッシュ計算時はhash）
+        """
+        # 読み込んだバイト列からハッシュと行数を計算（再読み込みしない）
+        info = {'line_count': data.count(b'\n') + (1 if data and not data.endswith(b'\n') else 0)}
+        notebook = not self.raw_notebooks and is_notebook(rel_path)
+        # ノートブックはセルを抽出するため生成コード等の判定の対象外
+        if self.generated_detector is not None and check_generated and not notebook and \
+                self._write_if_generated(output_file, rel_path, data, len(data)):
+            info['status'] = 'generated'
+            return info
+        if self._hash_algorithm:
+            info['hash'] = hashlib.new(self._hash_algorithm, data).hexdigest()
+        if self.codebase_stats is not None:
+            self.codebase_stats.add(rel_path, data)
 
-    def _write_markdown_content(self, output_file: TextIO, content: str) -> None:
+        lang = self._language(rel_path)
+        content = None
+        content_hash = None
+        # アウトラインで出力するかどうかの判定に使うサイズ
+        content_size = len(data)
+        if notebook:
+            try:
+                # 出力（base64の画像等）を除いたセルのみを出力
+                content, lang = extract_notebook(data, self.notebook_outputs, self.notebook_output_lines)
+                content_size = utf8_len(content)
+                content_hash = hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+            except NotebookError as e:
+                logger.warning(f"Failed to parse notebook {rel_path}, including it as JSON: {str(e)}")
+            if content_size / 1024 > self.max_file_size_kb:
+                logger.warning(f"Skipping large notebook: {rel_path} ({content_size / 1024:.1f}KB)")
+                self.renderer.write_notice(
+                    output_file, rel_path, NOTICE_SKIPPED,
+                    f"Extracted size ({content_size / 1024:.1f}KB) exceeds limit of {self.max_file_size_kb}KB",
+                    len(data))
+                info['status'] = 'skipped'
+                return info
+
+        if content is None:
+            # テキストモードと同じく改行コードを統一
+            content = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+        # メタ情報に出力済みの共通ヘッダーを除去
+        if self._banner_index is not None:
+            content, banner = self._banner_index.strip(rel_path, content)
+            if banner is not None:
+                # 除去前の内容のアウトラインをキャッシュから取り出さないよう除去後の内容で識別
+                content_hash = hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+        # 出力前にファイルごとに1回走査して秘密情報を伏せる
+        if self.redactor is not None:
+            redacted, redactions = self.redactor.redact(content)
+            if self.redactor.is_secret_file(rel_path, content, redactions):
+                self._write_secret_file(output_file, rel_path, len(data))
+                info['status'] = 'secret'
+                return info
+            if redactions:
+                info['redactions'] = self._record_redactions(rel_path, redactions)
+                content = redacted
+                # 伏せ字前の内容のアウトラインをキャッシュから取り出さないよう伏せ字後の内容で識別
+                content_hash = hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+        if self._should_outline(content_size):
+            content_hash = content_hash or info.get('hash') or hashlib.blake2b(data, digest_size=16).hexdigest()
+            outline = self.outline_cache.get_or_create(content_hash, lang, content)
+            if outline is not None:
+                self.renderer.write_outline(output_file, rel_path, lang, outline, len(data), info['line_count'])
+                info['outline'] = True
+                return info
+
+        if self.compact:
+            content = self._compact_content(content, lang)
+        self.renderer.write_file(output_file, rel_path, lang, content, len(data))
+        return info
+
+    @staticmethod
+    def _language(path: str) -> str:
         """
-        マークダウンファイルの内容を書き込み
-        コードブロックを適切にエスケープして書き込む
+        拡張子から言語名を取得
+
+        Args:
+            path (str): ファイルパス
+
+        Returns:
+            str: マークダウンでの言語名（未登録の拡張子は拡張子そのもの）
+        """
+        ext = os.path.splitext(path)[1].lower()
+        return MARKDOWN_LANGUAGE_MAP.get(ext, ext[1:] if ext else '')
+
+    def _read_head(self, file_path: str) -> bytes:
+        """
+        共通ヘッダー・生成コードの判定用にファイルの先頭部分を読み込み
+
+        Args:
+            file_path (str): ファイルの絶対パス
+
+        Returns:
+            bytes: 先頭BANNER_SCAN_BYTES（GENERATED_SCAN_BYTES以上）バイト
+        """
+        if self.content_cache is not None:
+            return self.content_cache.read(file_path)[:BANNER_SCAN_BYTES]
+        with open(file_path, 'rb') as source_file:
+            return source_file.read(BANNER_SCAN_BYTES)
+
+    def _write_if_generated(self, output_file: TextIO, rel_path: str, head: bytes, size: int) -> bool:
+        """
+        生成コード・minify済み・ロックファイル等であれば内容の代わりに1行の注記を書き込み
 
         Args:
             output_file (TextIO): 出力先のファイルオブジェクト
-            content (str): マークダウンファイルの内容
+            rel_path (str): ファイルの相対パス
+            head (bytes): ファイルの先頭部分
+            size (int): ファイルサイズ（バイト）
+
+        Returns:
+            bool: 注記に置き換えた場合True
         """
-        # <details>タグを使用してマークダウンコンテンツを折りたたみ可能にする
-        output_file.write("<details>\n<summary>Markdown content (click to expand)</summary>\n\n")
+        message = self.generated_detector.check(rel_path, head[:GENERATED_SCAN_BYTES])
+        if message is None:
+            return False
+        if self.codebase_stats is not None:
+            self.codebase_stats.add_unread(rel_path, size)
+        self.renderer.write_notice(output_file, rel_path, NOTICE_GENERATED, message, size)
+        return True
 
-        # マークダウンの内容をコードブロックとして表示
-        output_file.write("```markdown\n")
-        output_file.write(content)
-        output_file.write("\n```\n")
+    def _log_banner_stats(self) -> None:
+        """共通ヘッダーの除去結果をログに出力"""
+        stripped = sum(banner.stripped_files for banner in self._banner_index.banners)
+        removed = sum(banner.bytes_removed for banner in self._banner_index.banners)
+        logger.info(f"Common headers: {len(self._banner_index.banners)} headers stripped from "
+                    f"{stripped} files ({removed} bytes removed)")
+
+    def _snapshot_counters(self) -> Callable[[], None]:
+        """
+        ファイルの処理で更新される集計（統計・伏せ字・コンパクション・生成コード・共通ヘッダー）を保存
+
+        Returns:
+            Callable[[], None]: 保存時の状態に戻す関数（処理したセクションを書き込まない場合に呼ぶ）
+        """
+        stats = copy.deepcopy(self.codebase_stats)
+        redaction_count = len(self.redaction_counts)
+        secret_count = len(self.secret_files)
+        compaction = {lang: list(values) for lang, values in self.compaction_stats.items()}
+        generated = ({kind: len(paths) for kind, paths in self.generated_detector.files.items()}
+                     if self.generated_detector is not None else None)
+        banners = ([(banner.stripped_files, banner.bytes_removed) for banner in self._banner_index.banners]
+                   if self._banner_index is not None else None)
+
+        def restore() -> None:
+            self.codebase_stats = stats
+            for rel_path in list(self.redaction_counts)[redaction_count:]:
+                del self.redaction_counts[rel_path]
+            del self.secret_files[secret_count:]
+            self.compaction_stats = compaction
+            if generated is not None:
+                for kind in list(self.generated_detector.files):
+                    del self.generated_detector.files[kind][generated.get(kind, 0):]
+                    if not self.generated_detector.files[kind]:
+                        del self.generated_detector.files[kind]
+            if banners is not None:
+                for banner, (stripped_files, bytes_removed) in zip(self._banner_index.banners, banners):
+                    banner.stripped_files, banner.bytes_removed = stripped_files, bytes_removed
+
+        return restore
+
+    def _record_redactions(self, rel_path: str, count: int) -> int:
+        """
+        ファイルごとの伏せ字の数を記録
+
+        Args:
+            rel_path (str): ファイルの相対パス
+            count (int): 伏せ字にした箇所の数
+
+        Returns:
+            int: 記録した数
+        """
+        if count:
+            logger.debug(f"Redacted {count} secrets in {rel_path}")
+            self.redaction_counts[rel_path] = count
+        return count
+
+    def _write_secret_file(self, output_file: TextIO, rel_path: str, size: int) -> None:
+        """
+        全体が秘密情報のため出力しないファイルの情報を書き込み
+
+        Args:
+            output_file (TextIO): 出力先のファイルオブジェクト
+            rel_path (str): ファイルの相対パス
+            size (int): ファイルサイズ（バイト）
+        """
+        logger.warning(f"Skipping secret file: {rel_path}")
+        self.secret_files.append(rel_path)
+        self.renderer.write_notice(output_file, rel_path, NOTICE_SECRET, "Content consists of secrets", size)
+
+    def _log_redaction_stats(self) -> None:
+        """伏せ字の件数をログに出力"""
+        total = sum(self.redaction_counts.values())
+        logger.info(f"Redaction: {total} secrets in {len(self.redaction_counts)} files, "
+                    f"{len(self.secret_files)} secret files skipped")
+
+    def _should_outline(self, size: int) -> bool:
+        """
+        ファイルをアウトラインで出力すべきかを判定
+
+        Args:
+            size (int): ファイルサイズ（バイト）
+
+        Returns:
+            bool: アウトラインで出力する場合True
+        """
+        if self.outline:
+            return True
+        return self.outline_above_kb is not None and size / 1024 > self.outline_above_kb
+
+    def _compact_content(self, content: str, lang: str) -> str:
+        """
+        言語に応じてコメント・docstring・空行を除去し、削減量を集計
+
+        Args:
+            content (str): ファイルの内容
+            lang (str): マークダウンでの言語名
+
+        Returns:
+            str: コンパクションされた内容（未対応の言語はそのまま）
+        """
+        compactor = get_compactor(lang)
+        if compactor is None:
+            return content
+
+        compacted = compactor(content)
+        stats = self.compaction_stats.setdefault(lang, [0, 0])
+        stats[0] += utf8_len(content)
+        stats[1] += utf8_len(compacted)
+        return compacted
+
+    def _log_compaction_stats(self) -> None:
+        """言語ごとのコンパクションによる削減量をログに出力"""
+        for lang, (original, compacted) in sorted(self.compaction_stats.items()):
+            reduction = original - compacted
+            ratio = reduction / original * 100 if original else 0.0
+            logger.info(f"Compaction ({lang}): {original} -> {compacted} bytes (-{reduction} bytes, -{ratio:.1f}%)")
+
+    def _build_manifest(
+            self,
+            file_paths: List[str],
+            sections: Dict[str, Dict[str, Any]],
+            snapshot: Manifest,
+            hash_algorithm: str
+    ) -> Manifest:
+        """
+        出力したセクションの情報からマニフェストを作成
+
+        Args:
+            file_paths (List[str]): 収集されたすべてのファイルパス
+            sections (Dict[str, Dict[str, Any]]): ファイルパスから出力セクション情報への辞書
+            snapshot (Manifest): 差分計算時に作成したマニフェスト（存在する場合）
+            hash_algorithm (str): ハッシュアルゴリズム名
+
+        Returns:
+            Manifest: 作成されたマニフェスト
+        """
+        manifest = Manifest(hash_algorithm=hash_algorithm)
+        for file_path in file_paths:
+            section = dict(sections.get(file_path, {}))
+            previous_entry = snapshot.entries.get(file_path) if snapshot is not None else None
+
+            if previous_entry is not None and previous_entry['hash'] is not None:
+                size, mtime_ns, file_hash = previous_entry['size'], previous_entry['mtime_ns'], previous_entry['hash']
+            else:
+                stat = os.stat(file_path)
+                size, mtime_ns = stat.st_size, stat.st_mtime_ns
+                # 読み込まれなかったファイル（スキップ・エラー）のみ個別にハッシュを計算
+                file_hash = section.get('hash') or compute_file_hash(file_path, hash_algorithm)
 
-        # レンダリングされたマークダウンを表示
-        output_file.write("\nRendered markdown:\n\n")
-        output_file.write(content)
-        output_file.write("\n</details>\n")
+            for key in ('size', 'mtime_ns', 'hash'):
+                section.pop(key, None)
+            manifest.add(file_path, size, mtime_ns, file_hash, **section)
+        return manifest
 
     def _write_error_file(self, output_file: TextIO, rel_path: str, error: str) -> None:
         """
@@ -222,5 +1083,4 @@ class DocumentGenerator:
             error (str): エラーメッセージ
         """
         logger.error(f"Error reading file {rel_path}: {error}")
-        output_file.write(f"\n### `{rel_path}`\n\n")
-        output_file.write(f"> ❌ **Error**: Failed to read file: {error}\n\n")
\ No newline at end of file
+        self.renderer.write_notice(output_file, rel_path, NOTICE_ERROR, f"Failed to read file: {error}")
\ No newline at end of file
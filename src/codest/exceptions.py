@@ -16,3 +16,43 @@ class FileCollectionError(CodestError):
 class DocumentGenerationError(CodestError):
     """Raised when there's an error generating the document"""
     pass
+
+
+class ManifestError(CodestError):
+    """Raised when there's an error reading or writing a manifest"""
+    pass
+
+
+class SectionIndexError(CodestError):
+    """Raised when there's an error reading or using a section index"""
+    pass
+
+
+class ClipboardError(CodestError):
+    """Raised when there's an error copying to the clipboard"""
+    pass
+
+
+class GitObjectError(CodestError):
+    """Raised when there's an error reading objects from a git repository"""
+    pass
+
+
+class BatchConfigError(CodestError):
+    """Raised when there's an error reading a batch configuration"""
+    pass
+
+
+class SearchIndexError(CodestError):
+    """Raised when there's an error reading, writing or querying a search index"""
+    pass
+
+
+class ImportGraphError(CodestError):
+    """Raised when there's an error resolving an import graph"""
+    pass
+
+
+class NotebookError(CodestError):
+    """Raised when there's an error parsing a Jupyter notebook"""
+    pass
@@ -0,0 +1,121 @@
+import os
+from typing import BinaryIO, Tuple
+
+# 行数指定時の読み込みチャンクサイズ
+EXCERPT_CHUNK_SIZE = 64 * 1024
+
+
+def _read_head_lines(f: BinaryIO, lines: int, limit: int) -> bytes:
+    """
+    ファイル先頭から指定行数を読み込み
+
+    Args:
+        f (BinaryIO): 対象ファイル
+        lines (int): 読み込む行数
+        limit (int): 読み込む最大バイト位置
+
+    Returns:
+        bytes: 先頭の内容
+    """
+    f.seek(0)
+    data = b''
+    while len(data) < limit and data.count(b'\n') < lines:
+        chunk = f.read(min(EXCERPT_CHUNK_SIZE, limit - len(data)))
+        if not chunk:
+            break
+        data += chunk
+
+    end = -1
+    for _ in range(lines):
+        end = data.find(b'\n', end + 1)
+        if end == -1:
+            return data
+    return data[:end + 1]
+
+
+def _read_tail_lines(f: BinaryIO, lines: int, start_limit: int, size: int) -> bytes:
+    """
+    ファイル末尾から指定行数を読み込み
+
+    Args:
+        f (BinaryIO): 対象ファイル
+        lines (int): 読み込む行数
+        start_limit (int): 読み込みを開始できる最小バイト位置
+        size (int): ファイルサイズ
+
+    Returns:
+        bytes: 末尾の内容
+    """
+    data = b''
+    position = size
+    # 末尾の改行は行区切りとして数えない
+    while position > start_limit and data.rstrip(b'\n').count(b'\n') < lines:
+        read_size = min(EXCERPT_CHUNK_SIZE, position - start_limit)
+        position -= read_size
+        f.seek(position)
+        data = f.read(read_size) + data
+
+    body = data.rstrip(b'\n')
+    start = len(body)
+    for _ in range(lines):
+        start = body.rfind(b'\n', 0, start)
+        if start == -1:
+            return data
+    return data[start + 1:]
+
+
+def _trim_to_lines(head: bytes, tail: bytes, is_whole: bool) -> Tuple[bytes, bytes]:
+    """
+    バイト数指定で切り出した内容を行境界に揃える
+
+    Args:
+        head (bytes): 先頭の内容
+        tail (bytes): 末尾の内容
+        is_whole (bool): 先頭と末尾がファイル全体を覆っているか
+
+    Returns:
+        Tuple[bytes, bytes]: 行境界に揃えた先頭と末尾の内容（改行がない場合はそのまま）
+    """
+    if is_whole:
+        return head, tail
+    head_end = head.rfind(b'\n')
+    if head_end != -1:
+        head = head[:head_end + 1]
+    tail_start = tail.find(b'\n')
+    if tail_start != -1:
+        tail = tail[tail_start + 1:]
+    return head, tail
+
+
+def read_excerpt(file_path: str, head_tail_bytes: int = None, head_tail_lines: int = None) -> Tuple[str, str, int]:
+    """
+    ファイルの先頭と末尾のみをシークして読み込み（ファイル全体は読み込まない）
+
+    Args:
+        file_path (str): 対象ファイルのパス
+        head_tail_bytes (int, optional): 先頭・末尾それぞれの最大バイト数
+        head_tail_lines (int, optional): 先頭・末尾それぞれの最大行数
+
+    Returns:
+        Tuple[str, str, int]: (先頭の内容, 末尾の内容, 省略されたバイト数)
+    """
+    size = os.path.getsize(file_path)
+
+    with open(file_path, 'rb') as f:
+        if head_tail_lines is not None:
+            # 行数指定でも1行が極端に長い場合に備えてバイト数の上限を設ける
+            limit = min(size, head_tail_bytes) if head_tail_bytes is not None else size
+            head = _read_head_lines(f, head_tail_lines, limit)
+            tail_limit = max(len(head), size - limit)
+            tail = _read_tail_lines(f, head_tail_lines, tail_limit, size)
+        else:
+            head = f.read(min(size, head_tail_bytes))
+            tail_start = max(len(head), size - head_tail_bytes)
+            f.seek(tail_start)
+            tail = f.read(size - tail_start)
+            head, tail = _trim_to_lines(head, tail, len(head) + len(tail) >= size)
+
+    omitted = size - len(head) - len(tail)
+    return (head.decode('utf-8', errors='replace'),
+            tail.decode('utf-8', errors='replace'),
+            omitted)
@@ -1,10 +1,15 @@
 import os
+import sys
+import json
+import heapq
+import hashlib
 import logging
-from typing import List, Set
-from .gitignore import GitIgnoreHandler
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+from .dir_snapshot import DirectorySnapshot
+from .gitignore import GitIgnoreHandler, GitIgnoreCache
 from .constants import DEFAULT_IGNORE_PATTERNS, DEFAULT_IGNORE_DIRS, DEFAULT_FILE_EXTENSIONS
 from .exceptions import FileCollectionError
-from .normalize_paths import normalize_paths, is_subdirectory
+from .normalize_paths import normalize_paths, is_subdirectory, path_components
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +21,9 @@ class FileCollector:
             exclude_dirs: List[str] = None,
             ignore_patterns: Set[str] = None,
             ignore_dirs: Set[str] = None,
-            file_extensions: Set[str] = None
+            file_extensions: Set[str] = None,
+            gitignore_cache: GitIgnoreCache = None,
+            dir_snapshot: DirectorySnapshot = None
     ):
         """
         FileCollectorの初期化
@@ -27,6 +34,8 @@ class FileCollector:
             ignore_patterns (Set[str], optional): 無視するパターン
             ignore_dirs (Set[str], optional): 無視するディレクトリ
             file_extensions (Set[str], optional): 収集対象の拡張子
+            gitignore_cache (GitIgnoreCache, optional): 解析済み.gitignoreの共有キャッシュ
+            dir_snapshot (DirectorySnapshot, optional): 変更のないディレクトリの一覧を省くためのスナップショット
 
         Raises:
             FileCollectionError: ディレクトリが存在しない場合
@@ -40,6 +49,7 @@ class FileCollector:
                 raise FileCollectionError(f"Path is not a directory: {directory}")
 
         self.directories = [os.path.abspath(d) for d in directories]
+        self._root_components = {path_components(d): d for d in self.directories}
         self.exclude_dirs = set(os.path.abspath(d) for d in (exclude_dirs or []))
         self.ignore_patterns = ignore_patterns or DEFAULT_IGNORE_PATTERNS
         self.ignore_dirs = ignore_dirs or DEFAULT_IGNORE_DIRS
@@ -49,11 +59,48 @@ class FileCollector:
         self.gitignore_handlers = {}
         for directory in self.directories:
             try:
-                self.gitignore_handlers[directory] = GitIgnoreHandler(directory)
+                if gitignore_cache is not None:
+                    self.gitignore_handlers[directory] = gitignore_cache.get(directory)
+                else:
+                    self.gitignore_handlers[directory] = GitIgnoreHandler(directory)
             except Exception as e:
                 logger.warning(f"Failed to initialize GitIgnoreHandler for {directory}: {e}")
                 self.gitignore_handlers[directory] = GitIgnoreHandler(".")
 
+        self.dir_snapshot = dir_snapshot
+        if dir_snapshot is not None:
+            dir_snapshot.bind(self.filter_config_key())
+
+    def filter_config_key(self) -> str:
+        """
+        走査結果に影響するフィルタ設定（無視パターン・拡張子・除外ディレクトリ・.gitignore）のハッシュ
+
+        Returns:
+            str: ハッシュ
+        """
+        config = [sorted(self.ignore_patterns), sorted(self.ignore_dirs), sorted(self.file_extensions),
+                  sorted(self.exclude_dirs),
+                  {d: sorted(handler.patterns) for d, handler in self.gitignore_handlers.items()}]
+        return hashlib.blake2b(json.dumps(config, sort_keys=True).encode('utf-8', 'surrogateescape'),
+                               digest_size=16).hexdigest()
+
+    def find_base_dir(self, path: str) -> Optional[str]:
+        """
+        パスを含む最も近い収集対象ディレクトリを取得
+
+        Args:
+            path (str): 対象パス
+
+        Returns:
+            Optional[str]: 収集対象ディレクトリ（どの配下にもない場合はNone）
+        """
+        components = path_components(os.path.abspath(path))
+        for i in range(len(components) - 1, 0, -1):
+            base_dir = self._root_components.get(components[:i])
+            if base_dir is not None:
+                return base_dir
+        return None
+
     def should_ignore(self, path: str, base_dir: str) -> bool:
         """指定されたパスを無視すべきかを判定"""
         abs_path = os.path.abspath(path)
@@ -76,15 +123,146 @@ class FileCollector:
 
         return self.gitignore_handlers[base_dir].should_ignore(path)
 
-    def collect_files(self) -> List[str]:
+    def should_collect_member(self, member_path: str, gitignore: GitIgnoreHandler = None) -> bool:
         """
-        ファイルを収集
+        アーカイブ内のメンバーを収集すべきかを判定
+
+        Args:
+            member_path (str): アーカイブ内のパス（'/'区切り）
+            gitignore (GitIgnoreHandler, optional): アーカイブ内の.gitignoreのハンドラ
+
+        Returns:
+            bool: 拡張子・無視ディレクトリ・無視パターン・.gitignoreを通過した場合True
+        """
+        parts = member_path.split('/')
+        if not any(parts[-1].endswith(ext) for ext in self.file_extensions):
+            return False
+
+        if any(part in self.ignore_dirs for part in parts[:-1]):
+            logger.debug(f"Ignoring archive member in ignored directory: {member_path}")
+            return False
+
+        if any(pattern in member_path for pattern in self.ignore_patterns):
+            logger.debug(f"Ignoring archive member due to pattern match: {member_path}")
+            return False
+
+        return gitignore is None or not gitignore.should_ignore(member_path.replace('/', os.sep))
+
+    def _scan_sorted(self, directory: str) -> Iterator[Tuple[str, bool]]:
+        """
+        ディレクトリ直下のエントリを絶対パスの文字列順で取得
+
+        ディレクトリ名の後ろに区切り文字を付けて比較することで、配下のパスを含めた
+        全体の文字列順（sorted()と同じ順序）になる。
+
+        Args:
+            directory (str): 対象ディレクトリ
+
+        Returns:
+            Iterator[Tuple[str, bool]]: (パス, ディレクトリかどうか) のイテレータ
+        """
+        try:
+            with os.scandir(directory) as it:
+                entries = []
+                for entry in it:
+                    is_dir = entry.is_dir()
+                    # os.walkと同様にシンボリックリンクのディレクトリは辿らない
+                    if is_dir and entry.is_symlink():
+                        continue
+                    entries.append((entry.name + os.sep if is_dir else entry.name, entry.path, is_dir))
+        except OSError as e:
+            logger.debug(f"Failed to scan directory {directory}: {e}")
+            return iter(())
+        entries.sort()
+        return iter([(path, is_dir) for _, path, is_dir in entries])
+
+    def _iter_directory(self, directory: str) -> Iterator[str]:
+        """
+        1つの収集対象ディレクトリ配下のファイルを文字列順に列挙
+
+        再帰の代わりにディレクトリごとのイテレータのスタックを使うため、
+        保持するのはディレクトリの深さ分のエントリのみ。
+
+        Args:
+            directory (str): 収集対象ディレクトリ（絶対パス）
+
+        Yields:
+            str: ファイルの絶対パス
+        """
+        logger.info(f"Starting to collect files from: {directory}")
+        logger.debug(f"File extensions to collect: {self.file_extensions}")
+
+        if self.should_ignore(directory, directory):
+            return
+
+        stack = [(directory, self._directory_entries(directory, directory))]
+        while stack:
+            entry = next(stack[-1][1], None)
+            if entry is None:
+                finished, _ = stack.pop()
+                if self.dir_snapshot is not None:
+                    self.dir_snapshot.seal(directory, finished)
+                continue
+
+            path, is_dir = entry
+            if is_dir:
+                logger.debug(f"Scanning directory: {path}")
+                stack.append((path, self._directory_entries(path, directory)))
+            else:
+                logger.debug(f"Found source file: {path}")
+                yield path
+
+        if self.dir_snapshot is not None:
+            self.dir_snapshot.finish(directory)
+
+    def _filter_entries(self, directory: str, base_dir: str) -> Iterator[Tuple[str, bool]]:
+        """
+        ディレクトリ直下のエントリのうち、走査するサブディレクトリと収集対象ファイルを文字列順に取得
+
+        Args:
+            directory (str): 対象ディレクトリ
+            base_dir (str): 収集対象のルートディレクトリ
+
+        Yields:
+            Tuple[str, bool]: (パス, ディレクトリかどうか)
+        """
+        for path, is_dir in self._scan_sorted(directory):
+            if is_dir:
+                if not self.should_ignore(path, base_dir):
+                    yield path, True
+            elif any(path.endswith(ext) for ext in self.file_extensions):
+                if not self.should_ignore(path, base_dir):
+                    yield path, False
+
+    def _directory_entries(self, directory: str, base_dir: str) -> Iterator[Tuple[str, bool]]:
+        """
+        ディレクトリ直下のフィルタ適用後のエントリを取得（スナップショットがあれば変更のない場合は記録から）
+
+        Args:
+            directory (str): 対象ディレクトリ
+            base_dir (str): 収集対象のルートディレクトリ
 
         Returns:
-            List[str]: 重複のない収集されたファイルパスのリスト
+            Iterator[Tuple[str, bool]]: (パス, ディレクトリかどうか) のイテレータ
         """
-        collected_files = set()  # 重複を防ぐためにsetを使用
+        if self.dir_snapshot is None:
+            return self._filter_entries(directory, base_dir)
+        return iter(self.dir_snapshot.listing(
+            base_dir, directory, lambda: list(self._filter_entries(directory, base_dir))))
 
+    def iter_files(self) -> Iterator[str]:
+        """
+        ファイルを文字列順に逐次列挙
+
+        収集対象ディレクトリごとの列挙をマージし、重なり合うディレクトリによる
+        重複は隣接する同じパスを除くことで排除する（全パスの集合は保持しない）。
+
+        Yields:
+            str: 重複のないファイルの絶対パス
+
+        Raises:
+            FileCollectionError: ディレクトリが存在しない場合、または収集に失敗した場合
+        """
         for directory in self.directories:
             if not os.path.exists(directory):
                 raise FileCollectionError(f"Directory not found: {directory}")
@@ -92,24 +270,81 @@ class FileCollector:
             if not os.path.isdir(directory):
                 raise FileCollectionError(f"Path is not a directory: {directory}")
 
-            logger.info(f"Starting to collect files from: {directory}")
-            logger.debug(f"File extensions to collect: {self.file_extensions}")
+        previous = None
+        try:
+            for path in heapq.merge(*(self._iter_directory(d) for d in self.directories)):
+                if path != previous:
+                    yield path
+                    previous = path
+        except OSError as e:
+            raise FileCollectionError(f"Error collecting files: {str(e)}")
 
-            try:
-                for dirpath, dirnames, filenames in os.walk(directory):
-                    logger.debug(f"Scanning directory: {dirpath}")
-                    if self.should_ignore(dirpath, directory):
-                        dirnames.clear()
-                        continue
+    def collect_files(self) -> List[str]:
+        """
+        ファイルを収集
+
+        Returns:
+            List[str]: 重複のない収集されたファイルパスのリスト（文字列順）
+        """
+        return list(self.iter_files())
 
-                    for filename in filenames:
-                        full_path = os.path.abspath(os.path.join(dirpath, filename))
-                        if any(filename.endswith(ext) for ext in self.file_extensions):
-                            if not self.should_ignore(full_path, directory):
-                                logger.debug(f"Found source file: {full_path}")
-                                collected_files.add(full_path)
+    def filter_files(self, paths: Iterable[str]) -> List[str]:
+        """
+        明示的に指定されたファイルリストにフィルタを適用（ディレクトリ走査なし）
 
-            except Exception as e:
-                raise FileCollectionError(f"Error collecting files in {directory}: {str(e)}")
+        Args:
+            paths (Iterable[str]): ファイルパスのリスト（相対パスはカレントディレクトリ基準）
+
+        Returns:
+            List[str]: 拡張子・無視パターンを通過した重複のないファイルパスのリスト
+        """
+        collected_files = set()
+
+        for path in paths:
+            full_path = os.path.abspath(path)
+            filename = os.path.basename(full_path)
+
+            if not any(filename.endswith(ext) for ext in self.file_extensions):
+                continue
+
+            base_dir = self.find_base_dir(full_path)
+            if base_dir is None:
+                logger.warning(f"File is outside of the target directories: {path}")
+                continue
+
+            if not os.path.isfile(full_path):
+                logger.debug(f"Listed file does not exist: {path}")
+                continue
+
+            if not self.should_ignore(full_path, base_dir):
+                logger.debug(f"Found source file: {full_path}")
+                collected_files.add(full_path)
+
+        return sorted(collected_files)
+
+
+def read_file_list(source: str) -> List[str]:
+    """
+    改行またはNUL区切りのファイルリストを読み込み
+
+    Args:
+        source (str): リストファイルのパス（'-'の場合は標準入力）
+
+    Returns:
+        List[str]: ファイルパスのリスト
+
+    Raises:
+        FileCollectionError: リストの読み込みに失敗した場合
+    """
+    try:
+        if source == '-':
+            data = sys.stdin.buffer.read()
+        else:
+            with open(source, 'rb') as f:
+                data = f.read()
+    except OSError as e:
+        raise FileCollectionError(f"Failed to read file list {source}: {str(e)}")
 
-        return sorted(collected_files)
\ No newline at end of file
+    text = os.fsdecode(data)
+    entries = text.split('\0') if '\0' in text else text.splitlines()
+    return [entry for entry in entries if entry.strip()]
@@ -0,0 +1,137 @@
+"""ファイルの先頭部分のみから生成コード・minify済み・ロックファイル等を判定するモジュール"""
+import re
+import logging
+from typing import Dict, List, Optional, Tuple
+from .banners import leading_comment_lines
+
+logger = logging.getLogger(__name__)
+
+# 判定に使う先頭部分のサイズ
+GENERATED_SCAN_BYTES = 4096
+# これより大きいファイルは全体を読み込む前に先頭部分のみを読み込んで判定
+GENERATED_HEAD_READ_BYTES = 64 * 1024
+
+# 判定結果の種類
+KIND_GENERATED = 'generated'
+KIND_MINIFIED = 'minified'
+KIND_LOCKFILE = 'lockfile'
+KIND_DUMP = 'dump'
+
+KIND_LABELS = {
+    KIND_GENERATED: 'Generated file',
+    KIND_MINIFIED: 'Minified file',
+    KIND_LOCKFILE: 'Lock file',
+    KIND_DUMP: 'Database dump',
+}
+
+# minify済みとみなす行の長さと空白の比率
+MINIFIED_MAX_LINE = 1000
+MINIFIED_AVERAGE_LINE = 200
+MINIFIED_WHITESPACE_RATIO = 0.08
+# 短いファイルは行の長さで判定しない
+MINIFIED_MIN_BYTES = 1024
+
+# 文章・マークアップのファイル（見出しや箇条書きがコメントと区別できないため判定しない）
+PROSE_EXTENSIONS = ('.md', '.markdown', '.rst', '.txt', '.adoc')
+
+# 先頭のコメントに含まれる生成コードの目印
+_GENERATED_RE = re.compile(
+    r'@generated\b'
+    r'|\bcode generated\b.*\bdo not edit\b'
+    r'|\bgenerated\b.*\bdo not (?:edit|modify)\b'
+    r'|\bdo not (?:edit|modify)\b.*\bgenerated\b'
+    r'|\b(?:this|the) (?:file|code) (?:is|was|has been) (?:auto-?|automatically )?generated\b'
+    r'|\bauto-?generated (?:file|code|by)\b'
+    r'|\bautomatically generated by\b'
+    r'|\bgenerated by (?:the protocol buffer compiler|protoc|openapi|swagger|thrift|flatc|antlr|cython|bison)',
+    re.IGNORECASE)
+_LOCKFILE_RE = re.compile(
+    r'"lockfileVersion"\s*:|^lockfileVersion:|^# yarn lockfile|This file locks the dependencies',
+    re.MULTILINE)
+_DUMP_RE = re.compile(
+    r'^-- (?:MySQL dump|MariaDB dump|PostgreSQL database dump)|^PRAGMA foreign_keys=OFF;\s*BEGIN TRANSACTION;',
+    re.MULTILINE)
+
+
+def is_prose(path: str) -> bool:
+    """パスが文章・マークアップのファイルかどうか"""
+    return path.lower().endswith(PROSE_EXTENSIONS)
+
+
+def classify_head(head: bytes) -> Optional[Tuple[str, str]]:
+    """
+    ファイルの先頭部分から生成コード等を判定
+
+    生成コードの目印はファイル先頭のコメント（shebang行の後、最初のコード行の前）からのみ探す。
+
+    Args:
+        head (bytes): ファイルの先頭GENERATED_SCAN_BYTESバイト程度
+
+    Returns:
+        Optional[Tuple[str, str]]: (種類, 判定理由)。通常のファイルはNone
+    """
+    text = head.decode('utf-8', errors='replace').replace('\r\n', '\n')
+
+    for line in leading_comment_lines(text)[1]:
+        stripped = line.strip()
+        if _GENERATED_RE.search(stripped):
+            return KIND_GENERATED, f"marker `{stripped[:120]}`"
+
+    match = _LOCKFILE_RE.search(text)
+    if match:
+        return KIND_LOCKFILE, f"marker `{match.group(0).strip()}`"
+    match = _DUMP_RE.search(text)
+    if match:
+        return KIND_DUMP, f"marker `{match.group(0).splitlines()[0]}`"
+
+    if len(head) >= MINIFIED_MIN_BYTES:
+        all_lines = head.split(b'\n')
+        if len(all_lines) > 1 and len(head) >= GENERATED_SCAN_BYTES:
+            # 先頭部分の末尾で切れた行は長さの判定から除く
+            all_lines = all_lines[:-1]
+        longest = max(len(line) for line in all_lines)
+        average = sum(len(line) for line in all_lines) / len(all_lines)
+        whitespace = sum(head.count(c) for c in (b' ', b'\t', b'\n', b'\r')) / len(head)
+        if (longest >= MINIFIED_MAX_LINE or average >= MINIFIED_AVERAGE_LINE) \
+                and whitespace < MINIFIED_WHITESPACE_RATIO:
+            return KIND_MINIFIED, f"longest line {longest} bytes, {whitespace:.0%} whitespace"
+    return None
+
+
+class GeneratedFileDetector:
+    def __init__(self):
+        """生成コード等の判定と、種類ごとの判定したファイルの記録"""
+        # 種類 -> 相対パス
+        self.files: Dict[str, List[str]] = {}
+
+    def check(self, rel_path: str, head: bytes) -> Optional[str]:
+        """
+        ファイルを判定し、生成コード等であれば記録（文章・マークアップのファイルは判定しない）
+
+        Args:
+            rel_path (str): ファイルの相対パス
+            head (bytes): ファイルの先頭部分
+
+        Returns:
+            Optional[str]: 出力する1行の注記（通常のファイルはNone）
+        """
+        if is_prose(rel_path):
+            return None
+        result = classify_head(head)
+        if result is None:
+            return None
+        kind, reason = result
+        logger.debug(f"Skipping {kind} file: {rel_path} ({reason})")
+        self.files.setdefault(kind, []).append(rel_path)
+        return f"{KIND_LABELS[kind]} ({reason})"
+
+    def summary(self) -> str:
+        """
+        種類ごとの件数の要約
+
+        Returns:
+            str: 例: "3 files skipped (generated: 2, minified: 1)"
+        """
+        total = sum(len(paths) for paths in self.files.values())
+        counts = ', '.join(f"{kind}: {len(paths)}" for kind, paths in sorted(self.files.items()))
+        return f"{total} files skipped ({counts})" if total else "0 files skipped"
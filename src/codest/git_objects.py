@@ -0,0 +1,739 @@
+"""作業ツリーを使わずにgitのオブジェクトストアからリビジョンを読み込むモジュール"""
+import os
+import re
+import glob
+import zlib
+import struct
+import logging
+from collections import OrderedDict
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+from .archive import ArchiveMember
+from .exceptions import GitObjectError
+from .file_collector import FileCollector
+from .gitignore import GitIgnoreHandler, parse_gitignore_lines
+
+logger = logging.getLogger(__name__)
+
+# パックファイル内のオブジェクト種別
+OBJ_COMMIT = 1
+OBJ_TREE = 2
+OBJ_BLOB = 3
+OBJ_TAG = 4
+OBJ_OFS_DELTA = 6
+OBJ_REF_DELTA = 7
+
+_TYPE_NAMES = {OBJ_COMMIT: 'commit', OBJ_TREE: 'tree', OBJ_BLOB: 'blob', OBJ_TAG: 'tag'}
+
+# ツリーエントリのモード
+MODE_TREE = '40000'
+_BLOB_MODES = {'100644', '100755', '100664'}
+
+# 差分の基底オブジェクトのキャッシュ（エントリ数とキャッシュするオブジェクトの最大サイズ）
+DELTA_CACHE_ENTRIES = 256
+DELTA_CACHE_MAX_OBJECT_BYTES = 1024 * 1024
+
+_INFLATE_CHUNK_SIZE = 64 * 1024
+_HEX_RE = re.compile(r'^[0-9a-fA-F]{4,40}$')
+_ANCESTRY_RE = re.compile(r'([~^])(\d*)')
+_REVISION_RE = re.compile(r'^(.*?)((?:[~^]\d*)*)$')
+
+
+def find_git_dir(path: str) -> Tuple[str, str]:
+    """
+    パスを含む作業ツリーのルートとgitディレクトリを取得
+
+    Args:
+        path (str): 作業ツリー内のパス
+
+    Returns:
+        Tuple[str, str]: (作業ツリーのルート, gitディレクトリ)
+
+    Raises:
+        GitObjectError: gitリポジトリ内でない場合
+    """
+    current = os.path.abspath(path)
+    while True:
+        candidate = os.path.join(current, '.git')
+        if os.path.isdir(candidate):
+            return current, candidate
+        if os.path.isfile(candidate):
+            # worktree・サブモジュールでは.gitファイルがgitディレクトリを指す
+            with open(candidate, 'r', encoding='utf-8') as f:
+                content = f.read().strip()
+            if content.startswith('gitdir:'):
+                git_dir = content[len('gitdir:'):].strip()
+                return current, os.path.normpath(os.path.join(current, git_dir))
+        parent = os.path.dirname(current)
+        if parent == current:
+            raise GitObjectError(f"Not a git repository: {path}")
+        current = parent
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """
+    差分ヘッダーの可変長整数（リトルエンディアン）を読み込み
+
+    Args:
+        data (bytes): 差分データ
+        pos (int): 読み込み開始位置
+
+    Returns:
+        Tuple[int, int]: (値, 次の位置)
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, pos
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """
+    基底オブジェクトに差分を適用
+
+    Args:
+        base (bytes): 基底オブジェクトの内容
+        delta (bytes): 差分データ
+
+    Returns:
+        bytes: 適用後の内容
+
+    Raises:
+        GitObjectError: 差分が不正な場合
+    """
+    source_size, pos = _read_varint(delta, 0)
+    target_size, pos = _read_varint(delta, pos)
+    if source_size != len(base):
+        raise GitObjectError("Delta base size mismatch")
+
+    result = bytearray()
+    while pos < len(delta):
+        opcode = delta[pos]
+        pos += 1
+        if opcode & 0x80:
+            # 基底オブジェクトからのコピー
+            offset = 0
+            size = 0
+            for i in range(4):
+                if opcode & (1 << i):
+                    offset |= delta[pos] << (8 * i)
+                    pos += 1
+            for i in range(3):
+                if opcode & (0x10 << i):
+                    size |= delta[pos] << (8 * i)
+                    pos += 1
+            result += base[offset:offset + (size or 0x10000)]
+        elif opcode:
+            # 差分データからの挿入
+            result += delta[pos:pos + opcode]
+            pos += opcode
+        else:
+            raise GitObjectError("Invalid delta opcode")
+
+    if len(result) != target_size:
+        raise GitObjectError("Delta result size mismatch")
+    return bytes(result)
+
+
+def _inflate(f: BinaryIO, offset: int, max_length: int = 0) -> bytes:
+    """
+    ファイルの指定位置からzlibストリームを展開
+
+    Args:
+        f (BinaryIO): 対象ファイル
+        offset (int): zlibストリームの開始位置
+        max_length (int, optional): 展開する最大バイト数（0は全体）
+
+    Returns:
+        bytes: 展開された内容
+    """
+    f.seek(offset)
+    decompressor = zlib.decompressobj()
+    chunks = []
+    length = 0
+    while not decompressor.eof:
+        data = decompressor.unconsumed_tail or f.read(_INFLATE_CHUNK_SIZE)
+        if not data:
+            break
+        chunk = decompressor.decompress(data, max_length - length if max_length else 0)
+        chunks.append(chunk)
+        length += len(chunk)
+        if max_length and length >= max_length:
+            break
+    return b''.join(chunks)
+
+
+class PackFile:
+    def __init__(self, index_path: str):
+        """
+        パックファイルとそのインデックス（version 2）
+
+        Args:
+            index_path (str): .idxファイルのパス
+
+        Raises:
+            GitObjectError: インデックスの形式が不正な場合
+        """
+        with open(index_path, 'rb') as f:
+            self._index = f.read()
+        if self._index[:4] != b'\xfftOc' or struct.unpack_from('>I', self._index, 4)[0] != 2:
+            raise GitObjectError(f"Unsupported pack index format: {index_path}")
+
+        self._fanout = struct.unpack_from('>256I', self._index, 8)
+        self.count = self._fanout[255]
+        self._names_offset = 8 + 256 * 4
+        self._offsets_offset = self._names_offset + self.count * (20 + 4)
+        self._large_offsets_offset = self._offsets_offset + self.count * 4
+        self.pack_path = index_path[:-len('.idx')] + '.pack'
+        self._file: Optional[BinaryIO] = None
+
+    def _name_at(self, i: int) -> bytes:
+        start = self._names_offset + i * 20
+        return self._index[start:start + 20]
+
+    def _lower_bound(self, name: bytes) -> int:
+        """ソート済みのオブジェクト名から name 以上となる最初の位置を二分探索"""
+        first = name[0]
+        lo = self._fanout[first - 1] if first else 0
+        hi = self._fanout[first]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._name_at(mid) < name:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def find(self, sha: bytes) -> Optional[int]:
+        """
+        オブジェクトのパック内の位置を取得
+
+        Args:
+            sha (bytes): オブジェクト名（20バイト）
+
+        Returns:
+            Optional[int]: パックファイル内のオフセット（含まれない場合はNone）
+        """
+        i = self._lower_bound(sha)
+        if i >= self.count or self._name_at(i) != sha:
+            return None
+        offset = struct.unpack_from('>I', self._index, self._offsets_offset + i * 4)[0]
+        if offset & 0x80000000:
+            # 2GBを超える位置は64ビットオフセット表を参照
+            large_index = offset & 0x7fffffff
+            offset = struct.unpack_from('>Q', self._index, self._large_offsets_offset + large_index * 8)[0]
+        return offset
+
+    def names_with_prefix(self, prefix: str) -> List[str]:
+        """
+        指定された16進数の接頭辞で始まるオブジェクト名を取得
+
+        Args:
+            prefix (str): 16進数の接頭辞
+
+        Returns:
+            List[str]: 一致したオブジェクト名（16進数）
+        """
+        padded = bytes.fromhex(prefix + '0' * (40 - len(prefix)))
+        matches = []
+        i = self._lower_bound(padded)
+        while i < self.count:
+            name = self._name_at(i).hex()
+            if not name.startswith(prefix):
+                break
+            matches.append(name)
+            i += 1
+        return matches
+
+    def read_header(self, offset: int) -> Tuple[int, int, object, int]:
+        """
+        パック内のオブジェクトのヘッダーを読み込み
+
+        Args:
+            offset (int): オブジェクトの位置
+
+        Returns:
+            Tuple[int, int, object, int]: (種別, サイズ, 差分の基底（位置または名前）, データの開始位置)
+        """
+        f = self._open()
+        f.seek(offset)
+        header = f.read(32)
+        byte = header[0]
+        obj_type = (byte >> 4) & 0x7
+        size = byte & 0x0f
+        shift = 4
+        pos = 1
+        while byte & 0x80:
+            byte = header[pos]
+            pos += 1
+            size |= (byte & 0x7f) << shift
+            shift += 7
+
+        base = None
+        if obj_type == OBJ_OFS_DELTA:
+            byte = header[pos]
+            pos += 1
+            distance = byte & 0x7f
+            while byte & 0x80:
+                byte = header[pos]
+                pos += 1
+                distance = ((distance + 1) << 7) | (byte & 0x7f)
+            base = offset - distance
+        elif obj_type == OBJ_REF_DELTA:
+            base = header[pos:pos + 20]
+            pos += 20
+        return obj_type, size, base, offset + pos
+
+    def inflate(self, data_offset: int, max_length: int = 0) -> bytes:
+        """
+        オブジェクトのデータを展開
+
+        Args:
+            data_offset (int): データの開始位置
+            max_length (int, optional): 展開する最大バイト数（0は全体）
+
+        Returns:
+            bytes: 展開された内容
+        """
+        return _inflate(self._open(), data_offset, max_length)
+
+    def _open(self) -> BinaryIO:
+        if self._file is None:
+            self._file = open(self.pack_path, 'rb')
+        return self._file
+
+    def close(self) -> None:
+        """パックファイルを閉じる"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class GitRepository:
+    def __init__(self, git_dir: str):
+        """
+        gitのオブジェクトストア（ルーズオブジェクトとパックファイル）の読み取り
+
+        Args:
+            git_dir (str): gitディレクトリのパス
+        """
+        self.git_dir = git_dir
+        # worktreeではrefs・objectsは共通ディレクトリにある
+        commondir_path = os.path.join(git_dir, 'commondir')
+        if os.path.isfile(commondir_path):
+            with open(commondir_path, 'r', encoding='utf-8') as f:
+                self.common_dir = os.path.normpath(os.path.join(git_dir, f.read().strip()))
+        else:
+            self.common_dir = git_dir
+
+        self._object_dirs = [os.path.join(self.common_dir, 'objects')]
+        alternates_path = os.path.join(self._object_dirs[0], 'info', 'alternates')
+        if os.path.isfile(alternates_path):
+            with open(alternates_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith('#'):
+                        self._object_dirs.append(os.path.join(self._object_dirs[0], line))
+
+        self._packs: Optional[List[PackFile]] = None
+        self._packed_refs: Optional[Dict[str, str]] = None
+        self._delta_cache: 'OrderedDict[Tuple[str, int], Tuple[int, bytes]]' = OrderedDict()
+
+    @property
+    def packs(self) -> List[PackFile]:
+        """パックファイルの一覧（初回アクセス時に読み込み）"""
+        if self._packs is None:
+            self._packs = [PackFile(path) for object_dir in self._object_dirs
+                           for path in sorted(glob.glob(os.path.join(object_dir, 'pack', '*.idx')))]
+        return self._packs
+
+    def close(self) -> None:
+        """開いているパックファイルを閉じる"""
+        for pack in self._packs or []:
+            pack.close()
+
+    def _loose_path(self, sha: str) -> Optional[str]:
+        for object_dir in self._object_dirs:
+            path = os.path.join(object_dir, sha[:2], sha[2:])
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def _find_packed(self, sha: str) -> Optional[Tuple[PackFile, int]]:
+        binary = bytes.fromhex(sha)
+        for pack in self.packs:
+            offset = pack.find(binary)
+            if offset is not None:
+                return pack, offset
+        return None
+
+    def _read_ref_file(self, ref: str) -> Optional[str]:
+        """ルーズな参照ファイル、またはpacked-refsから参照の値を読み込み"""
+        for base_dir in (self.git_dir, self.common_dir):
+            path = os.path.join(base_dir, ref)
+            if os.path.isfile(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    return f.read().strip()
+
+        if self._packed_refs is None:
+            self._packed_refs = {}
+            packed_refs_path = os.path.join(self.common_dir, 'packed-refs')
+            if os.path.isfile(packed_refs_path):
+                with open(packed_refs_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if line.startswith(('#', '^')):
+                            continue
+                        parts = line.split()
+                        if len(parts) == 2:
+                            self._packed_refs[parts[1]] = parts[0]
+        return self._packed_refs.get(ref)
+
+    def _resolve_ref(self, name: str, depth: int = 0) -> Optional[str]:
+        """参照名をgitと同じ順序で探索してオブジェクト名を取得（シンボリック参照は辿る）"""
+        if depth > 5:
+            raise GitObjectError(f"Too many levels of symbolic refs: {name}")
+        for ref in (name, f'refs/{name}', f'refs/tags/{name}', f'refs/heads/{name}',
+                    f'refs/remotes/{name}', f'refs/remotes/{name}/HEAD'):
+            value = self._read_ref_file(ref)
+            if value is None:
+                continue
+            if value.startswith('ref:'):
+                return self._resolve_ref(value[len('ref:'):].strip(), depth + 1)
+            return value
+        return None
+
+    def _expand_abbreviated(self, prefix: str) -> Optional[str]:
+        """短縮されたオブジェクト名を完全な名前に展開"""
+        matches = set()
+        for object_dir in self._object_dirs:
+            loose_dir = os.path.join(object_dir, prefix[:2])
+            if os.path.isdir(loose_dir):
+                matches.update(prefix[:2] + name for name in os.listdir(loose_dir)
+                               if (prefix[:2] + name).startswith(prefix))
+        for pack in self.packs:
+            matches.update(pack.names_with_prefix(prefix))
+        if len(matches) > 1:
+            raise GitObjectError(f"Ambiguous revision: {prefix}")
+        return matches.pop() if matches else None
+
+    def resolve(self, rev: str) -> str:
+        """
+        リビジョン（ブランチ・タグ・HEAD・オブジェクト名、および`~N`・`^N`の祖先指定）をオブジェクト名に解決
+
+        Args:
+            rev (str): リビジョン
+
+        Returns:
+            str: オブジェクト名（40桁の16進数）
+
+        Raises:
+            GitObjectError: リビジョンが見つからない場合
+        """
+        name, suffix = _REVISION_RE.match(rev).groups()
+        sha = self._resolve_ref(name)
+        if sha is None and _HEX_RE.match(name):
+            sha = name.lower() if len(name) == 40 else self._expand_abbreviated(name.lower())
+        if sha is None:
+            raise GitObjectError(f"Unknown revision: {rev}")
+
+        for operator, count in _ANCESTRY_RE.findall(suffix):
+            count = int(count) if count else 1
+            if operator == '~':
+                for _ in range(count):
+                    sha = self._parent(sha, 1, rev)
+            elif count:
+                sha = self._parent(sha, count, rev)
+        return sha
+
+    def _parent(self, sha: str, number: int, rev: str) -> str:
+        """コミット（タグの場合は参照先）のnumber番目の親を取得"""
+        obj_type, data = self.read_object(sha)
+        while obj_type == 'tag':
+            sha = data.split(b'\n', 1)[0].split(b' ', 1)[1].decode('ascii')
+            obj_type, data = self.read_object(sha)
+        parents = [line[len(b'parent '):].decode('ascii')
+                   for line in data.split(b'\n\n', 1)[0].split(b'\n') if line.startswith(b'parent ')]
+        if obj_type != 'commit' or len(parents) < number:
+            raise GitObjectError(f"Unknown revision: {rev}")
+        return parents[number - 1]
+
+    def _read_packed(self, pack: PackFile, offset: int) -> Tuple[int, bytes]:
+        """
+        パック内のオブジェクトを読み込み、差分の連鎖を解決
+
+        Returns:
+            Tuple[int, bytes]: (種別, 内容)
+        """
+        chain: List[Tuple[PackFile, int, int]] = []
+        base_key: Optional[Tuple[str, int]] = (pack.pack_path, offset)
+        while True:
+            cached = self._delta_cache.get(base_key)
+            if cached is not None:
+                self._delta_cache.move_to_end(base_key)
+                obj_type, data = cached
+                break
+
+            obj_type, _, base, data_offset = pack.read_header(offset)
+            if obj_type == OBJ_OFS_DELTA:
+                chain.append((pack, offset, data_offset))
+                offset = base
+            elif obj_type == OBJ_REF_DELTA:
+                chain.append((pack, offset, data_offset))
+                location = self._find_packed(base.hex())
+                if location is None:
+                    obj_type, data = self._read_loose(base.hex())
+                    base_key = None
+                    break
+                pack, offset = location
+            else:
+                data = pack.inflate(data_offset)
+                break
+            base_key = (pack.pack_path, offset)
+
+        # 基底から順に差分を適用（再帰を使わないため長い差分の連鎖でも安全）
+        if chain and base_key is not None:
+            self._cache_object(base_key, obj_type, data)
+        for delta_pack, delta_offset, data_offset in reversed(chain):
+            data = apply_delta(data, delta_pack.inflate(data_offset))
+            self._cache_object((delta_pack.pack_path, delta_offset), obj_type, data)
+        return obj_type, data
+
+    def _cache_object(self, key: Tuple[str, int], obj_type: int, data: bytes) -> None:
+        if len(data) > DELTA_CACHE_MAX_OBJECT_BYTES:
+            return
+        self._delta_cache[key] = (obj_type, data)
+        if len(self._delta_cache) > DELTA_CACHE_ENTRIES:
+            self._delta_cache.popitem(last=False)
+
+    def _read_loose(self, sha: str) -> Tuple[int, bytes]:
+        """
+        ルーズオブジェクトを読み込み
+
+        Returns:
+            Tuple[int, bytes]: (種別, 内容)
+        """
+        path = self._loose_path(sha)
+        if path is None:
+            raise GitObjectError(f"Object not found: {sha}")
+        with open(path, 'rb') as f:
+            raw = zlib.decompress(f.read())
+        header, _, data = raw.partition(b'\0')
+        type_name = header.split(b' ', 1)[0].decode('ascii')
+        types = {name: obj_type for obj_type, name in _TYPE_NAMES.items()}
+        return types[type_name], data
+
+    def read_object(self, sha: str) -> Tuple[str, bytes]:
+        """
+        オブジェクトを読み込み
+
+        Args:
+            sha (str): オブジェクト名（40桁の16進数）
+
+        Returns:
+            Tuple[str, bytes]: (種別名, 内容)
+
+        Raises:
+            GitObjectError: オブジェクトが見つからない、または破損している場合
+        """
+        try:
+            location = self._find_packed(sha)
+            if location is not None:
+                obj_type, data = self._read_packed(*location)
+            else:
+                obj_type, data = self._read_loose(sha)
+        except (OSError, zlib.error, IndexError, KeyError) as e:
+            raise GitObjectError(f"Failed to read object {sha}: {str(e)}")
+        return _TYPE_NAMES[obj_type], data
+
+    def object_size(self, sha: str) -> int:
+        """
+        オブジェクト全体を展開せずにヘッダーからサイズを取得
+
+        Args:
+            sha (str): オブジェクト名（40桁の16進数）
+
+        Returns:
+            int: 内容のバイト数
+
+        Raises:
+            GitObjectError: オブジェクトが見つからない、または破損している場合
+        """
+        try:
+            location = self._find_packed(sha)
+            if location is not None:
+                pack, offset = location
+                obj_type, size, _, data_offset = pack.read_header(offset)
+                if obj_type not in (OBJ_OFS_DELTA, OBJ_REF_DELTA):
+                    return size
+                # 差分の場合は差分ヘッダーに記録された適用後のサイズを使用
+                delta_header = pack.inflate(data_offset, max_length=20)
+                _, pos = _read_varint(delta_header, 0)
+                return _read_varint(delta_header, pos)[0]
+
+            path = self._loose_path(sha)
+            if path is None:
+                raise GitObjectError(f"Object not found: {sha}")
+            with open(path, 'rb') as f:
+                header = _inflate(f, 0, max_length=64).split(b'\0', 1)[0]
+            return int(header.split(b' ', 1)[1])
+        except (OSError, zlib.error, IndexError, ValueError) as e:
+            raise GitObjectError(f"Failed to read object {sha}: {str(e)}")
+
+    def peel_to_tree(self, sha: str) -> Tuple[str, int]:
+        """
+        タグ・コミットを辿ってツリーを取得
+
+        Args:
+            sha (str): タグ・コミット・ツリーのオブジェクト名
+
+        Returns:
+            Tuple[str, int]: (ツリーのオブジェクト名, コミット時刻（ツリーを直接指定した場合は0）)
+
+        Raises:
+            GitObjectError: ツリーに到達できない場合
+        """
+        commit_time = 0
+        for _ in range(16):
+            obj_type, data = self.read_object(sha)
+            if obj_type == 'tree':
+                return sha, commit_time
+            if obj_type == 'tag':
+                sha = data.split(b'\n', 1)[0].split(b' ', 1)[1].decode('ascii')
+            elif obj_type == 'commit':
+                for line in data.split(b'\n\n', 1)[0].split(b'\n'):
+                    if line.startswith(b'committer '):
+                        commit_time = int(line.rsplit(b' ', 2)[1])
+                tree_line = data.split(b'\n', 1)[0]
+                sha = tree_line.split(b' ', 1)[1].decode('ascii')
+            else:
+                break
+        raise GitObjectError(f"Revision does not point to a tree: {sha}")
+
+
+def parse_tree(data: bytes) -> Iterator[Tuple[str, str, str]]:
+    """
+    ツリーオブジェクトのエントリを列挙
+
+    Args:
+        data (bytes): ツリーオブジェクトの内容
+
+    Yields:
+        Tuple[str, str, str]: (モード, 名前, オブジェクト名)
+    """
+    pos = 0
+    while pos < len(data):
+        space = data.index(b' ', pos)
+        nul = data.index(b'\0', space)
+        mode = data[pos:space].decode('ascii')
+        name = data[space + 1:nul].decode('utf-8', errors='surrogateescape')
+        yield mode, name, data[nul + 1:nul + 21].hex()
+        pos = nul + 21
+
+
+class GitRevision:
+    def __init__(self, path: str, rev: str):
+        """
+        作業ツリーをチェックアウトせずにリビジョンのファイルを読み込む
+
+        Args:
+            path (str): リポジトリ内のパス
+            rev (str): リビジョン（ブランチ・タグ・コミット）
+
+        Raises:
+            GitObjectError: リポジトリ・リビジョンが見つからない場合
+        """
+        self.worktree, git_dir = find_git_dir(path)
+        self.repository = GitRepository(git_dir)
+        self.rev = rev
+        self.commit = self.repository.resolve(rev)
+        self.tree, self.commit_time = self.repository.peel_to_tree(self.commit)
+
+    def _repo_relative(self, path: str) -> str:
+        rel_path = os.path.relpath(os.path.abspath(path), self.worktree)
+        if rel_path == os.pardir or rel_path.startswith(os.pardir + os.sep):
+            raise GitObjectError(f"Path is outside of the repository {self.worktree}: {path}")
+        return '' if rel_path == os.curdir else rel_path.replace(os.sep, '/')
+
+    def _find_subtree(self, path: str) -> Optional[str]:
+        """リビジョンのルートツリーから指定ディレクトリのツリーを取得"""
+        tree = self.tree
+        for part in filter(None, path.split('/')):
+            entries = {name: (mode, sha) for mode, name, sha in parse_tree(self.repository.read_object(tree)[1])}
+            mode, sha = entries.get(part, (None, None))
+            if mode != MODE_TREE:
+                return None
+            tree = sha
+        return tree
+
+    def _load_gitignore(self) -> Optional[GitIgnoreHandler]:
+        """リビジョンのルートの.gitignoreを読み込み"""
+        for mode, name, sha in parse_tree(self.repository.read_object(self.tree)[1]):
+            if name == '.gitignore' and mode in _BLOB_MODES:
+                lines = self.repository.read_object(sha)[1].decode('utf-8', errors='replace').splitlines()
+                return GitIgnoreHandler('.', parse_gitignore_lines(lines))
+        return None
+
+    def list_files(self, directories: List[str], collector: FileCollector
+                   ) -> List[Tuple[str, ArchiveMember, str]]:
+        """
+        指定ディレクトリ配下のファイルをツリーから列挙（ブロブの内容は読まない）
+
+        作業ツリーは参照せず、.gitignoreはリビジョンのツリー内のものを使う。そのため
+        ディレクトリは作業ツリーに存在しなくてもよい。
+
+        Args:
+            directories (List[str]): 収集対象のディレクトリ（作業ツリー上のパス）
+            collector (FileCollector): 拡張子・無視ディレクトリ・無視パターン・除外ディレクトリの判定に使用するコレクタ
+                （作業ツリーの.gitignoreは使わない）
+
+        Returns:
+            List[Tuple[str, ArchiveMember, str]]:
+                (作業ツリー上の絶対パス, ファイル情報, ブロブのオブジェクト名) のパス順のリスト
+        """
+        gitignore = self._load_gitignore()
+        excluded = {self._repo_relative(d) for d in collector.exclude_dirs
+                    if not os.path.relpath(d, self.worktree).startswith(os.pardir)}
+
+        files = {}
+        for directory in directories:
+            prefix = self._repo_relative(directory)
+            tree = self._find_subtree(prefix)
+            if tree is None:
+                logger.warning(f"Directory not found in {self.rev}: {directory}")
+                continue
+
+            stack = [(prefix, tree)]
+            while stack:
+                tree_path, tree_sha = stack.pop()
+                for mode, name, sha in parse_tree(self.repository.read_object(tree_sha)[1]):
+                    path = f"{tree_path}/{name}" if tree_path else name
+                    if mode == MODE_TREE:
+                        if name not in collector.ignore_dirs and path not in excluded:
+                            stack.append((path, sha))
+                    elif mode in _BLOB_MODES and path not in files:
+                        # シンボリックリンク・サブモジュールは対象外
+                        if collector.should_collect_member(path, gitignore):
+                            member = ArchiveMember(path, self.repository.object_size(sha), self.commit_time)
+                            files[path] = (os.path.join(self.worktree, *path.split('/')), member, sha)
+
+        return [files[path] for path in sorted(files)]
+
+    def read_blob(self, sha: str) -> bytes:
+        """
+        ブロブの内容を読み込み
+
+        Args:
+            sha (str): ブロブのオブジェクト名
+
+        Returns:
+            bytes: 内容
+        """
+        return self.repository.read_object(sha)[1]
+
+    def close(self) -> None:
+        """リポジトリのファイルを閉じる"""
+        self.repository.close()
@@ -1,22 +1,45 @@
 import os
 import fnmatch
 import logging
-from typing import Set
+import threading
+from typing import Dict, Iterable, Optional, Set, Tuple
 from .exceptions import GitIgnoreError
 
 logger = logging.getLogger(__name__)
 
 
+def parse_gitignore_lines(lines: Iterable[str]) -> Set[str]:
+    """
+    .gitignoreの各行を無視パターンに変換
+
+    Args:
+        lines (Iterable[str]): .gitignoreの行
+
+    Returns:
+        Set[str]: 無視パターンのセット
+    """
+    patterns = set()
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            # パターンの正規化
+            if line.startswith('/'):
+                line = line[1:]
+            patterns.add(line)
+    return patterns
+
+
 class GitIgnoreHandler:
-    def __init__(self, root_dir: str):
+    def __init__(self, root_dir: str, patterns: Set[str] = None):
         """
         GitIgnoreHandlerの初期化
 
         Args:
             root_dir (str): プロジェクトのルートディレクトリ
+            patterns (Set[str], optional): 無視パターン（省略時はroot_dirの.gitignoreを読み込む）
         """
         self.root_dir = root_dir
-        self.patterns = self._parse_gitignore()
+        self.patterns = patterns if patterns is not None else self._parse_gitignore()
 
     def _parse_gitignore(self) -> Set[str]:
         """
@@ -28,22 +51,15 @@ class GitIgnoreHandler:
         Raises:
             GitIgnoreError: .gitignoreの解析に失敗した場合
         """
-        patterns = set()
         gitignore_path = os.path.join(self.root_dir, '.gitignore')
 
         if not os.path.exists(gitignore_path):
             logger.debug("No .gitignore file found")
-            return patterns
+            return set()
 
         try:
             with open(gitignore_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        # パターンの正規化
-                        if line.startswith('/'):
-                            line = line[1:]
-                        patterns.add(line)
+                patterns = parse_gitignore_lines(f)
 
             logger.debug(f"Loaded {len(patterns)} patterns from .gitignore")
             return patterns
@@ -91,4 +107,49 @@ class GitIgnoreHandler:
                     logger.debug(f"Ignoring file due to basename pattern '{pattern}': {path}")
                     return True
 
-        return False
\ No newline at end of file
+        return False
+
+class GitIgnoreCache:
+    def __init__(self):
+        """
+        ディレクトリごとの解析済み.gitignoreのキャッシュ（複数の生成処理・スレッドで共有）
+
+        .gitignoreの更新時刻が変わった場合は再解析し、そのディレクトリのエントリを置き換える。
+        """
+        # ルートディレクトリ -> (.gitignoreの更新時刻, ハンドラ)
+        self._handlers: Dict[str, Tuple[Optional[int], GitIgnoreHandler]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, root_dir: str) -> GitIgnoreHandler:
+        """
+        ディレクトリのGitIgnoreHandlerを取得
+
+        Args:
+            root_dir (str): プロジェクトのルートディレクトリ
+
+        Returns:
+            GitIgnoreHandler: 解析済みのハンドラ
+        """
+        try:
+            mtime_ns = os.stat(os.path.join(root_dir, '.gitignore')).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        key = os.path.abspath(root_dir)
+
+        with self._lock:
+            entry = self._handlers.get(key)
+            if entry is not None and entry[0] == mtime_ns:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        handler = GitIgnoreHandler(root_dir)
+        with self._lock:
+            entry = self._handlers.get(key)
+            # 解析中に他のスレッドが同じ更新時刻で登録していればそちらを使う
+            if entry is not None and entry[0] == mtime_ns:
+                return entry[1]
+            self._handlers[key] = (mtime_ns, handler)
+            return handler
@@ -0,0 +1,460 @@
+"""エントリファイルからimportを辿って到達可能なファイルを選択するモジュール"""
+import os
+import re
+import ast
+import json
+import hashlib
+import logging
+from typing import Dict, Iterable, List, Optional, Set
+from .cache_lock import cache_file_lock
+from .exceptions import ImportGraphError
+
+logger = logging.getLogger(__name__)
+
+# 言語ごとの拡張子
+PYTHON_EXTENSIONS = ('.py', '.pyi')
+JS_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs')
+GO_EXTENSIONS = ('.go',)
+SWIFT_EXTENSIONS = ('.swift',)
+
+# JS/TSのimport・export from・require・動的import
+_JS_IMPORT_RE = re.compile(
+    r'''(?:\bimport\s+(?:[\w*{}\s,$]+\s+from\s+)?|\bexport\s+[\w*{}\s,$]+\s+from\s+|'''
+    r'''\brequire\s*\(\s*|\bimport\s*\(\s*)["']([^"'\n]+)["']''')
+# Goの単一のimportとimportブロック
+_GO_IMPORT_RE = re.compile(r'^\s*import\s+(?:[\w.]+\s+)?"([^"]+)"', re.MULTILINE)
+_GO_IMPORT_BLOCK_RE = re.compile(r'^\s*import\s*\(([^)]*)\)', re.MULTILINE)
+_GO_BLOCK_ENTRY_RE = re.compile(r'^\s*(?:[\w.]+\s+)?"([^"]+)"', re.MULTILINE)
+_GO_MODULE_RE = re.compile(r'^\s*module\s+(\S+)', re.MULTILINE)
+# Swiftのモジュールimport（import struct Foo.Bar等の種類指定を含む）
+_SWIFT_IMPORT_RE = re.compile(
+    r'^\s*(?:@\w+(?:\([^)]*\))?\s+)*import\s+(?:(?:typealias|struct|class|enum|protocol|let|var|func)\s+)?'
+    r'(\w+)', re.MULTILINE)
+
+
+def default_import_cache_path() -> str:
+    """
+    既定のimportキャッシュのパスを取得（$XDG_CACHE_HOME/codest/imports.json）
+
+    Returns:
+        str: キャッシュファイルのパス
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'codest', 'imports.json')
+
+
+def parse_python_imports(content: str) -> List[list]:
+    """
+    Pythonのimport文を抽出
+
+    Args:
+        content (str): ソースコード
+
+    Returns:
+        List[list]: [モジュール名, 相対importのレベル, from importの名前のリスト] のリスト
+    """
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return []
+    refs = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            refs.extend([alias.name, 0, []] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            refs.append([node.module or '', node.level, [alias.name for alias in node.names]])
+    return refs
+
+
+def parse_js_imports(content: str) -> List[str]:
+    """JS/TSのimport・require・export fromの指定子を抽出"""
+    return _JS_IMPORT_RE.findall(content)
+
+
+def parse_go_imports(content: str) -> List[str]:
+    """Goのimportパスを抽出"""
+    refs = _GO_IMPORT_RE.findall(content)
+    for block in _GO_IMPORT_BLOCK_RE.findall(content):
+        refs.extend(_GO_BLOCK_ENTRY_RE.findall(block))
+    return refs
+
+
+def parse_swift_imports(content: str) -> List[str]:
+    """Swiftのimportするモジュール名を抽出"""
+    return _SWIFT_IMPORT_RE.findall(content)
+
+
+def parse_imports(path: str, content: str) -> list:
+    """
+    拡張子に応じてimportを抽出
+
+    Args:
+        path (str): ファイルパス
+        content (str): ソースコード
+
+    Returns:
+        list: 言語ごとのimportの参照（未対応の言語は空）
+    """
+    if path.endswith(PYTHON_EXTENSIONS):
+        return parse_python_imports(content)
+    if path.endswith(JS_EXTENSIONS):
+        return parse_js_imports(content)
+    if path.endswith(GO_EXTENSIONS):
+        return parse_go_imports(content)
+    if path.endswith(SWIFT_EXTENSIONS):
+        return parse_swift_imports(content)
+    return []
+
+
+class ImportCache:
+    VERSION = 1
+
+    def __init__(self, path: str = None):
+        """
+        内容のハッシュをキーとする解析済みimportの永続キャッシュ
+
+        Args:
+            path (str, optional): キャッシュファイルのパス（省略時は保存しない）
+        """
+        self.path = path
+        self.entries: Dict[str, list] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        if path:
+            self.entries = self._load()
+
+    def _load(self) -> Dict[str, list]:
+        """キャッシュファイルのエントリを読み込み（存在しない・壊れている場合は空）"""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict) and data.get('version') == self.VERSION:
+                return data.get('entries', {})
+        except (OSError, ValueError) as e:
+            # キャッシュが壊れていても再解析すればよいため警告のみ
+            logger.warning(f"Ignoring unreadable import cache {self.path}: {str(e)}")
+        return {}
+
+    def get_or_parse(self, path: str, data: bytes) -> list:
+        """
+        キャッシュ済みのimportを取得し、なければ解析してキャッシュ
+
+        Args:
+            path (str): ファイルパス（言語の判定に使用）
+            data (bytes): ファイル内容
+
+        Returns:
+            list: importの参照
+        """
+        ext = os.path.splitext(path)[1].lower()
+        key = f"{ext}:{hashlib.blake2b(data, digest_size=16).hexdigest()}"
+        refs = self.entries.get(key)
+        if refs is not None:
+            self.hits += 1
+            return refs
+        self.misses += 1
+        refs = parse_imports(path, data.decode('utf-8', errors='replace'))
+        self.entries[key] = refs
+        self._dirty = True
+        return refs
+
+    def save(self) -> None:
+        """
+        変更があればキャッシュファイルを書き込み（失敗しても生成は続行）
+
+        並行して同じファイルを使う他のジョブ・プロセスの記録を落とさないよう、
+        ロックした上で保存済みのエントリを読み直してマージする。
+        """
+        if not self.path or not self._dirty:
+            return
+        try:
+            with cache_file_lock(self.path):
+                entries = self._load()
+                entries.update(self.entries)
+                self.entries = entries
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                temp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'version': self.VERSION, 'entries': self.entries}, f, separators=(',', ':'))
+                os.replace(temp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Failed to write import cache {self.path}: {str(e)}")
+
+
+class ImportGraph:
+    def __init__(self, file_paths: Iterable[str], cache: ImportCache = None):
+        """
+        収集対象ファイル間のimportの依存関係
+
+        Args:
+            file_paths (Iterable[str]): 収集対象ファイルの絶対パス（importはこの中でのみ解決）
+            cache (ImportCache, optional): 解析済みimportのキャッシュ
+        """
+        self.files = sorted(set(file_paths))
+        self._file_set = set(self.files)
+        self.cache = cache or ImportCache()
+        # Pythonのモジュール名（パッケージの外側のディレクトリからのドット区切り） -> ファイル
+        self._python_modules: Dict[str, List[str]] = {}
+        # パッケージに属さない単独のモジュール（スクリプト） -> sys.pathのルート
+        self._python_scripts: Dict[str, str] = {}
+        # 2階層以上のパスの末尾から作ったモジュール名 -> ファイル（名前空間パッケージ等の補完用）
+        self._python_suffixes: Dict[str, List[str]] = {}
+        # ディレクトリ -> 直下のファイル
+        self._directory_files: Dict[str, List[str]] = {}
+        # ディレクトリ名 -> ディレクトリ（Swiftのモジュール解決用）
+        self._directory_names: Dict[str, List[str]] = {}
+        self._go_modules: Dict[str, Optional[tuple]] = {}
+        self._swift_sources: Dict[str, List[str]] = {}
+        self._edges: Dict[str, List[str]] = {}
+
+        for file_path in self.files:
+            directory = os.path.dirname(file_path)
+            self._directory_files.setdefault(directory, []).append(file_path)
+            if file_path.endswith(PYTHON_EXTENSIONS):
+                self._register_python_module(file_path)
+        for directory in self._directory_files:
+            # ファイルを直接含まないSourcesの中間ディレクトリも対象とする
+            while directory and directory != os.path.dirname(directory):
+                names = self._directory_names.setdefault(os.path.basename(directory), [])
+                if directory in names:
+                    break
+                names.append(directory)
+                directory = os.path.dirname(directory)
+
+    def _register_python_module(self, file_path: str) -> None:
+        """Pythonファイルをモジュール名で登録"""
+        parts = os.path.splitext(file_path)[0].split(os.sep)[1:]
+        is_package = parts[-1] == '__init__'
+        if is_package:
+            parts = parts[:-1]
+
+        root, depth = self._python_root(file_path)
+        length = depth if is_package else depth + 1
+        if length:
+            self._python_modules.setdefault('.'.join(parts[-length:]), []).append(file_path)
+        if depth == 0:
+            self._python_scripts[file_path] = root
+        for i in range(len(parts) - 1):
+            self._python_suffixes.setdefault('.'.join(parts[i:]), []).append(file_path)
+
+    def _python_root(self, file_path: str) -> tuple:
+        """
+        __init__.pyを持つディレクトリを遡り、その外側をsys.pathのルートとみなす
+
+        Returns:
+            tuple: (ルートディレクトリ, ルートからのパッケージの階層数)
+        """
+        depth = 0
+        directory = os.path.dirname(file_path)
+        while os.path.join(directory, '__init__.py') in self._file_set and directory != os.path.dirname(directory):
+            depth += 1
+            directory = os.path.dirname(directory)
+        return directory, depth
+
+    def _find_python_module(self, module: str, importer: str) -> Optional[str]:
+        """モジュール名に対応するファイルを取得"""
+        candidates = self._python_modules.get(module, [])
+        if any(c in self._python_scripts for c in candidates):
+            # 単独のモジュールは同じルートからのみimportできる（標準ライブラリ名との衝突を避ける）
+            importer_root = self._python_root(importer)[0]
+            candidates = [c for c in candidates
+                          if c not in self._python_scripts or self._python_scripts[c] == importer_root]
+        resolved = self._closest(candidates, importer)
+        if resolved is None and '.' in module:
+            resolved = self._closest(self._python_suffixes.get(module, []), importer)
+        return resolved
+
+    def _closest(self, candidates: List[str], importer: str) -> Optional[str]:
+        """importするファイルに最も近い（共通の親ディレクトリが最も深い）候補を選択"""
+        candidates = [c for c in candidates if c != importer]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda c: (len(os.path.commonpath([c, importer])), -len(c), c))
+
+    def _resolve_python(self, importer: str, ref: list) -> List[str]:
+        module, level, names = ref
+        if level:
+            # 相対importはファイルのパッケージから遡ったディレクトリを基準に解決
+            base = os.path.dirname(importer)
+            for _ in range(level - 1):
+                base = os.path.dirname(base)
+            base_path = os.path.join(base, *module.split('.')) if module else base
+            candidates = [base_path + ext for ext in PYTHON_EXTENSIONS] if module else []
+            candidates.append(os.path.join(base_path, '__init__.py'))
+            targets = []
+            for candidate in candidates:
+                if candidate in self._file_set and candidate != importer:
+                    targets.append(candidate)
+                    break
+            for name in names:
+                sub_path = os.path.join(base_path, name)
+                for candidate in (sub_path + '.py', os.path.join(sub_path, '__init__.py')):
+                    if candidate in self._file_set:
+                        targets.append(candidate)
+                        break
+            return targets
+
+        targets = []
+        resolved = self._find_python_module(module, importer)
+        if resolved:
+            targets.append(resolved)
+        else:
+            # import a.b.c で a.b.c が見つからない場合は最も長い親パッケージに解決
+            parts = module.split('.')
+            for i in range(len(parts) - 1, 0, -1):
+                resolved = self._find_python_module('.'.join(parts[:i]), importer)
+                if resolved:
+                    targets.append(resolved)
+                    break
+        for name in names:
+            # from a.b import c の c がサブモジュールの場合
+            submodule = self._find_python_module(f"{module}.{name}", importer)
+            if submodule:
+                targets.append(submodule)
+        return targets
+
+    def _resolve_js(self, importer: str, spec: str) -> List[str]:
+        # パッケージ（node_modules）は対象外
+        if not spec.startswith('.'):
+            return []
+        base = os.path.normpath(os.path.join(os.path.dirname(importer), *spec.split('/')))
+        candidates = [base] + [base + ext for ext in JS_EXTENSIONS]
+        # TypeScriptでは.jsの指定子で.tsを指す場合がある
+        stem, ext = os.path.splitext(base)
+        if ext in ('.js', '.jsx', '.mjs', '.cjs'):
+            candidates += [stem + ts_ext for ts_ext in ('.ts', '.tsx')]
+        candidates += [os.path.join(base, 'index' + ext) for ext in JS_EXTENSIONS]
+        for candidate in candidates:
+            if candidate in self._file_set:
+                return [candidate]
+        return []
+
+    def _go_module(self, directory: str) -> Optional[tuple]:
+        """ディレクトリから上位に遡ってgo.modを探し、(モジュールパス, go.modのディレクトリ) を取得"""
+        if directory in self._go_modules:
+            return self._go_modules[directory]
+        result = None
+        go_mod = os.path.join(directory, 'go.mod')
+        if os.path.isfile(go_mod):
+            try:
+                with open(go_mod, 'r', encoding='utf-8') as f:
+                    match = _GO_MODULE_RE.search(f.read())
+                if match:
+                    result = (match.group(1), directory)
+            except OSError:
+                pass
+        elif os.path.dirname(directory) != directory:
+            result = self._go_module(os.path.dirname(directory))
+        self._go_modules[directory] = result
+        return result
+
+    def _resolve_go(self, importer: str, import_path: str) -> List[str]:
+        module = self._go_module(os.path.dirname(importer))
+        if module is None:
+            return []
+        module_path, module_dir = module
+        if import_path != module_path and not import_path.startswith(module_path + '/'):
+            return []
+        rel = import_path[len(module_path):].lstrip('/')
+        directory = os.path.join(module_dir, *rel.split('/')) if rel else module_dir
+        return [f for f in self._directory_files.get(directory, [])
+                if f.endswith('.go') and not f.endswith('_test.go')]
+
+    def _resolve_swift(self, importer: str, module: str) -> List[str]:
+        # SwiftPMのSources/<Module>等、モジュール名と同名のディレクトリ配下のSwiftファイル
+        directory = self._closest(self._directory_names.get(module, []), importer)
+        if directory is None:
+            return []
+        if directory not in self._swift_sources:
+            prefix = directory + os.sep
+            self._swift_sources[directory] = [f for f in self.files if f.startswith(prefix) and f.endswith('.swift')]
+        return self._swift_sources[directory]
+
+    def dependencies(self, file_path: str) -> List[str]:
+        """
+        ファイルがimportしている収集対象ファイルを取得
+
+        Args:
+            file_path (str): ファイルの絶対パス
+
+        Returns:
+            List[str]: 依存先のファイル（重複なし、出現順）
+        """
+        edges = self._edges.get(file_path)
+        if edges is not None:
+            return edges
+
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            logger.warning(f"Failed to read {file_path}: {str(e)}")
+            data = b''
+        refs = self.cache.get_or_parse(file_path, data)
+
+        if file_path.endswith(PYTHON_EXTENSIONS):
+            resolve = self._resolve_python
+        elif file_path.endswith(JS_EXTENSIONS):
+            resolve = self._resolve_js
+        elif file_path.endswith(GO_EXTENSIONS):
+            resolve = self._resolve_go
+        elif file_path.endswith(SWIFT_EXTENSIONS):
+            resolve = self._resolve_swift
+        else:
+            resolve = None
+
+        edges = []
+        seen = {file_path}
+        for ref in refs if resolve else []:
+            for target in resolve(file_path, ref):
+                if target not in seen:
+                    seen.add(target)
+                    edges.append(target)
+        self._edges[file_path] = edges
+        return edges
+
+    def closure(self, entry_files: List[str]) -> List[str]:
+        """
+        エントリファイルから到達可能なファイルを依存先が先になる順序で取得
+
+        循環importがある場合は、循環内で先に訪れたファイルの依存先を優先する。
+
+        Args:
+            entry_files (List[str]): エントリファイルの絶対パス
+
+        Returns:
+            List[str]: 到達可能なファイル（依存先が先）
+
+        Raises:
+            ImportGraphError: エントリファイルが収集対象に含まれない場合
+        """
+        for entry in entry_files:
+            if entry not in self._file_set:
+                raise ImportGraphError(f"Entry file is not a collected source file: {entry}")
+
+        ordered: List[str] = []
+        visited: Set[str] = set()
+        for entry in entry_files:
+            if entry in visited:
+                continue
+            visited.add(entry)
+            # 再帰の代わりに (ファイル, 依存先のイテレータ) のスタックで後行順に並べる
+            stack = [(entry, iter(self.dependencies(entry)))]
+            while stack:
+                file_path, dependencies = stack[-1]
+                for dependency in dependencies:
+                    if dependency not in visited:
+                        visited.add(dependency)
+                        stack.append((dependency, iter(self.dependencies(dependency))))
+                        break
+                else:
+                    stack.pop()
+                    ordered.append(file_path)
+
+        logger.info(f"Import closure: {len(ordered)} of {len(self.files)} files reachable "
+                    f"(import cache: {self.cache.hits} hits, {self.cache.misses} misses)")
+        return ordered
@@ -0,0 +1,197 @@
+import os
+import json
+import hashlib
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from .exceptions import ManifestError
+
+logger = logging.getLogger(__name__)
+
+# ハッシュ計算時の読み込みチャンクサイズ
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def compute_file_hash(file_path: str, algorithm: str = 'sha256') -> str:
+    """
+    ファイル内容のハッシュを計算
+
+    Args:
+        file_path (str): 対象ファイルのパス
+        algorithm (str, optional): ハッシュアルゴリズム名
+
+    Returns:
+        str: 16進数表現のハッシュ値
+    """
+    hasher = hashlib.new(algorithm)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class ManifestDiff:
+    def __init__(self, added: List[str], modified: List[str], deleted: List[str]):
+        """
+        マニフェスト間の差分
+
+        Args:
+            added (List[str]): 追加されたファイルパス
+            modified (List[str]): 変更されたファイルパス
+            deleted (List[str]): 削除されたファイルパス
+        """
+        self.added = added
+        self.modified = modified
+        self.deleted = deleted
+
+    @property
+    def changed(self) -> List[str]:
+        """追加または変更されたファイルパス（ソート済み）"""
+        return sorted(self.added + self.modified)
+
+
+class Manifest:
+    VERSION = 1
+
+    def __init__(self, entries: Dict[str, dict] = None, hash_algorithm: str = 'sha256'):
+        """
+        Manifestの初期化
+
+        Args:
+            entries (Dict[str, dict], optional): ファイルパスからエントリ（size, mtime_ns, hash）への辞書
+            hash_algorithm (str, optional): ハッシュアルゴリズム名
+        """
+        self.entries = entries or {}
+        self.hash_algorithm = hash_algorithm
+
+    @classmethod
+    def load(cls, manifest_path: str) -> 'Manifest':
+        """
+        マニフェストファイルを読み込み
+
+        Args:
+            manifest_path (str): マニフェストファイルのパス
+
+        Returns:
+            Manifest: 読み込まれたマニフェスト
+
+        Raises:
+            ManifestError: 読み込みまたは解析に失敗した場合
+        """
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ManifestError(f"Failed to load manifest {manifest_path}: {str(e)}")
+
+        if not isinstance(data, dict) or data.get('version') != cls.VERSION:
+            raise ManifestError(f"Unsupported manifest format: {manifest_path}")
+
+        entries = {entry['path']: entry for entry in data.get('files', [])}
+        logger.debug(f"Loaded {len(entries)} entries from manifest: {manifest_path}")
+        return cls(entries, data.get('hash_algorithm', 'sha256'))
+
+    @classmethod
+    def build(cls, file_paths: Iterable[str], previous: 'Manifest' = None,
+              hash_algorithm: str = 'sha256') -> 'Manifest':
+        """
+        ファイルリストからマニフェストを作成
+
+        前回のマニフェストとサイズ・更新時刻が一致するファイルはハッシュを再利用する。
+        追加されたファイル・サイズが変わったファイルは内容を読まずに変更と判定し、ハッシュは
+        None（出力時に読み込んだ内容から計算する）とする。更新時刻のみ変わったファイルは内容が同じ可能性が
+        あるため、内容を読み込んでハッシュを計算する。
+
+        Args:
+            file_paths (Iterable[str]): 対象ファイルのパス
+            previous (Manifest, optional): 前回のマニフェスト
+            hash_algorithm (str, optional): ハッシュアルゴリズム名
+
+        Returns:
+            Manifest: 作成されたマニフェスト
+        """
+        if previous is not None:
+            hash_algorithm = previous.hash_algorithm
+
+        manifest = cls(hash_algorithm=hash_algorithm)
+        hashed = 0
+        for file_path in file_paths:
+            stat = os.stat(file_path)
+            old_entry = previous.entries.get(file_path) if previous is not None else None
+            if (old_entry is not None
+                    and old_entry.get('size') == stat.st_size
+                    and old_entry.get('mtime_ns') == stat.st_mtime_ns):
+                file_hash = old_entry['hash']
+            elif previous is not None and (old_entry is None or old_entry.get('size') != stat.st_size):
+                file_hash = None
+            else:
+                file_hash = compute_file_hash(file_path, hash_algorithm)
+                hashed += 1
+            manifest.add(file_path, stat.st_size, stat.st_mtime_ns, file_hash)
+
+        logger.debug(f"Hashed {hashed} of {len(manifest.entries)} files for manifest")
+        return manifest
+
+    def add(self, file_path: str, size: int, mtime_ns: int, file_hash: str, **extra) -> None:
+        """
+        エントリを追加
+
+        Args:
+            file_path (str): ファイルの絶対パス
+            size (int): ファイルサイズ（バイト）
+            mtime_ns (int): 更新時刻（ナノ秒）
+            file_hash (str): 内容のハッシュ値（未計算の場合はNone）
+            **extra: 追加で記録する値
+        """
+        entry = {'path': file_path, 'size': size, 'mtime_ns': mtime_ns, 'hash': file_hash}
+        entry.update(extra)
+        self.entries[file_path] = entry
+
+    def diff(self, previous: 'Manifest') -> ManifestDiff:
+        """
+        前回のマニフェストとの差分を計算
+
+        Args:
+            previous (Manifest): 前回のマニフェスト
+
+        Returns:
+            ManifestDiff: 追加・変更・削除されたファイル
+        """
+        added, modified = [], []
+        for file_path, entry in self.entries.items():
+            old_entry = previous.entries.get(file_path)
+            if old_entry is None:
+                added.append(file_path)
+            elif entry['hash'] is None or old_entry.get('hash') != entry['hash']:
+                modified.append(file_path)
+
+        deleted = [p for p in previous.entries if p not in self.entries]
+        return ManifestDiff(sorted(added), sorted(modified), sorted(deleted))
+
+    def save(self, manifest_path: str, extra: Optional[dict] = None) -> None:
+        """
+        マニフェストファイルを書き込み
+
+        Args:
+            manifest_path (str): マニフェストファイルのパス
+            extra (dict, optional): トップレベルに追加で記録する値
+
+        Raises:
+            ManifestError: 書き込みに失敗した場合
+        """
+        data = {
+            'version': self.VERSION,
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'hash_algorithm': self.hash_algorithm,
+        }
+        if extra:
+            data.update(extra)
+        data['files'] = [self.entries[p] for p in sorted(self.entries)]
+
+        try:
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            raise ManifestError(f"Failed to write manifest {manifest_path}: {str(e)}")
+
+        logger.info(f"Manifest written to: {manifest_path}")
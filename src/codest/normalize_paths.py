@@ -1,16 +1,34 @@
 import logging
 import os
-from typing import List, Union
+from typing import Iterable, List, Tuple, Union
 
 PathLike = Union[str, bytes, os.PathLike]
 
 logger = logging.getLogger(__name__)
 
 
+def path_components(path: str) -> Tuple[str, ...]:
+    """
+    絶対パスをコンポーネントのタプルに分解
+
+    Args:
+        path (str): 正規化済みの絶対パス
+
+    Returns:
+        Tuple[str, ...]: パスコンポーネントのタプル（ドライブ/ルートを先頭要素に含む）
+    """
+    drive, rest = os.path.splitdrive(path)
+    parts = [part for part in rest.split(os.sep) if part]
+    return (drive,) + tuple(parts)
+
+
 def normalize_paths(directories: List[PathLike]) -> List[str]:
     """
     ディレクトリパスを正規化し、重複と包含関係を排除
 
+    パスをコンポーネント単位でソートし、直前に採用した親パスとの
+    プレフィックス比較だけで包含関係を判定する（O(n log n)）。
+
     Args:
         directories (List[PathLike]): ディレクトリパスのリスト
 
@@ -18,63 +36,69 @@ def normalize_paths(directories: List[PathLike]) -> List[str]:
         List[str]: 正規化され重複が排除されたパスのリスト
     """
     # すべてのパスを絶対パスに変換
-    abs_paths = set()  # 重複を自動的に排除するためにsetを使用
+    abs_paths = {}  # コンポーネントタプル -> 絶対パス
     cwd = os.getcwd()
 
     # カレントディレクトリのフラグ
     has_current_dir = False
 
     for path in directories:
-        path_str = str(path)
+        path_str = os.fsdecode(path) if isinstance(path, bytes) else str(path)
 
         # カレントディレクトリの特別処理
         if path_str == '.':
             has_current_dir = True
-            abs_paths.add(cwd)
-            continue
-
-        # 相対パスを絶対パスに変換（単純な結合のみ）
-        if not os.path.isabs(path_str):
-            abs_path = os.path.abspath(os.path.join(cwd, path_str))
+            abs_path = cwd
         else:
-            abs_path = path_str
+            abs_path = os.path.abspath(os.path.join(cwd, path_str))
 
-        abs_paths.add(abs_path)
+        abs_paths.setdefault(path_components(abs_path), abs_path)
 
-    # リストに変換
-    unique_paths = list(abs_paths)
+    cwd_components = path_components(cwd)
 
-    # 親子関係のチェックと排除
+    # コンポーネント順にソートすると、親パスは常にその子孫より先に現れる
     result = []
-    for path1 in sorted(unique_paths, key=len, reverse=True):  # 長いパスから処理
-        # カレントディレクトリは常に残す
-        if path1 == cwd and has_current_dir:
-            result.append(path1)
+    anchor = None  # 現在の親候補（このパス配下は子として排除する）
+    for components in sorted(abs_paths):
+        # カレントディレクトリは常に残し、その直下のパスも別パスとして扱う
+        if has_current_dir and components == cwd_components:
+            result.append(abs_paths[components])
             continue
 
-        # path1が他のパスの子ディレクトリでない場合、または
-        # 親がカレントディレクトリの場合は追加
-        is_child = False
-        for path2 in unique_paths:
-            if path1 != path2:
-                try:
-                    rel_path = os.path.relpath(path1, path2)
-                    # カレントディレクトリが指定されている場合は、
-                    # カレントディレクトリの直下のパスは別パスとして扱う
-                    if path2 == cwd and has_current_dir:
-                        continue
-                    # 相対パスが'..'で始まらず、かつ'.'でもない場合は子ディレクトリ
-                    if not rel_path.startswith('..') and rel_path != '.':
-                        is_child = True
-                        break
-                except ValueError:
-                    # 異なるドライブの場合などはスキップ
-                    continue
-        if not is_child:
-            result.append(path1)
+        if anchor is not None and components[:len(anchor)] == anchor:
+            continue
+
+        anchor = components
+        result.append(abs_paths[components])
 
     # 結果を長さでソート（一貫性のため）
-    return sorted(result, key=len)
+    return sorted(result, key=lambda p: (len(p), p))
+
+
+def find_paths_outside(paths: Iterable[PathLike], roots: Iterable[PathLike]) -> List[str]:
+    """
+    どのルートディレクトリの配下にもないパスを抽出
+
+    ルートをコンポーネントタプルの集合として保持し、各パスの祖先のみを
+    参照するため、パス数×ルート数の総当たり比較を行わない。
+
+    Args:
+        paths (Iterable[PathLike]): チェックするパスのリスト
+        roots (Iterable[PathLike]): ルートディレクトリのリスト
+
+    Returns:
+        List[str]: いずれのルートのサブディレクトリでもないパスのリスト
+    """
+    root_set = {path_components(os.path.abspath(os.fsdecode(r))) for r in roots}
+
+    outside = []
+    for path in paths:
+        path_str = os.fsdecode(path)
+        components = path_components(os.path.abspath(path_str))
+        # 自分自身を除く祖先のいずれかがルートであればサブディレクトリ
+        if not any(components[:i] in root_set for i in range(1, len(components))):
+            outside.append(path_str)
+    return outside
 
 
 def is_subdirectory(parent: PathLike, child: PathLike) -> bool:
@@ -101,4 +125,4 @@ def is_subdirectory(parent: PathLike, child: PathLike) -> bool:
         # 相対パスが'..'で始まらず、かつパスが同一でない場合のみTrue
         return not rel_path.startswith('..') and rel_path != '.'
     except (ValueError, OSError):
-        return False
\ No newline at end of file
+        return False
@@ -0,0 +1,133 @@
+"""Jupyterノートブック（.ipynb）からコードとマークダウンのセルのみを抽出するモジュール"""
+import json
+import logging
+from typing import Any, Dict, List, Tuple
+from .exceptions import NotebookError
+
+logger = logging.getLogger(__name__)
+
+NOTEBOOK_EXTENSION = '.ipynb'
+# 抽出後の内容にサイズ上限を適用するため、元のファイルはこのサイズまで読み込む
+NOTEBOOK_MAX_BYTES = 64 * 1024 * 1024
+
+# セルの出力の扱い
+OUTPUTS_NONE = 'none'
+OUTPUTS_TRUNCATE = 'truncate'
+OUTPUTS_FULL = 'full'
+NOTEBOOK_OUTPUT_MODES = (OUTPUTS_NONE, OUTPUTS_TRUNCATE, OUTPUTS_FULL)
+DEFAULT_OUTPUT_LINES = 20
+
+# カーネルの言語 -> 1行コメントの記号（未登録の言語は'#'）
+_COMMENT_PREFIXES = {
+    'c++': '//', 'cpp': '//', 'c': '//', 'java': '//', 'javascript': '//', 'typescript': '//',
+    'scala': '//', 'kotlin': '//', 'go': '//', 'rust': '//', 'csharp': '//', 'c#': '//', 'swift': '//',
+    'sql': '--', 'haskell': '--', 'lua': '--',
+}
+
+
+def is_notebook(path: str) -> bool:
+    """パスがノートブックかどうか"""
+    return path.lower().endswith(NOTEBOOK_EXTENSION)
+
+
+def _text(value: Any) -> str:
+    """ノートブックの複数行テキスト（文字列または文字列のリスト）を結合"""
+    if isinstance(value, list):
+        return ''.join(str(part) for part in value)
+    return value if isinstance(value, str) else ''
+
+
+def _notebook_language(notebook: Dict[str, Any]) -> str:
+    """メタデータからカーネルの言語を取得（不明な場合はpython）"""
+    metadata = notebook.get('metadata') or {}
+    language = ((metadata.get('kernelspec') or {}).get('language')
+                or (metadata.get('language_info') or {}).get('name') or 'python')
+    return str(language).lower()
+
+
+def _output_lines(outputs: List[Dict[str, Any]]) -> List[str]:
+    """
+    セルの出力をテキストの行に変換（画像等のテキスト以外の出力は種類のみ）
+
+    Args:
+        outputs (List[Dict[str, Any]]): セルの出力
+
+    Returns:
+        List[str]: 出力の行
+    """
+    lines: List[str] = []
+    for output in outputs:
+        if not isinstance(output, dict):
+            continue
+        output_type = output.get('output_type')
+        if output_type == 'stream':
+            lines.extend(_text(output.get('text')).splitlines())
+        elif output_type == 'error':
+            lines.append(f"{output.get('ename', 'Error')}: {output.get('evalue', '')}")
+        elif output_type in ('execute_result', 'display_data', 'pyout', 'display'):
+            data = output.get('data') or output
+            if 'text/plain' in data or 'text' in data:
+                lines.extend(_text(data.get('text/plain', data.get('text'))).splitlines())
+            for mime_type in data:
+                if mime_type not in ('text/plain', 'text', 'metadata', 'output_type', 'execution_count',
+                                     'prompt_number'):
+                    lines.append(f"[{mime_type} output omitted]")
+    return lines
+
+
+def extract_notebook(data: bytes, outputs: str = OUTPUTS_NONE,
+                     output_lines: int = DEFAULT_OUTPUT_LINES) -> Tuple[str, str]:
+    """
+    ノートブックのJSONからコードとマークダウンのセルを順に抽出
+
+    percent形式（`# %%`区切り）で出力し、マークダウンのセルはコメントとする。
+    セルの出力は既定で出力せず、base64の画像等は含めない。
+
+    Args:
+        data (bytes): ノートブックの内容
+        outputs (str, optional): セルの出力の扱い（none, truncate, full）
+        output_lines (int, optional): truncate時にセルごとに出力する最大行数
+
+    Returns:
+        Tuple[str, str]: (抽出した内容, カーネルの言語)
+
+    Raises:
+        NotebookError: ノートブックとして解析できない場合
+    """
+    try:
+        notebook = json.loads(data)
+    except ValueError as e:
+        raise NotebookError(f"Invalid notebook JSON: {str(e)}")
+    if not isinstance(notebook, dict):
+        raise NotebookError("Notebook must be a JSON object")
+
+    cells = notebook.get('cells')
+    if cells is None:
+        # nbformat 3以前はワークシートごとにセルを持つ
+        cells = [cell for sheet in notebook.get('worksheets') or [] for cell in sheet.get('cells') or []]
+    if not isinstance(cells, list):
+        raise NotebookError("Notebook cells must be a list")
+
+    language = _notebook_language(notebook)
+    comment = _COMMENT_PREFIXES.get(language, '#')
+    parts: List[str] = []
+    for cell in cells:
+        if not isinstance(cell, dict):
+            continue
+        cell_type = cell.get('cell_type')
+        source = _text(cell.get('source', cell.get('input'))).rstrip('\n')
+        if cell_type == 'code':
+            parts.append(f"{comment} %%\n{source}" if source else f"{comment} %%")
+            if outputs != OUTPUTS_NONE:
+                lines = _output_lines(cell.get('outputs') or [])
+                if outputs == OUTPUTS_TRUNCATE and len(lines) > output_lines:
+                    omitted = len(lines) - output_lines
+                    lines = lines[:output_lines] + [f"... {omitted} more lines"]
+                if lines:
+                    parts.append('\n'.join([f"{comment} Output:"] + [f"{comment} {line}".rstrip()
+                                                                     for line in lines]))
+        elif cell_type in ('markdown', 'raw', 'heading'):
+            marker = 'raw' if cell_type == 'raw' else 'markdown'
+            lines = [f"{comment} {line}".rstrip() for line in source.split('\n')] if source else []
+            parts.append('\n'.join([f"{comment} %% [{marker}]"] + lines))
+    return '\n\n'.join(parts) + '\n' if parts else '', language
@@ -0,0 +1,382 @@
+"""ソースコードのアウトライン（クラス・関数のシグネチャのみ）生成モジュール"""
+import ast
+import re
+import logging
+import threading
+import tokenize
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+from .compaction import compact_c_family, get_compactor
+
+logger = logging.getLogger(__name__)
+
+# アウトラインの本体省略記号
+ELLIPSIS = '...'
+
+# ブレースでブロックを表す言語
+BRACE_LANGUAGES = {
+    'c', 'cpp', 'java', 'groovy', 'csharp', 'go', 'rust', 'swift',
+    'javascript', 'jsx', 'typescript', 'tsx', 'php', 'kotlin', 'dart',
+}
+
+_MODIFIERS = (r'(?:(?:export|public|private|protected|internal|static|abstract|final|sealed|partial|open|'
+              r'pub(?:\([^)]*\))?|default|declare|data|unsafe|async|override|virtual|inline|extern|'
+              r'const|readonly|fileprivate|mutating|required|convenience|suspend|external)\s+)*')
+
+# クラス等のコンテナ宣言（内部のメンバー宣言も表示する）
+_CONTAINER_RE = re.compile(
+    r'^\s*(?:@\w+(?:\([^)]*\))?\s+)*' + _MODIFIERS +
+    r'(?:class|struct|interface|enum|namespace|impl|trait|protocol|extension|object|module|record|union|mod)\b'
+    r'|^\s*type\s+\w+(?:\[[^\]]*\])?\s+(?:struct|interface)\b'
+)
+
+# キーワードで始まる関数宣言
+_FUNCTION_KEYWORD_RE = re.compile(
+    r'^\s*' + _MODIFIERS + r'(?:func|fn|function\*?|fun|def|init|deinit|constructor)\b'
+    r'|^\s*' + _MODIFIERS + r'(?:const|let|var)\s+[\w$]+\s*(?::[^=]+)?=\s*(?:async\s+)?'
+    r'(?:\([^)]*\)|[\w$]+)\s*(?::[^=]+)?=>'
+)
+
+# 型名・修飾子に続く `名前(` 形式の関数・メソッド宣言（C/C++/Java/C#等）
+_FUNCTION_CALL_LIKE_RE = re.compile(
+    r'^\s*(?!(?:if|for|while|switch|catch|return|else|do|try|using|lock|foreach|synchronized|'
+    r'new|throw|case|await|yield|delete|sizeof|typeof)\b)'
+    r'[\w$<>\[\]:*&~,.?@\s]*?[\w$~]+\s*(?:<[^()]*>)?\s*\('
+)
+
+# ブロックを持つがアウトラインに表示しない文
+_BLOCK_STATEMENT_RE = re.compile(
+    r'^\s*(?:import|package|var|const|let|use|using|return|if|for|while|switch|do|else|try|catch|finally)'
+    r'\s*[({]|^\s*[})\]]'
+)
+
+# astの行番号と同じ規則（\r\n, \r, \n）で改行付きの行に分割
+_SOURCE_LINE_RE = re.compile(r'[^\r\n]*(?:\r\n|[\r\n])|[^\r\n]+\Z')
+
+# ブレース数を数える前に文字列リテラルを取り除く
+_SIMPLE_STRING_RE = re.compile(r'"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'|`[^`]*`')
+
+
+def _first_docstring_line(node: ast.AST) -> Optional[str]:
+    """
+    ノードのdocstringの1行目を取得
+
+    Args:
+        node (ast.AST): モジュール・クラス・関数のノード
+
+    Returns:
+        Optional[str]: docstringの1行目（存在しない場合はNone）
+    """
+    docstring = ast.get_docstring(node)
+    if not docstring:
+        return None
+    first_line = docstring.strip().splitlines()[0].strip()
+    return first_line or None
+
+
+def _source_header(node: ast.AST, source_lines: List[str]) -> Tuple[List[str], str]:
+    """
+    クラス・関数定義のデコレータと宣言部（末尾のコロンを除く）をソースのトークンから取得
+
+    ast.unparseのないPython 3.8以前用（3.7のノードには終了位置がないため、
+    宣言の先頭からブラケットの外側のコロンまでをトークン単位で切り出す）。
+    複数行にわたる宣言は1行にまとめ、コメントは除く。
+
+    Args:
+        node (ast.AST): クラス・関数定義のノード
+        source_lines (List[str]): 元のソースコードの行（改行付き）
+
+    Returns:
+        Tuple[List[str], str]: ('@'付きのデコレータ, 宣言部)
+    """
+    # 3.7ではデコレータ付きの定義の行番号が最初のデコレータの行を指す
+    start = min([d.lineno for d in node.decorator_list] + [node.lineno])
+    decorators = []
+    parts: List[str] = []
+    collecting = False
+    depth = 0
+    prev_end = None
+    readline = iter(source_lines[start - 1:]).__next__
+    for tok in tokenize.generate_tokens(readline):
+        if tok.type in (tokenize.COMMENT, tokenize.NL, tokenize.INDENT, tokenize.DEDENT):
+            continue
+        if tok.type == tokenize.NEWLINE and depth == 0:
+            if parts:
+                decorators.append(''.join(parts))
+            parts, collecting, prev_end = [], False, None
+            continue
+        if not collecting:
+            if tok.string not in ('@', 'def', 'class', 'async'):
+                break
+            collecting = True
+        elif tok.string == ':' and depth == 0 and not parts[0].startswith('@'):
+            return decorators, ''.join(parts)
+
+        if prev_end is not None:
+            if prev_end[0] == tok.start[0]:
+                parts.append(source_lines[start - 1 + tok.start[0] - 1][prev_end[1]:tok.start[1]])
+            elif not parts[-1].endswith(('(', '[', '{')) and tok.string not in (')', ']', '}'):
+                parts.append(' ')
+        parts.append(tok.string)
+        prev_end = tok.end
+        if tok.string in ('(', '[', '{'):
+            depth += 1
+        elif tok.string in (')', ']', '}'):
+            depth -= 1
+    raise ValueError(f"Cannot find the declaration of {getattr(node, 'name', node)}")
+
+
+def _python_header(node: ast.AST, source_lines: List[str]) -> Tuple[List[str], str]:
+    """
+    クラス・関数定義のデコレータと宣言部（末尾のコロンを除く）を取得
+
+    Args:
+        node (ast.AST): クラス・関数定義のノード
+        source_lines (List[str]): 元のソースコードの行（改行付き）
+
+    Returns:
+        Tuple[List[str], str]: ('@'付きのデコレータ, 宣言部)
+    """
+    if not hasattr(ast, 'unparse'):
+        return _source_header(node, source_lines)
+
+    decorators = [f"@{ast.unparse(decorator)}" for decorator in node.decorator_list]
+    if isinstance(node, ast.ClassDef):
+        bases = [ast.unparse(b) for b in node.bases]
+        bases += [f"{k.arg}={ast.unparse(k.value)}" if k.arg else f"**{ast.unparse(k.value)}"
+                  for k in node.keywords]
+        return decorators, f"class {node.name}" + (f"({', '.join(bases)})" if bases else '')
+
+    prefix = 'async def' if isinstance(node, ast.AsyncFunctionDef) else 'def'
+    header = f"{prefix} {node.name}({ast.unparse(node.args)})"
+    if node.returns is not None:
+        header += f" -> {ast.unparse(node.returns)}"
+    return decorators, header
+
+
+def _outline_python_body(body: List[ast.stmt], source_lines: List[str], indent: str, lines: List[str]) -> None:
+    """
+    クラス・関数定義のアウトラインを再帰的に追加
+
+    Args:
+        body (List[ast.stmt]): 対象の文のリスト
+        source_lines (List[str]): 元のソースコードの行（改行付き）
+        indent (str): インデント文字列
+        lines (List[str]): 出力先の行リスト
+    """
+    for node in body:
+        if not isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+
+        decorators, header = _python_header(node, source_lines)
+        lines.extend(f"{indent}{decorator}" for decorator in decorators)
+
+        docstring = _first_docstring_line(node)
+        if isinstance(node, ast.ClassDef):
+            lines.append(f"{indent}{header}:")
+            if docstring:
+                lines.append(f'{indent}    """{docstring}"""')
+            before = len(lines)
+            _outline_python_body(node.body, source_lines, indent + '    ', lines)
+            if len(lines) == before and not docstring:
+                lines.append(f"{indent}    {ELLIPSIS}")
+        elif docstring:
+            lines.append(f"{indent}{header}:")
+            lines.append(f'{indent}    """{docstring}"""')
+        else:
+            lines.append(f"{indent}{header}: {ELLIPSIS}")
+
+
+def outline_python(source: str) -> Optional[str]:
+    """
+    Pythonソースのアウトラインを生成
+
+    Args:
+        source (str): Pythonソースコード
+
+    Returns:
+        Optional[str]: アウトライン（構文解析に失敗した場合はNone）
+    """
+    try:
+        tree = ast.parse(source)
+        lines = []
+        docstring = _first_docstring_line(tree)
+        if docstring:
+            lines.append(f'"""{docstring}"""')
+        _outline_python_body(tree.body, _SOURCE_LINE_RE.findall(source), '', lines)
+    except (SyntaxError, ValueError, tokenize.TokenError):
+        return None
+    return '\n'.join(lines)
+
+
+def _count_braces(line: str) -> List[str]:
+    """
+    文字列リテラルを除いた行内のブレースを出現順に取得
+
+    Args:
+        line (str): 対象行
+
+    Returns:
+        List[str]: '{' または '}' のリスト
+    """
+    if '{' not in line and '}' not in line:
+        return []
+    return [c for c in _SIMPLE_STRING_RE.sub('""', line) if c in '{}']
+
+
+def _needs_continuation(signature: str) -> bool:
+    """
+    宣言が次の行に続くかを判定
+
+    Args:
+        signature (str): これまでに読み込んだ宣言
+
+    Returns:
+        bool: 括弧が閉じていない、または継続を示す記号で終わる場合True
+    """
+    return (signature.count('(') > signature.count(')')
+            or signature.endswith((',', '(', '=', '=>', ':', '->', '&&', '||', '+', '<')))
+
+
+def outline_braces(source: str, language: str) -> Optional[str]:
+    """
+    ブレース言語のソースのアウトラインを生成
+
+    宣言行を正規表現で検出し、ブレースの対応から関数本体を省略する。
+    クラス等のコンテナ内ではメンバー宣言も表示する。
+
+    Args:
+        source (str): ソースコード
+        language (str): 言語名
+
+    Returns:
+        Optional[str]: アウトライン（未対応の言語はNone）
+    """
+    if language not in BRACE_LANGUAGES:
+        return None
+
+    compactor = get_compactor(language)
+    code = compactor(source) if compactor is not None else compact_c_family(source, 'c')
+    # トップレベルの`;`で終わる宣言（プロトタイプ）を表示する言語
+    show_prototypes = language in ('c', 'cpp')
+
+    lines: List[str] = []
+    stack: List[bool] = []  # 開いているブロック（True: コンテナ、False: 関数本体等）
+    pending: List[str] = []  # ブレースを待っている複数行の宣言
+    pending_container = False
+
+    code_lines = [line.strip() for line in code.split('\n') if line.strip()]
+    for index, line in enumerate(code_lines):
+        depth = len(stack)
+        indent = '    ' * depth
+        braces = _count_braces(line)
+        first_open_is_container = False
+
+        if not pending and all(stack):
+            in_container = depth > 0
+            if _CONTAINER_RE.match(line):
+                pending, pending_container = [line], True
+            elif _BLOCK_STATEMENT_RE.match(line):
+                pass
+            elif _FUNCTION_KEYWORD_RE.match(line) or _FUNCTION_CALL_LIKE_RE.match(line):
+                pending, pending_container = [line], False
+            elif in_container and not line.startswith(('@', '#', '}')):
+                # コンテナ内のフィールド等の宣言
+                pending, pending_container = [line], False
+        elif pending:
+            pending.append(line)
+
+        if pending:
+            signature = ' '.join(pending)
+            if '{' in braces:
+                if braces.count('{') == braces.count('}') and pending_container:
+                    # 1行で完結するコンテナはそのまま表示
+                    lines.append(indent + signature)
+                elif pending_container:
+                    lines.append(f"{indent}{signature.split('{', 1)[0].rstrip()} {{")
+                    first_open_is_container = True
+                else:
+                    lines.append(f"{indent}{signature.split('{', 1)[0].rstrip()} {{ {ELLIPSIS} }}")
+                pending = []
+            elif _needs_continuation(signature) and len(pending) <= 20:
+                continue
+            elif index + 1 < len(code_lines) and code_lines[index + 1].startswith('{'):
+                # 次の行でブロックが始まる宣言
+                continue
+            else:
+                if depth > 0 or show_prototypes:
+                    lines.append(indent + signature)
+                pending = []
+
+        # ブレースの対応を追跡（宣言行の最初の'{'だけがコンテナになりうる）
+        for brace in braces:
+            if brace == '{':
+                stack.append(first_open_is_container)
+                first_open_is_container = False
+            elif stack:
+                closed_container = stack.pop()
+                if closed_container and all(stack):
+                    lines.append('    ' * len(stack) + '}')
+
+    return '\n'.join(lines)
+
+
+def get_outliner(language: str) -> Optional[Callable[[str], Optional[str]]]:
+    """
+    言語に対応するアウトライン生成関数を取得
+
+    Args:
+        language (str): MARKDOWN_LANGUAGE_MAPの言語名
+
+    Returns:
+        Optional[Callable[[str], Optional[str]]]: アウトライン生成関数（未対応の言語はNone）
+    """
+    if language == 'python':
+        return outline_python
+    if language in BRACE_LANGUAGES:
+        return lambda source: outline_braces(source, language)
+    return None
+
+
+class OutlineCache:
+    def __init__(self, max_entries: int = 4096):
+        """
+        内容のハッシュをキーとするアウトラインのキャッシュ（LRU、スレッドセーフ）
+
+        Args:
+            max_entries (int, optional): 保持する最大エントリ数
+        """
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, Optional[str]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_create(self, content_hash: str, language: str, source: str) -> Optional[str]:
+        """
+        キャッシュされたアウトラインを取得（存在しない場合は生成して保存）
+
+        Args:
+            content_hash (str): ファイル内容のハッシュ
+            language (str): 言語名
+            source (str): ソースコード
+
+        Returns:
+            Optional[str]: アウトライン（未対応・解析失敗の場合はNone）
+        """
+        key = f"{language}:{content_hash}"
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+
+        outliner = get_outliner(language)
+        outline = outliner(source) if outliner is not None else None
+        with self._lock:
+            self._entries[key] = outline
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return outline
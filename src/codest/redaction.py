@@ -0,0 +1,287 @@
+"""APIキー・トークン・内部ホスト名等の秘密情報の伏せ字処理モジュール"""
+import re
+import math
+import fnmatch
+import logging
+import posixpath
+from collections import Counter
+from typing import Iterable, Iterator, List, Optional, Pattern, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 伏せ字の書式（kindは検出ルール名）
+REDACTION_FORMAT = '[REDACTED:{kind}]'
+
+# 秘密情報の検出ルール（名前, 正規表現）。(?P<secret>...) がある場合はその部分のみを伏せる
+# ルールは個別にコンパイルして走査する。先頭をリテラルにしたルールはreの前方一致の探索で本文の大半を読み飛ばせるため、
+# 単語境界は先頭の\bではなくリテラルの後の否定後読みで判定する
+DEFAULT_SECRET_PATTERNS: List[Tuple[str, str]] = [
+    ('private-key', r'-----BEGIN [A-Z ]*PRIVATE KEY-----[\s\S]*?-----END [A-Z ]*PRIVATE KEY-----'),
+    ('aws-access-key', r'(?:AKIA|ASIA)(?<!\w.{4})[0-9A-Z]{16}\b'),
+    ('github-token', r'gh[pousr]_(?<!\w.{4})[A-Za-z0-9]{36,255}\b'),
+    ('slack-token', r'xox[abposr]-(?<!\w.{5})[A-Za-z0-9-]{10,}'),
+    ('google-api-key', r'AIza(?<!\w.{4})[0-9A-Za-z_\-]{35}\b'),
+    ('jwt', r'eyJ(?<!\w.{3})[A-Za-z0-9_\-]{8,}\.eyJ[A-Za-z0-9_\-]{8,}\.[A-Za-z0-9_\-]{8,}'),
+    ('url-credentials', r'://(?<=[a-zA-Z0-9+.\-]://)[^\s:/@"\']+:(?P<secret>[^\s@/"\']+)@'),
+    # keyed-secretは行単位のルールで、キーワード（KEYED_SECRET_KEYWORDS）を含む行のみを走査する
+    # 引用符で囲まれた値（ソースコード・JSON・YAML）
+    ('keyed-secret',
+     r'(?i)(?:api[_\-]?key|secret|access[_\-]?key|auth[_\-]?token|token|password|passwd|pwd)\w*["\']?'
+     r'[ \t]*[:=][ \t]*["\'](?P<secret>[^"\'\s]{8,})["\']'),
+    # 引用符のない設定ファイル形式の値（.env・INI・properties）
+    ('keyed-secret',
+     r'(?im)^[ \t]*(?:export[ \t]+)?[\w.\-]*(?:key|secret|token|password|passwd|pwd)[\w.\-]*[ \t]*[=:][ \t]*'
+     r'(?P<secret>[^\s"\'#()\[\]{}]{8,})[ \t]*$'),
+    # high-entropyは候補をエントロピーで絞り込むため、他のルールの一致を隠さないよう別に走査する
+    ('high-entropy', r'(?<![A-Za-z0-9+/_\-])[A-Za-z0-9+/_\-]{32,}={0,2}'),
+]
+
+# keyed-secretのルールを適用する行に含まれるキーワード（小文字）
+KEYED_SECRET_KEYWORDS = ('key', 'secret', 'token', 'passw', 'pwd')
+_KEYWORD_RE = re.compile('|'.join(KEYED_SECRET_KEYWORDS))
+
+# 高エントロピー文字列とみなすシャノンエントロピー（ビット/文字）の下限
+HIGH_ENTROPY_THRESHOLD = 4.3
+
+# ファイル全体が秘密情報とみなすファイル名
+SECRET_FILE_PATTERNS = (
+    '.env', '.env.*', '*.env', '*.pem', '*.key', '*.p12', '*.pfx', 'id_rsa*', 'id_ed25519*',
+    'credentials', 'credentials.*', 'secrets.*', '*.secrets.*',
+)
+
+# 設定ファイル形式の行（KEY=VALUE, key: value）
+_ASSIGNMENT_LINE_RE = re.compile(r'^\s*(?:export\s+)?["\']?[\w.\-]+["\']?\s*[:=]')
+
+
+def shannon_entropy(text: str) -> float:
+    """
+    文字列のシャノンエントロピーを計算
+
+    Args:
+        text (str): 対象文字列
+
+    Returns:
+        float: 1文字あたりのエントロピー（ビット）
+    """
+    if not text:
+        return 0.0
+    length = len(text)
+    return -sum(count / length * math.log2(count / length) for count in Counter(text).values())
+
+
+class LiteralMatcher:
+    def __init__(self, literals: Iterable[str]):
+        """
+        複数のリテラル文字列を1つの選択パターンで検出する
+
+        長い文字列を先に並べ、各開始位置で最も長い一致を得る。
+
+        Args:
+            literals (Iterable[str]): 検出する文字列（空文字列は無視）
+        """
+        self.literals = sorted({literal for literal in literals if literal}, key=lambda x: (-len(x), x))
+        self._regex = re.compile('|'.join(re.escape(literal) for literal in self.literals)) if self.literals else None
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int]]:
+        """
+        テキスト中の一致箇所を列挙（重なり合う一致も開始位置ごとに列挙）
+
+        Args:
+            text (str): 対象テキスト
+
+        Yields:
+            Tuple[int, int]: 一致箇所の (開始位置, 終了位置)
+        """
+        if self._regex is None:
+            return
+        match = self._regex.search(text)
+        while match:
+            yield match.span()
+            # 一致の内部から始まる別の文字列も検出するため、次の文字から探索する
+            match = self._regex.search(text, match.start() + 1)
+
+
+def _merge_spans(spans: List[Tuple[int, int, str]]) -> List[Tuple[int, int, str]]:
+    """
+    重なり合う伏せ字の範囲を統合
+
+    Args:
+        spans (List[Tuple[int, int, str]]): (開始位置, 終了位置, ルール名) のリスト
+
+    Returns:
+        List[Tuple[int, int, str]]: 開始位置順の重ならない範囲（統合時は先に始まる範囲のルール名）
+    """
+    merged: List[Tuple[int, int, str]] = []
+    for start, end, kind in sorted(spans):
+        if merged and start < merged[-1][1]:
+            last_start, last_end, last_kind = merged[-1]
+            merged[-1] = (last_start, max(last_end, end), last_kind)
+        else:
+            merged.append((start, end, kind))
+    return merged
+
+
+class Redactor:
+    def __init__(
+            self,
+            markers: Iterable[str] = (),
+            patterns: Sequence[Tuple[str, str]] = None,
+            entropy_threshold: float = HIGH_ENTROPY_THRESHOLD,
+            secret_file_patterns: Sequence[str] = SECRET_FILE_PATTERNS
+    ):
+        """
+        リテラルのマーカーと正規表現で秘密情報を検出して伏せ字にする
+
+        正規表現はルールごとにコンパイルして走査し、先頭がリテラルのルールはreの前方一致の探索で
+        本文の大半を読み飛ばす。keyed-secretのルールはキーワードを含む行のみを走査する。
+        high-entropyのルールは候補をエントロピーで絞り込むため、除外した候補が他のルールの
+        一致を隠さないよう別に走査する。リテラルのマーカーは1つの選択パターンで検出する。
+
+        Args:
+            markers (Iterable[str], optional): 伏せるリテラル文字列（内部ホスト名等）
+            patterns (Sequence[Tuple[str, str]], optional): (ルール名, 正規表現) のリスト（省略時は既定のルール）
+            entropy_threshold (float, optional): high-entropyルールで伏せるエントロピーの下限
+            secret_file_patterns (Sequence[str], optional): 全体が秘密情報とみなすファイル名のパターン
+        """
+        self.rules = list(patterns if patterns is not None else DEFAULT_SECRET_PATTERNS)
+        self.entropy_threshold = entropy_threshold
+        self.secret_file_patterns = secret_file_patterns
+        self._markers = LiteralMatcher(markers)
+        self._regexes: List[Tuple[str, Pattern]] = [(kind, re.compile(pattern)) for kind, pattern in self.rules]
+
+    @staticmethod
+    def _keyword_lines(text: str) -> List[Tuple[int, int]]:
+        """
+        keyed-secretのキーワードを含む行の範囲を取得
+
+        Args:
+            text (str): 対象テキスト
+
+        Returns:
+            List[Tuple[int, int]]: 行の (開始位置, 終了位置（改行の位置）) のリスト
+        """
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # 小文字化で長さが変わる文字を含む場合は位置が対応しないためテキスト全体を対象とする
+            return [(0, len(text))]
+        lines: List[Tuple[int, int]] = []
+        for match in _KEYWORD_RE.finditer(lowered):
+            if lines and match.start() < lines[-1][1]:
+                continue
+            line_start = lowered.rfind('\n', 0, match.start()) + 1
+            line_end = lowered.find('\n', match.end())
+            lines.append((line_start, line_end if line_end >= 0 else len(text)))
+        return lines
+
+    def _regex_spans(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """正規表現のルールに一致した伏せる範囲を列挙"""
+        keyword_lines = None
+        for kind, regex in self._regexes:
+            if kind == 'keyed-secret':
+                if keyword_lines is None:
+                    keyword_lines = self._keyword_lines(text)
+                matches = (match for line_start, line_end in keyword_lines
+                           for match in regex.finditer(text, line_start, line_end))
+            else:
+                matches = regex.finditer(text)
+
+            for match in matches:
+                if 'secret' in regex.groupindex and match.group('secret') is not None:
+                    start, end = match.span('secret')
+                else:
+                    start, end = match.span()
+
+                if kind == 'high-entropy':
+                    candidate = text[start:end]
+                    # 識別子・16進数のハッシュ等を除外するため、英字と数字の混在とエントロピーを条件とする
+                    if (not any(c.isdigit() for c in candidate) or not any(c.isalpha() for c in candidate)
+                            or shannon_entropy(candidate) < self.entropy_threshold):
+                        continue
+                yield start, end, kind
+
+    def redact(self, text: str) -> Tuple[str, int]:
+        """
+        テキスト中の秘密情報を伏せ字にする
+
+        Args:
+            text (str): 対象テキスト
+
+        Returns:
+            Tuple[str, int]: (伏せ字にしたテキスト, 伏せ字にした箇所の数)
+        """
+        spans = list(self._regex_spans(text))
+        spans.extend((start, end, 'marker') for start, end in self._markers.finditer(text))
+        if not spans:
+            return text, 0
+
+        merged = _merge_spans(spans)
+        parts = []
+        position = 0
+        for start, end, kind in merged:
+            parts.append(text[position:start])
+            parts.append(REDACTION_FORMAT.format(kind=kind))
+            position = end
+        parts.append(text[position:])
+        return ''.join(parts), len(merged)
+
+    def is_secret_file(self, rel_path: str, text: str, redactions: int) -> bool:
+        """
+        ファイル全体が秘密情報（.envや鍵ファイル等）かを判定
+
+        Args:
+            rel_path (str): ファイルの相対パス
+            text (str): ファイルの内容
+            redactions (int): 伏せ字にした箇所の数
+
+        Returns:
+            bool: ファイル名が秘密情報のパターンに一致する場合、または
+                設定形式の行の大半が秘密情報を含む場合True
+        """
+        name = posixpath.basename(rel_path.replace('\\', '/'))
+        if any(fnmatch.fnmatchcase(name.lower(), pattern) for pattern in self.secret_file_patterns):
+            return True
+        if redactions < 2:
+            return False
+
+        lines = [line for line in text.split('\n')
+                 if line.strip() and not line.lstrip().startswith(('#', '//', ';'))]
+        assignments = [line for line in lines if _ASSIGNMENT_LINE_RE.match(line)]
+        if not lines or len(assignments) < len(lines) * 0.8:
+            return False
+        secret_lines = sum(1 for line in assignments if self.redact(line)[1])
+        return secret_lines >= max(2, len(assignments) * 0.5)
+
+
+def load_markers(path: str) -> List[str]:
+    """
+    リテラルのマーカーを1行1件のファイルから読み込み（空行と#で始まる行は無視）
+
+    Args:
+        path (str): マーカーファイルのパス
+
+    Returns:
+        List[str]: マーカーのリスト
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+
+def compile_user_patterns(patterns: Optional[Iterable[str]]) -> List[Tuple[str, str]]:
+    """
+    ユーザー指定の正規表現を既定のルールに追加
+
+    Args:
+        patterns (Iterable[str], optional): 追加の正規表現
+
+    Returns:
+        List[Tuple[str, str]]: (ルール名, 正規表現) のリスト
+
+    Raises:
+        re.error: 正規表現が不正な場合
+    """
+    rules = list(DEFAULT_SECRET_PATTERNS)
+    for i, pattern in enumerate(patterns or []):
+        re.compile(pattern)
+        # high-entropyは最も優先度が低いため常に最後に置く
+        rules.insert(len(rules) - 1, (f'custom-{i + 1}', pattern))
+    return rules
@@ -0,0 +1,448 @@
+"""ドキュメントの出力形式（markdown, jsonl, xml）ごとの書き込み処理モジュール"""
+import re
+import json
+from typing import Any, Dict, List, TextIO, Type
+from xml.sax.saxutils import quoteattr
+
+# ファイルごとの注記（スキップ・エラー等）の状態
+NOTICE_SKIPPED = 'skipped'
+NOTICE_SECRET = 'secret'
+NOTICE_ERROR = 'error'
+NOTICE_GENERATED = 'generated'
+
+
+def _heading_anchor(text: str, used_anchors: Dict[str, int]) -> str:
+    """
+    GitHub互換の見出しアンカーを生成
+
+    Args:
+        text (str): 見出しのテキスト
+        used_anchors (Dict[str, int]): 生成済みアンカーの出現回数（重複時に連番を付与）
+
+    Returns:
+        str: アンカー
+    """
+    anchor = re.sub(r'[^\w\- ]', '', text.lower()).replace(' ', '-')
+    count = used_anchors.get(anchor, 0)
+    used_anchors[anchor] = count + 1
+    return f"{anchor}-{count}" if count else anchor
+
+
+class DocumentHeader:
+    def __init__(self, generated_at: str, total_files: int, directories: List[str],
+                 archives: List[str] = None, meta: Dict[str, str] = None, toc_paths: List[str] = None,
+                 banners: List[Dict[str, Any]] = None):
+        """
+        ドキュメントヘッダーの内容
+
+        Args:
+            generated_at (str): 生成日時
+            total_files (int): 出力するファイルの総数
+            directories (List[str]): 収集対象ディレクトリ
+            archives (List[str], optional): 収集対象アーカイブ
+            meta (Dict[str, str], optional): メタ情報に追加する項目
+            toc_paths (List[str], optional): 目次に載せる相対パス（指定時のみ目次を出力）
+            banners (List[Dict[str, Any]], optional): 各ファイルから除去した共通ヘッダー（id, files, text）
+        """
+        self.generated_at = generated_at
+        self.total_files = total_files
+        self.directories = directories
+        self.archives = archives or []
+        self.meta = meta or {}
+        self.toc_paths = toc_paths
+        self.banners = banners or []
+
+
+class Renderer:
+    """
+    出力形式ごとの書き込み処理の基底クラス
+
+    各メソッドは1つのセクション（ファイル）分をまとめて書き込む。セクション単位で
+    書き込むため、列挙しながら生成する場合もセクションのバイト位置を記録できる。
+    """
+    name = ''
+    extension = ''
+    # ヘッダーをセクションの後（末尾）に書き込む形式かどうか。Falseの形式はヘッダーを先頭に置く
+    header_at_end = False
+    # 予算の見積もり用: 1セクションあたりの見出し・タグ等の固定バイト数と、エスケープによる内容の増加率
+    section_overhead_bytes = 32
+    content_ratio = 1.0
+
+    def write_start(self, out: TextIO, generated_at: str) -> None:
+        """
+        ヘッダーを末尾に書き込む形式で、最初のセクションの前に書き込み
+
+        Args:
+            out (TextIO): 出力先
+            generated_at (str): 生成日時
+        """
+
+    def write_header(self, out: TextIO, header: DocumentHeader) -> None:
+        """ドキュメントヘッダーを書き込み"""
+        raise NotImplementedError
+
+    def write_footer(self, out: TextIO) -> None:
+        """ドキュメントの末尾を書き込み"""
+
+    def write_file(self, out: TextIO, rel_path: str, lang: str, content: str, size: int) -> None:
+        """
+        ファイル内容を書き込み
+
+        Args:
+            out (TextIO): 出力先
+            rel_path (str): ファイルの相対パス
+            lang (str): 言語名
+            content (str): 出力する内容
+            size (int): 元のファイルサイズ（バイト）
+        """
+        raise NotImplementedError
+
+    def write_outline(self, out: TextIO, rel_path: str, lang: str, outline: str, size: int,
+                      line_count: int) -> None:
+        """
+        ファイルのアウトライン（シグネチャのみ）を書き込み
+
+        Args:
+            out (TextIO): 出力先
+            rel_path (str): ファイルの相対パス
+            lang (str): 言語名
+            outline (str): アウトライン
+            size (int): 元のファイルサイズ（バイト）
+            line_count (int): 元のファイルの行数
+        """
+        raise NotImplementedError
+
+    def write_excerpt(self, out: TextIO, rel_path: str, lang: str, head: str, tail: str, omitted: int,
+                      size: int, limit_kb: float) -> None:
+        """
+        サイズ超過ファイルの先頭と末尾を書き込み
+
+        Args:
+            out (TextIO): 出力先
+            rel_path (str): ファイルの相対パス
+            lang (str): 言語名
+            head (str): 先頭部分
+            tail (str): 末尾部分
+            omitted (int): 省略したバイト数
+            size (int): 元のファイルサイズ（バイト）
+            limit_kb (float): ファイルサイズの上限（KB）
+        """
+        raise NotImplementedError
+
+    def write_notice(self, out: TextIO, rel_path: str, status: str, message: str, size: int = None) -> None:
+        """
+        内容を出力しないファイルの注記を書き込み
+
+        Args:
+            out (TextIO): 出力先
+            rel_path (str): ファイルの相対パス
+            status (str): 状態（skipped, secret, error, generated）
+            message (str): 注記
+            size (int, optional): 元のファイルサイズ（バイト）
+        """
+        raise NotImplementedError
+
+    def write_deleted(self, out: TextIO, rel_paths: List[str]) -> None:
+        """
+        前回のマニフェストから削除されたファイルの一覧を書き込み
+
+        Args:
+            out (TextIO): 出力先
+            rel_paths (List[str]): 削除されたファイルの相対パス
+        """
+        raise NotImplementedError
+
+    def write_stats(self, out: TextIO, stats: Dict[str, Any]) -> None:
+        """
+        言語別・ディレクトリ別の集計を書き込み
+
+        Args:
+            out (TextIO): 出力先
+            stats (Dict[str, Any]): CodebaseStats.to_dict()の結果
+        """
+        raise NotImplementedError
+
+
+class MarkdownRenderer(Renderer):
+    """見出しとコードブロックによるマークダウン形式"""
+    name = 'markdown'
+    extension = '.md'
+
+    NOTICE_LABELS = {
+        NOTICE_SKIPPED: '⚠️ **File skipped**',
+        NOTICE_SECRET: '🔒 **File skipped**',
+        NOTICE_ERROR: '❌ **Error**',
+        NOTICE_GENERATED: '🤖 **File skipped**',
+    }
+
+    @staticmethod
+    def _fence(content: str) -> str:
+        """内容に含まれるバッククォートの連続より長いフェンスを取得"""
+        longest = max((len(run) for run in re.findall(r'`{3,}', content)), default=2)
+        return '`' * (longest + 1)
+
+    def write_header(self, out: TextIO, header: DocumentHeader) -> None:
+        # タイトルセクション
+        out.write("# Source Code Collection\n\n")
+
+        # メタ情報セクション
+        out.write("## Meta Information\n\n")
+        out.write(f"- **Generated at**: {header.generated_at}\n")
+        out.write(f"- **Total files**: {header.total_files}\n")
+        for label, value in header.meta.items():
+            out.write(f"- **{label}**: {value}\n")
+
+        # ディレクトリ情報セクション
+        out.write("\n## Target Directories\n\n")
+        for directory in header.directories:
+            out.write(f"- `{directory}`\n")
+        for archive_path in header.archives:
+            out.write(f"- `{archive_path}` (archive)\n")
+
+        if header.banners:
+            # 各ファイルの先頭から除去した共通ヘッダーは1回だけ出力
+            out.write("\n## Common Headers\n")
+            for banner in header.banners:
+                fence = self._fence(banner['text'])
+                out.write(f"\n### Header {banner['id']} ({banner['files']} files)\n\n")
+                out.write(f"{fence}\n{banner['text']}\n{fence}\n")
+
+        if header.toc_paths is not None:
+            out.write("\n## Table of Contents\n\n")
+            used_anchors: Dict[str, int] = {}
+            for rel_path in header.toc_paths:
+                out.write(f"- [`{rel_path}`](#{_heading_anchor(rel_path, used_anchors)})\n")
+
+        # セパレータ
+        out.write("\n---\n\n")
+        out.write("## Source Files\n\n")
+
+    def write_file(self, out: TextIO, rel_path: str, lang: str, content: str, size: int) -> None:
+        # ファイル名をコードブロックで装飾
+        out.write(f"\n### `{rel_path}`\n\n")
+        if lang == 'markdown':
+            # マークダウンファイルは折りたたみ可能なソースとして1回だけ出力
+            fence = self._fence(content)
+            out.write("<details>\n<summary>Markdown content (click to expand)</summary>\n\n")
+            out.write(f"{fence}markdown\n{content}\n{fence}\n")
+            out.write("</details>\n")
+            return
+        out.write("```" + lang + "\n")
+        out.write(content)
+        out.write("\n```\n")
+
+    def write_outline(self, out: TextIO, rel_path: str, lang: str, outline: str, size: int,
+                      line_count: int) -> None:
+        out.write(f"\n### `{rel_path}`\n\n")
+        out.write(f"> 🧭 **Outline**: Signatures only ({line_count} lines in full file)\n\n")
+        out.write("```" + lang + "\n")
+        out.write(outline)
+        out.write("\n```\n")
+
+    def write_excerpt(self, out: TextIO, rel_path: str, lang: str, head: str, tail: str, omitted: int,
+                      size: int, limit_kb: float) -> None:
+        out.write(f"\n### `{rel_path}`\n\n")
+        out.write(
+            f"> ✂️ **File excerpted**: Size ({size / 1024:.1f}KB) exceeds limit of {limit_kb}KB, "
+            f"showing the beginning and end of the file\n\n")
+        out.write("```" + lang + "\n")
+        out.write(head)
+        if omitted > 0:
+            if head and not head.endswith('\n'):
+                out.write("\n")
+            out.write(f"... ✂️ {omitted} bytes omitted ✂️ ...\n")
+        out.write(tail)
+        out.write("\n```\n")
+
+    def write_notice(self, out: TextIO, rel_path: str, status: str, message: str, size: int = None) -> None:
+        out.write(f"\n### `{rel_path}`\n\n")
+        out.write(f"> {self.NOTICE_LABELS[status]}: {message}\n\n")
+
+    def write_deleted(self, out: TextIO, rel_paths: List[str]) -> None:
+        out.write("\n---\n\n")
+        out.write("## Deleted Files\n\n")
+        for rel_path in rel_paths:
+            out.write(f"- `{rel_path}`\n")
+
+    def write_stats(self, out: TextIO, stats: Dict[str, Any]) -> None:
+        out.write("\n---\n\n")
+        out.write("## Statistics\n")
+        for title, key in (('Language', 'languages'), ('Directory', 'directories')):
+            out.write(f"\n| {title} | Files | Bytes | Lines | Code | Blank |\n")
+            out.write("|---|---:|---:|---:|---:|---:|\n")
+            for name, values in list(stats[key].items()) + [('**Total**', stats['totals'])]:
+                out.write(f"| {name} | {values['files']} | {values['bytes']} | {values['lines']} | "
+                          f"{values['code']} | {values['blank']} |\n")
+
+
+class JsonlRenderer(Renderer):
+    """
+    1行1レコードのJSON Lines形式
+
+    ファイルごとに1レコード（type: file）で、path・language・size・status・contentを持つ。
+    生成しながら読み込めるよう、ファイル数等のヘッダーのレコード（type: header）は末尾に置く。
+    """
+    name = 'jsonl'
+    extension = '.jsonl'
+    header_at_end = True
+    # {"type": "file", "path": ..., "language": ..., "size": ..., "status": ..., "content": ...}
+    section_overhead_bytes = 96
+    # 改行・引用符・バックスラッシュ・タブのエスケープ（ソースコードでおおよそ1割）
+    content_ratio = 1.1
+
+    @staticmethod
+    def _write_record(out: TextIO, record: Dict) -> None:
+        out.write(json.dumps(record, ensure_ascii=False))
+        out.write("\n")
+
+    def write_header(self, out: TextIO, header: DocumentHeader) -> None:
+        record = {
+            'type': 'header',
+            'generated_at': header.generated_at,
+            'total_files': header.total_files,
+            'directories': header.directories,
+        }
+        if header.archives:
+            record['archives'] = header.archives
+        if header.meta:
+            record['meta'] = header.meta
+        if header.banners:
+            record['banners'] = header.banners
+        if header.toc_paths is not None:
+            record['files'] = header.toc_paths
+        self._write_record(out, record)
+
+    def write_file(self, out: TextIO, rel_path: str, lang: str, content: str, size: int) -> None:
+        self._write_record(out, {'type': 'file', 'path': rel_path, 'language': lang, 'size': size,
+                                 'status': 'included', 'content': content})
+
+    def write_outline(self, out: TextIO, rel_path: str, lang: str, outline: str, size: int,
+                      line_count: int) -> None:
+        self._write_record(out, {'type': 'file', 'path': rel_path, 'language': lang, 'size': size,
+                                 'status': 'outline', 'line_count': line_count, 'content': outline})
+
+    def write_excerpt(self, out: TextIO, rel_path: str, lang: str, head: str, tail: str, omitted: int,
+                      size: int, limit_kb: float) -> None:
+        self._write_record(out, {'type': 'file', 'path': rel_path, 'language': lang, 'size': size,
+                                 'status': 'excerpted', 'omitted_bytes': omitted,
+                                 'head': head, 'tail': tail})
+
+    def write_notice(self, out: TextIO, rel_path: str, status: str, message: str, size: int = None) -> None:
+        self._write_record(out, {'type': 'file', 'path': rel_path, 'size': size,
+                                 'status': status, 'message': message})
+
+    def write_deleted(self, out: TextIO, rel_paths: List[str]) -> None:
+        for rel_path in rel_paths:
+            self._write_record(out, {'type': 'deleted', 'path': rel_path})
+
+    def write_stats(self, out: TextIO, stats: Dict[str, Any]) -> None:
+        self._write_record(out, dict({'type': 'stats'}, **stats))
+
+
+class XmlRenderer(Renderer):
+    """
+    LLMプロンプト向けのXMLタグ形式
+
+    トークン数を抑えるため内容はエスケープせずにそのまま出力する（厳密なXMLではない）。
+    内容中の閉じタグ（</file）のみ &lt;/file とし、ファイルの境界が崩れないようにする。
+    生成しながら読み込めるよう、ファイル数等のヘッダー（<header>）は末尾に置く。
+    """
+    name = 'xml'
+    extension = '.xml'
+    header_at_end = True
+    # <file path="..." lang="...">\n ... \n</file>\n
+    section_overhead_bytes = 40
+
+    @staticmethod
+    def _open_tag(rel_path: str, lang: str = None, **attrs) -> str:
+        parts = [f"path={quoteattr(rel_path)}"]
+        if lang:
+            parts.append(f"lang={quoteattr(lang)}")
+        parts.extend(f"{key}={quoteattr(str(value))}" for key, value in attrs.items() if value is not None)
+        return f"<file {' '.join(parts)}>"
+
+    @staticmethod
+    def _escape_content(content: str) -> str:
+        return content.replace('</file', '&lt;/file')
+
+    def write_start(self, out: TextIO, generated_at: str) -> None:
+        out.write(f"<codebase generated_at={quoteattr(generated_at)}>\n")
+
+    def write_header(self, out: TextIO, header: DocumentHeader) -> None:
+        out.write(f"<header total_files=\"{header.total_files}\">\n")
+        for label, value in header.meta.items():
+            out.write(f"<meta name={quoteattr(label)}>{value}</meta>\n")
+        for directory in header.directories:
+            out.write(f"<directory>{directory}</directory>\n")
+        for archive_path in header.archives:
+            out.write(f"<archive>{archive_path}</archive>\n")
+        for banner in header.banners:
+            out.write(f"<banner id=\"{banner['id']}\" files=\"{banner['files']}\">\n"
+                      f"{self._escape_content(banner['text'])}\n</banner>\n")
+        if header.toc_paths is not None:
+            out.write("<files>\n")
+            out.write(''.join(f"{rel_path}\n" for rel_path in header.toc_paths))
+            out.write("</files>\n")
+        out.write("</header>\n")
+
+    def write_footer(self, out: TextIO) -> None:
+        out.write("</codebase>\n")
+
+    def write_file(self, out: TextIO, rel_path: str, lang: str, content: str, size: int) -> None:
+        out.write(f"{self._open_tag(rel_path, lang)}\n{self._escape_content(content)}\n</file>\n")
+
+    def write_outline(self, out: TextIO, rel_path: str, lang: str, outline: str, size: int,
+                      line_count: int) -> None:
+        out.write(f"{self._open_tag(rel_path, lang, status='outline', lines=line_count)}\n"
+                  f"{self._escape_content(outline)}\n</file>\n")
+
+    def write_excerpt(self, out: TextIO, rel_path: str, lang: str, head: str, tail: str, omitted: int,
+                      size: int, limit_kb: float) -> None:
+        out.write(f"{self._open_tag(rel_path, lang, status='excerpted', omitted_bytes=omitted)}\n")
+        out.write(self._escape_content(head))
+        if omitted > 0:
+            if head and not head.endswith('\n'):
+                out.write("\n")
+            out.write(f"... {omitted} bytes omitted ...\n")
+        out.write(f"{self._escape_content(tail)}\n</file>\n")
+
+    def write_notice(self, out: TextIO, rel_path: str, status: str, message: str, size: int = None) -> None:
+        out.write(f"{self._open_tag(rel_path, status=status)}{self._escape_content(message)}</file>\n")
+
+    def write_deleted(self, out: TextIO, rel_paths: List[str]) -> None:
+        for rel_path in rel_paths:
+            out.write(f"<deleted path={quoteattr(rel_path)}/>\n")
+
+    def write_stats(self, out: TextIO, stats: Dict[str, Any]) -> None:
+        out.write("<stats>\n")
+        for tag, key in (('language', 'languages'), ('directory', 'directories')):
+            for name, values in stats[key].items():
+                attrs = ' '.join(f'{field}="{value}"' for field, value in values.items())
+                out.write(f"<{tag} name={quoteattr(name)} {attrs}/>\n")
+        attrs = ' '.join(f'{field}="{value}"' for field, value in stats['totals'].items())
+        out.write(f"<total {attrs}/>\n")
+        out.write("</stats>\n")
+
+
+RENDERERS: Dict[str, Type[Renderer]] = {
+    renderer.name: renderer for renderer in (MarkdownRenderer, JsonlRenderer, XmlRenderer)
+}
+
+
+def get_renderer(name: str) -> Renderer:
+    """
+    出力形式名から書き込み処理を取得
+
+    Args:
+        name (str): 出力形式名（markdown, jsonl, xml）
+
+    Returns:
+        Renderer: 書き込み処理
+
+    Raises:
+        ValueError: 未対応の出力形式の場合
+    """
+    renderer_class = RENDERERS.get(name)
+    if renderer_class is None:
+        raise ValueError(f"Unknown output format: {name} (choose from {', '.join(RENDERERS)})")
+    return renderer_class()
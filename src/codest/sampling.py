@@ -0,0 +1,198 @@
+"""巨大なディレクトリから代表的なファイルを層別に抽出するモジュール"""
+import os
+import math
+import hashlib
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+from .constants import MARKDOWN_LANGUAGE_MAP
+from .file_collector import FileCollector
+
+logger = logging.getLogger(__name__)
+
+
+class StratifiedSampler:
+    def __init__(self, collector: FileCollector, sample_size: int = None, sample_ratio: float = None,
+                 seed: int = 0):
+        """
+        ディレクトリごと・言語ごとの層別抽出
+
+        sample_sizeを指定した場合は、各ディレクトリの割り当て数を直下の言語ごとのファイル群と
+        サブディレクトリに均等に配分し、割り当てが尽きたサブツリーは走査しない。
+        そのため走査量はリポジトリ全体の大きさではなく抽出数に比例する。
+        sample_ratioを指定した場合はすべてのディレクトリを一覧し（内容は読まない）、
+        言語ごとの端数を持ち越しながら各ディレクトリから比率分のファイルを選ぶ。
+
+        Args:
+            collector (FileCollector): 収集対象ディレクトリ・無視パターンの判定に使用するコレクタ
+            sample_size (int, optional): 抽出するファイル数
+            sample_ratio (float, optional): 抽出する比率（0より大きく1以下）
+            seed (int, optional): 抽出順を決める乱数シード（同じシードでは同じ結果）
+
+        Raises:
+            ValueError: sample_sizeとsample_ratioの指定が不正な場合
+        """
+        if (sample_size is None) == (sample_ratio is None):
+            raise ValueError("Specify exactly one of sample size or sample ratio")
+        if sample_size is not None and sample_size < 1:
+            raise ValueError(f"Sample size must be positive: {sample_size}")
+        if sample_ratio is not None and not 0 < sample_ratio <= 1:
+            raise ValueError(f"Sample ratio must be in (0, 1]: {sample_ratio}")
+
+        self.collector = collector
+        self.sample_size = sample_size
+        self.sample_ratio = sample_ratio
+        self.seed = seed
+        # 言語ごとの比率抽出の端数
+        self._carry: Dict[str, float] = {}
+        self.scanned_directories = 0
+
+    def _order_key(self, path: str) -> bytes:
+        """シードとパスから決まる抽出順のキー"""
+        return hashlib.blake2b(f"{self.seed}\0{path}".encode('utf-8', 'surrogateescape'),
+                               digest_size=8).digest()
+
+    def _list_directory(self, directory: str, base_dir: str) -> Tuple[Dict[str, List[str]], List[str]]:
+        """
+        ディレクトリ直下の収集対象ファイル（言語ごと）とサブディレクトリを抽出順で取得
+
+        Args:
+            directory (str): 対象ディレクトリ
+            base_dir (str): 収集対象のルートディレクトリ
+
+        Returns:
+            Tuple[Dict[str, List[str]], List[str]]: (言語 -> ファイルパス, サブディレクトリ)
+        """
+        self.scanned_directories += 1
+        groups: Dict[str, List[str]] = {}
+        subdirectories = []
+        try:
+            with os.scandir(directory) as it:
+                entries = [(entry.path, entry.is_dir() and not entry.is_symlink()) for entry in it]
+        except OSError as e:
+            logger.debug(f"Failed to scan directory {directory}: {e}")
+            return groups, subdirectories
+
+        for path, is_dir in entries:
+            if is_dir:
+                if not self.collector.should_ignore(path, base_dir):
+                    subdirectories.append(path)
+            elif any(path.endswith(ext) for ext in self.collector.file_extensions):
+                if not self.collector.should_ignore(path, base_dir):
+                    ext = os.path.splitext(path)[1].lower()
+                    groups.setdefault(MARKDOWN_LANGUAGE_MAP.get(ext, ext[1:]), []).append(path)
+
+        for files in groups.values():
+            files.sort(key=self._order_key)
+        subdirectories.sort(key=self._order_key)
+        return groups, subdirectories
+
+    @staticmethod
+    def _fill_quota(takers: List[Callable[[int], List[str]]], quota: int) -> List[str]:
+        """
+        層ごとの抽出関数に割り当て数を配分して抽出
+
+        抽出順に残りの割り当てを残りの層の数で均等に割って配分する。層が割り当てを使い切らなかった
+        （ファイルの尽きた）分は、まだファイルの残っている層に配り直す。各層の抽出関数は大きい割り当てで
+        呼び直すとそれまでの結果を含む結果を返すため、最終的に min(割り当て数, 対象ファイル数) を抽出する。
+
+        Args:
+            takers (List[Callable[[int], List[str]]]): 割り当て数を受け取り、それ以内のファイルを返す関数（抽出順）
+            quota (int): 割り当て数
+
+        Returns:
+            List[str]: 抽出したファイルパス
+        """
+        results: List[List[str]] = [[] for _ in takers]
+        exhausted = [False] * len(takers)
+        total = 0
+        while total < quota:
+            open_strata = [i for i, done in enumerate(exhausted) if not done]
+            progressed = False
+            for j, i in enumerate(open_strata):
+                remaining = quota - total
+                if remaining <= 0:
+                    # 割り当てが尽きたため残りのサブディレクトリは走査しない
+                    break
+                request = len(results[i]) + math.ceil(remaining / (len(open_strata) - j))
+                taken = takers[i](request)
+                if len(taken) < request:
+                    exhausted[i] = True
+                if len(taken) > len(results[i]):
+                    total += len(taken) - len(results[i])
+                    results[i] = taken
+                    progressed = True
+            if not progressed:
+                break
+        return [path for result in results for path in result]
+
+    def _sample_quota(self, directory: str, base_dir: str, quota: int) -> List[str]:
+        """
+        割り当て数以内のファイルをディレクトリから抽出
+
+        直下の言語ごとのファイル群とサブディレクトリを層とし、抽出順に割り当てを配分する。
+
+        Args:
+            directory (str): 対象ディレクトリ
+            base_dir (str): 収集対象のルートディレクトリ
+            quota (int): 割り当て数
+
+        Returns:
+            List[str]: 抽出したファイルパス（割り当て数と対象ファイル数の小さい方の数）
+        """
+        groups, subdirectories = self._list_directory(directory, base_dir)
+        strata: List[Tuple[bytes, str, Optional[List[str]]]] = (
+            [(self._order_key(f"{directory}\0{lang}"), directory, files) for lang, files in groups.items()]
+            + [(self._order_key(path), path, None) for path in subdirectories]
+        )
+        strata.sort(key=lambda stratum: stratum[0])
+
+        takers: List[Callable[[int], List[str]]] = []
+        for _, path, files in strata:
+            if files is not None:
+                takers.append(lambda count, files=files: files[:count])
+            else:
+                takers.append(lambda count, path=path: self._sample_quota(path, base_dir, count))
+        return self._fill_quota(takers, quota)
+
+    def _sample_ratio(self, directory: str, base_dir: str) -> List[str]:
+        """
+        各ディレクトリから言語ごとに比率分のファイルを抽出（端数は同じ言語の次のディレクトリに持ち越す）
+
+        Args:
+            directory (str): 対象ディレクトリ
+            base_dir (str): 収集対象のルートディレクトリ
+
+        Returns:
+            List[str]: 抽出したファイルパス
+        """
+        sampled: List[str] = []
+        stack = [directory]
+        while stack:
+            groups, subdirectories = self._list_directory(stack.pop(), base_dir)
+            for lang in sorted(groups):
+                files = groups[lang]
+                expected = self._carry.get(lang, 0.0) + len(files) * self.sample_ratio
+                count = min(len(files), int(expected + 1e-9))
+                self._carry[lang] = expected - count
+                sampled.extend(files[:count])
+            stack.extend(reversed(subdirectories))
+        return sampled
+
+    def sample(self) -> List[str]:
+        """
+        ファイルを抽出
+
+        Returns:
+            List[str]: 抽出した重複のないファイルパス（文字列順）
+        """
+        roots = [d for d in self.collector.directories if not self.collector.should_ignore(d, d)]
+        if self.sample_size is not None:
+            sampled = self._fill_quota([lambda count, d=d: self._sample_quota(d, d, count) for d in roots],
+                                       self.sample_size)
+        else:
+            sampled = []
+            for directory in roots:
+                sampled.extend(self._sample_ratio(directory, directory))
+
+        logger.info(f"Sampled {len(sampled)} files from {self.scanned_directories} directories")
+        return sorted(set(sampled))
@@ -0,0 +1,258 @@
+"""ファイル内容の識別子から収集対象ファイルを検索する転置インデックスモジュール"""
+import os
+import re
+import gzip
+import json
+import logging
+from typing import Dict, Iterable, List, Set, Tuple
+from .exceptions import SearchIndexError
+
+logger = logging.getLogger(__name__)
+
+# 既定の検索インデックスのファイル名（最初の収集対象ディレクトリに置く）
+SEARCH_INDEX_NAME = '.codest-search.json.gz'
+
+# 索引に登録する単語（識別子）と、キャメルケース・スネークケースの構成要素
+_WORD_RE = re.compile(rb'[A-Za-z_][A-Za-z0-9_]*')
+_QUERY_WORD_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+_PART_RE = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+')
+MIN_TOKEN_LENGTH = 2
+
+
+def default_search_index_path(directories: List[str]) -> str:
+    """
+    収集対象ディレクトリに対応する既定の検索インデックスのパスを取得
+
+    Args:
+        directories (List[str]): 収集対象ディレクトリ
+
+    Returns:
+        str: 検索インデックスのパス
+    """
+    return os.path.join(os.path.abspath(directories[0]), SEARCH_INDEX_NAME)
+
+
+def _word_tokens(word: str, tokens: Set[str]) -> None:
+    """単語そのものと構成要素を小文字でトークンに追加"""
+    tokens.add(word.lower())
+    for part in _PART_RE.findall(word):
+        if len(part) >= MIN_TOKEN_LENGTH:
+            tokens.add(part.lower())
+
+
+def tokenize(data: bytes) -> Set[str]:
+    """
+    ファイル内容から索引に登録するトークンを抽出
+
+    識別子（小文字化）と、キャメルケース・スネークケースで分割した構成要素を登録する。
+    例: PaymentClient -> paymentclient, payment, client
+
+    Args:
+        data (bytes): ファイル内容
+
+    Returns:
+        Set[str]: トークンのセット
+    """
+    tokens: Set[str] = set()
+    for word in set(_WORD_RE.findall(data)):
+        if len(word) >= MIN_TOKEN_LENGTH:
+            _word_tokens(word.decode('ascii'), tokens)
+    return tokens
+
+
+def query_tokens(query: str) -> List[str]:
+    """
+    検索語から照合するトークンを抽出
+
+    Args:
+        query (str): 検索語（空白区切りの複数語はすべてを含むファイルに一致）
+
+    Returns:
+        List[str]: トークンのリスト
+
+    Raises:
+        SearchIndexError: 検索語に識別子が含まれない場合
+    """
+    tokens = [word.lower() for word in _QUERY_WORD_RE.findall(query) if len(word) >= MIN_TOKEN_LENGTH]
+    if not tokens:
+        raise SearchIndexError(f"Query contains no searchable words: {query!r}")
+    return tokens
+
+
+class SearchIndex:
+    VERSION = 1
+
+    def __init__(self, directories: List[str] = None):
+        """
+        トークンからファイルへの転置インデックス
+
+        Args:
+            directories (List[str], optional): 索引を作成した収集対象ディレクトリ
+        """
+        self.directories = [os.path.abspath(d) for d in (directories or [])]
+        # ファイルID -> [パス, サイズ, 更新時刻(ns)]
+        self.files: List[List] = []
+        # トークン -> 昇順のファイルIDのリスト
+        self.postings: Dict[str, List[int]] = {}
+
+    def update(self, file_paths: Iterable[str], max_file_size_bytes: int = None) -> Tuple[int, int, int]:
+        """
+        statが変化したファイルのみ読み込んで索引を更新
+
+        Args:
+            file_paths (Iterable[str]): 現在の収集対象ファイルのパス
+            max_file_size_bytes (int, optional): これを超えるファイルは内容を索引に登録しない
+
+        Returns:
+            Tuple[int, int, int]: (追加, 更新, 削除) したファイル数
+        """
+        known = {entry[0]: file_id for file_id, entry in enumerate(self.files)}
+        keep: Set[int] = set()
+        pending: List[Tuple[str, int, int]] = []
+        updated = 0
+        for file_path in file_paths:
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            file_id = known.get(file_path)
+            if file_id is not None:
+                entry = self.files[file_id]
+                if entry[1] == stat.st_size and entry[2] == stat.st_mtime_ns:
+                    keep.add(file_id)
+                    continue
+                updated += 1
+            pending.append((file_path, stat.st_size, stat.st_mtime_ns))
+        removed = len(self.files) - len(keep) - updated
+
+        # 変化・削除されたファイルのIDを除き、残りのIDを詰め直す
+        if len(keep) < len(self.files):
+            remap = {old_id: new_id for new_id, old_id in enumerate(sorted(keep))}
+            self.files = [self.files[old_id] for old_id in sorted(keep)]
+            postings = {}
+            for token, ids in self.postings.items():
+                remapped = [remap[file_id] for file_id in ids if file_id in remap]
+                if remapped:
+                    postings[token] = remapped
+            self.postings = postings
+
+        for file_path, size, mtime_ns in pending:
+            file_id = len(self.files)
+            self.files.append([file_path, size, mtime_ns])
+            if max_file_size_bytes is not None and size > max_file_size_bytes:
+                continue
+            try:
+                with open(file_path, 'rb') as f:
+                    data = f.read()
+            except OSError as e:
+                logger.warning(f"Failed to index {file_path}: {str(e)}")
+                continue
+            for token in tokenize(data):
+                self.postings.setdefault(token, []).append(file_id)
+
+        added = len(pending) - updated
+        logger.debug(f"Search index updated: {added} added, {updated} updated, {removed} removed")
+        return added, updated, removed
+
+    def refresh(self, max_file_size_bytes: int = None) -> Tuple[int, int]:
+        """
+        索引済みのファイルのうちstatが変化したものを読み直し、削除されたものを除く
+        （ディレクトリは走査しないため、新しいファイルは索引の再作成まで検索されない）
+
+        Args:
+            max_file_size_bytes (int, optional): これを超えるファイルは内容を索引に登録しない
+
+        Returns:
+            Tuple[int, int]: (更新, 削除) したファイル数
+        """
+        _, updated, removed = self.update([entry[0] for entry in self.files], max_file_size_bytes)
+        return updated, removed
+
+    def search(self, query: str) -> List[str]:
+        """
+        検索語のすべての語を含むファイルを取得
+
+        Args:
+            query (str): 検索語
+
+        Returns:
+            List[str]: 一致したファイルのパス（文字列順）
+
+        Raises:
+            SearchIndexError: 検索語に識別子が含まれない場合
+        """
+        # 出現ファイル数の少ないトークンから積集合を取る
+        postings = sorted((self.postings.get(token, []) for token in query_tokens(query)), key=len)
+        matched = set(postings[0])
+        for ids in postings[1:]:
+            if not matched:
+                break
+            matched.intersection_update(ids)
+        return sorted(self.files[file_id][0] for file_id in matched)
+
+    def save(self, index_path: str) -> None:
+        """
+        検索インデックスを書き込み（gzip圧縮したJSON、IDは差分で格納）
+
+        Args:
+            index_path (str): 検索インデックスのパス
+
+        Raises:
+            SearchIndexError: 書き込みに失敗した場合
+        """
+        tokens = {}
+        for token, ids in self.postings.items():
+            previous = 0
+            deltas = []
+            for file_id in ids:
+                deltas.append(file_id - previous)
+                previous = file_id
+            tokens[token] = deltas
+        data = {'version': self.VERSION, 'directories': self.directories, 'files': self.files, 'tokens': tokens}
+
+        # 書き込み途中のファイルを読み込まないよう一時ファイルから置き換える
+        temp_path = f"{index_path}.{os.getpid()}.tmp"
+        try:
+            with gzip.open(temp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temp_path, index_path)
+        except OSError as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise SearchIndexError(f"Failed to write search index {index_path}: {str(e)}")
+        logger.info(f"Search index written to: {index_path} "
+                    f"({len(self.files)} files, {len(self.postings)} tokens)")
+
+    @classmethod
+    def load(cls, index_path: str) -> 'SearchIndex':
+        """
+        検索インデックスを読み込み
+
+        Args:
+            index_path (str): 検索インデックスのパス
+
+        Returns:
+            SearchIndex: 読み込まれた検索インデックス
+
+        Raises:
+            SearchIndexError: 読み込みまたは解析に失敗した場合
+        """
+        try:
+            with gzip.open(index_path, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, EOFError, ValueError) as e:
+            raise SearchIndexError(f"Failed to load search index {index_path}: {str(e)}")
+
+        if not isinstance(data, dict) or data.get('version') != cls.VERSION:
+            raise SearchIndexError(f"Unsupported search index format: {index_path}")
+
+        index = cls(data.get('directories', []))
+        index.files = data.get('files', [])
+        for token, deltas in data.get('tokens', {}).items():
+            ids = []
+            previous = 0
+            for delta in deltas:
+                previous += delta
+                ids.append(previous)
+            index.postings[token] = ids
+        return index
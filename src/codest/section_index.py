@@ -0,0 +1,141 @@
+import os
+import json
+import fnmatch
+import logging
+from typing import BinaryIO, Dict, List
+from .exceptions import SectionIndexError
+
+logger = logging.getLogger(__name__)
+
+# インデックスファイルの拡張子
+INDEX_SUFFIX = '.index.json'
+
+
+def default_index_path(document_path: str) -> str:
+    """
+    ドキュメントに対応するインデックスファイルのパスを取得
+
+    Args:
+        document_path (str): ドキュメントのパス
+
+    Returns:
+        str: インデックスファイルのパス
+    """
+    return document_path + INDEX_SUFFIX
+
+
+class SectionIndex:
+    VERSION = 1
+
+    def __init__(self, document_size: int = 0, sections: List[Dict] = None):
+        """
+        出力ドキュメント内の各セクションのバイト位置のインデックス
+
+        Args:
+            document_size (int, optional): ドキュメント全体のバイト数
+            sections (List[Dict], optional): セクション情報（name, offset, length）のリスト
+        """
+        self.document_size = document_size
+        self.sections = sections or []
+
+    def add(self, name: str, offset: int, length: int) -> None:
+        """
+        セクションを追加
+
+        Args:
+            name (str): セクション名（ファイルの相対パス）
+            offset (int): ドキュメント先頭からのバイト位置
+            length (int): セクションのバイト数
+        """
+        self.sections.append({'name': name, 'offset': offset, 'length': length})
+
+    def find(self, patterns: List[str]) -> List[Dict]:
+        """
+        名前またはglobパターンに一致するセクションを取得
+
+        Args:
+            patterns (List[str]): セクション名またはglobパターンのリスト
+
+        Returns:
+            List[Dict]: 一致したセクション（ドキュメント内の順序）
+        """
+        normalized = [os.path.normpath(p) for p in patterns]
+        return [
+            section for section in self.sections
+            if any(section['name'] == p or fnmatch.fnmatchcase(section['name'], p) for p in normalized)
+        ]
+
+    def save(self, index_path: str) -> None:
+        """
+        インデックスファイルを書き込み
+
+        Args:
+            index_path (str): インデックスファイルのパス
+
+        Raises:
+            SectionIndexError: 書き込みに失敗した場合
+        """
+        data = {'version': self.VERSION, 'document_size': self.document_size, 'sections': self.sections}
+        try:
+            with open(index_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+        except OSError as e:
+            raise SectionIndexError(f"Failed to write index {index_path}: {str(e)}")
+        logger.info(f"Index written to: {index_path}")
+
+    @classmethod
+    def load(cls, index_path: str) -> 'SectionIndex':
+        """
+        インデックスファイルを読み込み
+
+        Args:
+            index_path (str): インデックスファイルのパス
+
+        Returns:
+            SectionIndex: 読み込まれたインデックス
+
+        Raises:
+            SectionIndexError: 読み込みまたは解析に失敗した場合
+        """
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise SectionIndexError(f"Failed to load index {index_path}: {str(e)}")
+
+        if not isinstance(data, dict) or data.get('version') != cls.VERSION:
+            raise SectionIndexError(f"Unsupported index format: {index_path}")
+        return cls(data.get('document_size', 0), data.get('sections', []))
+
+
+def extract_sections(document_path: str, patterns: List[str], output: BinaryIO,
+                     index_path: str = None) -> int:
+    """
+    インデックスを使って指定されたセクションのみをシークして読み出す
+
+    Args:
+        document_path (str): ドキュメントのパス
+        patterns (List[str]): セクション名またはglobパターンのリスト
+        output (BinaryIO): 出力先
+        index_path (str, optional): インデックスファイルのパス（省略時はドキュメント名から決定）
+
+    Returns:
+        int: 出力したセクション数
+
+    Raises:
+        SectionIndexError: インデックスがドキュメントと一致しない場合
+    """
+    index = SectionIndex.load(index_path or default_index_path(document_path))
+
+    document_size = os.path.getsize(document_path)
+    if document_size != index.document_size:
+        raise SectionIndexError(
+            f"Index does not match document {document_path} "
+            f"(expected {index.document_size} bytes, found {document_size})")
+
+    sections = index.find(patterns)
+    with open(document_path, 'rb') as f:
+        for section in sections:
+            f.seek(section['offset'])
+            output.write(f.read(section['length']))
+    return len(sections)
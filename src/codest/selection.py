@@ -0,0 +1,233 @@
+import os
+import re
+import math
+import time
+import logging
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from .constants import DEFAULT_PRIORITY_WEIGHTS, DEFAULT_EXTENSION_WEIGHTS, ENTRY_POINT_NAMES
+
+logger = logging.getLogger(__name__)
+
+# トークン数をバイト数に換算する係数（1トークンあたりの平均バイト数）
+BYTES_PER_TOKEN = 4
+
+# セクション見出し・コードブロック記号等の1ファイルあたりの固定コスト（バイト）
+SECTION_OVERHEAD_BYTES = 32
+
+# スキップされるファイルのセクションのコスト（バイト）
+SKIPPED_SECTION_BYTES = 160
+
+# 先頭・末尾のみ出力するファイルの注記・省略記号のコスト（バイト）
+EXCERPT_SECTION_BYTES = 192
+
+# 目次の1項目のパス以外の記号のコスト（バイト、パスはリンク先のアンカーと合わせて2回出力される）
+TOC_ENTRY_BYTES = 16
+
+# コスト当たりの価値を計算する際のコストの下限（極小ファイルが過度に優先されるのを防ぐ）
+MIN_COST_BYTES = 1024
+
+_SIZE_RE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([kKmMgG]?)(i?[bB])?\s*$')
+_SIZE_UNITS = {'': 1, 'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3}
+
+
+def parse_size(value: str) -> int:
+    """
+    サイズ指定の文字列をバイト数に変換
+
+    Args:
+        value (str): サイズ（例: "500000", "512K", "2MB"）
+
+    Returns:
+        int: バイト数
+
+    Raises:
+        ValueError: 形式が不正な場合
+    """
+    match = _SIZE_RE.match(value)
+    if match is None:
+        raise ValueError(f"Invalid size: {value}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).lower()])
+
+
+def parse_weights(value: str) -> Dict[str, float]:
+    """
+    `name=value,...` 形式の重み指定を解析
+
+    Args:
+        value (str): 重み指定の文字列（例: "recency=2,size=0"）
+
+    Returns:
+        Dict[str, float]: シグナル名から重みへの辞書
+
+    Raises:
+        ValueError: 形式が不正、または未知のシグナル名の場合
+    """
+    weights = {}
+    for item in filter(None, (part.strip() for part in value.split(','))):
+        name, sep, weight = item.partition('=')
+        if not sep or name not in DEFAULT_PRIORITY_WEIGHTS:
+            raise ValueError(f"Invalid priority weight: {item}")
+        weights[name] = float(weight)
+    return weights
+
+
+def toc_entry_bytes(rel_path: str) -> int:
+    """
+    目次の1項目のバイト数の上限（パスはリンク先のアンカー・エスケープを含めて最大2回分）
+
+    Args:
+        rel_path (str): 表示用の相対パス
+
+    Returns:
+        int: バイト数
+    """
+    return 2 * len(rel_path.encode('utf-8', 'surrogateescape')) + TOC_ENTRY_BYTES
+
+
+class BudgetSelector:
+    def __init__(
+            self,
+            budget_bytes: int,
+            weights: Dict[str, float] = None,
+            extension_weights: Dict[str, float] = None,
+            entry_point_names: Set[str] = None,
+            max_file_size_bytes: int = None,
+            excerpt_bytes: int = None,
+            reserved_bytes: int = 0,
+            toc: bool = False,
+            section_overhead_bytes: int = SECTION_OVERHEAD_BYTES,
+            content_ratio: float = 1.0,
+            now: float = None
+    ):
+        """
+        BudgetSelectorの初期化
+
+        Args:
+            budget_bytes (int): 出力全体の予算（バイト）
+            weights (Dict[str, float], optional): シグナルごとの重み（未指定のシグナルはデフォルト値）
+            extension_weights (Dict[str, float], optional): 拡張子ごとの優先度
+            entry_point_names (Set[str], optional): エントリポイントとみなすファイル名
+            max_file_size_bytes (int, optional): これを超えるファイルはスキップされるものとしてコストを見積もる
+            excerpt_bytes (int, optional): 指定時はmax_file_size_bytesを超えるファイルを先頭・末尾のこのバイト数ずつ
+                出力するものとしてコストを見積もる
+            reserved_bytes (int, optional): ヘッダー等のファイル以外の出力として予算から差し引くバイト数
+            toc (bool, optional): 目次を出力するかどうか（各ファイルのコストに目次の項目を含める）
+            section_overhead_bytes (int, optional): 出力形式の1セクションあたりの固定バイト数
+            content_ratio (float, optional): 出力形式のエスケープによる内容の増加率
+            now (float, optional): 更新時刻の比較基準（UNIX時刻）
+        """
+        self.budget_bytes = budget_bytes
+        self.weights = dict(DEFAULT_PRIORITY_WEIGHTS)
+        self.weights.update(weights or {})
+        self.extension_weights = extension_weights or DEFAULT_EXTENSION_WEIGHTS
+        self.entry_point_names = entry_point_names or ENTRY_POINT_NAMES
+        self.max_file_size_bytes = max_file_size_bytes
+        self.excerpt_bytes = excerpt_bytes
+        self.reserved_bytes = reserved_bytes
+        self.toc = toc
+        self.section_overhead_bytes = section_overhead_bytes
+        self.content_ratio = content_ratio
+        self.now = now if now is not None else time.time()
+        self.used_bytes = 0
+
+    def estimate_cost(self, rel_path: str, size: int) -> int:
+        """
+        ファイルのセクションが出力に占めるバイト数を見積もり
+
+        Args:
+            rel_path (str): 表示用の相対パス
+            size (int): ファイルサイズ（バイト）
+
+        Returns:
+            int: 見積もりバイト数
+        """
+        toc_bytes = toc_entry_bytes(rel_path) if self.toc else 0
+        if self.max_file_size_bytes is not None and size > self.max_file_size_bytes:
+            if self.excerpt_bytes is not None:
+                return (math.ceil(min(size, 2 * self.excerpt_bytes) * self.content_ratio) + EXCERPT_SECTION_BYTES
+                        + self.section_overhead_bytes + len(rel_path) + toc_bytes)
+            return SKIPPED_SECTION_BYTES + len(rel_path) + toc_bytes
+        return math.ceil(size * self.content_ratio) + self.section_overhead_bytes + len(rel_path) + toc_bytes
+
+    def score(self, rel_path: str, stat: os.stat_result) -> float:
+        """
+        statの情報のみからファイルの優先度を計算（ファイル内容は読まない）
+
+        Args:
+            rel_path (str): 収集対象ディレクトリからの相対パス
+            stat (os.stat_result): ファイルのstat情報
+
+        Returns:
+            float: 優先度スコア（大きいほど優先）
+        """
+        depth = rel_path.count(os.sep)
+        age_days = max(self.now - stat.st_mtime, 0) / 86400
+        name, ext = os.path.splitext(os.path.basename(rel_path))
+
+        signals = {
+            'depth': 1.0 / (1 + depth),
+            'recency': math.exp(-age_days / 30),
+            'size': 1.0 / (1 + math.log2(1 + stat.st_size / 1024)),
+            'extension': self.extension_weights.get(ext.lower(), 0.5),
+            'entry_point': 1.0 if name in self.entry_point_names else 0.0,
+        }
+        return sum(self.weights.get(key, 0.0) * value for key, value in signals.items())
+
+    def select(self, file_paths: List[str], rel_path_of: Callable[[str], str]) -> List[str]:
+        """
+        予算内に収まるよう優先度の高いファイルを選択
+
+        ヘッダー等の分を予算から差し引いた上で、コスト当たりの価値の高い順に貪欲に選択し
+        （ナップサック問題の貪欲解）、残りの予算に収まるファイルがあれば続けて追加する。
+
+        Args:
+            file_paths (List[str]): 候補となるファイルパス（ソート済み）
+            rel_path_of (Callable[[str], str]): ファイルパスから表示用の相対パスを得る関数
+
+        Returns:
+            List[str]: 選択されたファイルパス（元の順序を維持）
+        """
+        candidates: List[Tuple[float, float, int, str]] = []
+        for file_path in file_paths:
+            try:
+                stat = os.stat(file_path)
+            except OSError as e:
+                logger.debug(f"Failed to stat {file_path}: {e}")
+                continue
+            rel_path = rel_path_of(file_path)
+            value = self.score(rel_path, stat)
+            cost = self.estimate_cost(rel_path, stat.st_size)
+            candidates.append((value / max(cost, MIN_COST_BYTES), value, cost, file_path))
+
+        candidates.sort(key=lambda c: (-c[0], -c[1], c[3]))
+
+        remaining = max(self.budget_bytes - self.reserved_bytes, 0)
+        selected = set()
+        for _, _, cost, file_path in candidates:
+            if cost <= remaining:
+                selected.add(file_path)
+                remaining -= cost
+
+        # ヘッダー等の分も含めた出力全体の見積もり
+        self.used_bytes = self.budget_bytes - remaining
+        logger.info(f"Selected {len(selected)} of {len(file_paths)} files "
+                    f"within budget ({self.used_bytes}/{self.budget_bytes} bytes)")
+        return [p for p in file_paths if p in selected]
+
+
+def budget_from_options(budget: Optional[str], budget_tokens: Optional[int]) -> Optional[int]:
+    """
+    CLIオプションから予算（バイト）を算出
+
+    Args:
+        budget (str, optional): バイト数での予算（K/M接尾辞可）
+        budget_tokens (int, optional): トークン数での予算
+
+    Returns:
+        Optional[int]: 予算（バイト）、指定がない場合はNone
+    """
+    if budget is not None:
+        return parse_size(budget)
+    if budget_tokens is not None:
+        return budget_tokens * BYTES_PER_TOKEN
+    return None
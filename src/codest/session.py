@@ -0,0 +1,289 @@
+"""ライブラリとして繰り返しドキュメントを生成するためのセッションモジュール"""
+import os
+import threading
+import logging
+from typing import Any, Dict, Iterator, List, Tuple, Union
+from .content_cache import ContentCache, DEFAULT_CONTENT_CACHE_BYTES
+from .document_generator import DocumentGenerator
+from .exceptions import FileCollectionError
+from .file_collector import FileCollector
+from .gitignore import GitIgnoreCache
+from .normalize_paths import is_subdirectory
+from .outline import OutlineCache
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotCollector(FileCollector):
+    def __init__(self, collector: FileCollector, directories: List[str], files: List[str]):
+        """
+        セッションのスナップショットから列挙するコレクタ（ディレクトリを走査しない）
+
+        無視パターン・.gitignoreの判定は元のコレクタの解析済みの状態を共有する。
+
+        Args:
+            collector (FileCollector): 元のコレクタ
+            directories (List[str]): 収集対象ディレクトリ（相対パスの基準）
+            files (List[str]): 列挙するファイルの絶対パス（文字列順）
+        """
+        self.__dict__.update(collector.__dict__)
+        self.directories = directories
+        self._files = files
+
+    def iter_files(self) -> Iterator[str]:
+        return iter(self._files)
+
+
+class CodestSession:
+    def __init__(
+            self,
+            directories: Union[str, List[str]],
+            exclude_dirs: List[str] = None,
+            content_cache_bytes: int = DEFAULT_CONTENT_CACHE_BYTES,
+            **generator_options
+    ):
+        """
+        解析済みの無視ルール・ファイル一覧のスナップショット・内容のキャッシュを保持し、
+        ルート配下の任意のサブセットやサブディレクトリのドキュメントを繰り返し生成するセッション
+
+        ファイル一覧はディレクトリごとに更新時刻とともに保持し、再走査時は更新時刻が
+        変わったディレクトリのみを一覧し直す。.gitignoreが変更された場合は無視ルールを
+        解析し直してすべてのディレクトリを一覧し直す。
+
+        Args:
+            directories (Union[str, List[str]]): 収集対象のルートディレクトリ
+            exclude_dirs (List[str], optional): 除外するディレクトリリスト
+            content_cache_bytes (int, optional): ファイル内容のキャッシュの最大バイト数
+            **generator_options: すべての生成に共通するDocumentGeneratorの引数
+
+        Raises:
+            FileCollectionError: ディレクトリが存在しない場合
+        """
+        if isinstance(directories, str):
+            directories = [directories]
+
+        self.directories = [os.path.abspath(d) for d in directories]
+        self.exclude_dirs = exclude_dirs
+        self.generator_options = generator_options
+        self.gitignore_cache = GitIgnoreCache()
+        self.content_cache = ContentCache(content_cache_bytes)
+        self.outline_cache = OutlineCache()
+        self.collector = FileCollector(self.directories, exclude_dirs, gitignore_cache=self.gitignore_cache)
+        # ディレクトリ -> (更新時刻, 収集対象ファイル, 無視されないサブディレクトリ)
+        self._listings: Dict[str, Tuple[int, List[str], List[str]]] = {}
+        # ファイル -> (サイズ, 更新時刻)
+        self._stats: Dict[str, Tuple[int, int]] = {}
+        self._files: List[str] = []
+        self._lock = threading.Lock()
+        self._refreshed = False
+        # 直近の再走査で一覧し直したディレクトリ数
+        self.rescanned_directories = 0
+
+    def _reload_ignore_rules(self) -> bool:
+        """
+        .gitignoreが変更されたルートの無視ルールを解析し直す
+
+        Returns:
+            bool: 無視ルールが変わった場合True
+        """
+        changed = False
+        for directory in self.directories:
+            handler = self.gitignore_cache.get(directory)
+            if self.collector.gitignore_handlers.get(directory) is not handler:
+                self.collector.gitignore_handlers[directory] = handler
+                changed = True
+        return changed
+
+    def _list_directory(self, directory: str, base_dir: str) -> Tuple[List[str], List[str]]:
+        """
+        ディレクトリ直下の収集対象ファイルとサブディレクトリを取得（更新時刻が同じなら前回の結果）
+
+        Args:
+            directory (str): 対象ディレクトリ
+            base_dir (str): 収集対象のルートディレクトリ
+
+        Returns:
+            Tuple[List[str], List[str]]: (ファイルパス, サブディレクトリ)
+        """
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return [], []
+        cached = self._listings.get(directory)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1], cached[2]
+
+        self.rescanned_directories += 1
+        files, subdirectories = [], []
+        for path, is_dir in self.collector._scan_sorted(directory):
+            if is_dir:
+                if not self.collector.should_ignore(path, base_dir):
+                    subdirectories.append(path)
+            elif any(path.endswith(ext) for ext in self.collector.file_extensions):
+                if not self.collector.should_ignore(path, base_dir):
+                    files.append(path)
+        self._listings[directory] = (mtime_ns, files, subdirectories)
+        return files, subdirectories
+
+    def refresh(self) -> Dict[str, int]:
+        """
+        ファイル一覧とstat情報のスナップショットを更新
+
+        Returns:
+            Dict[str, int]: 前回からの added, modified, removed のファイル数と
+                一覧し直したディレクトリ数（rescanned_directories）
+        """
+        with self._lock:
+            if self._reload_ignore_rules() and self._listings:
+                logger.info("Ignore rules changed; rescanning all directories")
+                self._listings.clear()
+
+            self.rescanned_directories = 0
+            files = set()
+            visited = set()
+            for root in self.directories:
+                if self.collector.should_ignore(root, root):
+                    continue
+                stack = [root]
+                while stack:
+                    directory = stack.pop()
+                    visited.add(directory)
+                    directory_files, subdirectories = self._list_directory(directory, root)
+                    files.update(directory_files)
+                    stack.extend(subdirectories)
+            # 削除されたディレクトリの一覧を破棄
+            for directory in set(self._listings) - visited:
+                del self._listings[directory]
+
+            stats = {}
+            added = modified = 0
+            for file_path in files:
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                stats[file_path] = (stat.st_size, stat.st_mtime_ns)
+                previous = self._stats.get(file_path)
+                if previous is None:
+                    added += 1
+                elif previous != stats[file_path]:
+                    modified += 1
+            removed = len(set(self._stats) - set(stats))
+
+            self._stats = stats
+            self._files = sorted(stats)
+            self._refreshed = True
+            changes = {'added': added, 'modified': modified, 'removed': removed,
+                       'rescanned_directories': self.rescanned_directories}
+            logger.info(f"Session refreshed: {added} added, {modified} modified, {removed} removed "
+                        f"({self.rescanned_directories} directories rescanned)")
+            return changes
+
+    def files(self, subdirectory: str = None) -> List[str]:
+        """
+        スナップショットのファイル一覧を取得
+
+        Args:
+            subdirectory (str, optional): 指定時はこのディレクトリ配下のファイルのみ
+
+        Returns:
+            List[str]: ファイルの絶対パス（文字列順）
+
+        Raises:
+            FileCollectionError: サブディレクトリがルート配下にない場合
+        """
+        if not self._refreshed:
+            self.refresh()
+        files = self._files
+        if subdirectory is not None:
+            subdirectory = self._resolve_subdirectory(subdirectory)
+            prefix = subdirectory.rstrip(os.sep) + os.sep
+            files = [f for f in files if f.startswith(prefix)]
+        return files
+
+    def _resolve_subdirectory(self, subdirectory: str) -> str:
+        """ルートからの相対パスまたは絶対パスのサブディレクトリを解決"""
+        candidates = ([subdirectory] if os.path.isabs(subdirectory)
+                      else [os.path.join(root, subdirectory) for root in self.directories])
+        for candidate in candidates:
+            candidate = os.path.abspath(candidate)
+            if os.path.isdir(candidate) and any(candidate == root or is_subdirectory(root, candidate)
+                                                for root in self.directories):
+                return candidate
+        raise FileCollectionError(f"Not a directory under the session roots: {subdirectory}")
+
+    def _resolve_paths(self, paths: List[str]) -> List[str]:
+        """ルートからの相対パスまたは絶対パスのファイルのうちスナップショットにあるものを取得"""
+        selected = set()
+        for path in paths:
+            candidates = ([path] if os.path.isabs(path)
+                          else [os.path.join(root, path) for root in self.directories])
+            for candidate in candidates:
+                candidate = os.path.abspath(candidate)
+                if candidate in self._stats:
+                    selected.add(candidate)
+                    break
+            else:
+                logger.warning(f"File is not collected in this session: {path}")
+        return sorted(selected)
+
+    def generator(self, paths: List[str] = None, subdirectory: str = None, refresh: bool = True,
+                  **options) -> DocumentGenerator:
+        """
+        セッションの状態を共有するDocumentGeneratorを作成
+
+        Args:
+            paths (List[str], optional): 出力するファイル（ルートからの相対パスまたは絶対パス）
+            subdirectory (str, optional): 出力するサブディレクトリ（パスはこのディレクトリからの相対パスになる）
+            refresh (bool, optional): 作成前にスナップショットを更新するかどうか
+            **options: DocumentGeneratorの引数（セッション共通の引数より優先）
+
+        Returns:
+            DocumentGenerator: ドキュメント生成器
+
+        Raises:
+            FileCollectionError: サブディレクトリがルート配下にない場合
+        """
+        if refresh or not self._refreshed:
+            self.refresh()
+        directories = self.directories
+        files = self.files(subdirectory)
+        if subdirectory is not None:
+            directories = [self._resolve_subdirectory(subdirectory)]
+        if paths is not None:
+            selected = set(self._resolve_paths(paths))
+            files = [f for f in files if f in selected]
+
+        kwargs: Dict[str, Any] = dict(self.generator_options)
+        kwargs.update(options)
+        kwargs.setdefault('content_cache', self.content_cache)
+        kwargs.setdefault('outline_cache', self.outline_cache)
+        return DocumentGenerator(
+            directories=directories,
+            collector=SnapshotCollector(self.collector, directories, files),
+            **kwargs
+        )
+
+    def generate(self, output_file: str = None, paths: List[str] = None, subdirectory: str = None,
+                 to_clipboard: bool = False, refresh: bool = True,
+                 **options) -> Union[str, Tuple[str, str]]:
+        """
+        ルート全体・サブディレクトリ・ファイルのサブセットのドキュメントを生成
+
+        Args:
+            output_file (str, optional): 出力ファイルパス
+            paths (List[str], optional): 出力するファイル（ルートからの相対パスまたは絶対パス）
+            subdirectory (str, optional): 出力するサブディレクトリ
+            to_clipboard (bool, optional): クリップボードにコピーするかどうか
+            refresh (bool, optional): 生成前にスナップショットを更新するかどうか
+            **options: DocumentGeneratorの引数（セッション共通の引数より優先）
+
+        Returns:
+            Union[str, Tuple[str, str]]: DocumentGenerator.generate()の結果
+
+        Raises:
+            FileCollectionError: サブディレクトリがルート配下にない場合
+            DocumentGenerationError: ドキュメント生成に失敗した場合
+        """
+        generator = self.generator(paths, subdirectory, refresh, **options)
+        return generator.generate(output_file, to_clipboard)
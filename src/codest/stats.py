@@ -0,0 +1,164 @@
+"""言語別・ディレクトリ別の行数・バイト数・ファイル数の集計モジュール"""
+import os
+import re
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional
+from .constants import MARKDOWN_LANGUAGE_MAP
+
+logger = logging.getLogger(__name__)
+
+# 空白のみの行（\r\nの\rを含む）
+_BLANK_LINE_RE = re.compile(rb'^[ \t\f\v\r]*$', re.MULTILINE)
+
+# 集計の列
+STAT_FIELDS = ('files', 'bytes', 'lines', 'code', 'blank')
+
+
+def count_lines(data: bytes) -> Dict[str, int]:
+    """
+    読み込み済みのバイト列から行数を数える（デコードしない）
+
+    Args:
+        data (bytes): ファイル内容
+
+    Returns:
+        Dict[str, int]: lines（総行数）, code（空白以外の行数）, blank（空白のみの行数）
+    """
+    lines = data.count(b'\n')
+    blank = len(_BLANK_LINE_RE.findall(data))
+    if data.endswith(b'\n') or not data:
+        # 末尾の改行の後の空文字列は行として数えない
+        blank -= 1
+    else:
+        lines += 1
+    return {'lines': lines, 'code': lines - blank, 'blank': blank}
+
+
+def _language(rel_path: str) -> str:
+    ext = os.path.splitext(rel_path)[1].lower()
+    return MARKDOWN_LANGUAGE_MAP.get(ext, ext[1:] if ext else 'other')
+
+
+def _top_directory(rel_path: str) -> str:
+    parts = rel_path.replace('\\', '/').split('/')
+    return parts[0] if len(parts) > 1 else '.'
+
+
+class CodebaseStats:
+    def __init__(self):
+        """言語別・最上位ディレクトリ別の集計"""
+        self.totals = dict.fromkeys(STAT_FIELDS, 0)
+        self.by_language: Dict[str, Dict[str, int]] = {}
+        self.by_directory: Dict[str, Dict[str, int]] = {}
+        # 内容を読み込まなかった（行数を数えていない）ファイル数
+        self.unread_files = 0
+
+    def add_counts(self, rel_path: str, values: Dict[str, int]) -> None:
+        """
+        集計済みの値を追加
+
+        Args:
+            rel_path (str): ファイルの相対パス
+            values (Dict[str, int]): STAT_FIELDSの一部の値
+        """
+        for table in (self.by_language.setdefault(_language(rel_path), dict.fromkeys(STAT_FIELDS, 0)),
+                      self.by_directory.setdefault(_top_directory(rel_path), dict.fromkeys(STAT_FIELDS, 0)),
+                      self.totals):
+            for key, value in values.items():
+                table[key] += value
+
+    def add(self, rel_path: str, data: bytes) -> None:
+        """
+        読み込み済みのファイル内容を集計に追加
+
+        Args:
+            rel_path (str): ファイルの相対パス
+            data (bytes): ファイル内容
+        """
+        values = count_lines(data)
+        values['files'] = 1
+        values['bytes'] = len(data)
+        self.add_counts(rel_path, values)
+
+    def add_unread(self, rel_path: str, size: int) -> None:
+        """
+        内容を読み込まなかったファイル（サイズ超過等）をファイル数・バイト数のみ集計に追加
+
+        Args:
+            rel_path (str): ファイルの相対パス
+            size (int): ファイルサイズ（バイト）
+        """
+        self.unread_files += 1
+        self.add_counts(rel_path, {'files': 1, 'bytes': size})
+
+    def to_dict(self) -> Dict:
+        """
+        集計結果を辞書に変換
+
+        Returns:
+            Dict: totals, languages, directories（言語・ディレクトリは行数の多い順）
+        """
+        def ordered(table: Dict[str, Dict[str, int]]) -> Dict[str, Dict[str, int]]:
+            return dict(sorted(table.items(), key=lambda item: (-item[1]['lines'], -item[1]['bytes'], item[0])))
+
+        data = {'totals': dict(self.totals), 'languages': ordered(self.by_language),
+                'directories': ordered(self.by_directory)}
+        if self.unread_files:
+            data['unread_files'] = self.unread_files
+        return data
+
+    def format_table(self) -> str:
+        """
+        集計結果を表形式のテキストに変換
+
+        Returns:
+            str: 言語別・ディレクトリ別の表
+        """
+        data = self.to_dict()
+        lines = []
+        for title, table in (('Language', data['languages']), ('Directory', data['directories'])):
+            width = max([len(name) for name in table] + [len(title), len('Total')])
+            header = f"{title:<{width}}  " + '  '.join(f"{field.capitalize():>10}" for field in STAT_FIELDS)
+            lines.append(header)
+            lines.append('-' * len(header))
+            for name, values in list(table.items()) + [('Total', data['totals'])]:
+                lines.append(f"{name:<{width}}  " + '  '.join(f"{values[field]:>10}" for field in STAT_FIELDS))
+            lines.append('')
+        if self.unread_files:
+            lines.append(f"{self.unread_files} files were not read; their lines are not counted")
+        return '\n'.join(lines).rstrip('\n') + '\n'
+
+
+def scan_stats(file_paths: Iterable[str], rel_path: Callable[[str], str],
+               max_workers: Optional[int] = None) -> CodebaseStats:
+    """
+    ファイルを読み込み専用で並列に走査して集計（ドキュメントは生成しない）
+
+    Args:
+        file_paths (Iterable[str]): 対象ファイルのパス
+        rel_path (Callable[[str], str]): 絶対パスから表示用の相対パスへの変換
+        max_workers (int, optional): 読み込みのスレッド数（省略時はCPU数）
+
+    Returns:
+        CodebaseStats: 集計結果
+    """
+    def read(file_path: str):
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            logger.warning(f"Failed to read {file_path}: {str(e)}")
+            return file_path, None
+        # 内容は保持せず行数のみを返す
+        values = count_lines(data)
+        values['files'] = 1
+        values['bytes'] = len(data)
+        return file_path, values
+
+    stats = CodebaseStats()
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1) as executor:
+        for file_path, values in executor.map(read, file_paths):
+            if values is not None:
+                stats.add_counts(rel_path(file_path), values)
+    return stats
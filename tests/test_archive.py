@@ -0,0 +1,101 @@
+import io
+import tarfile
+import zipfile
+import pytest
+from codest.archive import is_archive, iter_archive_members
+from codest.document_generator import DocumentGenerator
+from codest.exceptions import FileCollectionError
+from codest.file_collector import FileCollector
+
+MEMBERS = {
+    'pkg-1.0/.gitignore': b'generated.py\n',
+    'pkg-1.0/src/main.py': b'print("main")\n',
+    'pkg-1.0/src/generated.py': b'x = 1\n',
+    'pkg-1.0/node_modules/lib/index.js': b'module.exports = 1;\n',
+    'pkg-1.0/data.bin': b'\x00\x01',
+    'pkg-1.0/README.md': b'# Package\n',
+}
+
+
+@pytest.fixture
+def zip_archive(tmp_path):
+    """テスト用のzipアーカイブを作成"""
+    path = tmp_path / 'pkg-1.0.zip'
+    with zipfile.ZipFile(path, 'w') as archive:
+        for name, data in MEMBERS.items():
+            archive.writestr(name, data)
+    return str(path)
+
+
+@pytest.fixture
+def tar_archive(tmp_path):
+    """テスト用のtar.gzアーカイブを作成（.gitignoreを先頭に格納）"""
+    path = tmp_path / 'pkg-1.0.tar.gz'
+    with tarfile.open(path, 'w:gz') as archive:
+        for name, data in MEMBERS.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return str(path)
+
+
+@pytest.mark.parametrize('archive_fixture', ['zip_archive', 'tar_archive'])
+def test_iter_archive_members(archive_fixture, request, tmp_path):
+    """フィルタを適用したメンバーの列挙をテスト"""
+    archive_path = request.getfixturevalue(archive_fixture)
+    collected = {member.name: read() for member, read in
+                 iter_archive_members(archive_path, FileCollector([]))}
+    assert collected == {
+        'pkg-1.0/README.md': b'# Package\n',
+        'pkg-1.0/src/main.py': b'print("main")\n',
+    }
+
+
+def test_is_archive(zip_archive, tmp_path):
+    """アーカイブの判定をテスト"""
+    assert is_archive(zip_archive)
+    assert not is_archive(str(tmp_path))
+    assert not is_archive(str(tmp_path / 'missing.tar.gz'))
+
+
+def test_invalid_archive(tmp_path):
+    """壊れたアーカイブはエラー"""
+    path = tmp_path / 'broken.tar.gz'
+    path.write_bytes(b'not an archive')
+    with pytest.raises(FileCollectionError):
+        list(iter_archive_members(str(path), FileCollector([])))
+
+
+def test_generate_from_archive(tar_archive, tmp_path):
+    """アーカイブからのドキュメント生成テスト"""
+    output_file = DocumentGenerator(
+        directories=[],
+        archives=[tar_archive]
+    ).generate(str(tmp_path / 'doc.md'))
+
+    with open(output_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+        assert '(archive)' in content
+        assert '- **Total files**: 2\n' in content
+        assert '### `pkg-1.0.tar.gz/pkg-1.0/src/main.py`' in content
+        assert 'print("main")' in content
+        assert 'generated.py' not in content
+        assert 'node_modules' not in content
+
+
+@pytest.mark.parametrize('archive_fixture', ['zip_archive', 'tar_archive'])
+def test_generate_from_archive_header_counts_members(archive_fixture, request, tmp_path):
+    """アーカイブのメンバーをヘッダーのファイル数と目次に含めるテスト"""
+    output_file = DocumentGenerator(
+        directories=[],
+        archives=[request.getfixturevalue(archive_fixture)],
+        toc=True
+    ).generate(str(tmp_path / 'doc.md'))
+
+    with open(output_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    assert content.startswith('# Source Code Collection\n')
+    assert '- **Total files**: 2\n' in content
+    toc = content[content.index('## Table of Contents'):content.index('## Source Files')]
+    assert '/pkg-1.0/src/main.py`](#' in toc
+    assert '/pkg-1.0/README.md`](#' in toc
@@ -0,0 +1,68 @@
+import pytest
+from codest.banners import BannerIndex, leading_comment_lines
+
+LICENSE = ['# Copyright (c) Example Corp.', '# Licensed under the Apache License, Version 2.0.',
+           '# You may not use this file except in compliance with the License.']
+
+
+def build_index(files, **kwargs):
+    """メモリ上のファイル内容から共通ヘッダーを検出"""
+    index = BannerIndex(**kwargs)
+    index.build(files, lambda name: files[name].encode('utf-8'))
+    return index
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('# a\n# b\n\nx = 1\n', (0, ['# a', '# b'])),
+    ('#!/bin/sh\n# a\necho hi\n', (1, ['# a'])),
+    ('/*\n * License\n */\nint x;\n', (0, ['/*', ' * License', ' */'])),
+    ('#include <stdio.h>\n', (0, [])),
+    ('// a\n// b\n/* unterminated\n', (0, [])),
+    ('x = 1\n# comment\n', (0, [])),
+])
+def test_leading_comment_lines(text, expected):
+    """先頭のコメント行の取得テスト"""
+    assert leading_comment_lines(text) == expected
+
+
+def test_shared_prefix_is_factored():
+    """ファイル固有のコメントが続く場合も共有部分のみを共通ヘッダーとするテスト"""
+    header = '\n'.join(LICENSE) + '\n'
+    files = {
+        'a.py': header + '# Module a helpers\n\nA = 1\n',
+        'b.py': header + '\nB = 2\n',
+        'c.py': '#!/usr/bin/env python\n' + header + 'C = 3\n',
+        'd.py': '# Only a short note\nD = 4\n',
+    }
+    index = build_index(files)
+    assert len(index.banners) == 1
+    assert index.banners[0].lines == LICENSE
+    assert index.banners[0].files == 3
+
+    removed = 0
+    for name, content in files.items():
+        stripped, banner = index.strip(name, content)
+        removed += len(content) - len(stripped)
+        if name == 'd.py':
+            assert banner is None and stripped == content
+    assert index.strip('a.py', files['a.py'])[0] == '# Module a helpers\n\nA = 1\n'
+    assert index.strip('b.py', files['b.py'])[0] == 'B = 2\n'
+    assert index.strip('c.py', files['c.py'])[0] == '#!/usr/bin/env python\nC = 3\n'
+    assert removed == index.expected_bytes
+
+
+def test_below_min_files_is_kept():
+    """共有するファイル数が足りない場合は除去しないテスト"""
+    header = '\n'.join(LICENSE) + '\n'
+    files = {'a.py': header + 'A = 1\n', 'b.py': header + 'B = 2\n'}
+    assert build_index(files).banners == []
+    assert len(build_index(files, min_files=2).banners) == 1
+
+
+def test_changed_content_is_not_stripped():
+    """検出後に先頭が変わったファイルはそのまま出力するテスト"""
+    header = '\n'.join(LICENSE) + '\n'
+    files = {name: header + 'x = 1\n' for name in ('a.py', 'b.py', 'c.py')}
+    index = build_index(files)
+    changed = '# Rewritten\nx = 1\n'
+    assert index.strip('a.py', changed) == (changed, None)
@@ -0,0 +1,138 @@
+import json
+import pytest
+from codest.batch import load_batch_config, options_to_argv, format_report, JobResult
+from codest.cli import main
+from codest.content_cache import ContentCache
+from codest.exceptions import BatchConfigError
+
+
+@pytest.fixture
+def services(tmp_path):
+    """共有ライブラリを含む複数サービスのプロジェクトを作成"""
+    for name in ('billing', 'search'):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / 'app.py').write_text(f'SERVICE = "{name}"\n')
+    (tmp_path / 'shared').mkdir()
+    (tmp_path / 'shared' / 'util.py').write_text('def helper():\n    return 1\n')
+    return tmp_path
+
+
+def write_config(path, config):
+    path.write_text(json.dumps(config))
+    return str(path)
+
+
+def test_options_to_argv(tmp_path):
+    """オプション辞書からコマンドライン引数への変換をテスト"""
+    argv = options_to_argv({'compact': True, 'toc': False, 'max_size': 100,
+                            'since': 'prev.json', 'priority-weights': 'size=0'}, str(tmp_path))
+    assert argv == ['--compact', '--max-size', '100', '--since', str(tmp_path / 'prev.json'),
+                    '--priority-weights', 'size=0']
+
+
+
+def test_options_to_argv_repeats_append_options(tmp_path):
+    """繰り返し指定するオプションは値ごとにフラグを繰り返し、パスは設定ファイルから解決する"""
+    argv = options_to_argv({'entry': ['a.py', 'b.py'], 'redact_pattern': ['x+', 'y+'],
+                            'exclude': ['build', 'dist'], 'import_cache': 'cache.json'}, str(tmp_path))
+    assert argv == ['--entry', str(tmp_path / 'a.py'), '--entry', str(tmp_path / 'b.py'),
+                    '--redact-pattern', 'x+', '--redact-pattern', 'y+',
+                    '--exclude', str(tmp_path / 'build'), str(tmp_path / 'dist'),
+                    '--import-cache', str(tmp_path / 'cache.json')]
+
+def test_load_batch_config(services):
+    """設定ファイルの読み込みと相対パスの解決をテスト"""
+    config = write_config(services / 'batch.json', {
+        'defaults': {'compact': True},
+        'jobs': [{'roots': ['billing', 'shared'], 'output': 'billing.md', 'options': {'toc': True}}],
+    })
+    jobs = load_batch_config(config)
+    assert len(jobs) == 1
+    assert jobs[0].name == 'billing'
+    assert jobs[0].argv == [str(services / 'billing'), str(services / 'shared'),
+                            '-o', str(services / 'billing.md'), '--compact', '--toc']
+
+
+def test_load_invalid_batch_config(services):
+    """不正な設定ファイルはエラー"""
+    with pytest.raises(BatchConfigError):
+        load_batch_config(write_config(services / 'batch.json', {'jobs': [{'roots': ['billing']}]}))
+    with pytest.raises(BatchConfigError):
+        load_batch_config(write_config(services / 'batch.json', [{'output': 'a.md'}]))
+    with pytest.raises(BatchConfigError):
+        load_batch_config(str(services / 'missing.json'))
+
+
+def test_batch_command(services):
+    """複数ジョブの実行とレポート出力をテスト"""
+    config = write_config(services / 'batch.json', {
+        'jobs': [
+            {'name': 'billing', 'roots': ['billing', 'shared'], 'output': 'billing.md'},
+            {'name': 'search', 'roots': ['search', 'shared'], 'output': 'search.md', 'options': {'toc': True}},
+        ],
+    })
+    report_path = services / 'report.json'
+    assert main(['batch', config, '--jobs', '2', '--report', str(report_path)]) == 0
+
+    billing = (services / 'billing.md').read_text(encoding='utf-8')
+    assert 'SERVICE = "billing"' in billing
+    assert 'def helper()' in billing
+    assert 'SERVICE = "search"' not in billing
+    assert '## Table of Contents' in (services / 'search.md').read_text(encoding='utf-8')
+
+    report = json.loads(report_path.read_text())
+    assert [(job['name'], job['status'], job['files']) for job in report['jobs']] == \
+        [('billing', 'ok', 2), ('search', 'ok', 2)]
+
+
+
+def test_batch_command_with_entries_from_other_directory(services, tmp_path_factory, monkeypatch):
+    """複数のエントリファイルを指定したジョブを設定ファイルと別のディレクトリから実行するテスト"""
+    (services / 'billing' / 'app.py').write_text('import util\n')
+    (services / 'billing' / 'worker.py').write_text('WORKER = 1\n')
+    (services / 'billing' / 'unused.py').write_text('UNUSED = 1\n')
+    (services / 'billing' / 'util.py').write_text('UTIL = 1\n')
+    config = write_config(services / 'batch.json', {
+        'jobs': [{'name': 'billing', 'roots': ['billing'], 'output': 'billing.md',
+                  'options': {'entry': ['billing/app.py', 'billing/worker.py'], 'import_cache': 'imports.json'}}],
+    })
+    monkeypatch.chdir(tmp_path_factory.mktemp('elsewhere'))
+    assert main(['batch', config]) == 0
+
+    billing = (services / 'billing.md').read_text(encoding='utf-8')
+    assert 'WORKER = 1' in billing
+    assert 'UTIL = 1' in billing
+    assert 'UNUSED' not in billing
+    assert (services / 'imports.json').exists()
+
+def test_batch_command_with_failed_job(services):
+    """失敗したジョブがあっても他のジョブは実行される"""
+    config = write_config(services / 'batch.json', {
+        'jobs': [
+            {'name': 'missing', 'roots': ['no-such-dir'], 'output': 'missing.md'},
+            {'name': 'billing', 'roots': ['billing'], 'output': 'billing.md'},
+        ],
+    })
+    assert main(['batch', config]) == 1
+    assert (services / 'billing.md').exists()
+
+
+def test_format_report():
+    """レポートの書式をテスト"""
+    report = format_report([JobResult('a', 'a.md', 1.5, 3, 100), JobResult('b', error='boom')])
+    assert 'FAILED' in report
+    assert '2 jobs, 1 failed' in report
+
+
+def test_shared_content_cache(tmp_path):
+    """同じファイルの読み込みが共有され、変更後は読み直されることをテスト"""
+    path = tmp_path / 'shared.py'
+    path.write_text('a = 1\n')
+    cache = ContentCache()
+    assert cache.read(str(path)) == b'a = 1\n'
+    assert cache.read(str(path)) == b'a = 1\n'
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    path.write_text('a = 22\n')
+    assert cache.read(str(path)) == b'a = 22\n'
+    assert cache.misses == 2
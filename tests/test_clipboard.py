@@ -0,0 +1,66 @@
+import sys
+import pytest
+from codest.clipboard import ClipboardSink, detect_clipboard_command
+from codest.exceptions import ClipboardError
+
+
+def copy_to_file_command(path):
+    """標準入力の内容をファイルに書き込む偽のクリップボードコマンド"""
+    return [sys.executable, '-c',
+            'import sys; data = sys.stdin.buffer.read(); open(sys.argv[1], "wb").write(data)',
+            str(path)]
+
+
+def test_sink_streams_chunks(tmp_path):
+    """書き込んだ内容が順にコマンドへ渡されることをテスト"""
+    target = tmp_path / 'clipboard'
+    with ClipboardSink(copy_to_file_command(target)) as sink:
+        sink.write('# タイトル\n')
+        sink.write('body\n')
+    assert target.read_text(encoding='utf-8') == '# タイトル\nbody\n'
+    assert sink.bytes_written == len('# タイトル\nbody\n'.encode('utf-8'))
+    # 上限を指定しない場合は内容を保持しない
+    assert sink.getvalue() is None
+
+
+def test_sink_keeps_text_within_limit(tmp_path):
+    """上限の指定時は書き込んだ内容を保持することをテスト"""
+    target = tmp_path / 'clipboard'
+    with ClipboardSink(copy_to_file_command(target), max_bytes=100) as sink:
+        sink.write('# タイトル\n')
+        sink.write('body\n')
+    assert sink.getvalue() == '# タイトル\nbody\n'
+
+
+def test_sink_size_limit(tmp_path):
+    """上限を超えるとコマンドを中断し、クリップボードを変更しない"""
+    target = tmp_path / 'clipboard'
+    with pytest.raises(ClipboardError):
+        with ClipboardSink(copy_to_file_command(target), max_bytes=10) as sink:
+            sink.write('12345')
+            sink.write('678901')
+    assert not target.exists()
+
+
+def test_sink_command_failure():
+    """コマンドが異常終了した場合はエラー"""
+    with pytest.raises(ClipboardError):
+        with ClipboardSink([sys.executable, '-c', 'import sys; sys.stdin.read(); sys.exit(3)']) as sink:
+            sink.write('content')
+
+
+def test_sink_missing_command():
+    """存在しないコマンドはエラー"""
+    with pytest.raises(ClipboardError):
+        ClipboardSink(['codest-no-such-clipboard-command'])
+
+
+def test_detect_prefers_wayland(monkeypatch):
+    """Waylandセッションではwl-copyを優先して検出"""
+    monkeypatch.setattr(sys, 'platform', 'linux')
+    monkeypatch.setenv('WAYLAND_DISPLAY', 'wayland-0')
+    monkeypatch.setattr('shutil.which', lambda name: '/usr/bin/' + name)
+    assert detect_clipboard_command() == ['wl-copy']
+
+    monkeypatch.delenv('WAYLAND_DISPLAY')
+    assert detect_clipboard_command() == ['xclip', '-selection', 'clipboard']
@@ -0,0 +1,68 @@
+import ast
+import pytest
+from codest.compaction import compact_python, compact_c_family, get_compactor
+
+
+def test_compact_python_removes_comments_and_docstrings():
+    """Pythonのコメント・docstring・空行の除去をテスト"""
+    source = '''#!/usr/bin/env python
+"""Module docstring."""
+import os  # comment
+
+
+def f(x):
+    """Function docstring."""
+    # standalone comment
+    return x
+'''
+    compacted = compact_python(source)
+    assert compacted == '#!/usr/bin/env python\nimport os\ndef f(x):\n    return x'
+
+
+def test_compact_python_keeps_semantics():
+    """docstringのみのブロックと複数行文字列の扱いをテスト"""
+    source = '''class A:
+    """Only a docstring."""
+
+
+def g():
+    s = """first
+
+    # not a comment   """
+    return s
+'''
+    compacted = compact_python(source)
+    assert 'class A:\n    pass' in compacted
+    assert '"""first\n\n    # not a comment   """' in compacted
+    assert ast.dump(ast.parse(compacted).body[1]) == ast.dump(ast.parse(source).body[1])
+
+
+def test_compact_python_invalid_source():
+    """字句解析できないソースはそのまま返す"""
+    source = 'def f(:\n    """unterminated'
+    assert compact_python(source) == source
+
+
+@pytest.mark.parametrize('language,source,expected', [
+    ('c', 'int a; // c\n\n/* block */ int b = "/* s */";\n', 'int a;\n  int b = "/* s */";'),
+    ('cpp', 'auto s = R"x(// raw)x"; // c\nint n = 1\'000; \n', 'auto s = R"x(// raw)x";\nint n = 1\'000;'),
+    ('java', 'String s = """\n  // text\n\n  """; // c\n', 'String s = """\n  // text\n\n  """;'),
+    ('go', 's := `// raw\n\n` /* a\nb */ x := 1\n', 's := `// raw\n\n`\n x := 1'),
+    ('rust', "/* a /* nested */ b */ fn f<'a>(s: &'a str) -> char { '\"' } // c\n",
+     "  fn f<'a>(s: &'a str) -> char { '\"' }"),
+    ('swift', 'let s = #"// raw"# // c\n', 'let s = #"// raw"#'),
+    ('csharp', 'var p = @"C:\\dir\\"; // c\n', 'var p = @"C:\\dir\\";'),
+    ('javascript', 'const r = /\\/\\/x/g; const d = a / b / c; // c\nlet t = `\n// t\n`;\n',
+     'const r = /\\/\\/x/g; const d = a / b / c;\nlet t = `\n// t\n`;'),
+])
+def test_compact_c_family(language, source, expected):
+    """C系言語のコメント・空行の除去をテスト"""
+    assert compact_c_family(source, language) == expected
+
+
+def test_get_compactor():
+    """言語に対応するコンパクション関数の取得をテスト"""
+    assert get_compactor('python') is compact_python
+    assert get_compactor('typescript')('let a = 1; // c') == 'let a = 1;'
+    assert get_compactor('markdown') is None
+    assert get_compactor('yaml') is None
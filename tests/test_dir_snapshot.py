@@ -0,0 +1,109 @@
+import os
+import pytest
+from codest.dir_snapshot import DirectorySnapshot
+from codest.file_collector import FileCollector
+
+
+def age(path, seconds=10):
+    """スナップショットに記録されるよう更新時刻を過去にずらす"""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - seconds * 1_000_000_000))
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """テスト用のディレクトリ構造を作成"""
+    root = tmp_path / 'repo'
+    for rel_path in ('app.py', 'pkg/core.py', 'pkg/sub/deep.py', 'web/index.js', 'pkg/notes.txt'):
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('x = 1\n')
+    for directory in ('pkg/sub', 'pkg', 'web', '.'):
+        age(root / directory)
+    return root
+
+
+def collect(root, snapshot):
+    return FileCollector([str(root)], dir_snapshot=snapshot).collect_files()
+
+
+def test_unchanged_directories_are_reused(tree, tmp_path):
+    """変更のないディレクトリは記録したエントリを使い、結果が同じになるテスト"""
+    path = str(tmp_path / 'dirs.json.gz')
+    expected = FileCollector([str(tree)]).collect_files()
+
+    first = DirectorySnapshot(path)
+    assert collect(tree, first) == expected
+    assert (first.reused_directories, first.rescanned_directories) == (0, 4)
+    first.save()
+    root_hash = first.root_hash(str(tree))
+
+    second = DirectorySnapshot(path)
+    assert collect(tree, second) == expected
+    assert (second.reused_directories, second.rescanned_directories) == (4, 0)
+    assert second.root_hash(str(tree)) == root_hash
+
+
+def test_changed_directory_is_rescanned(tree, tmp_path):
+    """変更されたディレクトリのみを一覧し直し、ルートのハッシュが変わるテスト"""
+    path = str(tmp_path / 'dirs.json.gz')
+    first = DirectorySnapshot(path)
+    collect(tree, first)
+    first.save()
+
+    (tree / 'pkg' / 'sub' / 'added.py').write_text('y = 2\n')
+    age(tree / 'pkg' / 'sub')
+    second = DirectorySnapshot(path)
+    files = collect(tree, second)
+    assert str(tree / 'pkg' / 'sub' / 'added.py') in files
+    assert (second.reused_directories, second.rescanned_directories) == (3, 1)
+    assert second.root_hash(str(tree)) != first.root_hash(str(tree))
+
+
+def test_filter_change_discards_snapshot(tree, tmp_path):
+    """フィルタ設定が変わった場合はスナップショットを使わないテスト"""
+    path = str(tmp_path / 'dirs.json.gz')
+    first = DirectorySnapshot(path)
+    collect(tree, first)
+    first.save()
+
+    second = DirectorySnapshot(path)
+    files = FileCollector([str(tree)], file_extensions={'.txt'}, dir_snapshot=second).collect_files()
+    assert files == [str(tree / 'pkg' / 'notes.txt')]
+    assert second.reused_directories == 0
+
+
+def test_recent_directory_is_not_trusted(tree, tmp_path):
+    """直近に変更されたディレクトリは次回も一覧し直すテスト"""
+    (tree / 'web' / 'extra.js').write_text('z;\n')
+    snapshot = DirectorySnapshot(str(tmp_path / 'dirs.json.gz'))
+    collect(tree, snapshot)
+    snapshot.save()
+
+    again = DirectorySnapshot(str(tmp_path / 'dirs.json.gz'))
+    collect(tree, again)
+    assert again.rescanned_directories == 1
+
+
+def test_concurrent_saves_keep_other_roots(tree, tmp_path):
+    """同じスナップショットを使う並行したジョブの保存が互いの記録を落とさないテスト"""
+    other = tmp_path / 'other'
+    (other / 'lib').mkdir(parents=True)
+    (other / 'lib' / 'util.py').write_text('x = 1\n')
+    for directory in (other / 'lib', other):
+        age(directory)
+    path = str(tmp_path / 'dirs.json.gz')
+
+    # 両方のジョブが保存前の同じスナップショットを読み込む
+    first = DirectorySnapshot(path)
+    second = DirectorySnapshot(path)
+    collect(tree, first)
+    collect(other, second)
+    first.save()
+    second.save()
+
+    merged = DirectorySnapshot(path)
+    assert set(merged.roots) == {str(tree), str(other)}
+    collect(tree, merged)
+    collect(other, merged)
+    assert merged.rescanned_directories == 0
@@ -1,7 +1,20 @@
 import pytest
 import os
-import pyperclip
+import json
+import sys
 from codest.document_generator import DocumentGenerator
+from codest.exceptions import DocumentGenerationError
+from codest.redaction import Redactor
+from codest.renderers import get_renderer
+from codest.section_index import SectionIndex
+
+
+def fake_clipboard_command(path):
+    """標準入力の内容をファイルに書き込む偽のクリップボードコマンド"""
+    script = ('import sys\n'
+              'data = sys.stdin.buffer.read()\n'
+              'open(sys.argv[1], "wb").write(data)')
+    return [sys.executable, '-c', script, str(path)]
 
 
 @pytest.fixture
@@ -58,23 +71,37 @@ def test_generate_document(temp_project):
         assert '⚠️ **File skipped**' in content
 
 
-def test_generate_to_clipboard(temp_project):
-    """クリップボードへの出力テスト"""
+def test_generate_to_clipboard(temp_project, tmp_path_factory):
+    """クリップボードへの出力テスト（偽のクリップボードコマンドを使用）"""
+    clipboard_file = tmp_path_factory.mktemp('clipboard') / 'content'
     generator = DocumentGenerator(
         directories=[str(temp_project)],
-        max_file_size_kb=1000
+        max_file_size_kb=1000,
+        clipboard_command=fake_clipboard_command(clipboard_file)
     )
     content, _ = generator.generate(to_clipboard=True)
 
-    # 生成された内容の検証
-    assert '# Source Code Collection' in content
-    assert '```python' in content
-    assert 'print("Hello")' in content
-    assert '<details>' in content  # マークダウンファイルの処理を確認
+    # クリップボードの内容を検証（サイズの上限以内の内容は戻り値でも返す）
+    clipboard_content = clipboard_file.read_text(encoding='utf-8')
+    assert content == clipboard_content
+    assert '# Source Code Collection' in clipboard_content
+    assert '```python' in clipboard_content
+    assert 'print("Hello")' in clipboard_content
+    assert '<details>' in clipboard_content  # マークダウンファイルの処理を確認
 
-    # クリップボードの内容を検証
-    clipboard_content = pyperclip.paste()
-    assert clipboard_content == content
+
+def test_generate_to_clipboard_size_limit(temp_project, tmp_path_factory):
+    """クリップボードのサイズ上限を超える場合はエラー"""
+    clipboard_file = tmp_path_factory.mktemp('clipboard') / 'content'
+    generator = DocumentGenerator(
+        directories=[str(temp_project)],
+        max_file_size_kb=1000,
+        clipboard_command=fake_clipboard_command(clipboard_file),
+        clipboard_max_bytes=100
+    )
+    with pytest.raises(DocumentGenerationError, match='clipboard size limit'):
+        generator.generate(to_clipboard=True)
+    assert not clipboard_file.exists()
 
 
 def test_generate_with_multiple_directories(temp_project):
@@ -146,4 +173,461 @@ def test_generate_empty_directory(tmp_path):
     with open(output_file, 'r', encoding='utf-8') as f:
         content = f.read()
         assert '# Source Code Collection' in content
-        assert '**Total files**: 0' in content
\ No newline at end of file
+        assert '**Total files**: 0' in content
+
+def test_generate_from_file_list(temp_project):
+    """明示的なファイルリストからの生成テスト"""
+    generator = DocumentGenerator(
+        directories=[str(temp_project)],
+        max_file_size_kb=1000,
+        source_files=[
+            str(temp_project / 'src' / 'main.py'),
+            str(temp_project / 'src' / 'large_file.py'),
+        ]
+    )
+    output_file = generator.generate('test_file_list.md')
+
+    with open(output_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+        assert '**Total files**: 2' in content
+        assert 'src/main.py' in content
+        assert 'test_main.py' not in content
+        # サイズ制限はファイルリストにも適用される
+        assert '⚠️ **File skipped**' in content
+
+
+def test_generate_since_manifest(temp_project, tmp_path):
+    """前回のマニフェストからの変更分のみの生成テスト"""
+    manifest_path = str(tmp_path / 'manifest.json')
+    DocumentGenerator(
+        directories=[str(temp_project)],
+        manifest_file=manifest_path
+    ).generate('test_manifest.md')
+    assert os.path.exists(manifest_path)
+
+    (temp_project / 'src' / 'main.py').write_text('print("Changed")')
+    (temp_project / 'src' / 'new.py').write_text('print("New")')
+    os.remove(str(temp_project / 'tests' / 'test_main.py'))
+
+    output_file = DocumentGenerator(
+        directories=[str(temp_project)],
+        since_manifest=manifest_path
+    ).generate('test_since.md')
+
+    with open(output_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+        assert '**Total files**: 2' in content
+        assert '1 added, 1 modified, 1 deleted' in content
+        assert 'print("Changed")' in content
+        assert 'print("New")' in content
+        assert 'large_file.py' not in content
+        assert '## Deleted Files' in content
+        assert 'tests/test_main.py' in content
+
+
+
+def test_generate_since_reads_changed_files_once(temp_project, tmp_path, monkeypatch):
+    """変更分の生成でサイズが変わったファイルはハッシュ計算のために読み直さないテスト"""
+    from codest.manifest import Manifest, compute_file_hash
+
+    manifest_path = str(tmp_path / 'manifest.json')
+    DocumentGenerator(directories=[str(temp_project)], manifest_file=manifest_path).generate(
+        str(tmp_path / 'full.md'))
+    main_py = temp_project / 'src' / 'main.py'
+    main_py.write_text('print("Changed")')
+
+    hashed = []
+    monkeypatch.setattr('codest.manifest.compute_file_hash', lambda path, algorithm: hashed.append(path))
+    monkeypatch.setattr('codest.document_generator.compute_file_hash', lambda path, algorithm: hashed.append(path))
+    next_manifest = str(tmp_path / 'next.json')
+    DocumentGenerator(directories=[str(temp_project)], since_manifest=manifest_path,
+                      manifest_file=next_manifest).generate(str(tmp_path / 'since.md'))
+
+    assert hashed == []
+    assert Manifest.load(next_manifest).entries[str(main_py)]['hash'] == compute_file_hash(str(main_py))
+
+def test_generate_manifest_sections(temp_project, tmp_path_factory):
+    """マニフェストに記録されたセクション情報のテスト"""
+    import json
+    import hashlib
+
+    (temp_project / 'src' / 'unicode.py').write_text('print("こんにちは")\r\nprint(1)\n', newline='')
+    manifest_path = str(tmp_path_factory.mktemp('manifest') / 'manifest.json')
+    output_file = DocumentGenerator(
+        directories=[str(temp_project)],
+        manifest_file=manifest_path,
+        hash_algorithm='blake2b'
+    ).generate('test_sections.md')
+
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    with open(output_file, 'rb') as f:
+        output = f.read()
+
+    assert manifest['hash_algorithm'] == 'blake2b'
+    entries = {entry['name']: entry for entry in manifest['files']}
+    assert set(entries) == {'src/main.py', 'src/README.md', 'src/large_file.py',
+                            'src/unicode.py', 'tests/test_main.py'}
+
+    unicode_path = str(temp_project / 'src' / 'unicode.py')
+    entry = entries['src/unicode.py']
+    assert entry['path'] == unicode_path
+    assert entry['line_count'] == 2
+    with open(unicode_path, 'rb') as f:
+        assert entry['hash'] == hashlib.blake2b(f.read()).hexdigest()
+
+    # セクションのバイトオフセットが出力内容と一致する
+    for name, entry in entries.items():
+        section = output[entry['offset']:entry['offset'] + entry['length']]
+        assert section.startswith(f'\n### `{name}`'.encode('utf-8'))
+
+    # スキップされたファイルもハッシュが記録される
+    assert entries['src/large_file.py']['status'] == 'skipped'
+    assert len(entries['src/large_file.py']['hash']) == 128
+
+
+def test_generate_compact(temp_project):
+    """コンパクションを有効にした生成テスト"""
+    (temp_project / 'src' / 'commented.py').write_text('# comment\n\n\nx = 1  # trailing\n')
+    generator = DocumentGenerator(
+        directories=[str(temp_project)],
+        max_file_size_kb=1000,
+        compact=True
+    )
+    output_file = generator.generate('test_compact.md')
+
+    with open(output_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+        assert '```python\nx = 1\n```' in content
+        assert '# comment' not in content
+        # マークダウンはコンパクションの対象外
+        assert '# Test Project' in content
+
+    original, compacted = generator.compaction_stats['python']
+    assert compacted < original
+
+
+def test_generate_with_excerpt(temp_project):
+    """サイズ超過ファイルの先頭・末尾のみの出力テスト"""
+    (temp_project / 'src' / 'big.py').write_text(''.join(f'value_{i} = {i}\n' for i in range(200000)))
+    generator = DocumentGenerator(
+        directories=[str(temp_project)],
+        max_file_size_kb=1000,
+        excerpt_lines=2
+    )
+    output_file = generator.generate('test_excerpt.md')
+
+    with open(output_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+        assert '✂️ **File excerpted**' in content
+        assert '⚠️ **File skipped**' not in content
+        assert 'value_0 = 0\nvalue_1 = 1\n... ✂️' in content
+        assert 'bytes omitted ✂️ ...\nvalue_199998 = 199998\nvalue_199999 = 199999\n' in content
+        assert 'value_100000 = 100000' not in content
+
+
+def test_generate_signatures_above_threshold(temp_project):
+    """サイズしきい値を超えるファイルのみのアウトライン出力テスト"""
+    (temp_project / 'src' / 'service.py').write_text(
+        'class Service:\n    """Service."""\n\n    def run(self):\n' + '        x = 1\n' * 2000)
+    output_file = DocumentGenerator(
+        directories=[str(temp_project)],
+        max_file_size_kb=1000,
+        outline_above_kb=5
+    ).generate('test_outline.md')
+
+    with open(output_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+        assert '🧭 **Outline**' in content
+        assert 'class Service:\n    """Service."""\n    def run(self): ...' in content
+        assert 'x = 1' not in content
+        # しきい値以下のファイルは全文を出力
+        assert 'print("Hello")' in content
+
+
+def test_generate_with_budget(temp_project):
+    """出力全体の予算を指定した生成テスト"""
+    # ヘッダー（対象ディレクトリのパスを含む）の分を予算から差し引いて選択する
+    budget_bytes = 400 + len(str(temp_project))
+    output_file = DocumentGenerator(
+        directories=[str(temp_project)],
+        max_file_size_kb=1000,
+        budget_bytes=budget_bytes
+    ).generate('test_budget.md')
+
+    with open(output_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+        assert '- **Budget**:' in content
+        assert '**Total files**: 2' in content
+        assert 'src/main.py' in content
+        assert 'large_file.py' not in content
+    assert os.path.getsize(output_file) <= budget_bytes
+
+
+
+@pytest.mark.parametrize('format_name', ['markdown', 'jsonl', 'xml'])
+def test_generate_with_budget_stays_within_budget(tmp_path, format_name):
+    """エスケープで内容が増える形式でも出力全体が予算に収まるテスト"""
+    project = tmp_path / 'project'
+    project.mkdir()
+    for i in range(40):
+        # 改行・引用符・バックスラッシュの多い内容（jsonlでは大きく膨らむ）
+        (project / f'module_{i:02d}.py').write_text('s = "\\t\\"q\\""\n' * 120)
+    budget_bytes = 60 * 1024
+    generator = DocumentGenerator(
+        directories=[str(project)],
+        budget_bytes=budget_bytes,
+        toc=True,
+        collect_stats=True,
+        renderer=get_renderer(format_name)
+    )
+    output_file = generator.generate(str(tmp_path / f'budget{get_renderer(format_name).extension}'))
+
+    size = os.path.getsize(output_file)
+    assert budget_bytes * 0.8 < size <= budget_bytes
+    # 書き込まなかったセクションは集計に含めない
+    assert generator.codebase_stats.totals['files'] == generator.stats['files'] < 40
+
+def test_generate_toc_and_index(temp_project, tmp_path_factory):
+    """目次とセクションインデックスの出力テスト"""
+    output_file = str(tmp_path_factory.mktemp('doc') / 'project.md')
+    DocumentGenerator(
+        directories=[str(temp_project)],
+        max_file_size_kb=1000,
+        toc=True,
+        write_index=True
+    ).generate(output_file)
+
+    with open(output_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+        assert '## Table of Contents' in content
+        assert '(#srcmainpy)' in content
+
+    index = SectionIndex.load(output_file + '.index.json')
+    assert index.document_size == os.path.getsize(output_file)
+    section = index.find([os.path.join('src', 'main.py')])[0]
+    with open(output_file, 'rb') as f:
+        f.seek(section['offset'])
+        text = f.read(section['length']).decode('utf-8')
+    assert text.startswith('\n### `src/main.py`')
+    assert 'print("Hello")' in text
+    assert 'test_main' not in text
+
+
+def test_generate_streaming_index_offsets(temp_project, tmp_path_factory):
+    """列挙しながら生成する場合もヘッダー・インデックスが正しいことをテスト"""
+    output_file = str(tmp_path_factory.mktemp('doc') / 'project.md')
+    generator = DocumentGenerator(
+        directories=[str(temp_project)],
+        max_file_size_kb=1000,
+        write_index=True
+    )
+    generator.generate(output_file)
+
+    with open(output_file, 'r', encoding='utf-8') as f:
+        assert f.read().startswith('# Source Code Collection')
+    assert generator.stats['files'] == 4
+
+    index = SectionIndex.load(output_file + '.index.json')
+    assert index.document_size == os.path.getsize(output_file)
+    section = index.find([os.path.join('src', 'main.py')])[0]
+    with open(output_file, 'rb') as f:
+        f.seek(section['offset'])
+        assert f.read(section['length']).decode('utf-8').startswith('\n### `src/main.py`')
+
+
+def test_generate_with_redaction(temp_project):
+    """秘密情報の伏せ字と秘密情報だけのファイルのスキップのテスト"""
+    (temp_project / 'src' / 'settings.py').write_text(
+        'import os\n\nAPI_KEY = "sk_live_4f9aQ2xZ7LmN3pR8tV1w"\nHOST = "db.corp.internal"\nDEBUG = True\n\n'
+        'def connect():\n    return os.environ.get("DSN")\n')
+    (temp_project / 'src' / 'secrets.yml').write_text(
+        'db_password: Zq8mW2xR4tY7uP1s\nstripe_token: 9fK3mQ7wE2rT5yU8\n')
+    generator = DocumentGenerator(
+        directories=[str(temp_project)],
+        max_file_size_kb=1000,
+        redactor=Redactor(['db.corp.internal'])
+    )
+    output_file = generator.generate('test_redaction.md')
+
+    with open(output_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+        assert 'API_KEY = "[REDACTED:keyed-secret]"' in content
+        assert 'HOST = "[REDACTED:marker]"' in content
+        assert 'DEBUG = True' in content
+        assert 'Zq8mW2xR4tY7uP1s' not in content
+        assert 'File skipped**: Content consists of secrets' in content
+
+    assert generator.redaction_counts == {os.path.join('src', 'settings.py'): 2}
+    assert generator.secret_files == [os.path.join('src', 'secrets.yml')]
+
+
+@pytest.mark.parametrize('output_format', ['jsonl', 'xml'])
+def test_generate_streaming_formats(temp_project, tmp_path_factory, output_format):
+    """markdown以外の出力形式でも列挙しながら生成でき、インデックスが正しいことをテスト"""
+    output_file = str(tmp_path_factory.mktemp('doc') / f'project.{output_format}')
+    generator = DocumentGenerator(
+        directories=[str(temp_project)],
+        max_file_size_kb=1000,
+        write_index=True,
+        renderer=get_renderer(output_format)
+    )
+    generator.generate(output_file)
+
+    index = SectionIndex.load(output_file + '.index.json')
+    assert index.document_size == os.path.getsize(output_file)
+    section = index.find([os.path.join('src', 'main.py')])[0]
+    with open(output_file, 'rb') as f:
+        f.seek(section['offset'])
+        text = f.read(section['length']).decode('utf-8')
+
+    if output_format == 'jsonl':
+        record = json.loads(text)
+        assert record['path'] == os.path.join('src', 'main.py')
+        assert record['language'] == 'python'
+        assert record['content'] == 'print("Hello")'
+        with open(output_file, 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        # ヘッダーのレコードはファイル数が確定してから末尾に書き込む
+        assert records[-1]['type'] == 'header'
+        assert records[-1]['total_files'] == 4
+        assert {r['status'] for r in records[:-1]} == {'included', 'skipped'}
+    else:
+        assert text.startswith('<file path=')
+        assert 'print("Hello")' in text
+        with open(output_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        assert content.startswith('<codebase ')
+        assert '<header total_files="4">\n' in content
+        assert content.endswith('</header>\n</codebase>\n')
+
+
+def test_generate_streams_records_to_output(temp_project, tmp_path_factory, monkeypatch):
+    """ファイルごとのレコードを生成しながら出力ファイルへ書き込むことのテスト"""
+    output_file = str(tmp_path_factory.mktemp('doc') / 'project.jsonl')
+    generator = DocumentGenerator(directories=[str(temp_project)], max_file_size_kb=1000,
+                                  renderer=get_renderer('jsonl'))
+    sizes = []
+    process_file = generator._process_file
+
+    def tracking_process_file(writer, file_path):
+        writer.stream.flush()
+        sizes.append(os.path.getsize(output_file))
+        return process_file(writer, file_path)
+
+    monkeypatch.setattr(generator, '_process_file', tracking_process_file)
+    generator.generate(output_file)
+    assert sizes[0] == 0
+    assert sizes == sorted(sizes) and sizes[-1] > 0
+    with open(output_file, 'r', encoding='utf-8') as f:
+        assert json.loads(f.readline())['type'] == 'file'
+
+
+def test_generate_with_sample(temp_project):
+    """層別抽出したファイルのみを出力するテスト"""
+    generator = DocumentGenerator(
+        directories=[str(temp_project)],
+        max_file_size_kb=1000,
+        sample_size=2,
+        sample_seed=7
+    )
+    output_file = generator.generate('test_sample.md')
+
+    with open(output_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+        assert '- **Total files**: 2' in content
+        assert '- **Sample**: 2 files (seed 7' in content
+    assert generator.stats['files'] == 2
+
+
+def test_generate_with_stats(temp_project):
+    """読み込み済みの内容から集計して末尾に出力するテスト"""
+    generator = DocumentGenerator(
+        directories=[str(temp_project)],
+        max_file_size_kb=1000,
+        collect_stats=True
+    )
+    output_file = generator.generate('test_stats.md')
+
+    with open(output_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+        assert '## Statistics' in content
+        assert '| python | 3 |' in content
+    totals = generator.codebase_stats.totals
+    assert totals['files'] == 4
+    assert generator.codebase_stats.unread_files == 1
+
+
+def test_generate_with_factored_banners(temp_project):
+    """共通のライセンス表示をメタ情報に1回だけ出力するテスト"""
+    banner = '# Copyright (c) Example Corp.\n# Licensed under the MIT License.\n# See LICENSE for details.\n'
+    src_dir = temp_project / 'src'
+    for name in ('alpha.py', 'beta.py', 'gamma.py'):
+        (src_dir / name).write_text(f'{banner}\n{name[:-3]} = 1\n')
+
+    generator = DocumentGenerator(
+        directories=[str(temp_project)],
+        max_file_size_kb=1000,
+        factor_banners=True
+    )
+    output_file = generator.generate('test_banners.md')
+
+    with open(output_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    assert content.count('Licensed under the MIT License') == 1
+    assert '## Common Headers' in content
+    assert '### Header 1 (3 files)' in content
+    assert '- **Common headers**: 1 stripped from 3 files (' in content
+    assert '```python\nbeta = 1\n' in content
+
+
+def test_generate_notebook_cells(temp_project):
+    """ノートブックは出力を除いたセルのみを出力するテスト"""
+    notebook = {
+        'nbformat': 4, 'metadata': {},
+        'cells': [{'cell_type': 'code', 'source': 'plot()',
+                   'outputs': [{'output_type': 'display_data', 'data': {'image/png': 'A' * 2 * 1024 * 1024}}]}],
+    }
+    (temp_project / 'src' / 'analysis.ipynb').write_text(json.dumps(notebook))
+
+    generator = DocumentGenerator(directories=[str(temp_project)], max_file_size_kb=1000)
+    output_file = generator.generate('test_notebook.md')
+
+    with open(output_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    assert '### `src/analysis.ipynb`\n\n```python\n# %%\nplot()\n' in content
+    assert 'AAAA' not in content
+
+
+def test_generate_skips_generated_files(temp_project):
+    """生成コードを1行の注記に置き換えるテスト"""
+    (temp_project / 'src' / 'api_pb.go').write_text('// Code generated by protoc-gen-go. DO NOT EDIT.\npackage api\n')
+
+    generator = DocumentGenerator(directories=[str(temp_project)], max_file_size_kb=1000)
+    with open(generator.generate('test_generated.md'), 'r', encoding='utf-8') as f:
+        content = f.read()
+    assert '> 🤖 **File skipped**: Generated file (marker `// Code generated by protoc-gen-go' in content
+    assert 'package api' not in content
+    assert generator.generated_detector.files == {'generated': ['src/api_pb.go']}
+
+    generator = DocumentGenerator(directories=[str(temp_project)], max_file_size_kb=1000, skip_generated=False)
+    with open(generator.generate('test_generated.md'), 'r', encoding='utf-8') as f:
+        assert 'package api' in f.read()
+
+
+def test_generate_keeps_prose_and_checks_large_files_once(temp_project, monkeypatch):
+    """文章のファイルを生成コードと判定せず、大きいファイルを1回だけ判定するテスト"""
+    import codest.generated
+    (temp_project / 'CONTRIBUTING.md').write_text(
+        '# Contributing\n\n# Files under gen/ are generated from protos; do not edit them by hand.\n')
+    (temp_project / 'src' / 'large.py').write_text('# large module\n' + 'value = 1\n' * 8000)
+    calls = []
+    classify_head = codest.generated.classify_head
+    monkeypatch.setattr(codest.generated, 'classify_head', lambda head: calls.append(head) or classify_head(head))
+
+    generator = DocumentGenerator(directories=[str(temp_project)], max_file_size_kb=1000)
+    with open(generator.generate('test_generated.md'), 'r', encoding='utf-8') as f:
+        content = f.read()
+    assert 'do not edit them by hand' in content
+    assert generator.generated_detector.files == {}
+    assert sum(1 for head in calls if head.startswith(b'# large module')) == 1
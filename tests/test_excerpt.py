@@ -0,0 +1,45 @@
+import pytest
+from codest.excerpt import read_excerpt
+
+
+@pytest.fixture
+def numbered_file(tmp_path):
+    """1000行の番号付きファイルを作成"""
+    path = tmp_path / 'numbered.py'
+    path.write_text(''.join(f'line {i}\n' for i in range(1000)))
+    return str(path)
+
+
+def test_excerpt_lines(numbered_file):
+    """行数指定での先頭・末尾の切り出しをテスト"""
+    head, tail, omitted = read_excerpt(numbered_file, head_tail_lines=3)
+    assert head == 'line 0\nline 1\nline 2\n'
+    assert tail == 'line 997\nline 998\nline 999\n'
+    assert omitted == len(''.join(f'line {i}\n' for i in range(3, 997)))
+
+
+def test_excerpt_bytes_aligned_to_lines(numbered_file):
+    """バイト数指定での切り出しが行境界に揃うことをテスト"""
+    head, tail, omitted = read_excerpt(numbered_file, head_tail_bytes=20)
+    assert head == 'line 0\nline 1\n'
+    assert tail == 'line 998\nline 999\n'
+    assert len(head) + len(tail) + omitted == len(''.join(f'line {i}\n' for i in range(1000)))
+
+
+def test_excerpt_lines_with_byte_limit(tmp_path):
+    """1行が長いファイルでもバイト数の上限を超えて読み込まない"""
+    path = tmp_path / 'minified.js'
+    path.write_text('x' * 100000)
+    head, tail, omitted = read_excerpt(str(path), head_tail_bytes=1000, head_tail_lines=10)
+    assert len(head) <= 1000
+    assert len(tail) <= 1000
+    assert len(head) + len(tail) + omitted == 100000
+
+
+def test_excerpt_small_file(tmp_path):
+    """先頭・末尾がファイル全体を覆う場合は省略しない"""
+    path = tmp_path / 'small.py'
+    path.write_text('a\nb\nc\n')
+    head, tail, omitted = read_excerpt(str(path), head_tail_lines=5)
+    assert head + tail == 'a\nb\nc\n'
+    assert omitted == 0
@@ -1,6 +1,6 @@
 import os
 import pytest
-from codest.file_collector import FileCollector
+from codest.file_collector import FileCollector, read_file_list
 from codest.exceptions import FileCollectionError
 
 
@@ -146,3 +146,69 @@ def test_overlapping_directories(temp_project):
     # ファイルが重複して収集されていないことを確認
     file_names = [os.path.basename(f) for f in files]
     assert file_names.count('main.py') == 1
+
+
+def test_filter_files(temp_project):
+    """明示的なファイルリストへのフィルタ適用をテスト"""
+    (temp_project / 'src' / 'readme.txt').write_text('readme')
+    collector = FileCollector([str(temp_project)])
+    files = collector.filter_files([
+        str(temp_project / 'src' / 'main.py'),
+        str(temp_project / 'src' / 'readme.txt'),  # 対象外の拡張子
+        str(temp_project / 'build' / 'output.py'),  # 無視ディレクトリ
+        str(temp_project / 'src' / 'deleted.py'),  # 存在しないファイル
+        '/outside/of/roots.py',  # 収集対象外
+        str(temp_project / 'src' / 'main.py'),  # 重複
+    ])
+
+    assert files == [str(temp_project / 'src' / 'main.py')]
+
+
+def test_filter_files_relative_paths(temp_project):
+    """相対パスのファイルリストをテスト"""
+    os.chdir(str(temp_project))
+    collector = FileCollector(['.'])
+    files = collector.filter_files(['tests/test_main.py', './src/test.py'])
+
+    assert files == [
+        str(temp_project / 'src' / 'test.py'),
+        str(temp_project / 'tests' / 'test_main.py'),
+    ]
+
+
+def test_read_file_list(tmp_path):
+    """改行区切り・NUL区切りのファイルリスト読み込みをテスト"""
+    newline_list = tmp_path / 'files.txt'
+    newline_list.write_text('src/a.py\nsrc/b.py\r\n\nsrc/c d.py\n')
+    assert read_file_list(str(newline_list)) == ['src/a.py', 'src/b.py', 'src/c d.py']
+
+    nul_list = tmp_path / 'files0.txt'
+    nul_list.write_bytes(b'src/a.py\0src/with\nnewline.py\0')
+    assert read_file_list(str(nul_list)) == ['src/a.py', 'src/with\nnewline.py']
+
+    with pytest.raises(FileCollectionError):
+        read_file_list(str(tmp_path / 'missing.txt'))
+
+
+def test_iter_files_sorted_order(tmp_path):
+    """逐次列挙がsorted()と同じ文字列順になることをテスト"""
+    (tmp_path / 'a').mkdir()
+    (tmp_path / 'a' / 'x.py').write_text('')
+    (tmp_path / 'a.py').write_text('')
+    (tmp_path / 'a-b').mkdir()
+    (tmp_path / 'a-b' / 'y.py').write_text('')
+    (tmp_path / 'B.py').write_text('')
+
+    files = list(FileCollector([str(tmp_path)]).iter_files())
+    assert files == sorted(files)
+    assert len(files) == 4
+
+
+def test_iter_files_overlapping_roots(temp_project):
+    """重なり合うディレクトリの重複を集合を使わずに排除することをテスト"""
+    collector = FileCollector([str(temp_project), str(temp_project / 'src')])
+    files = collector.iter_files()
+    assert next(files) == str(temp_project / 'src' / 'main.py')
+    rest = list(files)
+    assert str(temp_project / 'src' / 'main.py') not in rest
+    assert len(rest) == len(set(rest))
@@ -0,0 +1,49 @@
+import pytest
+from codest.generated import (
+    GeneratedFileDetector, classify_head, KIND_GENERATED, KIND_MINIFIED, KIND_LOCKFILE, KIND_DUMP
+)
+
+
+@pytest.mark.parametrize('head, kind', [
+    (b'// Code generated by protoc-gen-go. DO NOT EDIT.\npackage pb\n', KIND_GENERATED),
+    (b'# -*- coding: utf-8 -*-\n# Generated by the protocol buffer compiler.  DO NOT EDIT!\n', KIND_GENERATED),
+    (b'/**\n * @generated\n */\nexport {}\n', KIND_GENERATED),
+    (b'{\n  "name": "app",\n  "lockfileVersion": 3,\n', KIND_LOCKFILE),
+    (b'# THIS IS AN AUTOGENERATED FILE. DO NOT EDIT THIS FILE DIRECTLY.\n# yarn lockfile v1\n', KIND_GENERATED),
+    (b'-- MySQL dump 10.13  Distrib 8.0.32\n--\n-- Host: localhost\n', KIND_DUMP),
+    (b'!function(e,t){"use strict";var n=' + b'a.b(c),d=e[f];' * 400, KIND_MINIFIED),
+])
+def test_classify_flagged(head, kind):
+    """生成コード・ロックファイル・ダンプ・minify済みの判定テスト"""
+    assert classify_head(head)[0] == kind
+
+
+@pytest.mark.parametrize('head', [
+    b'def handler(event):\n    # Do not edit the event in place\n    return event\n',
+    b'x = "generated by protoc"\n',
+    b'# Title\n\n' + b'A long paragraph with many words in it. ' * 100 + b'\n',
+    b'short();',
+    b'# Contributing\n\n* Files under gen/ are generated from protos; do not edit them by hand.\n',
+    b'import os\n\n# This file was generated by hand, do not edit\n',
+])
+def test_classify_regular(head):
+    """通常のファイルを誤判定しないテスト"""
+    assert classify_head(head) is None
+
+
+def test_detector_summary():
+    """種類ごとの件数の集計テスト"""
+    detector = GeneratedFileDetector()
+    assert detector.check('api/client.go', b'// Code generated by oapi-codegen. DO NOT EDIT.\n').startswith(
+        'Generated file (marker `// Code generated')
+    assert detector.check('main.go', b'package main\n') is None
+    detector.check('static/app.min.js', b'a.b(c);' * 600)
+    assert detector.summary() == '2 files skipped (generated: 1, minified: 1)'
+
+
+def test_detector_skips_prose():
+    """文章・マークアップのファイルを判定しないテスト"""
+    detector = GeneratedFileDetector()
+    assert detector.check('docs/README.md', b'# This file is generated, do not edit\n') is None
+    assert detector.check('NOTES.txt', b'a.b(c);' * 600) is None
+    assert detector.summary() == '0 files skipped'
@@ -0,0 +1,136 @@
+import os
+import shutil
+import subprocess
+import pytest
+from codest.document_generator import DocumentGenerator
+from codest.exceptions import GitObjectError
+from codest.file_collector import FileCollector
+from codest.git_objects import GitRepository, GitRevision, find_git_dir
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason='git is not installed')
+
+
+def git(repo, *args):
+    """テスト用リポジトリでgitコマンドを実行"""
+    env = dict(os.environ, GIT_AUTHOR_NAME='test', GIT_AUTHOR_EMAIL='test@example.com',
+               GIT_COMMITTER_NAME='test', GIT_COMMITTER_EMAIL='test@example.com')
+    return subprocess.run(['git', '-C', str(repo)] + list(args), check=True, env=env,
+                          stdout=subprocess.PIPE).stdout
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """複数のコミットとタグを持つテスト用リポジトリを作成"""
+    path = tmp_path / 'repo'
+    path.mkdir()
+    git(path, 'init', '-q', '-b', 'main')
+    (path / 'src').mkdir()
+    (path / 'node_modules').mkdir()
+    (path / 'node_modules' / 'dep.js').write_text('module.exports = 1;\n')
+    (path / '.gitignore').write_text('generated.py\n')
+    (path / 'src' / 'generated.py').write_text('x = 1\n')
+    git(path, 'add', '-f', '.')
+
+    # 差分圧縮されるよう少しずつ変更を加えたコミットを重ねる
+    lines = [f'def function_{i}():\n    return {i}\n' for i in range(200)]
+    for version in range(5):
+        lines[version * 10] = f'def function_{version * 10}():\n    return "v{version}"\n'
+        (path / 'src' / 'main.py').write_text(''.join(lines))
+        git(path, 'add', 'src/main.py')
+        git(path, 'commit', '-q', '-m', f'v{version}')
+        git(path, 'tag', '-a', f'v{version}', '-m', f'release {version}')
+    return path
+
+
+def test_read_loose_objects(repo):
+    """ルーズオブジェクトからの読み込みをテスト"""
+    revision = GitRevision(str(repo), 'v1')
+    files = revision.list_files([str(repo)], FileCollector([str(repo)]))
+    assert [member.name for _, member, _ in files] == ['src/main.py']
+
+    _, member, sha = files[0]
+    expected = git(repo, 'show', 'v1:src/main.py')
+    assert revision.read_blob(sha) == expected
+    assert member.size == len(expected)
+
+
+def test_read_packed_objects(repo):
+    """差分圧縮されたパックファイルからの読み込みをテスト"""
+    git(repo, 'repack', '-a', '-d', '-f', '-q', '--depth=50', '--window=50')
+    git(repo, 'pack-refs', '--all')
+    git(repo, 'prune-packed')
+
+    repository = GitRepository(os.path.join(str(repo), '.git'))
+    for tag in ('v0', 'v2', 'v4'):
+        sha = git(repo, 'rev-parse', f'{tag}:src/main.py').decode().strip()
+        assert repository.read_object(sha) == ('blob', git(repo, 'show', f'{tag}:src/main.py'))
+        assert repository.object_size(sha) == int(git(repo, 'cat-file', '-s', sha))
+    repository.close()
+
+
+def test_resolve_revisions(repo):
+    """ブランチ・タグ・短縮名・HEADの解決をテスト"""
+    repository = GitRepository(os.path.join(str(repo), '.git'))
+    head = git(repo, 'rev-parse', 'HEAD').decode().strip()
+    assert repository.resolve('HEAD') == head
+    assert repository.resolve('main') == head
+    assert repository.resolve(head[:10]) == head
+    assert repository.resolve('v3') == git(repo, 'rev-parse', 'v3').decode().strip()
+    with pytest.raises(GitObjectError):
+        repository.resolve('no-such-branch')
+
+
+def test_find_git_dir_outside_repository(tmp_path):
+    """リポジトリ外のパスはエラー"""
+    with pytest.raises(GitObjectError):
+        find_git_dir(str(tmp_path))
+
+
+def test_generate_from_revision(repo, tmp_path):
+    """作業ツリーの変更に影響されずリビジョンから生成されることをテスト"""
+    (repo / 'src' / 'main.py').write_text('working tree change\n')
+    (repo / 'src' / 'untracked.py').write_text('untracked\n')
+
+    output_file = DocumentGenerator(
+        directories=[str(repo)],
+        revision='v0'
+    ).generate(str(tmp_path / 'doc.md'))
+
+    with open(output_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+        assert '- **Revision**: `v0`' in content
+        assert '**Total files**: 1' in content
+        assert '### `src/main.py`' in content
+        assert 'return "v0"' in content
+        assert 'working tree change' not in content
+        assert 'untracked' not in content
+        assert 'generated.py' not in content
+        assert 'node_modules' not in content
+    assert (repo / 'src' / 'main.py').read_text() == 'working tree change\n'
+
+
+def test_generate_from_revision_without_working_tree(repo, tmp_path):
+    """作業ツリーにないディレクトリ・作業ツリーの.gitignoreに影響されないことをテスト"""
+    shutil.rmtree(str(repo / 'src'))
+    (repo / '.gitignore').write_text('main.py\n')
+
+    output_file = DocumentGenerator(
+        directories=[str(repo / 'src')],
+        revision='v1'
+    ).generate(str(tmp_path / 'doc.md'))
+
+    with open(output_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+        assert '### `main.py`' in content
+        assert 'return "v1"' in content
+        assert 'generated.py' not in content
+    assert not (repo / 'src').exists()
+
+
+def test_resolve_ancestry(repo):
+    """~N・^N による祖先の解決をテスト"""
+    repository = GitRepository(os.path.join(str(repo), '.git'))
+    for rev in ('HEAD~2', 'main^', 'v3~1', 'HEAD^^', 'HEAD~0'):
+        assert repository.resolve(rev) == git(repo, 'rev-parse', rev + '^{commit}').decode().strip()
+    with pytest.raises(GitObjectError):
+        repository.resolve('HEAD~10')
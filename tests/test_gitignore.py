@@ -1,6 +1,6 @@
 import pytest
 import os
-from codest.gitignore import GitIgnoreHandler
+from codest.gitignore import GitIgnoreCache, GitIgnoreHandler
 
 
 @pytest.fixture
@@ -49,4 +49,21 @@ def test_missing_gitignore():
     """Test behavior when .gitignore file is missing"""
     handler = GitIgnoreHandler('/nonexistent/path')
     assert len(handler.patterns) == 0
-    assert not handler.should_ignore('any/file.txt')
\ No newline at end of file
+    assert not handler.should_ignore('any/file.txt')
+
+def test_gitignore_cache_replaces_stale_entry(tmp_path):
+    """Test that a changed .gitignore replaces the cached handler instead of adding another"""
+    gitignore = tmp_path / '.gitignore'
+    gitignore.write_text('*.log\n')
+    cache = GitIgnoreCache()
+    first = cache.get(str(tmp_path))
+    assert cache.get(str(tmp_path)) is first
+
+    gitignore.write_text('*.tmp\n')
+    stat = os.stat(gitignore)
+    os.utime(gitignore, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    second = cache.get(str(tmp_path))
+    assert second is not first
+    assert second.should_ignore(str(tmp_path / 'a.tmp'))
+    assert len(cache._handlers) == 1
+    assert (cache.hits, cache.misses) == (1, 2)
@@ -0,0 +1,146 @@
+import os
+import pytest
+from codest.document_generator import DocumentGenerator
+from codest.exceptions import ImportGraphError
+from codest.imports import (
+    ImportCache, ImportGraph, parse_go_imports, parse_js_imports, parse_python_imports, parse_swift_imports
+)
+
+
+def write(root, rel_path, content):
+    path = root / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return str(path)
+
+
+def test_parse_python_imports():
+    """Pythonのimport文の抽出テスト"""
+    refs = parse_python_imports('import os, pkg.sub\nfrom . import a\nfrom ..b import c as d\n')
+    assert refs == [['os', 0, []], ['pkg.sub', 0, []], ['', 1, ['a']], ['b', 2, ['c']]]
+    assert parse_python_imports('def (:') == []
+
+
+def test_parse_js_imports():
+    """JS/TSのimport・require・export fromの抽出テスト"""
+    source = (
+        "import React from 'react';\n"
+        "import { a,\n  b } from './lib/util';\n"
+        "import './styles.css';\n"
+        "export * from \"../shared\";\n"
+        "const x = require('./x');\n"
+        "const y = await import('./lazy');\n"
+    )
+    assert parse_js_imports(source) == ['react', './lib/util', './styles.css', '../shared', './x', './lazy']
+
+
+def test_parse_go_and_swift_imports():
+    """GoとSwiftのimportの抽出テスト"""
+    go = 'package main\n\nimport "fmt"\n\nimport (\n\t"os"\n\tdb "example.com/app/internal/db"\n)\n'
+    assert parse_go_imports(go) == ['fmt', 'os', 'example.com/app/internal/db']
+    swift = 'import Foundation\n@testable import Core\nimport struct Models.User\n'
+    assert parse_swift_imports(swift) == ['Foundation', 'Core', 'Models']
+
+
+def test_python_closure_dependencies_first(tmp_path):
+    """Pythonのimportを辿り依存先から順に並べるテスト"""
+    main = write(tmp_path, 'app/main.py', 'from app import service\nimport json\n')
+    write(tmp_path, 'app/__init__.py', '')
+    service = write(tmp_path, 'app/service.py', 'from .models import User\nfrom . import util\n')
+    models = write(tmp_path, 'app/models.py', 'from app.util import helper\n')
+    util = write(tmp_path, 'app/util.py', 'import app.service\n')
+    write(tmp_path, 'app/unused.py', '')
+    write(tmp_path, 'tools/json.py', '')
+
+    graph = ImportGraph([str(p) for p in tmp_path.rglob('*.py')])
+    ordered = graph.closure([main])
+    assert set(ordered) == {main, service, models, util, str(tmp_path / 'app' / '__init__.py')}
+    assert ordered[-1] == main
+    assert ordered.index(models) < ordered.index(service)
+    # 循環importでも各ファイルは1回だけ
+    assert len(ordered) == len(set(ordered))
+
+
+def test_js_closure(tmp_path):
+    """JS/TSの相対importの解決テスト"""
+    index = write(tmp_path, 'src/index.ts', "import { api } from './api';\nimport 'lodash';\n")
+    api = write(tmp_path, 'src/api/index.ts', "export * from '../util.js';\n")
+    util = write(tmp_path, 'src/util.ts', 'export const x = 1;\n')
+    graph = ImportGraph([index, api, util])
+    assert graph.closure([index]) == [util, api, index]
+
+
+def test_go_closure(tmp_path):
+    """go.modのモジュールパスからのGoのimport解決テスト"""
+    (tmp_path / 'go.mod').write_text('module example.com/app\n\ngo 1.21\n')
+    main = write(tmp_path, 'cmd/server/main.go', 'package main\n\nimport (\n\t"fmt"\n\t"example.com/app/internal/db"\n)\n')
+    conn = write(tmp_path, 'internal/db/conn.go', 'package db\n')
+    query = write(tmp_path, 'internal/db/query.go', 'package db\n')
+    test = write(tmp_path, 'internal/db/conn_test.go', 'package db\n')
+    graph = ImportGraph([main, conn, query, test])
+    assert graph.closure([main]) == [conn, query, main]
+
+
+def test_swift_closure(tmp_path):
+    """SwiftPMのモジュールのimport解決テスト"""
+    app = write(tmp_path, 'Sources/App/main.swift', 'import Foundation\nimport Core\n')
+    core = write(tmp_path, 'Sources/Core/Models/User.swift', 'struct User {}\n')
+    other = write(tmp_path, 'Sources/Other/Other.swift', '')
+    graph = ImportGraph([app, core, other])
+    assert graph.closure([app]) == [core, app]
+
+
+def test_closure_unknown_entry(tmp_path):
+    """収集対象外のエントリファイルのテスト"""
+    with pytest.raises(ImportGraphError):
+        ImportGraph([]).closure([str(tmp_path / 'missing.py')])
+
+
+def test_import_cache_persists(tmp_path):
+    """解析済みimportを内容のハッシュで永続化するテスト"""
+    main = write(tmp_path, 'main.py', 'import helper\n')
+    helper = write(tmp_path, 'helper.py', '')
+    cache_path = str(tmp_path / 'cache' / 'imports.json')
+
+    cache = ImportCache(cache_path)
+    ImportGraph([main, helper], cache).closure([main])
+    cache.save()
+    assert cache.misses == 2
+
+    cache = ImportCache(cache_path)
+    assert ImportGraph([main, helper], cache).closure([main]) == [helper, main]
+    assert (cache.hits, cache.misses) == (2, 0)
+
+
+
+def test_import_cache_concurrent_saves_merge(tmp_path):
+    """同じキャッシュファイルを使う並行したジョブの保存が互いのエントリを落とさないテスト"""
+    first_file = write(tmp_path, 'first.py', 'import os\n')
+    second_file = write(tmp_path, 'second.py', 'import sys\n')
+    cache_path = str(tmp_path / 'imports.json')
+
+    # 両方のジョブが保存前の同じキャッシュを読み込む
+    first = ImportCache(cache_path)
+    second = ImportCache(cache_path)
+    ImportGraph([first_file], first).closure([first_file])
+    ImportGraph([second_file], second).closure([second_file])
+    first.save()
+    second.save()
+
+    cache = ImportCache(cache_path)
+    ImportGraph([first_file, second_file], cache).closure([first_file, second_file])
+    assert (cache.hits, cache.misses) == (2, 0)
+
+def test_generate_with_entry(tmp_path):
+    """エントリファイルから到達可能なファイルのみを依存先から出力するテスト"""
+    main = write(tmp_path, 'main.py', 'import helper\n')
+    write(tmp_path, 'helper.py', 'VALUE = 1\n')
+    write(tmp_path, 'unused.py', 'UNUSED = 1\n')
+    generator = DocumentGenerator(directories=[str(tmp_path)], entry_files=[main])
+    output_file = generator.generate(str(tmp_path / 'doc.md'))
+
+    with open(output_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    assert 'UNUSED' not in content
+    assert content.index('### `helper.py`') < content.index('### `main.py`')
+    assert '- **Entry points**: `main.py` (2 of 3 files reachable)' in content
@@ -0,0 +1,93 @@
+import os
+import pytest
+from codest.manifest import Manifest, compute_file_hash
+from codest.exceptions import ManifestError
+
+
+@pytest.fixture
+def temp_files(tmp_path):
+    """テスト用のファイルを作成"""
+    a = tmp_path / 'a.py'
+    b = tmp_path / 'b.py'
+    a.write_text('print("a")')
+    b.write_text('print("b")')
+    return tmp_path, str(a), str(b)
+
+
+def test_build_and_save_roundtrip(temp_files):
+    """マニフェストの作成・保存・読み込みをテスト"""
+    tmp_path, a, b = temp_files
+    manifest = Manifest.build([a, b])
+    manifest_path = str(tmp_path / 'manifest.json')
+    manifest.save(manifest_path)
+
+    loaded = Manifest.load(manifest_path)
+    assert set(loaded.entries) == {a, b}
+    assert loaded.entries[a]['size'] == os.path.getsize(a)
+    assert loaded.entries[a]['hash'] == compute_file_hash(a)
+    assert loaded.entries[a]['mtime_ns'] == os.stat(a).st_mtime_ns
+
+
+def test_diff(temp_files):
+    """追加・変更・削除の検出をテスト"""
+    tmp_path, a, b = temp_files
+    previous = Manifest.build([a, b])
+
+    c = str(tmp_path / 'c.py')
+    with open(c, 'w') as f:
+        f.write('print("c")')
+    with open(a, 'w') as f:
+        f.write('print("changed")')
+    os.remove(b)
+
+    diff = Manifest.build([a, c], previous).diff(previous)
+    assert diff.added == [c]
+    assert diff.modified == [a]
+    assert diff.deleted == [b]
+    assert diff.changed == [a, c]
+
+
+def test_unchanged_stat_reuses_hash(temp_files):
+    """statが変化していないファイルはハッシュを再計算しない"""
+    tmp_path, a, b = temp_files
+    previous = Manifest.build([a])
+    previous.entries[a]['hash'] = 'cached'
+
+    manifest = Manifest.build([a], previous)
+    assert manifest.entries[a]['hash'] == 'cached'
+
+
+def test_touched_file_is_not_modified(temp_files):
+    """更新時刻のみ変化したファイルは変更扱いにしない"""
+    tmp_path, a, b = temp_files
+    previous = Manifest.build([a])
+    stat = os.stat(a)
+    os.utime(a, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    diff = Manifest.build([a], previous).diff(previous)
+    assert diff.changed == []
+
+
+
+def test_size_change_is_detected_without_reading(temp_files, monkeypatch):
+    """追加・サイズが変わったファイルは内容を読まずに変更と判定する"""
+    tmp_path, a, b = temp_files
+    previous = Manifest.build([a])
+    with open(a, 'w') as f:
+        f.write('print("changed")')
+
+    hashed = []
+    monkeypatch.setattr('codest.manifest.compute_file_hash', lambda path, algorithm: hashed.append(path))
+    diff = Manifest.build([a, b], previous).diff(previous)
+    assert diff.added == [b]
+    assert diff.modified == [a]
+    assert hashed == []
+
+def test_load_invalid_manifest(tmp_path):
+    """不正なマニフェストの読み込みをテスト"""
+    invalid = tmp_path / 'invalid.json'
+    invalid.write_text('{"version": 99}')
+    with pytest.raises(ManifestError):
+        Manifest.load(str(invalid))
+    with pytest.raises(ManifestError):
+        Manifest.load(str(tmp_path / 'missing.json'))
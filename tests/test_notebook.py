@@ -0,0 +1,61 @@
+import json
+import pytest
+from codest.exceptions import NotebookError
+from codest.notebook import extract_notebook, OUTPUTS_TRUNCATE, OUTPUTS_FULL
+
+
+def make_notebook(cells, language='python'):
+    """テスト用のノートブックのJSONを作成"""
+    return json.dumps({
+        'nbformat': 4,
+        'metadata': {'kernelspec': {'name': 'k', 'language': language}},
+        'cells': cells,
+    }).encode('utf-8')
+
+
+CELLS = [
+    {'cell_type': 'markdown', 'source': ['# Analysis\n', 'Load the data.']},
+    {'cell_type': 'code', 'source': ['import pandas as pd\n', 'df = pd.read_csv("x.csv")'],
+     'outputs': [
+         {'output_type': 'stream', 'name': 'stdout', 'text': ['line %d\n' % i for i in range(5)]},
+         {'output_type': 'display_data', 'data': {'image/png': 'iVBORw0KGgo' * 1000, 'text/plain': ['<Figure>']}},
+     ]},
+    {'cell_type': 'code', 'source': 'df.head()', 'outputs': [
+        {'output_type': 'error', 'ename': 'KeyError', 'evalue': "'a'", 'traceback': ['\x1b[0m...']},
+    ]},
+]
+
+
+def test_extract_cells_without_outputs():
+    """セルを順に抽出し出力を除外するテスト"""
+    content, language = extract_notebook(make_notebook(CELLS))
+    assert language == 'python'
+    assert content == ('# %% [markdown]\n# # Analysis\n# Load the data.\n\n'
+                       '# %%\nimport pandas as pd\ndf = pd.read_csv("x.csv")\n\n'
+                       '# %%\ndf.head()\n')
+
+
+def test_extract_truncated_outputs():
+    """テキストの出力を行数で切り詰め、画像は種類のみ出力するテスト"""
+    content, _ = extract_notebook(make_notebook(CELLS), OUTPUTS_TRUNCATE, output_lines=2)
+    assert '# Output:\n# line 0\n# line 1\n# ... 5 more lines' in content
+    assert 'iVBOR' not in content
+    assert "# KeyError: 'a'" in content
+
+    content, _ = extract_notebook(make_notebook(CELLS), OUTPUTS_FULL)
+    assert '# line 4\n# <Figure>\n# [image/png output omitted]' in content
+
+
+def test_extract_non_python_kernel():
+    """カーネルの言語に合わせたコメント記号のテスト"""
+    content, language = extract_notebook(make_notebook(CELLS[:1], language='Scala'))
+    assert language == 'scala'
+    assert content.startswith('// %% [markdown]\n// # Analysis')
+
+
+def test_extract_invalid_notebook():
+    """ノートブックとして解析できない場合のテスト"""
+    with pytest.raises(NotebookError):
+        extract_notebook(b'{"cells": ')
+    with pytest.raises(NotebookError):
+        extract_notebook(b'[]')
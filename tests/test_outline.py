@@ -0,0 +1,179 @@
+import ast
+from codest.outline import outline_python, outline_braces, get_outliner, OutlineCache
+
+
+def test_outline_python():
+    """Pythonのアウトライン生成をテスト"""
+    source = '''"""Module docstring.
+
+Details."""
+import os
+
+CONSTANT = 1
+
+
+@decorator
+class Service(Base, metaclass=Meta):
+    """Service class.
+
+    Long description."""
+
+    def run(self, x: int, *args, **kwargs) -> str:
+        """Run the service."""
+        return str(x)
+
+    async def stop(self):
+        pass
+
+
+def helper(a, b=2):
+    def inner():
+        pass
+    return a + b
+'''
+    assert outline_python(source) == '\n'.join([
+        '"""Module docstring."""',
+        '@decorator',
+        'class Service(Base, metaclass=Meta):',
+        '    """Service class."""',
+        '    def run(self, x: int, *args, **kwargs) -> str:',
+        '        """Run the service."""',
+        '    async def stop(self): ...',
+        'def helper(a, b=2): ...',
+    ])
+
+
+
+def test_outline_python_without_unparse(monkeypatch):
+    """ast.unparseのないPython 3.8以前ではソースのトークンから宣言部を切り出すテスト"""
+    source = '''class Service(Base, metaclass=Meta):
+    @property
+    @cached(  # コメント
+        size=10)
+    def run(self, x: int = 1,
+            *args, **kwargs) -> Dict[str, int]:
+        """Run the service."""
+        return {}
+
+    async def stop(self): pass
+'''
+    expected = outline_python(source)
+    monkeypatch.delattr(ast, 'unparse', raising=False)
+    assert outline_python(source) == '\n'.join([
+        'class Service(Base, metaclass=Meta):',
+        '    @property',
+        '    @cached(size=10)',
+        '    def run(self, x: int = 1, *args, **kwargs) -> Dict[str, int]:',
+        '        """Run the service."""',
+        '    async def stop(self): ...',
+    ])
+    assert outline_python(source) == expected.replace('x: int=1', 'x: int = 1')
+
+def test_outline_python_syntax_error():
+    """構文エラーのソースはNoneを返す"""
+    assert outline_python('def broken(:') is None
+
+
+def test_outline_braces_java():
+    """Javaのアウトライン生成をテスト"""
+    source = '''package demo;
+
+import java.util.List;
+
+// comment with { brace
+public class Main {
+    private static final String BRACE = "}";
+
+    @Override
+    public String toString() {
+        if (true) {
+            return BRACE;
+        }
+        return "";
+    }
+
+    public interface Listener {
+        void onEvent(String name);
+    }
+}
+'''
+    assert outline_braces(source, 'java') == '\n'.join([
+        'public class Main {',
+        '    private static final String BRACE = "}";',
+        '    public String toString() { ... }',
+        '    public interface Listener {',
+        '        void onEvent(String name);',
+        '    }',
+        '}',
+    ])
+
+
+def test_outline_braces_go():
+    """Goのアウトライン生成をテスト"""
+    source = '''package main
+
+import (
+    "fmt"
+)
+
+type Server struct {
+    Addr string
+}
+
+func (s *Server) Start(port int) error {
+    fmt.Println(port)
+    return nil
+}
+'''
+    assert outline_braces(source, 'go') == '\n'.join([
+        'type Server struct {',
+        '    Addr string',
+        '}',
+        'func (s *Server) Start(port int) error { ... }',
+    ])
+
+
+def test_outline_braces_typescript():
+    """TypeScriptのアウトライン生成をテスト"""
+    source = '''import { x } from "y";
+
+export interface Props {
+  name: string
+}
+
+export const handler = async (event) => {
+  return x;
+};
+
+export function render(props: Props): string {
+  return props.name;
+}
+'''
+    assert outline_braces(source, 'typescript') == '\n'.join([
+        'export interface Props {',
+        '    name: string',
+        '}',
+        'export const handler = async (event) => { ... }',
+        'export function render(props: Props): string { ... }',
+    ])
+
+
+def test_get_outliner_unsupported():
+    """未対応の言語ではNoneを返す"""
+    assert get_outliner('yaml') is None
+    assert get_outliner('markdown') is None
+    assert outline_braces('a: 1', 'yaml') is None
+
+
+def test_outline_cache():
+    """ハッシュをキーとしたキャッシュをテスト"""
+    cache = OutlineCache(max_entries=1)
+    source = 'def f(): pass\n'
+    assert cache.get_or_create('h1', 'python', source) == 'def f(): ...'
+    assert cache.get_or_create('h1', 'python', 'ignored') == 'def f(): ...'
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # 最大エントリ数を超えると古いエントリが破棄される
+    cache.get_or_create('h2', 'python', source)
+    cache.get_or_create('h1', 'python', 'def g(): pass\n')
+    assert cache.misses == 3
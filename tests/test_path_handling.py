@@ -1,7 +1,7 @@
 # tests/test_path_handling.py
 import os
 import pytest
-from codest.normalize_paths import normalize_paths, is_subdirectory
+from codest.normalize_paths import normalize_paths, is_subdirectory, find_paths_outside
 from codest.file_collector import FileCollector
 
 
@@ -173,4 +173,65 @@ def test_file_collector_gitignore_handling(temp_project_structure):
     file_names = [os.path.basename(f) for f in files]
     assert 'debug.log' not in file_names
     assert 'app.js' not in file_names  # frontend/内のファイル
-    assert 'main.py' in file_names  # 通常のソースファイル
\ No newline at end of file
+    assert 'main.py' in file_names  # 通常のソースファイル
+
+def _normalize_paths_pairwise(directories):
+    """旧実装（総当たり比較）による参照結果"""
+    cwd = os.getcwd()
+    has_current_dir = '.' in directories
+    unique_paths = {cwd if p == '.' else os.path.abspath(p) for p in directories}
+    result = []
+    for path1 in unique_paths:
+        if path1 == cwd and has_current_dir:
+            result.append(path1)
+            continue
+        if not any(
+                path1 != path2 and not (path2 == cwd and has_current_dir) and is_subdirectory(path2, path1)
+                for path2 in unique_paths
+        ):
+            result.append(path1)
+    return sorted(result)
+
+
+def test_normalize_paths_matches_pairwise(tmp_path):
+    """ソート済みプレフィックス方式が総当たり方式と同じ結果になることを確認"""
+    os.chdir(str(tmp_path))
+    paths = ['.', 'a', 'a/b', 'a/bc', 'ab', 'ab/c', 'x/y/z', 'x/y', str(tmp_path.parent), 'a/./b/../b']
+    for subset in (paths, paths[1:], paths[1:8]):
+        assert sorted(normalize_paths(subset)) == _normalize_paths_pairwise(subset)
+
+
+def test_normalize_paths_sibling_prefix(tmp_path):
+    """文字列プレフィックスが一致するだけの兄弟ディレクトリは排除されない"""
+    paths = [str(tmp_path / 'src'), str(tmp_path / 'src2'), str(tmp_path / 'src' / 'a')]
+    normalized = normalize_paths(paths)
+    assert normalized == [str(tmp_path / 'src'), str(tmp_path / 'src2')]
+
+
+def test_normalize_paths_benchmark_10k(tmp_path):
+    """10,000パスの正規化ベンチマーク"""
+    import time
+
+    paths = []
+    for i in range(100):
+        paths.append(str(tmp_path / f'pkg{i}'))
+        for j in range(99):
+            paths.append(str(tmp_path / f'pkg{i}' / f'mod{j}' / 'src'))
+    assert len(paths) == 10000
+
+    start = time.perf_counter()
+    normalized = normalize_paths(paths)
+    elapsed = time.perf_counter() - start
+
+    assert len(normalized) == 100
+    assert elapsed < 2.0
+
+
+def test_find_paths_outside(temp_project_structure):
+    """ルート配下にないパスの抽出テスト"""
+    root = temp_project_structure
+    outside = find_paths_outside(
+        [str(root / 'src' / 'frontend'), str(root / 'tests'), str(root / 'build')],
+        [str(root / 'src')]
+    )
+    assert outside == [str(root / 'tests'), str(root / 'build')]
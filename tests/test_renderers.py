@@ -0,0 +1,73 @@
+import io
+import json
+import pytest
+from codest.renderers import (
+    DocumentHeader, MarkdownRenderer, JsonlRenderer, XmlRenderer, get_renderer, NOTICE_SKIPPED
+)
+
+
+def render(renderer, write):
+    out = io.StringIO()
+    write(renderer, out)
+    return out.getvalue()
+
+
+def test_get_renderer():
+    """出力形式名からの取得テスト"""
+    assert isinstance(get_renderer('markdown'), MarkdownRenderer)
+    assert isinstance(get_renderer('jsonl'), JsonlRenderer)
+    assert isinstance(get_renderer('xml'), XmlRenderer)
+    with pytest.raises(ValueError):
+        get_renderer('html')
+
+
+def test_markdown_header_with_toc():
+    """マークダウンのヘッダーと目次のテスト"""
+    header = DocumentHeader('2024-01-01 00:00:00', 2, ['/project'], meta={'Revision': '`main`'},
+                            toc_paths=['src/main.py', 'src/main.py'])
+    text = render(MarkdownRenderer(), lambda r, out: r.write_header(out, header))
+    assert text.startswith('# Source Code Collection\n\n## Meta Information\n\n')
+    assert '- **Revision**: `main`\n' in text
+    assert '- [`src/main.py`](#srcmainpy)\n- [`src/main.py`](#srcmainpy-1)\n' in text
+    assert text.endswith('## Source Files\n\n')
+
+
+def test_markdown_file_written_once():
+    """マークダウンファイルを1回だけ、内部のフェンスより長いフェンスで出力するテスト"""
+    content = '# Title\n\n```python\nprint(1)\n```'
+    text = render(MarkdownRenderer(), lambda r, out: r.write_file(out, 'README.md', 'markdown', content, 30))
+    assert text.count('# Title') == 1
+    assert '````markdown\n' + content + '\n````\n' in text
+    assert '<details>' in text
+
+
+def test_jsonl_records():
+    """JSON Lines形式のレコードのテスト"""
+    def write(renderer, out):
+        renderer.write_header(out, DocumentHeader('2024-01-01 00:00:00', 2, ['/project']))
+        renderer.write_file(out, 'src/main.py', 'python', 'print("hi")\n', 12)
+        renderer.write_notice(out, 'big.bin', NOTICE_SKIPPED, 'too large', 10 ** 7)
+        renderer.write_deleted(out, ['old.py'])
+
+    records = [json.loads(line) for line in render(JsonlRenderer(), write).splitlines()]
+    assert records[0]['type'] == 'header'
+    assert records[0]['total_files'] == 2
+    assert records[1] == {'type': 'file', 'path': 'src/main.py', 'language': 'python', 'size': 12,
+                          'status': 'included', 'content': 'print("hi")\n'}
+    assert records[2]['status'] == 'skipped'
+    assert records[3] == {'type': 'deleted', 'path': 'old.py'}
+
+
+def test_xml_tags():
+    """XMLタグ形式のテスト"""
+    def write(renderer, out):
+        renderer.write_start(out, '2024-01-01 00:00:00')
+        renderer.write_file(out, 'a "b".py', 'python', 'x = "</file>" if a < b else 0', 30)
+        renderer.write_header(out, DocumentHeader('2024-01-01 00:00:00', 1, ['/project']))
+        renderer.write_footer(out)
+
+    assert XmlRenderer.header_at_end
+    text = render(XmlRenderer(), write)
+    assert text.startswith('<codebase generated_at="2024-01-01 00:00:00">\n')
+    assert '<file path=\'a "b".py\' lang="python">\nx = "&lt;/file>" if a < b else 0\n</file>\n' in text
+    assert text.endswith('<header total_files="1">\n<directory>/project</directory>\n</header>\n</codebase>\n')
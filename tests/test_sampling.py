@@ -0,0 +1,80 @@
+import os
+import pytest
+from codest.file_collector import FileCollector
+from codest.sampling import StratifiedSampler
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """複数言語・多数のディレクトリを持つプロジェクトを作成"""
+    for i in range(10):
+        package = tmp_path / f'pkg{i}'
+        package.mkdir()
+        for j in range(10):
+            (package / f'mod{j}.py').write_text(f'VALUE = {j}\n')
+        (package / 'index.js').write_text('module.exports = {};\n')
+    (tmp_path / 'main.go').write_text('package main\n')
+    return tmp_path
+
+
+def sampler(directory, **kwargs):
+    return StratifiedSampler(FileCollector([str(directory)]), **kwargs)
+
+
+def test_sample_size(tree):
+    """指定数のファイルが複数のディレクトリ・言語から抽出されることをテスト"""
+    files = sampler(tree, sample_size=12).sample()
+    assert len(files) == 12
+    assert len({os.path.dirname(f) for f in files}) >= 5
+    assert {os.path.splitext(f)[1] for f in files} >= {'.py', '.js'}
+
+
+def test_sample_is_deterministic(tree):
+    """同じシードでは同じ結果、異なるシードでは異なる結果になることをテスト"""
+    first = sampler(tree, sample_size=8, seed=1).sample()
+    assert sampler(tree, sample_size=8, seed=1).sample() == first
+    assert sampler(tree, sample_size=8, seed=2).sample() != first
+
+
+def test_sample_size_stops_scanning(tree):
+    """割り当てが尽きたサブツリーを走査しないことをテスト"""
+    sample = sampler(tree, sample_size=3)
+    sample.sample()
+    assert sample.scanned_directories < 11
+
+
+def test_sample_size_larger_than_tree(tree):
+    """抽出数がファイル数より多い場合はすべてのファイルを返すことをテスト"""
+    assert len(sampler(tree, sample_size=1000).sample()) == 10 * 11 + 1
+
+
+@pytest.mark.parametrize('seed', range(8))
+@pytest.mark.parametrize('size', [1, 60, 99, 100, 150])
+def test_sample_size_reallocates_leftover_quota(tmp_path, seed, size):
+    """ファイルのないサブディレクトリの余った割り当てが他の層に配り直されることをテスト"""
+    for i in range(100):
+        (tmp_path / f'mod{i:03d}.py').write_text(f'VALUE = {i}\n')
+    for name in ('empty', 'assets', 'vendor'):
+        (tmp_path / name).mkdir()
+    (tmp_path / 'assets' / 'logo.bin').write_bytes(b'\x00\x01')
+    (tmp_path / 'vendor' / 'nested').mkdir()
+    files = sampler(tmp_path, sample_size=size, seed=seed).sample()
+    assert len(files) == min(size, 100)
+    assert len(set(files)) == len(files)
+
+
+def test_sample_ratio(tree):
+    """言語ごとの比率抽出のテスト"""
+    files = sampler(tree, sample_ratio=0.2).sample()
+    assert sum(1 for f in files if f.endswith('.py')) == 20
+    assert sum(1 for f in files if f.endswith('.js')) == 2
+
+
+def test_invalid_sample_options(tree):
+    """不正な指定のテスト"""
+    with pytest.raises(ValueError):
+        sampler(tree)
+    with pytest.raises(ValueError):
+        sampler(tree, sample_size=5, sample_ratio=0.5)
+    with pytest.raises(ValueError):
+        sampler(tree, sample_ratio=1.5)
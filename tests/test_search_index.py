@@ -0,0 +1,122 @@
+import os
+import pytest
+from codest.cli import main
+from codest.exceptions import SearchIndexError
+from codest.file_collector import FileCollector
+from codest.search_index import SearchIndex, default_search_index_path, query_tokens, tokenize
+
+
+@pytest.fixture
+def project(tmp_path):
+    """検索対象のプロジェクトを作成"""
+    (tmp_path / 'payments').mkdir()
+    (tmp_path / 'payments' / 'client.py').write_text('class PaymentClient:\n    def retry(self): pass\n')
+    (tmp_path / 'payments' / 'views.py').write_text('from .client import PaymentClient\n')
+    (tmp_path / 'search.py').write_text('def query_index(): pass\n')
+    return tmp_path
+
+
+def build_index(directory):
+    index = SearchIndex([str(directory)])
+    index.update(FileCollector([str(directory)]).iter_files())
+    return index
+
+
+def test_tokenize():
+    """識別子と構成要素のトークン化テスト"""
+    tokens = tokenize(b'PaymentClient.send_HTTPRequest(x)')
+    assert {'paymentclient', 'payment', 'client', 'send_httprequest', 'send', 'http', 'request'} <= tokens
+    assert 'x' not in tokens
+
+
+def test_query_tokens():
+    """検索語のトークン化テスト"""
+    assert query_tokens('PaymentClient retry') == ['paymentclient', 'retry']
+    with pytest.raises(SearchIndexError):
+        query_tokens('= ?')
+
+
+def test_search(project):
+    """検索語のすべての語を含むファイルの検索テスト"""
+    index = build_index(project)
+    client = str(project / 'payments' / 'client.py')
+    views = str(project / 'payments' / 'views.py')
+    assert index.search('PaymentClient') == [client, views]
+    assert index.search('paymentclient retry') == [client]
+    assert index.search('payment') == [client, views]
+    assert index.search('missing_name') == []
+
+
+def test_incremental_update(project, tmp_path_factory):
+    """statが変化したファイルのみ再読み込みする更新のテスト"""
+    index_path = str(tmp_path_factory.mktemp('index') / 'search.json.gz')
+    build_index(project).save(index_path)
+
+    index = SearchIndex.load(index_path)
+    views = project / 'payments' / 'views.py'
+    views.write_text('from .client import RefundClient\n')
+    os.utime(views, ns=(1, 1))
+    os.remove(project / 'search.py')
+    (project / 'refunds.py').write_text('RefundClient = None\n')
+
+    assert index.update(FileCollector([str(project)]).iter_files()) == (1, 1, 1)
+    assert index.search('PaymentClient') == [str(project / 'payments' / 'client.py')]
+    assert index.search('RefundClient') == [str(views), str(project / 'refunds.py')]
+    assert index.search('query_index') == []
+
+    # 変更がなければ何も読み込まない
+    assert index.update(FileCollector([str(project)]).iter_files()) == (0, 0, 0)
+
+
+def test_load_invalid_search_index(tmp_path):
+    """不正な検索インデックスの読み込みテスト"""
+    path = tmp_path / 'broken.json.gz'
+    path.write_text('not gzip')
+    with pytest.raises(SearchIndexError):
+        SearchIndex.load(str(path))
+
+
+def test_index_and_match_commands(project, tmp_path_factory):
+    """indexコマンドで作成した索引から--matchでドキュメントを生成するテスト"""
+    assert main(['index', str(project)]) == 0
+    assert os.path.exists(default_search_index_path([str(project)]))
+
+    output = str(tmp_path_factory.mktemp('doc') / 'payments.md')
+    assert main([str(project), '--match', 'PaymentClient', '-o', output]) == 0
+    with open(output, 'r', encoding='utf-8') as f:
+        content = f.read()
+    assert '- **Total files**: 2' in content
+    assert 'class PaymentClient' in content
+    assert 'query_index' not in content
+
+
+def test_directory_named_like_subcommand(tmp_path, monkeypatch):
+    """サブコマンドと同名のディレクトリがある場合はディレクトリを収集するテスト"""
+    (tmp_path / 'index').mkdir()
+    (tmp_path / 'index' / 'lookup.py').write_text('TABLE = {}\n')
+    monkeypatch.chdir(tmp_path)
+    output = str(tmp_path / 'index.md')
+    assert main(['index', '-o', output]) == 0
+    with open(output, 'r', encoding='utf-8') as f:
+        assert 'TABLE = {}' in f.read()
+
+
+def test_match_refreshes_stale_entries(project, tmp_path_factory):
+    """索引後に変更・削除されたファイルは--matchの前に索引を更新して検索するテスト"""
+    assert main(['index', str(project)]) == 0
+    (project / 'payments' / 'views.py').write_text('VIEWS = []\n')
+    (project / 'search.py').write_text('from payments.client import PaymentClient\n')
+    os.remove(str(project / 'payments' / 'client.py'))
+
+    output = str(tmp_path_factory.mktemp('doc') / 'payments.md')
+    assert main([str(project), '--match', 'PaymentClient', '-o', output]) == 0
+    with open(output, 'r', encoding='utf-8') as f:
+        content = f.read()
+    assert '- **Total files**: 1' in content
+    assert 'search.py' in content
+    assert 'VIEWS' not in content
+
+    # 更新した索引は保存され、次回は読み直さない
+    index = SearchIndex.load(default_search_index_path([str(project)]))
+    assert index.refresh() == (0, 0)
+    assert index.search('PaymentClient') == [str(project / 'search.py')]
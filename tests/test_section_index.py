@@ -0,0 +1,69 @@
+import io
+import pytest
+from codest.section_index import SectionIndex, extract_sections, default_index_path
+from codest.exceptions import SectionIndexError
+
+
+@pytest.fixture
+def indexed_document(tmp_path):
+    """セクションインデックス付きのドキュメントを作成"""
+    sections = [('src/a.py', b'## src/a.py\n\na = 1\n\n'),
+                ('src/b.py', b'## src/b.py\n\nb = "\xe3\x81\x82"\n\n'),
+                ('docs/c.md', b'## docs/c.md\n\n# C\n\n')]
+    header = b'# Header\n\n'
+    document = tmp_path / 'doc.md'
+    index = SectionIndex()
+    offset = len(header)
+    for name, body in sections:
+        index.add(name, offset, len(body))
+        offset += len(body)
+    index.document_size = offset
+    document.write_bytes(header + b''.join(body for _, body in sections))
+    index.save(default_index_path(str(document)))
+    return str(document)
+
+
+def test_index_round_trip(tmp_path):
+    """インデックスの保存と読み込みをテスト"""
+    index = SectionIndex(100)
+    index.add('src/main.py', 10, 50)
+    path = str(tmp_path / 'doc.md.index.json')
+    index.save(path)
+
+    loaded = SectionIndex.load(path)
+    assert loaded.document_size == 100
+    assert loaded.sections == [{'name': 'src/main.py', 'offset': 10, 'length': 50}]
+
+
+def test_extract_by_name_and_glob(indexed_document):
+    """名前とglobパターンでのセクション抽出をテスト"""
+    output = io.BytesIO()
+    assert extract_sections(indexed_document, ['src/*.py'], output) == 2
+    assert output.getvalue() == b'## src/a.py\n\na = 1\n\n## src/b.py\n\nb = "\xe3\x81\x82"\n\n'
+
+    output = io.BytesIO()
+    assert extract_sections(indexed_document, ['docs/c.md'], output) == 1
+    assert output.getvalue() == b'## docs/c.md\n\n# C\n\n'
+
+
+def test_extract_no_match(indexed_document):
+    """一致するセクションがない場合をテスト"""
+    output = io.BytesIO()
+    assert extract_sections(indexed_document, ['missing.py'], output) == 0
+    assert output.getvalue() == b''
+
+
+def test_extract_stale_index(indexed_document):
+    """ドキュメントが変更された場合はエラー"""
+    with open(indexed_document, 'ab') as f:
+        f.write(b'extra')
+    with pytest.raises(SectionIndexError):
+        extract_sections(indexed_document, ['src/a.py'], io.BytesIO())
+
+
+def test_load_invalid_index(tmp_path):
+    """不正なインデックスファイルの読み込みはエラー"""
+    path = tmp_path / 'bad.index.json'
+    path.write_text('{"version": 99}')
+    with pytest.raises(SectionIndexError):
+        SectionIndex.load(str(path))
@@ -0,0 +1,97 @@
+import os
+import time
+import pytest
+from codest.selection import BudgetSelector, parse_size, parse_weights, budget_from_options
+
+
+@pytest.fixture
+def scored_project(tmp_path):
+    """優先度の異なるファイルを持つプロジェクトを作成"""
+    (tmp_path / 'main.py').write_text('x' * 2000)
+    deep = tmp_path / 'a' / 'b' / 'c'
+    deep.mkdir(parents=True)
+    (deep / 'helper.py').write_text('x' * 2000)
+    (tmp_path / 'data.json').write_text('x' * 2000)
+    old = tmp_path / 'old.py'
+    old.write_text('x' * 2000)
+    old_time = time.time() - 365 * 86400
+    os.utime(str(old), (old_time, old_time))
+    return tmp_path
+
+
+def _rel(root):
+    return lambda p: os.path.relpath(p, str(root))
+
+
+def test_score_signals(scored_project):
+    """各シグナルがスコアに反映されることをテスト"""
+    selector = BudgetSelector(10000)
+    stat = os.stat(str(scored_project / 'main.py'))
+    main = selector.score('main.py', stat)
+    assert main > selector.score('helper.py', stat)  # エントリポイント
+    assert selector.score('helper.py', stat) > selector.score(os.path.join('a', 'b', 'helper.py'), stat)
+    assert selector.score('helper.py', stat) > selector.score('helper.json', stat)
+    old_stat = os.stat(str(scored_project / 'old.py'))
+    assert selector.score('helper.py', stat) > selector.score('helper.py', old_stat)
+
+
+def test_select_within_budget(scored_project):
+    """予算内で優先度の高いファイルが選択されることをテスト"""
+    files = sorted(str(p) for p in scored_project.rglob('*') if p.is_file())
+    selector = BudgetSelector(4200)
+    selected = selector.select(files, _rel(scored_project))
+
+    # エントリポイントが最優先され、古いファイルは選択されない
+    assert len(selected) == 2
+    assert str(scored_project / 'main.py') in selected
+    assert str(scored_project / 'old.py') not in selected
+    assert selector.used_bytes <= 4200
+
+
+def test_select_with_custom_weights(scored_project):
+    """重みの変更で選択結果が変わることをテスト"""
+    files = sorted(str(p) for p in scored_project.rglob('*') if p.is_file())
+    selector = BudgetSelector(2100, weights={'recency': 0, 'depth': 0, 'entry_point': 0, 'size': 0,
+                                             'extension': 1},
+                              extension_weights={'.json': 5.0})
+    assert selector.select(files, _rel(scored_project)) == [str(scored_project / 'data.json')]
+
+
+def test_oversized_files_cost_stub(scored_project):
+    """スキップされるファイルはスタブのサイズで見積もる"""
+    selector = BudgetSelector(1000, max_file_size_bytes=1000)
+    assert selector.estimate_cost('main.py', 2000) < 1000
+
+
+
+def test_excerpted_files_cost_excerpt_cap():
+    """先頭・末尾のみ出力するファイルは抜粋の上限で見積もる"""
+    selector = BudgetSelector(100000, max_file_size_bytes=1000, excerpt_bytes=300)
+    assert 600 < selector.estimate_cost('big.py', 50000) < 1000
+    # 抜粋の上限より小さいサイズ超過ファイルはファイルサイズで見積もる
+    selector = BudgetSelector(100000, max_file_size_bytes=100, excerpt_bytes=300)
+    assert selector.estimate_cost('big.py', 200) < 600
+
+
+def test_toc_and_reserved_bytes(scored_project):
+    """目次の項目を各ファイルのコストに含め、ヘッダーの分を予算から差し引く"""
+    assert BudgetSelector(1000, toc=True).estimate_cost('main.py', 100) > \
+        BudgetSelector(1000).estimate_cost('main.py', 100) + 2 * len('main.py')
+
+    files = sorted(str(p) for p in scored_project.rglob('*') if p.is_file())
+    selector = BudgetSelector(10 ** 9, reserved_bytes=10 ** 9)
+    assert selector.select(files, _rel(scored_project)) == []
+    assert selector.used_bytes == 10 ** 9
+
+def test_parse_options():
+    """予算・重みの解析をテスト"""
+    assert parse_size('1500') == 1500
+    assert parse_size('512K') == 512 * 1024
+    assert parse_size('2MB') == 2 * 1024 * 1024
+    assert budget_from_options(None, 1000) == 4000
+    assert budget_from_options(None, None) is None
+    assert parse_weights('recency=2, size=0') == {'recency': 2.0, 'size': 0.0}
+    with pytest.raises(ValueError):
+        parse_size('lots')
+    with pytest.raises(ValueError):
+        parse_weights('unknown=1')
@@ -0,0 +1,74 @@
+import os
+import pytest
+from codest import CodestSession
+from codest.exceptions import FileCollectionError
+
+
+@pytest.fixture
+def project(tmp_path):
+    """テスト用のプロジェクト構造を作成"""
+    (tmp_path / 'pkg').mkdir()
+    (tmp_path / 'pkg' / 'core.py').write_text('CORE = 1\n')
+    (tmp_path / 'pkg' / 'util.py').write_text('UTIL = 2\n')
+    (tmp_path / 'web').mkdir()
+    (tmp_path / 'web' / 'app.js').write_text('export const app = 1;\n')
+    (tmp_path / 'ignored').mkdir()
+    (tmp_path / 'ignored' / 'skip.py').write_text('SKIP = 3\n')
+    (tmp_path / '.gitignore').write_text('ignored/\n')
+    return tmp_path
+
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def test_refresh_reuses_unchanged_directories(project):
+    """変更のないディレクトリは一覧し直さないテスト"""
+    session = CodestSession(str(project))
+    first = session.refresh()
+    assert first['added'] == 3
+    assert [os.path.basename(f) for f in session.files()] == ['core.py', 'util.py', 'app.js']
+
+    assert session.refresh() == {'added': 0, 'modified': 0, 'removed': 0, 'rescanned_directories': 0}
+
+    (project / 'pkg' / 'extra.py').write_text('EXTRA = 4\n')
+    (project / 'web' / 'app.js').write_text('export const app = 22;\n')
+    os.remove(project / 'pkg' / 'util.py')
+    changes = session.refresh()
+    assert changes == {'added': 1, 'modified': 1, 'removed': 1, 'rescanned_directories': 1}
+
+
+def test_gitignore_change_reloads_rules(project):
+    """.gitignoreの変更で無視ルールを解析し直すテスト"""
+    session = CodestSession(str(project))
+    session.refresh()
+    gitignore = project / '.gitignore'
+    gitignore.write_text('web/\n')
+    stat = os.stat(gitignore)
+    os.utime(gitignore, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    session.refresh()
+    names = [os.path.basename(f) for f in session.files()]
+    assert 'skip.py' in names
+    assert 'app.js' not in names
+
+
+def test_generate_subdirectory_and_subset(project, tmp_path_factory):
+    """サブディレクトリ・ファイルのサブセットのドキュメント生成テスト"""
+    out_dir = tmp_path_factory.mktemp('docs')
+    session = CodestSession(str(project), toc=True)
+
+    content = read(session.generate(str(out_dir / 'pkg.md'), subdirectory='pkg'))
+    assert '### `core.py`' in content
+    assert 'app.js' not in content
+
+    content = read(session.generate(str(out_dir / 'subset.md'), paths=['web/app.js', 'missing.py']))
+    assert '- **Total files**: 1' in content
+    assert '### `web/app.js`' in content
+    # 2回目以降はキャッシュから読み込む
+    session.generate(str(out_dir / 'all.md'), compact=True)
+    assert session.content_cache.hits >= 1
+
+    with pytest.raises(FileCollectionError):
+        session.generate(str(out_dir / 'bad.md'), subdirectory='nowhere')
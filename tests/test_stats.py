@@ -0,0 +1,82 @@
+import io
+import json
+import pytest
+from contextlib import redirect_stdout
+from codest.cli import main
+from codest.stats import CodebaseStats, count_lines, scan_stats
+
+
+@pytest.mark.parametrize('data, expected', [
+    (b'', (0, 0, 0)),
+    (b'x = 1', (1, 1, 0)),
+    (b'x = 1\n', (1, 1, 0)),
+    (b'x = 1\n\n  \ny = 2\n', (4, 2, 2)),
+    (b'a\r\n\r\nb', (3, 2, 1)),
+    (b'\n\n', (2, 0, 2)),
+])
+def test_count_lines(data, expected):
+    """バイト列の行数計算のテスト"""
+    counts = count_lines(data)
+    assert (counts['lines'], counts['code'], counts['blank']) == expected
+
+
+def test_codebase_stats_breakdown():
+    """言語別・最上位ディレクトリ別の集計テスト"""
+    stats = CodebaseStats()
+    stats.add('src/app.py', b'import os\n\nprint(os.name)\n')
+    stats.add('src/web/index.js', b'console.log(1);\n')
+    stats.add('setup.py', b'setup()\n')
+    stats.add_unread('src/big.py', 5000)
+
+    data = stats.to_dict()
+    assert data['totals'] == {'files': 4, 'bytes': 5000 + 26 + 16 + 8, 'lines': 5, 'code': 4, 'blank': 1}
+    assert data['languages']['python']['files'] == 3
+    assert data['languages']['python']['lines'] == 4
+    assert data['languages']['javascript']['lines'] == 1
+    assert data['directories']['src']['files'] == 3
+    assert data['directories']['.']['lines'] == 1
+    assert data['unread_files'] == 1
+    assert 'python' in stats.format_table()
+
+
+def test_scan_stats(tmp_path):
+    """読み込み専用の並列走査のテスト"""
+    (tmp_path / 'a.py').write_text('x = 1\n\ny = 2\n')
+    (tmp_path / 'b.go').write_text('package main\n')
+    paths = [str(tmp_path / 'a.py'), str(tmp_path / 'b.go'), str(tmp_path / 'missing.py')]
+    stats = scan_stats(paths, lambda p: p[len(str(tmp_path)) + 1:], max_workers=2)
+    assert stats.totals['files'] == 2
+    assert stats.totals['lines'] == 4
+    assert stats.by_language['go']['code'] == 1
+
+
+def test_stats_only_command(tmp_path):
+    """--stats-onlyでドキュメントを生成せず集計を出力するテスト"""
+    (tmp_path / 'pkg').mkdir()
+    (tmp_path / 'pkg' / 'main.py').write_text('print(1)\n\n')
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        assert main([str(tmp_path), '--stats-only', '--format', 'jsonl']) == 0
+    data = json.loads(buffer.getvalue())
+    assert data['totals'] == {'files': 1, 'bytes': 10, 'lines': 2, 'code': 1, 'blank': 1}
+    assert data['directories'] == {'pkg': data['totals']}
+
+
+def test_stats_only_follows_entry(tmp_path):
+    """--stats-onlyでも--entryで選択したファイルのみを集計するテスト"""
+    (tmp_path / 'main.py').write_text('import helper\n')
+    (tmp_path / 'helper.py').write_text('VALUE = 1\n')
+    (tmp_path / 'unused.py').write_text('UNUSED = 1\n')
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        assert main([str(tmp_path), '--stats-only', '--format', 'jsonl',
+                     '--entry', str(tmp_path / 'main.py'),
+                     '--import-cache', str(tmp_path / 'cache' / 'imports.json')]) == 0
+    assert json.loads(buffer.getvalue())['totals']['files'] == 2
+
+
+@pytest.mark.parametrize('option', [['--since', 'prev.json'], ['--manifest', 'out.json'], ['--budget', '1M']])
+def test_stats_only_rejects_output_options(tmp_path, option):
+    """--stats-onlyと差分・予算・マニフェストの指定は併用できないテスト"""
+    with pytest.raises(SystemExit):
+        main([str(tmp_path), '--stats-only'] + option)